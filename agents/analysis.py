@@ -7,7 +7,18 @@ Agenci w tym pliku odpowiadają za "mózg" operacji:
 - Trend Analyst: Wybiera najlepsze pomysły na podstawie wyników wyszukiwania.
 """
 
-from core import ask_llm, MAX_INSIGHTS, CUISINES
+from history import MAX_INSIGHTS
+from cuisines import CUISINES
+from llm_json import ask_llm_json, ANALYST_SCHEMA, QUERIES_SCHEMA, IDEAS_SCHEMA
+from wire import ANALYST_WIRE, QUERIES_WIRE, IDEAS_WIRE
+from preferences import summarize_preferences
+from matching import idea_name
+
+
+def _preferences_line(history: dict) -> str:
+    """Streszczenie modelu preferencji (fallback: 3 ostatnie zwycięskie dania)."""
+    summary = summarize_preferences(history.get('preference_model', {}))
+    return summary or str(history.get('liked_trends', [])[-3:])
 
 # ==============================================================================
 # 1. DEEP ANALYST (GŁÓWNY ANALITYK)
@@ -28,11 +39,11 @@ _deep_analyst_system_message = f"""Jesteś **Głównym Analitykiem** w projekcie
 **DOSTĘPNE KUCHNIE:**
 {', '.join(CUISINES)}
 
-**FORMAT WYJŚCIOWY (JSON):**
+**FORMAT WYJŚCIOWY (JSON, b=brief, c=kuchnia, l=wniosek):**
 {{
-  "daily_brief": "<Twój zwięzły brief na dziś, np. tanio i szybko, danie wegetariańskie, coś na imprezę>",
-  "suggested_cuisine": "<DOKŁADNA nazwa kuchni z powyższej listy, np. 'Turecka (Kebab/Meze)'>",
-  "new_learning": "<Nowy, ciekawy wniosek na temat preferencji użytkownika, np. Użytkownik często wybiera dania z makaronem w weekendy, ale unika dań mięsnych w poniedziałki.>"
+  "b": "<Twój zwięzły brief na dziś, np. tanio i szybko, danie wegetariańskie, coś na imprezę>",
+  "c": "<DOKŁADNA nazwa kuchni z powyższej listy, np. 'Turecka (Kebab/Meze)'>",
+  "l": "<Nowy, ciekawy wniosek na temat preferencji użytkownika, np. Użytkownik często wybiera dania z makaronem w weekendy, ale unika dań mięsnych w poniedziałki.>"
 }}
 """
 
@@ -52,18 +63,18 @@ async def agent_deep_analyst(user_query: str, history: dict):
 {insights if insights else 'Brak.'}
 
 **Pełna historia (ostatnie wpisy):**
-- Ostatnio lubiane trendy: {history.get('liked_trends', [])[-5:]}
+- Preferencje z ankiet: {_preferences_line(history)}
 - Ostatnio proponowane kuchnie: {history.get('last_cuisines', [])[:5]}
 - Ostatnio proponowane regiony: {history.get('last_regions', [])}
 
-Wykonaj analizę i zwróć JSON. Jeśli w historii czatu użytkownik wyraził konkretną chęć (np. "zjadłbym kebaba"), potraktuj to jako nadrzędną wytyczną dla 'suggested_cuisine' i 'daily_brief'.
+Wykonaj analizę i zwróć JSON. Jeśli w historii czatu użytkownik wyraził konkretną chęć (np. "zjadłbym kebaba"), potraktuj to jako nadrzędną wytyczną dla kuchni (c) i briefu (b).
 """
     messages = [
         {"role": "system", "content": _deep_analyst_system_message},
         {"role": "user", "content": prompt}
     ]
     
-    response = await ask_llm(messages, json_mode=True)
+    response = await ask_llm_json(messages, ANALYST_SCHEMA, label="Analityk", wire=ANALYST_WIRE) or {}
     # Silent on success
     return response
 
@@ -80,23 +91,31 @@ _strategist_system_message = """Jesteś **Strategiem Wyszukiwania** w projekcie
 3.  Muszą być zgodne z briefem i kuchnią tematyczną.
 
 **FORMAT WYJŚCIOWY (JSON):**
-`{ "queries": ["<zapytanie 1>", "<zapytanie 2>"] }`
+`{ "q": ["<zapytanie 1>", "<zapytanie 2>"] }`
 """
 
-async def agent_search_strategist(cuisine: str, daily_brief: str):
+async def agent_search_strategist(cuisine, daily_brief: str, max_queries: int = 3):
     """
     Generuje zapytania do Google na podstawie kuchni i briefu.
+    `cuisine` może być listą kuchni (wspólny research dla planu tygodniowego).
     """
     # Silent operation
     
     prompt = f"""**Kuchnia:** {cuisine}\n**Brief:** {daily_brief}\n\nWygeneruj zapytania i zwróć JSON.
+"""
+    if isinstance(cuisine, (list, tuple)):
+        prompt = f"""**Kuchnie:** {'; '.join(cuisine)}\n**Brief:** {daily_brief}
+
+Limit w tym zadaniu: maksymalnie {max_queries} zapytań (zamiast 3), co najmniej jedno dla każdej kuchni.
+Zapytanie może łączyć kuchnie o wspólnych składnikach lub technikach. Wygeneruj zapytania i zwróć JSON.
 """
     messages = [
         {"role": "system", "content": _strategist_system_message},
         {"role": "user", "content": prompt}
     ]
     
-    response = await ask_llm(messages, json_mode=True)
+    response = await ask_llm_json(messages, QUERIES_SCHEMA, label="Strateg", wire=QUERIES_WIRE) or {}
+    response["queries"] = response.get("queries", [])[:max_queries]
     # Silent on success
     return response
 
@@ -113,7 +132,7 @@ _trend_analyst_system_message = """Jesteś **Analitykiem Trendów Kulinarnych**
 3.  **Bądź zwięzły:** Każdy pomysł to tylko nazwa i krótki, intrygujący opis.
 
 **FORMAT WYJŚCIOWY (JSON):**
-`{ "ideas": [{"nazwa": "<nazwa dania>", "opis": "<opis>"}, ...] }`
+`{ "i": [{"n": "<nazwa dania>", "o": "<opis>"}, ...] }` (i=pomysły, n=nazwa, o=opis)
 """
 
 async def agent_trend_analyst_multi_source(cuisine: str, search_data: str, history: dict, guidelines: list):
@@ -128,8 +147,8 @@ async def agent_trend_analyst_multi_source(cuisine: str, search_data: str, histo
 {search_data if search_data else 'Brak danych z wyszukiwarki.'}
 
 **Dane historyczne i wnioski:**
-- Ostatnio lubiane trendy: {history.get('liked_trends', [])[-5:]}
-- Ostatnio proponowane dania (unikać, jeśli to możliwe): {history.get('last_trends', [])[:1]}
+- Preferencje z ankiet: {_preferences_line(history)}
+- Ostatnio proponowane dania (unikać, jeśli to możliwe): {', '.join(idea_name(i) for t in history.get('last_trends', [])[:1] for i in t) or 'Brak'}
 - Dodatkowe wytyczne: {guidelines if guidelines else 'Brak'}
 
 Przeanalizuj wszystkie dane i przedstaw od 3 do 5 unikalnych, inspirujących pomysłów na dania. Zwróć JSON.
@@ -139,6 +158,6 @@ Przeanalizuj wszystkie dane i przedstaw od 3 do 5 unikalnych, inspirujących pom
         {"role": "user", "content": prompt}
     ]
     
-    response = await ask_llm(messages, model="llama-3.1-8b-instant", json_mode=True)
+    response = await ask_llm_json(messages, IDEAS_SCHEMA, label="Analityk Trendów", wire=IDEAS_WIRE, model="llama-3.1-8b-instant") or {}
     # Silent on success
     return response
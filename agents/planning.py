@@ -5,7 +5,8 @@ Agenci w tym pliku odpowiadają za:
 - Meal Planner: Tworzenie pełnego planu dnia (śniadanie i kolacja) wokół wybranego obiadu.
 """
 
-from core import ask_llm
+from llm_json import ask_llm_json, MEAL_PLAN_SCHEMA
+from wire import MEAL_PLAN_WIRE, RECIPE_WIRE_FORMAT, RECIPE_WIRE_LEGEND, format_ingredient_rows
 
 _meal_planner_system_message = f"""Jesteś **Kreatywnym Szefem Planowania Posiłków** w projekcie RecipeCooker. Twoim zadaniem jest stworzenie komplementarnego planu posiłków na cały dzień, bazując na danym obiedzie, który jest "gwiazdą dnia".
 
@@ -15,37 +16,25 @@ _meal_planner_system_message = f"""Jesteś **Kreatywnym Szefem Planowania Posił
 3.  **Zachowaj motyw przewodni:** Jeśli obiad jest w konkretnym stylu (np. włoski, azjatycki), śniadanie i kolacja mogą do niego nawiązywać, ale nie muszą być z tej samej kuchni.
 4.  **Zbilansuj dzień:** Jeśli obiad jest ciężki, zaproponuj lekkie śniadanie i kolację. I odwrotnie.
 
-**FORMAT WYJŚCIOWY (JSON):**
-`{{
-  "breakfast": {{
-    "dish_name": "<Nazwa dania>",
-    "description": "<Krótki opis, 1 zdanie>",
-    "prep_time": "<Szacowany czas przygotowania>",
-    "calories": "<Szacowana liczba kcal>",
-    "ingredients": [{{"item": "<Składnik>", "amount": "<Ilość>", "unit": "<Jednostka>"}}],
-    "steps": ["<Krok 1>", "<Krok 2>"]
-  }},
-  "dinner": {{
-    "dish_name": "<Nazwa dania>",
-    "description": "<Krótki opis, 1 zdanie>",
-    "prep_time": "<Szacowany czas przygotowania>",
-    "calories": "<Szacowana liczba kcal>",
-    "ingredients": [{{"item": "<Składnik>", "amount": "<Ilość>", "unit": "<Jednostka>"}}],
-    "steps": ["<Krok 1>", "<Krok 2>"]
-  }}
-}}`
+**FORMAT WYJŚCIOWY (JSON, b=śniadanie, d=kolacja):**
+`{{"b": {RECIPE_WIRE_FORMAT}, "d": {RECIPE_WIRE_FORMAT}}}`
+{RECIPE_WIRE_LEGEND} W obu przepisach podaj też szacowaną kaloryczność (k). Opis (d) to 1 zdanie.
 """
 
 async def agent_meal_planner(main_dish: dict):
     """
     Generuje plan posiłków (śniadanie + kolacja) pasujący do podanego obiadu.
+
+    Returns:
+        dict: Plan zgodny z MEAL_PLAN_SCHEMA; posiłki, których nie udało się odzyskać, są pominięte.
     """
     # Silent operation
     
     prompt = f"""Oto dzisiejszy obiad:
 - Nazwa: {main_dish.get('dish_name')}
 - Opis: {main_dish.get('description')}
-- Składniki: {main_dish.get('ingredients')}
+- Składniki (składnik|ilość|jednostka):
+{format_ingredient_rows(main_dish.get('ingredients'))}
 
 Zaproponuj śniadanie i kolację, które będą pasować do tego dania. Zwróć pełne przepisy w formacie JSON.
 """
@@ -54,6 +43,6 @@ Zaproponuj śniadanie i kolację, które będą pasować do tego dania. Zwróć
         {"role": "user", "content": prompt}
     ]
     
-    response = await ask_llm(messages, json_mode=True)
+    response = await ask_llm_json(messages, MEAL_PLAN_SCHEMA, label="Planista", partial=True, wire=MEAL_PLAN_WIRE) or {}
     # Silent on success
     return response
@@ -5,6 +5,7 @@ Zastępuje skomplikowane potoki jednym, inteligentnym agentem stylistą i prosty
 """
 
 from core import ask_llm
+from llm_json import ask_llm_json, PUBLISHER_SCHEMA
 import json
 import re
 
@@ -136,7 +137,7 @@ async def agent_smart_stylist(text: str, mode: str = "recipe") -> str:
     ]
     
     # NIŻSZA TEMPERATURA = MNIEJ HALUCYNACJI
-    raw_output = await ask_llm(messages, temperature=0.3)
+    raw_output = await ask_llm(messages, temperature=0.3, agent="Stylista")
     
     # POST-PROCESSING: Usuń halucynowane treści
     cleaned_output = _clean_hallucinated_content(raw_output)
@@ -189,35 +190,34 @@ async def agent_publisher(components: dict) -> list[str]:
     ]
     
     # BARDZO NISKA TEMPERATURA = DOKŁADNE KOPIOWANIE
-    response = await ask_llm(messages, json_mode=True, temperature=0.1)
-    
-    try:
-        result = json.loads(response).get("messages", [])
-        
-        # Walidacja: Czy Publisher nie skrócił treści?
-        # Teraz components ma tylko stringi: intro, breakfast, lunch, dinner
-        input_length = sum(len(str(v)) for v in components.values())
-        output_length = sum(len(msg) for msg in result)
-        
-        if output_length < input_length * 0.7:
-            print(f"  ⚠️ Wydawca: Fallback ({output_length}/{input_length})")
-            # Fallback: Po prostu zwróć wszystkie wartości jako osobne wiadomości
-            messages = []
-            for key, value in components.items():
-                if isinstance(value, list):
-                    messages.extend(value)
-                else:
-                    messages.append(value)
-            return messages
-        
-        return result
-    except Exception as e:
+    # Bez dopytywania: ponowne kopiowanie całej treści kosztuje tyle co pełna regeneracja
+    response = await ask_llm_json(messages, PUBLISHER_SCHEMA, label="Wydawca", max_reasks=0, temperature=0.1)
+
+    if not response:
         print(f"  ❌ Wydawca: Błąd JSON")
-        # Fallback
-        messages = []
-        for key, value in components.items():
-            if isinstance(value, list):
-                messages.extend(value)
-            else:
-                messages.append(value)
-        return messages
+        return publisher_fallback(components)
+    return validate_publication(response["messages"], components)
+
+
+def publisher_fallback(components: dict) -> list[str]:
+    """Fallback: Po prostu zwróć wszystkie wartości jako osobne wiadomości."""
+    fallback = []
+    for key, value in components.items():
+        if isinstance(value, list):
+            fallback.extend(value)
+        else:
+            fallback.append(value)
+    return fallback
+
+
+def validate_publication(result: list[str], components: dict) -> list[str]:
+    """Walidacja: Czy Publisher nie skrócił treści? Jeśli tak - fallback."""
+    # Teraz components ma tylko stringi: intro, breakfast, lunch, dinner
+    input_length = sum(len(str(v)) for v in components.values())
+    output_length = sum(len(msg) for msg in result)
+    
+    if output_length < input_length * 0.7:
+        print(f"  ⚠️ Wydawca: Fallback ({output_length}/{input_length})")
+        return publisher_fallback(components)
+    
+    return result
@@ -7,7 +7,11 @@ Odpowiada za proces tworzenia i weryfikacji przepisów:
 - Nutrition Audit: Sprawdza wartości odżywcze i zgodność z dietą.
 """
 
-from core import ask_llm
+from llm_json import ask_llm_json, RECIPE_SCHEMA, SHOPPER_SCHEMA, NUTRITION_SCHEMA
+from wire import (
+    RECIPE_WIRE, SHOPPER_WIRE, NUTRITION_WIRE, RECIPE_WIRE_FORMAT, RECIPE_WIRE_LEGEND,
+    encode_recipe, encode_mapping, format_ingredient_rows
+)
 
 # ==============================================================================
 # 1. CHEF REFINER (SZEF KUCHNI)
@@ -19,16 +23,11 @@ _chef_system_message = """Jesteś **Mistrzem Kuchni** w projekcie RecipeCooker.
 1.  **Kompletność:** Przepis musi mieć nazwę, TREŚCIWY OPIS (w tym 1 zdanie wyjaśniające co to za danie i skąd pochodzi, dla laika), listę składników i instrukcje.
 2.  **Kreatywność:** Dodaj "twist".
 3.  **Realizm:** Składniki dostępne w Polsce.
-4.  **Ścisły JSON.**
+4.  **Ścisły JSON w formacie kompaktowym** (krótkie klucze, składniki jako wiersze tabeli).
 
 **FORMAT WYJŚCIOWY (JSON):**
-`{
-  "dish_name": "<Nazwa dania>",
-  "description": "<Opis dania + Wyjaśnienie kulturowe>",
-  "prep_time": "<Szacowany czas przygotowania>",
-  "ingredients": [{"item": "<Składnik>", "amount": "<Ilość>", "unit": "<Jednostka>"}],
-  "steps": ["<Krok 1>", "<Krok 2>"]
-}`
+`""" + RECIPE_WIRE_FORMAT + """`
+""" + RECIPE_WIRE_LEGEND + """ Opis (d) zawiera wyjaśnienie kulturowe, porcje (p) to liczba porcji, na którą podane są ilości.
 """
 
 async def agent_chef_refiner(draft: dict):
@@ -39,6 +38,9 @@ async def agent_chef_refiner(draft: dict):
     1. Otrzymuje pomysł + kuchnię + wytyczne
     2. Analizuje historię feedbacku (jeśli były poprawki)
     3. Generuje kompletny przepis w JSON (nazwa, opis, składniki, kroki)
+
+    Returns:
+        dict | None: Przepis zgodny z RECIPE_SCHEMA lub None, jeśli odpowiedzi nie da się odzyskać.
     """
     dish_name = draft.get('idea', 'Danie')[:40]  # Max 40 znaków dla czytelności
     print(f"  🧑‍🍳 Chef: '{dish_name}'...")
@@ -46,8 +48,8 @@ async def agent_chef_refiner(draft: dict):
     # Budujemy prompt dla LLM z całym kontekstem
     prompt = f"""**Pomysł:** {draft.get('idea')}
 **Kuchnia:** {draft.get('cuisine')}
-**Wytyczne:** {draft.get('guidelines')}
-**Historia feedbacku (do poprawy):** {draft.get('feedback_history', 'Brak')}
+**Wytyczne:** {encode_mapping(draft.get('guidelines'))}
+**Historia feedbacku (do poprawy):** {'; '.join(draft.get('feedback_history') or []) or 'Brak'}
 
 Stwórz lub popraw przepis, stosując się do powyższych informacji. Zwróć uwagę na feedback, jeśli jest dostępny.
 """
@@ -56,7 +58,7 @@ Stwórz lub popraw przepis, stosując się do powyższych informacji. Zwróć uw
         {"role": "user", "content": prompt}
     ]
     
-    return await ask_llm(messages, json_mode=True)
+    return await ask_llm_json(messages, RECIPE_SCHEMA, label="Chef", wire=RECIPE_WIRE)
 
 
 # ==============================================================================
@@ -70,8 +72,8 @@ _shopper_system_message = """Jesteś **Audytorem Logistycznym** w RecipeCooker.
 2.  **Koszt:** Czy przepis jest ekonomiczny? Odrzuć go, jeśli wymaga wielu bardzo drogich składników (np. szafran, polędwica wołowa, świeże owoce morza w dużych ilościach).
 3.  **Decyzja:** Zatwierdź przepis (`approved: true`), jeśli jest rozsądny cenowo i logistycznie. Odrzuć (`approved: false`) tylko w przypadku POWAŻNYCH problemów z kosztem lub dostępnością. Zawsze podaj krótkie uzasadnienie.
 
-**FORMAT WYJŚCIOWY (JSON):**
-`{\"approved\": <true/false>, \"feedback\": \"<Twoje zwięzłe uzasadnienie>\"}`
+**FORMAT WYJŚCIOWY (JSON, a=approved, f=feedback):**
+`{\"a\": <true/false>, \"f\": \"<Twoje zwięzłe uzasadnienie>\"}`
 """
 
 async def agent_shopper_audit(draft: dict):
@@ -83,14 +85,16 @@ async def agent_shopper_audit(draft: dict):
     - Koszt (odrzuca przepisy z wieloma drogimi składnikami)
     
     Returns:
-        JSON: {"approved": true/false, "feedback": "uzasadnienie"}
+        dict | None: {"approved": True/False, "feedback": "uzasadnienie"}
     """
     dish_name = draft.get('chef_work', {}).get('dish_name', 'Danie')[:30]
     print(f"  🛒 Logistyk: '{dish_name}'...")
     
     prompt = f"""**Danie:** {draft.get('chef_work', {}).get('dish_name')}
-**Składniki:** {draft.get('chef_work', {}).get('ingredients')}
-**Wytyczne:** {draft.get('guidelines')}
+**Składniki (składnik|ilość|jednostka):**
+{format_ingredient_rows(draft.get('chef_work', {}).get('ingredients'))}
+**Wytyczne:** {encode_mapping(draft.get('guidelines'))}
+**Wycena lokalna (orientacyjna):** {draft.get('local_cost') or 'Brak'}
 
 Oceń przepis pod kątem logistyki i kosztów dla polskiego użytkownika.
 """
@@ -99,7 +103,7 @@ Oceń przepis pod kątem logistyki i kosztów dla polskiego użytkownika.
         {"role": "user", "content": prompt}
     ]
     
-    return await ask_llm(messages, json_mode=True)
+    return await ask_llm_json(messages, SHOPPER_SCHEMA, label="Logistyk", wire=SHOPPER_WIRE)
 
 
 # ==============================================================================
@@ -110,12 +114,12 @@ _nutrition_system_message = """Jesteś **Audytorem Dietetycznym** w RecipeCooker
 
 **Zasady Oceny:**
 1.  **Zbilansowanie:** Czy przepis jest w miarę zbilansowany? Nie musi być super-fit, ale nie powinien być skrajnie niezdrowy (np. sam tłuszcz i cukier).
-2.  **Kaloryczność:** Dokonaj *szacunkowej* oceny kalorii. Dopuszczalny przedział na obiad to 400-900 kcal. Nie odrzucaj przepisu, jeśli lekko wychodzi poza te ramy, ale jest sensowny.
+2.  **Kaloryczność:** Jeśli otrzymasz kalorie wyliczone lokalnie, przyjmij je (nie szacuj ponownie). W przeciwnym razie dokonaj *szacunkowej* oceny. Dopuszczalny przedział na obiad to 400-900 kcal. Nie odrzucaj przepisu, jeśli lekko wychodzi poza te ramy, ale jest sensowny.
 3.  **Zgodność:** Sprawdź, czy przepis jest zgodny z podstawowymi założeniami (np. czy danie wegetariańskie nie zawiera mięsa). To jest najważniejsze kryterium.
 4.  **Decyzja:** Zatwierdź (`approved: true`), jeśli przepis jest akceptowalny. Odrzuć (`approved: false`) tylko w przypadku rażących błędów (np. mięso w daniu wege) lub gdy danie jest skrajnie niezbilansowane. Podaj uzasadnienie.
 
-**FORMAT WYJŚCIOWY (JSON):**
-`{\"approved\": <true/false>, \"calories\": \"<Twoja szacowana wartość kcal>\", \"feedback\": \"<Twoje zwięzłe uzasadnienie>\"}`
+**FORMAT WYJŚCIOWY (JSON, a=approved, k=kcal, f=feedback):**
+`{\"a\": <true/false>, \"k\": \"<Twoja szacowana wartość kcal>\", \"f\": \"<Twoje zwięzłe uzasadnienie>\"}`
 """
 
 async def agent_nutrition_audit(draft: dict):
@@ -124,9 +128,17 @@ async def agent_nutrition_audit(draft: dict):
     """
     # (agent already logged by simplified logging in core.py)
     
-    prompt = f"""**Danie:** {draft.get('chef_work', {}).get('dish_name')}
-**Składniki i Kroki:** {draft.get('chef_work')}
-**Wytyczne:** {draft.get('guidelines')}
+    local_nutrition = draft.get('local_nutrition') or {}
+    servings_note = ""
+    if local_nutrition and not local_nutrition.get('servings_known', True):
+        # Brak liczby porcji: lokalne kcal to tylko szacunek dla domyślnej liczby porcji
+        servings_note = (f"\n**Uwaga:** przepis nie podaje liczby porcji - kalorie wyliczono dla "
+                         f"{local_nutrition.get('servings')} porcji. Oceń realną liczbę porcji z ilości składników "
+                         "i na tej podstawie kaloryczność na porcję (nie przyjmuj lokalnych kcal wprost).")
+    prompt = f"""**Składniki i Kroki:**
+{encode_recipe(draft.get('chef_work'))}
+**Wytyczne:** {encode_mapping(draft.get('guidelines'))}
+**Wyliczone lokalnie (na porcję):** {encode_mapping(local_nutrition)}{servings_note}
 
 Oceń przepis pod kątem wartości odżywczych.
 """
@@ -135,6 +147,6 @@ Oceń przepis pod kątem wartości odżywczych.
         {"role": "user", "content": prompt}
     ]
     
-    response = await ask_llm(messages, json_mode=True)
+    response = await ask_llm_json(messages, NUTRITION_SCHEMA, label="Dietetyk", wire=NUTRITION_WIRE)
     # (silent on success)
     return response
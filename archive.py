@@ -0,0 +1,337 @@
+"""
+Moduł Archiwum Planów i Migawek Pamięci (Paczki Miesięczne z Indeksem).
+
+`daily_plans/` przybywa jeden plik dziennie, a przepływ GitHub Actions co dzień commituje
+`daily_plans/` i `memory/` (bez pamięci podręcznych i telemetrii - `.gitignore`) - checkout
+i `git pull --rebase` rosną z czasem. Archiwum trzyma
+w drzewie roboczym tylko bieżący miesiąc; miniony miesiąc zwijany jest (`roll`) do paczki:
+
+- Paczka `<katalog>/archive/<rodzaj>-RRRR-MM.pack`: nagłówek, słownik kompresji (ostatnie
+  32 KiB treści miesiąca - plany są do siebie podobne) i osobno skompresowane wpisy (zlib ze
+  słownikiem), więc odczyt jednego dnia nie rozpakowuje całego miesiąca.
+- Indeks `<rodzaj>-RRRR-MM.idx` (JSON): data -> (przesunięcie, długość, CRC32 treści).
+  Odczyt dowolnej daty: miesiąc z daty -> indeks -> jeden odczyt z paczki - O(1) niezależnie
+  od wieku bota. Paczki po zapisaniu się nie zmieniają (git przechowuje je raz).
+
+Rodzaje:
+- "plans"  - plany dzienne (`daily_plans/RRRR-MM-DD.md` -> `daily_plans/archive/plans-*.pack`).
+- "memory" - migawki pamięci (`snapshot_memory`: pliki JSON z `memory/` danego dnia,
+  `memory/snapshots/RRRR-MM-DD.json` -> `memory/archive/memory-*.pack`). Tylko tryb ciągły:
+  w przepływie GitHub Actions historię `memory/` trzyma git, a luźne migawki są w `.gitignore`.
+
+API odczytu (ta sama treść co pliki luźne): `read_plan`, `plan_dates`, `iter_plans`,
+`read_snapshot`, `snapshot_dates`. Każdy kanał (`tenants`) ma własne katalogi i paczki.
+
+Użycie z linii komend:
+    python archive.py --roll                # zwinięcie minionych miesięcy (przepływ GitHub Actions)
+    python archive.py --snapshot --roll     # także migawka pamięci na dziś (tryb ciągły)
+    python archive.py --show 2026-01-15     # plan z dowolnego dnia (luźny lub z paczki)
+    python archive.py --verify              # sprawdzenie sum kontrolnych wszystkich paczek
+"""
+
+import os
+import re
+import json
+import zlib
+import argparse
+from datetime import datetime
+from collections import namedtuple
+from functools import lru_cache
+
+from history import HISTORY_DIR, PLANS_DIR, _load_json_file
+
+# Stałe konfiguracyjne
+ARCHIVE_SUBDIR = "archive"
+SNAPSHOTS_SUBDIR = "snapshots"
+PACK_MAGIC = b"RCPACK1\n"
+DICTIONARY_SIZE = 32 * 1024   # Maksymalny słownik zlib
+COMPRESSION_LEVEL = 9
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Gdzie leżą wpisy luźne (bieżący miesiąc) i paczki jednego rodzaju
+_Store = namedtuple("_Store", "kind loose_dir suffix archive_dir")
+
+
+def _plans_store(plans_dir=PLANS_DIR):
+    return _Store("plans", plans_dir, ".md", os.path.join(plans_dir, ARCHIVE_SUBDIR))
+
+
+def _memory_store(history_dir=HISTORY_DIR):
+    return _Store("memory", os.path.join(history_dir, SNAPSHOTS_SUBDIR), ".json", os.path.join(history_dir, ARCHIVE_SUBDIR))
+
+
+def _pack_paths(store, month):
+    base = os.path.join(store.archive_dir, f"{store.kind}-{month}")
+    return base + ".pack", base + ".idx"
+
+
+def _loose_entries(store):
+    """Wpisy luźne: {data: ścieżka}."""
+    if not os.path.isdir(store.loose_dir):
+        return {}
+    entries = {}
+    for name in os.listdir(store.loose_dir):
+        stem = name[: -len(store.suffix)] if name.endswith(store.suffix) else ""
+        if _DATE_RE.fullmatch(stem):
+            entries[stem] = os.path.join(store.loose_dir, name)
+    return entries
+
+
+# ==============================================================================
+# PACZKI: ZAPIS I ODCZYT
+# ==============================================================================
+
+def write_pack(members, pack_path, index_path):
+    """
+    Zapisuje paczkę i jej indeks (atomowo: plik tymczasowy i podmiana; indeks na końcu).
+
+    Args:
+        members (dict): data -> treść (bytes).
+    """
+    dates = sorted(members)
+    dictionary = b"".join(members[d] for d in dates)[-DICTIONARY_SIZE:]
+    index = {"version": 1, "dictionary": None, "members": {}}
+
+    os.makedirs(os.path.dirname(pack_path) or ".", exist_ok=True)
+    with open(pack_path + ".tmp", "wb") as f:
+        f.write(PACK_MAGIC)
+        block = zlib.compress(dictionary, COMPRESSION_LEVEL)
+        index["dictionary"] = [f.tell(), len(block)]
+        f.write(block)
+        for date in dates:
+            compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=dictionary)
+            block = compressor.compress(members[date]) + compressor.flush()
+            index["members"][date] = [f.tell(), len(block), zlib.crc32(members[date])]
+            f.write(block)
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(pack_path + ".tmp", pack_path)
+    os.replace(index_path + ".tmp", index_path)
+    _load_index.cache_clear()
+    _load_dictionary.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def _load_index(index_path, mtime):
+    return _load_json_file(index_path, {"members": {}})
+
+
+@lru_cache(maxsize=8)
+def _load_dictionary(pack_path, mtime, offset, length):
+    return zlib.decompress(_read_block(pack_path, offset, length))
+
+
+def _read_block(pack_path, offset, length):
+    with open(pack_path, "rb") as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+def _pack_index(store, month):
+    """Indeks paczki miesiąca (lub None, gdy paczki nie ma)."""
+    pack_path, index_path = _pack_paths(store, month)
+    if not os.path.exists(index_path):
+        return None
+    return _load_index(index_path, os.path.getmtime(index_path))
+
+
+def read_member(store, date_str):
+    """Treść wpisu z paczki (bytes) lub None. Uszkodzony wpis -> ValueError."""
+    index = _pack_index(store, date_str[:7])
+    entry = index and index["members"].get(date_str)
+    if not entry:
+        return None
+    pack_path, _ = _pack_paths(store, date_str[:7])
+    dictionary = _load_dictionary(pack_path, os.path.getmtime(pack_path), *index["dictionary"])
+    decompressor = zlib.decompressobj(zdict=dictionary)
+    try:
+        data = decompressor.decompress(_read_block(pack_path, entry[0], entry[1])) + decompressor.flush()
+    except zlib.error as e:
+        raise ValueError(f"Uszkodzony wpis {date_str} w {pack_path} ({e})")
+    if zlib.crc32(data) != entry[2]:
+        raise ValueError(f"Uszkodzony wpis {date_str} w {pack_path} (CRC)")
+    return data
+
+
+def _read(store, date_str):
+    """Wpis z dnia: najpierw plik luźny, potem paczka miesiąca."""
+    path = os.path.join(store.loose_dir, date_str + store.suffix)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return read_member(store, date_str)
+
+
+def _dates(store):
+    """Wszystkie daty rodzaju (luźne i spakowane), rosnąco."""
+    dates = set(_loose_entries(store))
+    if os.path.isdir(store.archive_dir):
+        for name in os.listdir(store.archive_dir):
+            if name.startswith(store.kind + "-") and name.endswith(".idx"):
+                dates.update(_pack_index(store, name[len(store.kind) + 1:-4])["members"])
+    return sorted(dates)
+
+
+# ==============================================================================
+# API ODCZYTU
+# ==============================================================================
+
+def read_plan(date_str, plans_dir=PLANS_DIR):
+    """Plan dnia (Markdown) z pliku luźnego albo z paczki; None, gdy planu nie ma."""
+    data = _read(_plans_store(plans_dir), date_str)
+    return data.decode("utf-8", errors="replace") if data is not None else None
+
+
+def plan_dates(plans_dir=PLANS_DIR):
+    return _dates(_plans_store(plans_dir))
+
+
+def iter_plans(plans_dir=PLANS_DIR):
+    """Wszystkie plany po kolei: (data, Markdown). Uszkodzone wpisy są pomijane (z ostrzeżeniem)."""
+    for date_str in plan_dates(plans_dir):
+        try:
+            yield date_str, read_plan(date_str, plans_dir)
+        except ValueError as e:
+            print(f"⚠️ [ARCHIWUM] {e}")
+
+
+def read_snapshot(date_str, history_dir=HISTORY_DIR):
+    """Migawka pamięci z dnia: {nazwa pliku: zawartość JSON} lub None."""
+    data = _read(_memory_store(history_dir), date_str)
+    return json.loads(data) if data is not None else None
+
+
+def snapshot_dates(history_dir=HISTORY_DIR):
+    return _dates(_memory_store(history_dir))
+
+
+# ==============================================================================
+# ZAPIS: MIGAWKI I ZWIJANIE MIESIĘCY
+# ==============================================================================
+
+def snapshot_memory(date_str=None, history_dir=HISTORY_DIR):
+    """
+    Migawka plików JSON pamięci (katalog `history_dir`, bez podkatalogów i baz SQLite).
+
+    Returns:
+        str: Ścieżka migawki.
+    """
+    date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+    store = _memory_store(history_dir)
+    files = sorted(name for name in os.listdir(history_dir)
+                   if name.endswith(".json") and os.path.isfile(os.path.join(history_dir, name)))
+    snapshot = {name: _load_json_file(os.path.join(history_dir, name), None) for name in files}
+    os.makedirs(store.loose_dir, exist_ok=True)
+    path = os.path.join(store.loose_dir, date_str + store.suffix)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1)
+    print(f"📸 [ARCHIWUM] Migawka pamięci: {path} ({len(files)} plików)")
+    return path
+
+
+def _roll_store(store, current_month):
+    """Zwija luźne wpisy minionych miesięcy do paczek (dołącza do istniejącej paczki miesiąca)."""
+    by_month = {}
+    for date_str, path in _loose_entries(store).items():
+        if date_str[:7] < current_month:
+            by_month.setdefault(date_str[:7], {})[date_str] = path
+
+    rolled = 0
+    for month, loose in sorted(by_month.items()):
+        pack_path, index_path = _pack_paths(store, month)
+        index = _pack_index(store, month)
+        members = {d: read_member(store, d) for d in (index["members"] if index else {})}
+        for date_str, path in loose.items():
+            with open(path, "rb") as f:
+                members[date_str] = f.read()
+        write_pack(members, pack_path, index_path)
+
+        # Pliki luźne usuwane dopiero po odczycie z paczki bez błędów
+        for date_str, path in loose.items():
+            if read_member(store, date_str) != members[date_str]:
+                raise ValueError(f"Weryfikacja paczki {pack_path} nie powiodła się ({date_str})")
+            os.remove(path)
+        size = sum(map(len, members.values()))
+        print(f"📦 [ARCHIWUM] {store.kind} {month}: {len(loose)} wpisów -> {pack_path} "
+              f"({size // 1024} KiB -> {os.path.getsize(pack_path) // 1024} KiB)")
+        rolled += len(loose)
+    return rolled
+
+
+def roll(plans_dir=PLANS_DIR, history_dir=HISTORY_DIR, today=None):
+    """
+    Zwija plany i migawki pamięci sprzed bieżącego miesiąca do paczek.
+
+    Returns:
+        int: Liczba zwiniętych wpisów.
+    """
+    current_month = (today or datetime.now().strftime("%Y-%m-%d"))[:7]
+    return _roll_store(_plans_store(plans_dir), current_month) + _roll_store(_memory_store(history_dir), current_month)
+
+
+def archive_day(tenants, snapshot=True, today=None):
+    """
+    Codzienna obsługa archiwum wszystkich kanałów: migawka pamięci i zwinięcie minionych miesięcy
+    (harmonogram trybu ciągłego; przepływ GitHub Actions wywołuje tylko `--roll`).
+
+    Returns:
+        int: Liczba zwiniętych wpisów.
+    """
+    if snapshot:
+        for tenant in tenants:
+            if os.path.isdir(tenant.history_dir):
+                snapshot_memory(today, tenant.history_dir)
+    return sum(roll(t.plans_dir, t.history_dir, today) for t in tenants)
+
+
+def verify(plans_dir=PLANS_DIR, history_dir=HISTORY_DIR):
+    """
+    Odczyt i sprawdzenie CRC każdego spakowanego wpisu.
+
+    Returns:
+        list[str]: Opisy problemów (pusta lista - archiwum spójne).
+    """
+    problems = []
+    for store in (_plans_store(plans_dir), _memory_store(history_dir)):
+        loose = _loose_entries(store)
+        for date_str in _dates(store):
+            if date_str in loose:
+                continue
+            try:
+                read_member(store, date_str)
+            except (ValueError, OSError) as e:
+                problems.append(f"{store.kind} {date_str}: {e}")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archiwum planów dziennych i migawek pamięci (paczki miesięczne).")
+    parser.add_argument("--snapshot", action="store_true", help="Migawka pamięci na dziś (każdy kanał).")
+    parser.add_argument("--roll", action="store_true", help="Zwiń minione miesiące do paczek (każdy kanał).")
+    parser.add_argument("--show", metavar="DATA", help="Wypisz plan z dnia RRRR-MM-DD.")
+    parser.add_argument("--verify", action="store_true", help="Sprawdź wszystkie paczki.")
+    args = parser.parse_args()
+
+    from tenants import load_tenants, default_tenant
+
+    tenants = load_tenants() or [default_tenant()]
+    if args.roll:
+        print(f"📦 [ARCHIWUM] Zwinięto {archive_day(tenants, snapshot=args.snapshot)} wpisów.")
+    elif args.snapshot:
+        for tenant in tenants:
+            if os.path.isdir(tenant.history_dir):
+                snapshot_memory(history_dir=tenant.history_dir)
+    if args.show:
+        plan = read_plan(args.show)
+        print(plan if plan is not None else f"Brak planu z {args.show}.")
+    if args.verify:
+        problems = [p for t in tenants for p in verify(t.plans_dir, t.history_dir)]
+        for problem in problems:
+            print(f"❌ {problem}")
+        print(f"{'✅' if not problems else '❌'} Archiwum: {len(problems)} problemów")
+        raise SystemExit(1 if problems else 0)
+    if not (args.snapshot or args.roll or args.show):
+        dates = plan_dates()
+        print(f"🗂️ Plany: {len(dates)} ({dates[0] if dates else '-'} .. {dates[-1] if dates else '-'}), "
+              f"migawki pamięci: {len(snapshot_dates())}")
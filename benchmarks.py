@@ -0,0 +1,291 @@
+"""
+Moduł Mikrobenchmarków (Gorące Ścieżki w Czystym Pythonie).
+
+Mierzy funkcje, których koszt rośnie z wiekiem bota (historia) i długością treści
+(przepisy, wyjście Stylisty), na syntetycznych danych w dwóch skalach ("1k" i "10k"):
+- `load_history` / `save_history` - historia z tysiącami wniosków i trendów,
+- `format_recipe_raw` - przepis z tysiącami linii składników i kroków,
+- `_clean_hallucinated_content` - zaszumione wyjście Stylisty (linki, zakazane frazy, puste linie),
+- `choose_cuisine`, `get_region_for_cuisine` - z długą historią i dużym modelem preferencji,
+- składanie fallbacku Wydawcy (`publisher_fallback`, `validate_publication`).
+
+Wyniki (najlepszy czas jednego wywołania) porównywane są z bazą w `benchmarks_baseline.json`;
+wynik wolniejszy niż baza o więcej niż TOLERANCE jest oznaczany jako regresja.
+
+Czasy bezwzględne zależą od maszyny, dlatego porównanie jest względne: stosunek każdego
+przypadku do bazy dzielony jest przez medianę stosunków wszystkich przypadków (wspólny
+czynnik szybkości maszyny). Regresja jednej ścieżki odstaje od mediany; równomierne
+spowolnienie wszystkich przypadków jest z definicji niewidoczne. Przy mniej niż MIN_RELATIVE_CASES
+porównywanych przypadkach czynnikiem jest mediana pętli kalibracyjnej (`calibration_loop`,
+mierzonej naprzemiennie z przypadkami) - przybliżenie, bo mikropętla nie ma profilu cache
+i wejścia/wyjścia prawdziwych przypadków.
+
+Baza jest ważna tylko dla maszyny, na której ją zapisano - przed porównywaniem zmian zapisz
+ją lokalnie (`--save` na kodzie wyjściowym). `--check` jest sygnałem dla programisty,
+a nie bramką CI na współdzielonych runnerach.
+
+Użycie z linii komend:
+    python benchmarks.py                    # pomiar i porównanie z bazą
+    python benchmarks.py --check            # kod wyjścia 1 przy regresji
+    python benchmarks.py --save             # zapis wyników jako nowej bazy (na tej maszynie)
+    python benchmarks.py choose format      # tylko przypadki zawierające podane frazy
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import statistics
+import argparse
+import platform
+import tempfile
+from contextlib import redirect_stdout
+
+from cuisines import CUISINES, CUISINE_REGIONS
+from history import load_history, save_history
+
+# Stałe konfiguracyjne
+BASELINE_FILE = "benchmarks_baseline.json"
+TOLERANCE = 0.30          # Dopuszczalne spowolnienie względem bazy (szum maszyny)
+TARGET_SECONDS = 0.2      # Czas jednej serii pomiaru (liczba wywołań dobierana automatycznie)
+REPEATS = 5               # Wynik to minimum z serii
+SCALES = {"1k": 1_000, "10k": 10_000}
+SEED = 46
+MIN_RELATIVE_CASES = 5    # Od tylu przypadków z bazą - normalizacja medianą stosunków
+CALIBRATION_SECONDS = 0.05
+
+_WORDS = ("pomidor cebula czosnek papryka bazylia oregano makaron ryż kurczak dorsz tofu "
+          "ciecierzyca jogurt masło oliwa sól pieprz kmin kolendra imbir cytryna").split()
+_UNITS = ("g", "ml", "szt", "łyżka", "łyżeczka", "szczypta", "", None)
+
+
+# ==============================================================================
+# GENERATORY DANYCH SYNTETYCZNYCH
+# ==============================================================================
+
+def _phrase(rng, words=4):
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def make_history(size, rng):
+    """Historia z `size` wnioskami i `size` dniami trendów (po 4 pomysły) oraz dużym modelem preferencji."""
+    return {
+        "last_cuisines": [rng.choice(CUISINES) for _ in range(15)],
+        "last_regions": rng.sample(list(CUISINE_REGIONS), 2),
+        "last_poll": {"message_id": 1, "options": [_phrase(rng) for _ in range(3)], "cuisine": CUISINES[0]},
+        "last_trends": [[{"nazwa": _phrase(rng, 3), "opis": _phrase(rng, 12)} for _ in range(4)] for _ in range(size)],
+        "user_insights": [f"Wniosek {idx}: {_phrase(rng, 10)}" for idx in range(size)],
+        "liked_trends": [_phrase(rng, 3) for _ in range(size // 10)],
+        "preference_model": {
+            "cuisines": {c: round(rng.uniform(-2, 2), 4) for c in CUISINES},
+            "ingredients": {f"{rng.choice(_WORDS)} {idx}": round(rng.uniform(-1, 1), 4) for idx in range(size // 10)},
+            "polls": size,
+        },
+    }
+
+
+def make_recipe(lines, rng):
+    """Przepis z `lines` liniami (połowa składniki, połowa kroki)."""
+    return {
+        "dish_name": _phrase(rng, 3).title(),
+        "description": _phrase(rng, 20),
+        "prep_time": "45 min",
+        "ingredients": [{"item": _phrase(rng, 2) if idx % 50 else "", "amount": rng.choice(["200", "1/2", "200g", 1.5, None]),
+                         "unit": rng.choice(_UNITS)} for idx in range(lines // 2)],
+        "steps": [_phrase(rng, 15) for _ in range(lines - lines // 2)],
+    }
+
+
+def make_stylist_output(lines, rng):
+    """Zaszumione wyjście Stylisty: emoji, linki, zakazane frazy z punktorami, wielokrotne puste linie."""
+    noise = [
+        lambda: f"🍅 {_phrase(rng)} – 200 g",
+        lambda: f"{rng.randint(1, 99)}. {_phrase(rng, 12)}",
+        lambda: f"Zobacz, jak to zrobić: https://example.com/{_phrase(rng, 1)}?id={rng.randint(1, 10 ** 6)}",
+        lambda: "Zdjęcia: galeria poniżej",
+        lambda: f"- https://youtube.com/watch?v={rng.randint(1, 10 ** 6)}",
+        lambda: "\n\n\n",
+        lambda: f"**{_phrase(rng, 2).upper()}**",
+    ]
+    return "\n".join(rng.choice(noise)() for _ in range(lines))
+
+
+def make_components(size, rng):
+    """Składniki numeru dla Wydawcy (intro + 3 przepisy, łącznie ok. `size` linii)."""
+    return {key: make_stylist_output(size // 4, rng) for key in ("intro", "breakfast", "lunch", "dinner")}
+
+
+# ==============================================================================
+# PRZYPADKI
+# ==============================================================================
+
+def build_cases(work_dir, selected=None):
+    """
+    Przypadki benchmarku: nazwa -> funkcja bez argumentów (dane przygotowane wcześniej).
+    Pliki historii trafiają do `work_dir`. Funkcje pipeline'u importowane są tutaj (nie przy imporcie modułu).
+    """
+    from pipeline import format_recipe_raw, choose_cuisine, get_region_for_cuisine
+    from agents.presentation import _clean_hallucinated_content, publisher_fallback, validate_publication
+
+    rng = random.Random(SEED)
+    cases = {}
+    for label, size in SCALES.items():
+        history = make_history(size, rng)
+        history_dir = os.path.join(work_dir, f"history-{label}")
+        save_history(history, history_dir)
+        recipe = make_recipe(size, rng)
+        stylist = make_stylist_output(size, rng)
+        components = make_components(size, rng)
+        shortened = [text[: len(text) // 2] for text in components.values()]
+
+        cases[f"load_history[{label}]"] = lambda d=history_dir: load_history(d)
+        cases[f"save_history[{label}]"] = lambda h=history, d=history_dir: save_history(h, d)
+        cases[f"format_recipe_raw[{label}]"] = lambda r=recipe: format_recipe_raw(r, "Obiad", {"calories": 650})
+        cases[f"clean_hallucinated_content[{label}]"] = lambda t=stylist: _clean_hallucinated_content(t)
+        cases[f"choose_cuisine[{label}]"] = lambda h=history: choose_cuisine(h, "")
+        cases[f"publisher_fallback[{label}]"] = lambda c=components: publisher_fallback(c)
+        cases[f"validate_publication[{label}]"] = lambda r=shortened, c=components: validate_publication(r, c)
+    cases["get_region_for_cuisine[all]"] = lambda: [get_region_for_cuisine(c) for c in CUISINES]
+
+    if selected:
+        cases = {name: fn for name, fn in cases.items() if any(s in name for s in selected)}
+    return cases
+
+
+# ==============================================================================
+# POMIAR I PORÓWNANIE Z BAZĄ
+# ==============================================================================
+
+def measure(fn, target=TARGET_SECONDS, repeats=REPEATS):
+    """
+    Najlepszy czas jednego wywołania (s): seria trwa ok. `target` sekund, wynik to minimum z `repeats` serii.
+    Wyjście funkcji (printy) jest pomijane.
+    """
+    with redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        fn()
+        single = max(time.perf_counter() - started, 1e-7)
+        number = max(1, int(target / single))
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def calibration_loop():
+    """Stała porcja pracy w czystym Pythonie (słowniki, napisy, listy) - miara szybkości maszyny."""
+    counts = {}
+    for idx in range(2_000):
+        word = _WORDS[idx % len(_WORDS)]
+        counts[word] = counts.get(word, 0) + len(word.upper())
+    return sorted(f"{word}:{count}" for word, count in counts.items())
+
+
+def load_baseline(path=BASELINE_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_baseline(results, calibration, path=BASELINE_FILE):
+    data = {
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "created": time.strftime("%Y-%m-%d %H:%M"),
+        "calibration": round(calibration, 9),
+        "results": {name: round(seconds, 9) for name, seconds in results.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def machine_speed(results, baseline, calibration=None):
+    """
+    Wspólny czynnik szybkości maszyny względem bazy.
+
+    Returns:
+        tuple: (czynnik, źródło: "mediana" | "kalibracja" | "brak").
+    """
+    base_results = baseline.get("results", {})
+    ratios = [seconds / base_results[name] for name, seconds in results.items() if base_results.get(name)]
+    if len(ratios) >= MIN_RELATIVE_CASES:
+        return statistics.median(ratios), "mediana"
+    base_calibration = baseline.get("calibration")
+    if calibration and base_calibration:
+        return calibration / base_calibration, "kalibracja"
+    return 1.0, "brak"
+
+
+def compare(results, baseline, tolerance=TOLERANCE, calibration=None):
+    """
+    Porównanie z bazą, po odjęciu wspólnego czynnika szybkości maszyny (`machine_speed`).
+
+    Returns:
+        list[tuple]: (nazwa, czas, czas bazowy lub None, stosunek lub None, czy regresja).
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    speed, _ = machine_speed(results, baseline, calibration)
+    for name, seconds in results.items():
+        base = base_results.get(name)
+        ratio = seconds / (base * speed) if base else None
+        rows.append((name, seconds, base, ratio, bool(ratio and ratio > 1 + tolerance)))
+    return rows
+
+
+def _format_time(seconds):
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    return f"{seconds * 1e3:.2f} ms"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mikrobenchmarki gorących ścieżek (dane syntetyczne).")
+    parser.add_argument("cases", nargs="*", help="Tylko przypadki zawierające podane frazy.")
+    parser.add_argument("--save", action="store_true", help="Zapisz wyniki jako nową bazę.")
+    parser.add_argument("--check", action="store_true",
+                        help="Kod wyjścia 1 przy regresji względem bazy (baza zapisana na tej samej maszynie).")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Dopuszczalne spowolnienie (0.3 = 30%%).")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Plik bazy (JSON).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as work_dir:
+        # Kalibracja naprzemiennie z przypadkami (mediana) - odporna na chwilowe obciążenie maszyny
+        results, calibrations = {}, [measure(calibration_loop, CALIBRATION_SECONDS)]
+        for name, fn in build_cases(work_dir, args.cases).items():
+            results[name] = measure(fn)
+            calibrations.append(measure(calibration_loop, CALIBRATION_SECONDS))
+        calibration = statistics.median(calibrations)
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(results, baseline, args.tolerance, calibration)
+    speed, source = machine_speed(results, baseline, calibration)
+    if source != "brak":
+        print(f"📐 Szybkość maszyny względem bazy: x{speed:.2f} ({source}; baza: maszyna {baseline.get('machine', '?')}, "
+              f"Python {baseline.get('python', '?')})")
+    elif baseline:
+        print("⚠️ Za mało przypadków i baza bez kalibracji - porównanie czasów bezwzględnych; zapisz bazę ponownie (--save).")
+    print(f"{'Przypadek':<38}{'czas':>12}{'baza':>12}{'zmiana*':>10}")
+    for name, seconds, base, ratio, regressed in rows:
+        change = f"{(ratio - 1) * 100:+.0f}%" if ratio else "nowy"
+        print(f"{name:<38}{_format_time(seconds):>12}{_format_time(base):>12}{change:>10}{' ⚠️' if regressed else ''}")
+    print("* zmiana po odjęciu wspólnego czynnika szybkości maszyny (czasy w kolumnach są bezwzględne)")
+
+    regressions = [name for name, *_, regressed in rows if regressed]
+    if args.save:
+        merged = dict(baseline.get("results", {}), **results)
+        save_baseline(merged, calibration, args.baseline)
+        print(f"💾 Zapisano bazę: {args.baseline} ({len(merged)} przypadków)")
+    elif regressions:
+        print(f"⚠️ Regresja (> {args.tolerance:.0%}): {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
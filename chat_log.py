@@ -0,0 +1,190 @@
+"""
+Moduł Przyrostowego Pobierania Czatu.
+
+Zawiera:
+- Kursor (ID ostatniej pobranej wiadomości) zapisywany w memory/chat_log.json, dzięki czemu
+  każde uruchomienie pobiera z Discorda tylko nowe wiadomości (`after=`), najwyżej jedną stronę API.
+- Lokalny, ograniczony dziennik czatu (bez wiadomości bota, skrócone treści).
+- Słowa kluczowe dla każdej wiadomości (składniki z katalogu, kuchnie, słowa treści).
+- Znacznik "przeanalizowano do", więc wiadomości z przerwanego uruchomienia trafią do Analityka następnym razem.
+"""
+
+import os
+import re
+
+from history import HISTORY_DIR, _load_json_file, _save_json_file
+from cuisines import CUISINE_MAP
+from matching import normalize_dish_name
+from ingredient_catalog import resolve_ingredient
+
+# Stałe konfiguracyjne
+CHAT_LOG_FILE = os.path.join(HISTORY_DIR, "chat_log.json")
+MAX_FETCH = 100              # Jedna strona API Discorda na uruchomienie (stały koszt pobrania)
+INITIAL_FETCH = 10           # Pierwsze uruchomienie (brak kursora): tyle co dotychczas
+MAX_LOG_MESSAGES = 200       # Limit dziennika (najstarsze wpisy są usuwane)
+MAX_MESSAGE_CHARS = 300      # Treść wiadomości w dzienniku jest skracana
+MAX_KEYWORDS = 8
+SUMMARY_KEYWORDS = 12        # Ile słów kluczowych ze starszych wiadomości pokazać Analitykowi
+
+# Słowa bez znaczenia dla preferencji (po normalizacji: bez diakrytyków, małe litery)
+_STOPWORDS = {
+    "ale", "albo", "bardzo", "bedzie", "bylo", "byl", "byla", "chce", "chcialbym", "chcialabym", "czy",
+    "dla", "dobry", "dobre", "dzis", "dzisiaj", "gdzie", "jak", "jakies", "jakis", "jest", "jestem", "juz",
+    "kiedy", "ktory", "mam", "mamy", "moze", "mnie", "nam", "nas", "nie", "niech", "jutro", "ochote",
+    "ochota", "przez", "sie", "tak", "taki", "takie", "tez", "tego", "ten", "tej", "teraz", "tutaj", "tylko",
+    "wiecej", "wszystko", "wlasnie", "zeby", "zrobic", "zjesc", "zjadlbym", "zjadlabym", "this", "that",
+    "with", "have", "what", "want", "please", "dzieki", "dziekuje", "hej", "czesc", "super", "fajnie",
+}
+_MENTION_RE = re.compile(r'<[@#:][^>]+>|https?://\S+')
+
+
+# ==============================================================================
+# SŁOWA KLUCZOWE
+# ==============================================================================
+
+def extract_keywords(text, max_keywords=MAX_KEYWORDS):
+    """
+    Słowa kluczowe wiadomości: najpierw rozpoznane kuchnie i składniki z katalogu,
+    potem pozostałe słowa treści (bez słów pospolitych).
+
+    Returns:
+        list[str]: Do `max_keywords` słów w kolejności ważności.
+    """
+    normalized = normalize_dish_name(_MENTION_RE.sub(" ", text or ""))
+    words = [w for w in normalized.split() if len(w) > 2 and w not in _STOPWORDS and not w.isdigit()]
+
+    # Kuchnie po rdzeniu nazwy ("wloskie", "wloska" -> "Włoska (Klasyczna)")
+    cuisine_stems = {c: normalize_dish_name(c.split(" (")[0])[:5] for c in CUISINE_MAP}
+    cuisines = [c for c, stem in cuisine_stems.items() if any(w.startswith(stem) for w in words)]
+    ingredients = []
+    for word in words:
+        ingredient_id = resolve_ingredient(word) if len(word) > 3 else None
+        if ingredient_id and ingredient_id not in ingredients:
+            ingredients.append(ingredient_id)
+    stems = set(cuisine_stems.values())
+    other = [w for w in words if len(w) > 3 and not resolve_ingredient(w) and w[:5] not in stems]
+
+    keywords = []
+    for word in [normalize_dish_name(c) for c in cuisines] + ingredients + other:
+        if word not in keywords:
+            keywords.append(word)
+    return keywords[:max_keywords]
+
+
+# ==============================================================================
+# DZIENNIK CZATU
+# ==============================================================================
+
+def load_chat_log(path=CHAT_LOG_FILE):
+    """Wczytuje dziennik czatu (kursor, znacznik analizy i wiadomości); path=None - pusty dziennik w pamięci."""
+    log = _load_json_file(path, {}) if path else {}
+    log.setdefault("cursor", None)
+    log.setdefault("analyzed_upto", None)
+    log.setdefault("messages", [])
+    return log
+
+
+def save_chat_log(log, path=CHAT_LOG_FILE):
+    """Zapisuje dziennik czatu, przycinając go do limitu (path=None - tylko w pamięci)."""
+    log["messages"] = log["messages"][-MAX_LOG_MESSAGES:]
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _save_json_file(path, log)
+
+
+def _compact_entry(message):
+    """Wpis dziennika z wiadomości Discorda (lub None dla wiadomości bez treści)."""
+    text = re.sub(r'\s+', ' ', message.content or "").strip()
+    if not text:
+        return None
+    if len(text) > MAX_MESSAGE_CHARS:
+        text = text[:MAX_MESSAGE_CHARS - 1].rstrip() + "…"
+    return {
+        "id": message.id,
+        "author": message.author.name,
+        "date": message.created_at.strftime("%Y-%m-%d"),
+        "text": text,
+        "keywords": extract_keywords(text),
+    }
+
+
+async def ingest_chat(channel, bot_user=None, log=None, path=CHAT_LOG_FILE):
+    """
+    Pobiera z kanału wiadomości nowsze niż kursor i dopisuje je do dziennika.
+
+    Args:
+        channel: Kanał Discorda.
+        bot_user: Użytkownik bota (jego wiadomości - przepisy, ankiety - nie trafiają do dziennika).
+
+    Returns:
+        dict: Zaktualizowany (i zapisany) dziennik czatu.
+    """
+    import discord  # Leniwy import: dziennik i słowa kluczowe działają bez biblioteki Discorda
+
+    log = log or load_chat_log(path)
+    if log["cursor"]:
+        history = channel.history(limit=MAX_FETCH, after=discord.Object(id=log["cursor"]), oldest_first=True)
+    else:
+        history = channel.history(limit=INITIAL_FETCH)
+
+    fetched, added = [], 0
+    async for message in history:
+        fetched.append(message)
+    fetched.sort(key=lambda m: m.id)
+
+    for message in fetched:
+        log["cursor"] = max(log["cursor"] or 0, message.id)
+        if message.author.bot or (bot_user is not None and message.author.id == bot_user.id):
+            continue
+        entry = _compact_entry(message)
+        if entry:
+            log["messages"].append(entry)
+            added += 1
+
+    if len(fetched) >= MAX_FETCH:
+        print(f"  ⚠️ Pobrano pełną stronę ({MAX_FETCH}) - starsze wiadomości zostaną dobrane przy następnym uruchomieniu.")
+    print(f"💬 [CZAT] Pobrano {len(fetched)} nowych wiadomości, w dzienniku +{added} (razem {len(log['messages'])})")
+    save_chat_log(log, path)
+    return log
+
+
+def pending_messages(log):
+    """Wiadomości jeszcze nieprzeanalizowane (nowsze niż znacznik analizy)."""
+    upto = log.get("analyzed_upto") or 0
+    return [m for m in log["messages"] if m["id"] > upto]
+
+
+def mark_analyzed(log, path=CHAT_LOG_FILE):
+    """Przesuwa znacznik analizy na koniec dziennika (wywoływane po udanej analizie)."""
+    log["analyzed_upto"] = log.get("cursor")
+    save_chat_log(log, path)
+
+
+def keyword_summary(entries, top_n=SUMMARY_KEYWORDS):
+    """Najczęstsze słowa kluczowe z podanych wpisów (np. starszej części dziennika)."""
+    counts = {}
+    for entry in entries:
+        for keyword in entry.get("keywords", []):
+            counts[keyword] = counts.get(keyword, 0) + 1
+    ranked = sorted(counts.items(), key=lambda pair: (-pair[1], pair[0]))[:top_n]
+    return ", ".join(f"{word} ({count})" if count > 1 else word for word, count in ranked)
+
+
+def format_for_analyst(log):
+    """
+    Tekst historii czatu dla Analityka: wszystkie nowe wiadomości od ostatniej analizy
+    oraz słowa kluczowe starszych wiadomości z dziennika.
+
+    Returns:
+        tuple: (tekst dla Analityka, lista linii "autor: treść" nowych wiadomości).
+    """
+    pending = pending_messages(log)
+    pending_ids = {m["id"] for m in pending}
+    lines = [f"{m['author']}: {m['text']}" for m in pending]
+    older = keyword_summary([m for m in log["messages"] if m["id"] not in pending_ids])
+
+    text = "\n".join(lines)
+    if older:
+        text += f"\n(Wcześniej na czacie - słowa kluczowe: {older})"
+    return text.strip(), lines
@@ -5,7 +5,7 @@ Zawiera:
 - Konfigurację globalną i ładowanie zmiennych środowiskowych.
 - Wrapper dla klienta LLM (Groq) z obsługą wielu kluczy API (load balancing).
 - Wrapper dla wyszukiwarki Google.
-- Zarządzanie historią (odczyt/zapis JSON).
+- Re-eksport historii (history.py) i katalogu kuchni (cuisines.py) dla zgodności.
 - Logikę warsztatu kulinarnego (koordynacja agentów).
 """
 
@@ -13,7 +13,6 @@ import os
 import json
 import asyncio
 import random
-import requests
 from functools import partial
 from dotenv import load_dotenv
 
@@ -47,148 +46,111 @@ except (ValueError, TypeError):
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 GOOGLE_CX = os.environ.get("GOOGLE_CX")
 
-# Pliki Historii
-HISTORY_DIR = "memory"
-MAIN_HISTORY_FILE = os.path.join(HISTORY_DIR, "main.json")  # Historia regionów, kuchni, ankiet
-TRENDS_FILE = os.path.join(HISTORY_DIR, "trends.json")      # Historia trendów
-INSIGHTS_FILE = os.path.join(HISTORY_DIR, "insights.json")  # Wnioski o użytkowniku
-
-# Stałe konfiguracyjne
-MAX_INSIGHTS = 15      # Maksymalna liczba wniosków trzymanych w pamięci
-RECENT_REGION_COUNT = 2 # Ile ostatnich regionów pamiętać, by ich nie powtarzać
-
-# Mapowanie Regionów i Kuchni
-# Struktura: Kontynent -> Rodzaj Kuchni -> Nazwa wyświetlana (dopełniacz: "do...")
-CUISINE_REGIONS = {
-    "Europa": {
-        "Włoska (Klasyczna)": "Włoch",
-        "Włoska (Sycylia/Południe)": "Słonecznej Sycylii",
-        "Francuska (Prowansalska)": "Prowansji",
-        "Francuska (Bistro)": "Paryża",
-        "Hiszpańska (Tapas/Paella)": "Hiszpanii",
-        "Grecka (Tawerna)": "Grecji",
-        "Polska (Staropolska)": "Szlacheckiego Dworku",
-        "Polska (Bar Mleczny)": "PRL-u",
-        "Ukraińska (Wareniki/Barszcz)": "Ukrainy",
-        "Gruzińska (Supra)": "Gruzji",
-        "Węgierska (Papryka)": "Węgier",
-        "Niemiecka (Wurst/Kartoffel)": "Bawarii",
-        "Skandynawska (Hygge)": "Północy",
-        "Bałkańska (Grill)": "Bałkanów",
-    },
-    "Azja": {
-        "Japońska (Ramen Shop)": "Tokio",
-        "Japońska (Domowa)": "Japonii",
-        "Chińska (Syzuana/Ostry)": "Syczuanu",
-        "Chińska (Kantońska/DimSum)": "Kantonu",
-        "Wietnamska (Street Food)": "Hanoi",
-        "Tajska (Curry/PadThai)": "Bangkoku",
-        "Indyjska (Curry House)": "Mumbaju",
-        "Koreańska (K-Drama Food)": "Seulu",
-        "Indonezyjska (Bali Vibe)": "Bali",
-        "Turecka (Kebab/Meze)": "Stambułu",
-        "Libańska/Arabska": "Bejrutu",
-    },
-    "Ameryki": {
-        "Meksykańska (Cantina)": "Meksyku",
-        "Meksykańska (Tex-Mex)": "Pogranicza USA/Meksyk",
-        "USA (Southern BBQ)": "Teksasu",
-        "USA (NYC Style)": "Nowego Jorku",
-        "USA (Cajun/Creole)": "Nowego Orleanu",
-        "Brazylijska": "Rio de Janeiro",
-        "Argentyńska": "Buenos Aires",
-        "Peruwiańska": "Limon",
-    },
-    "Specjalne / Klimatyczne": {
-        "Babcina Kuchnia (Comfort Food)": "Domu Babci",
-        "Smak Jesieni (Dyniowe/Grzybowe)": "Złotej Jesieni",
-    }
-}
-
-# Spłaszczona mapa kuchni
-CUISINE_MAP = {k: v for region in CUISINE_REGIONS.values() for k, v in region.items()}
-CUISINES = list(CUISINE_MAP.keys())
+# Historia i katalog kuchni żyją w lekkich modułach (re-eksport dla zgodności)
+from history import (
+    HISTORY_DIR, MAIN_HISTORY_FILE, TRENDS_FILE, INSIGHTS_FILE, MAX_INSIGHTS, RECENT_REGION_COUNT,
+    MAIN_KEYS, TRENDS_KEYS, INSIGHTS_KEYS, _load_json_file, _save_json_file,
+    load_history, save_history, save_daily_plan
+)
+from cuisines import CUISINE_REGIONS, CUISINE_MAP, CUISINES
+import quota
 
 
 # ==============================================================================
 # SERWISY (LLM & Google)
 # ==============================================================================
 
-try:
-    from groq import Groq
-    
-    # Inicjalizacja klientów Groq (po jednym na każdy klucz API)
-    GROQ_CLIENTS = []
-    if GROQ_API_KEYS:
-        for key in GROQ_API_KEYS:
-            GROQ_CLIENTS.append(Groq(api_key=key))
-            
+# Klienci Groq są tworzeni leniwie przy pierwszym zapytaniu do LLM (import `groq`
+# i budowa klientów HTTP kosztują czas startu, a wiele ścieżek ich nie potrzebuje)
+GROQ_CLIENTS = None
+
+def _build_groq_clients():
+    """Tworzy klientów Groq (po jednym na każdy klucz API); brak biblioteki -> pusta lista."""
+    try:
+        from groq import Groq
+    except ImportError:
+        return []
+    return [Groq(api_key=key) for key in GROQ_API_KEYS]
+
+def get_groq_client(index=None):
+    """Zwraca klienta Groq dla klucza `index` (domyślnie losowego - load balancing)."""
+    global GROQ_CLIENTS
+    if GROQ_CLIENTS is None:
+        GROQ_CLIENTS = _build_groq_clients()
     if not GROQ_CLIENTS:
-        GROQ_CLIENT = None
-    else:
-        GROQ_CLIENT = GROQ_CLIENTS[0]
-
-    def get_groq_client():
-        """Zwraca losowego klienta Groq w celu rozłożenia obciążenia (load balancing)."""
-        if not GROQ_CLIENTS:
-            return None
-        return random.choice(GROQ_CLIENTS)
-
-except ImportError:
-    GROQ_CLIENT = None
-    GROQ_CLIENTS = []
-    def get_groq_client():
         return None
+    return GROQ_CLIENTS[index] if index is not None else random.choice(GROQ_CLIENTS)
 
 # Semafor ograniczający liczbę równoległych zapytań do LLM (zapobiega spamowaniu API)
+# W puli procesów (`workers.py`) limity kluczy są dodatkowo wspólne dla procesów (`rate_limit`)
 LLM_SEMAPHORE = asyncio.Semaphore(1)
+LLM_COURTESY_DELAY_S = 0.5   # Przerwa po udanym zapytaniu (w semaforze), patrz `llm_loadtest.py`
+
+def is_rate_limited():
+    """Czy limity kluczy są wspólne dla procesów (LLM_RATE_LIMIT=1, ustawiane przez `workers.py`)."""
+    return os.environ.get("LLM_RATE_LIMIT") == "1"
 
 def is_google_search_configured():
     """Sprawdza, czy klucze API Google są poprawnie skonfigurowane."""
     return bool(GOOGLE_API_KEY and GOOGLE_CX)
 
-def google_search(query, num_results=3):
+def google_search_snippets(query, num_results=3):
     """
-    Wykonuje wyszukiwanie w Google Custom Search API.
+    Wykonuje wyszukiwanie w Google Custom Search API i zwraca surowe fragmenty.
     
     Args:
         query (str): Fraza do wyszukania.
-        num_results (int): Oczekiwana liczba wyników.
+        num_results (int): Oczekiwana liczba wyników (maksymalnie 10 na zapytanie).
         
     Returns:
-        str: Połączone fragmenty (snippets) znalezionych stron lub komunikat błędu.
+        tuple: (lista fragmentów (snippets), komunikat błędu lub None).
     """
     # Silent operation
     if not is_google_search_configured():
         print("  ⚠️ Brak klucza Google API")
-        return "Brak danych z wyszukiwarki."
+        return [], "Brak danych z wyszukiwarki."
     
     url = "https://www.googleapis.com/customsearch/v1"
     params = {
         'key': GOOGLE_API_KEY,
         'cx': GOOGLE_CX,
         'q': query,
-        'num': num_results
+        'num': min(num_results, 10)
     }
     
+    import requests  # Leniwy import: potrzebny tylko przy faktycznym wyszukiwaniu
     try:
         response = requests.get(url, params=params)
         response.raise_for_status()
         result = response.json()
-        snippets = [item.get('snippet', '') for item in result.get('items', [])]
+        snippets = [item.get('snippet', '') for item in result.get('items', []) if item.get('snippet')]
         if not snippets:
-            return f"Brak wyników dla zapytania: '{query}'"
+            return [], f"Brak wyników dla zapytania: '{query}'"
         # Silent on success
-        return "\n".join(snippets)
+        return snippets, None
     except requests.exceptions.HTTPError as http_err:
         error_details = response.json().get('error', {}).get('message', 'Brak szczegółów')
         print(f"  ❌ Google API: Błąd {response.status_code}")
-        return f"Błąd serwera Google: {error_details}"
+        return [], f"Błąd serwera Google: {error_details}"
     except Exception as e:
         print(f"  ❌ Google: {str(e)[:40]}")
-        return f"Błąd podczas wyszukiwania frazy: {query}"
+        return [], f"Błąd podczas wyszukiwania frazy: {query}"
 
-async def ask_llm(messages, model="llama-3.1-8b-instant", temperature=0.7, json_mode=False):
+def google_search(query, num_results=3):
+    """
+    Wykonuje wyszukiwanie w Google Custom Search API.
+    
+    Args:
+        query (str): Fraza do wyszukania.
+        num_results (int): Oczekiwana liczba wyników.
+        
+    Returns:
+        str: Połączone fragmenty (snippets) znalezionych stron lub komunikat błędu.
+    """
+    snippets, error = google_search_snippets(query, num_results)
+    return error if error else "\n".join(snippets)
+
+async def ask_llm(messages, model="llama-3.1-8b-instant", temperature=0.7, json_mode=False, agent=None):
     """
     Funkcja wysyłająca zapytanie do LLM (Groq API) z mechanizmami odporności na błędy.
     
@@ -196,25 +158,27 @@ async def ask_llm(messages, model="llama-3.1-8b-instant", temperature=0.7, json_
     - Semaphore: Ogranicza równoległe wywołania API (1 na raz)
     - Retry logic: Automatyczne ponowne próby przy błędzie 429 (Rate Limit)
     - Exponential backoff: Zwiększanie czasu oczekiwania między próbami (1s, 2s, 4s, 8s, 16s)
-    - Load balancing: Jeśli mamy wiele kluczy API, wybiera losowy
+    - Load balancing: Jeśli mamy wiele kluczy API, wybiera losowy (z pominięciem kluczy,
+      które wyczerpały dziś limit dzienny - `quota`)
+    - Telemetria: zużycie tokenów per agent i per klucz (`quota.record_usage`)
+    - Wspólne limity (LLM_RATE_LIMIT=1): klucz z wolnym limitem RPM/TPM według kubełków
+      dzielonych przez wszystkie procesy (`rate_limit`)
     
     Args:
         messages (list): Lista wiadomości w formacie [{"role": "system/user", "content": "..."}]
         model (str): Nazwa modelu Groq (domyślnie llama-3.1-8b-instant)
         temperature (float): Kreatywność/losowość odpowiedzi (0.0=deterministyczny, 1.0=kreatywny)
         json_mode (bool): Czy wymusić odpowiedź w formacie JSON
+        agent (str): Nazwa agenta do logów i telemetrii (domyślnie z system message)
         
     Returns:
         str: Odpowiedź modelu (tekst lub JSON string) albo "" w przypadku błędu
     """
     # Wyciągamy nazwę agenta z system message (dla logowania)
-    agent_name = messages[0].get('content', 'Agent').split('.')[0][:30]  # Max 30 znaków
-    
-    # Pobieramy klienta Groq (może być jeden z wielu kluczy API)
-    current_client = get_groq_client()
+    agent_name = agent or messages[0].get('content', 'Agent').split('.')[0][:30]  # Max 30 znaków
 
-    # Sprawdzenie czy klient jest dostępny
-    if not current_client:
+    # Sprawdzenie czy klient jest dostępny (klucz wybierany przy każdej próbie)
+    if not get_groq_client():
         print(f"  ⚠️ LLM niedostępny")
         return "{}" if json_mode else ""
 
@@ -232,11 +196,23 @@ async def ask_llm(messages, model="llama-3.1-8b-instant", temperature=0.7, json_
     max_retries = 5
     initial_delay = 1.0
 
+    # Wspólne limity kluczy między procesami (pula procesów roboczych)
+    limiter = None
+    if is_rate_limited():
+        import rate_limit as limiter  # Leniwy import: tylko w trybie wspólnych limitów
+        reserved = limiter.estimate_tokens(messages)
+
     # Semaphore zapewnia że tylko 1 zapytanie LLM jest wysyłane w danym momencie
     # (ograniczenie API rate limit)
     async with LLM_SEMAPHORE:
         delay = initial_delay
         for attempt in range(max_retries):
+            usable = await asyncio.to_thread(quota.usable_keys, GROQ_API_KEYS)
+            if limiter:
+                key_index = usable[await limiter.acquire([GROQ_API_KEYS[i] for i in usable], reserved)]
+            else:
+                key_index = random.choice(usable)
+            current_client = get_groq_client(key_index)
             try:
                 # Wywołanie Groq API (blokujące, więc używamy executor)
                 blocking_task = partial(current_client.chat.completions.create, **params)
@@ -245,18 +221,26 @@ async def ask_llm(messages, model="llama-3.1-8b-instant", temperature=0.7, json_
                 
                 # Sukces! Wyciągamy treść odpowiedzi
                 content = response.choices[0].message.content
+                used_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+                await asyncio.to_thread(quota.record_usage, agent_name, used_tokens, GROQ_API_KEYS[key_index])
+                if limiter:
+                    await asyncio.to_thread(limiter.settle, GROQ_API_KEYS[key_index], reserved, used_tokens)
                 
                 # CLEANED LOG: Tylko jeśli sukces po retry
                 if attempt > 0:
                     print(f"  ✓ {agent_name} (próba {attempt+1})")
                 
                 # Krótkie opóźnienie dla API (dobre obyczaje)
-                await asyncio.sleep(0.5)
+                await asyncio.sleep(LLM_COURTESY_DELAY_S)
                 return content
                 
             except Exception as e:
                 # --- OBSŁUGA BŁĘDU RATE LIMIT (429) ---
                 if '429' in str(e):
+                    if quota.is_daily_limit_error(e):
+                        await asyncio.to_thread(quota.mark_exhausted, GROQ_API_KEYS[key_index])
+                    if limiter:
+                        await asyncio.to_thread(limiter.drain, GROQ_API_KEYS[key_index])
                     if attempt < max_retries - 1:
                         # Mamy jeszcze próby - czekamy i ponawiamy
                         print(f"  ⏳ {agent_name}: Rate limit, czekam {delay:.0f}s...")
@@ -276,86 +260,34 @@ async def ask_llm(messages, model="llama-3.1-8b-instant", temperature=0.7, json_
     return "{}" if json_mode else ""
 
 
-# ==============================================================================
-# ZARZĄDZANIE HISTORIĄ (PAMIĘĆ)
-# ==============================================================================
-
-MAIN_KEYS = ["last_cuisines", "last_regions", "last_poll"]
-TRENDS_KEYS = ["last_trends"]
-INSIGHTS_KEYS = ["user_insights", "liked_trends"]
-
-def _load_json_file(file_path, default_value):
-    """Pomocnicza funkcja do bezpiecznego wczytywania JSON."""
-    if not os.path.exists(file_path):
-        return default_value
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if not content:
-                return default_value
-            return json.loads(content)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return default_value
-
-def load_history():
-    """Wczytuje całą historię (główną, trendy, insighty) do jednego słownika."""
-    os.makedirs(HISTORY_DIR, exist_ok=True)
-    
-    history = {}
-    
-    main_data = _load_json_file(MAIN_HISTORY_FILE, {k: [] for k in MAIN_KEYS})
-    trends_data = _load_json_file(TRENDS_FILE, {k: [] for k in TRENDS_KEYS})
-    insights_data = _load_json_file(INSIGHTS_FILE, {k: [] for k in INSIGHTS_KEYS})
-    
-    history.update(main_data)
-    history.update(trends_data)
-    history.update(insights_data)
-    
-    # Inicjalizacja brakujących kluczy
-    for key in MAIN_KEYS + TRENDS_KEYS + INSIGHTS_KEYS:
-        if key not in history:
-            history[key] = [] if 'last' in key else {}
-            
-    return history
-
-def _save_json_file(file_path, data):
-    """Pomocnicza funkcja do zapisu JSON."""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-
-def save_history(history):
-    """Zapisuje stan historii do odpowiednich plików JSON."""
-    os.makedirs(HISTORY_DIR, exist_ok=True)
-    
-    main_data = {k: history.get(k) for k in MAIN_KEYS if k in history}
-    trends_data = {k: history.get(k) for k in TRENDS_KEYS if k in history}
-    insights_data = {k: history.get(k) for k in INSIGHTS_KEYS if k in history}
-    
-    _save_json_file(MAIN_HISTORY_FILE, main_data)
-    _save_json_file(TRENDS_FILE, trends_data)
-    _save_json_file(INSIGHTS_FILE, insights_data)
-
-def save_daily_plan(date_str, content):
-    """Zapisuje wygenerowany plan (Markdown) do pliku w folderze daily_plans."""
-    os.makedirs("daily_plans", exist_ok=True)
-    file_path = os.path.join("daily_plans", f"{date_str}.md")
-    with open(file_path, 'w', encoding='utf-8', errors='replace') as f:
-        f.write(content)
-    print(f"💾 [PLIK] Zapisano plan dzienny: {file_path}")
-
-
 # ==============================================================================
 # WARSZTAT KULINARNY (KOORDYNACJA AGENTÓW)
 # ==============================================================================
 
-async def culinary_workshop(trend, cuisine, daily_brief, insights_list):
+async def culinary_workshop(trend, cuisine, daily_brief, insights_list, local_audits=False, exclude=()):
     """
     Warsztat kulinarny - iteracyjny proces tworzenia przepisu.
     
-    Proces: Chef -> Logistyk -> Dietetyk -> (jeśli odrzucono: powtórz z feedbackiem)
-    Maksymalnie 3 iteracje.
+    Proces: Chef -> Dietetyk lokalny -> Logistyk (LLM tylko w przypadkach granicznych)
+    -> Dietetyk (LLM, tylko gdy potrzebny)
+    -> (jeśli odrzucono: powtórz z feedbackiem)
+    Maksymalnie 3 iteracje. Jeśli podobne danie tej kuchni zostało już zweryfikowane
+    (i jest poza oknem nowości), przepis jest brany z archiwum bez wywołań LLM - z pominięciem
+    dań z `exclude` (już wybranych w tym przebiegu).
+    `local_audits=True` (mały limit tokenów, `quota`): przypadki graniczne rozstrzygają
+    audyty lokalne - bez Logistyka i Dietetyka LLM.
     """
     from agents.workshop import agent_chef_refiner, agent_shopper_audit, agent_nutrition_audit
+    from recipe_store import find_reusable_recipe
+    from nutrition import local_nutrition_review
+    from pricing import local_shopper_review, cost_summary
+
+    # Ponowne użycie zweryfikowanego przepisu z archiwum (pomija całą rundę Chef -> Logistyk -> Dietetyk)
+    cached = find_reusable_recipe(trend, cuisine, exclude=exclude)
+    if cached:
+        print(f"  ♻️ Z archiwum: '{cached['dish_name'][:30]}' ({cached['plan_date']}, podobieństwo {cached['similarity']})")
+        recipe = dict(cached["recipe"], reused_from=cached["plan_date"])
+        return recipe, {"calories": cached.get("calories") or "?"}
     
     # Przygotowanie draftu przepisu
     draft = {
@@ -368,13 +300,9 @@ async def culinary_workshop(trend, cuisine, daily_brief, insights_list):
     # Iteracje warsztatu (maksymalnie 3)
     for i in range(MAX_ITERATIONS):
         # --- CHEF ---
-        chef_response_str = await agent_chef_refiner(draft)
-        try: 
-            chef_response = json.loads(chef_response_str)
-        except (json.JSONDecodeError, TypeError): 
-            chef_response = None
-        
-        if not chef_response or not isinstance(chef_response, dict) or not chef_response.get("dish_name"):
+        # Usterki JSON naprawiane są lokalnie (llm_json), brakujące pola - dopytaniem
+        chef_response = await agent_chef_refiner(draft)
+        if not chef_response:
             draft["feedback_history"].append("Błąd formatu JSON")
             continue
             
@@ -382,34 +310,47 @@ async def culinary_workshop(trend, cuisine, daily_brief, insights_list):
         dish = chef_response.get('dish_name', '')[:30]  # Skrócona nazwa
         print(f"  ✓ '{dish}'")
 
-        # --- LOGISTYK ---
-        shopper_review_str = await agent_shopper_audit(draft)
-        try: 
-            shopper_review = json.loads(shopper_review_str)
-        except (json.JSONDecodeError, TypeError): 
-            shopper_review = None
-
-        if not isinstance(shopper_review, dict) or not shopper_review.get("approved", False):
-            feedback = f"Logistyk: {shopper_review.get('feedback', 'Odrzucony') if isinstance(shopper_review, dict) else 'Błąd'}"
-            draft["feedback_history"].append(feedback)
-            print(f"  ✗ Odrzucono (logistyk)")
+        # --- DIETETYK LOKALNY (tabela wartości odżywczych, bez LLM) ---
+        local_review = local_nutrition_review(chef_response, daily_brief)
+        if local_review["approved"] is False:
+            draft["feedback_history"].append(f"Dietetyk: {local_review['feedback']}")
+            print(f"  ✗ Odrzucono (dietetyk lokalny: {local_review['macros']['calories']} kcal)")
             continue
-
-        # --- DIETETYK ---
-        nutrition_review_str = await agent_nutrition_audit(draft)
-        try: 
-            nutrition_review = json.loads(nutrition_review_str)
-        except (json.JSONDecodeError, TypeError): 
-            nutrition_review = None
-
-        if not isinstance(nutrition_review, dict) or not nutrition_review.get("approved", False):
-            feedback = f"Dietetyk: {nutrition_review.get('feedback', 'Odrzucony') if isinstance(nutrition_review, dict) else 'Błąd'}"
-            draft["feedback_history"].append(feedback)
-            print(f"  ✗ Odrzucono (dietetyk)")
+        local_macros = local_review["macros"]
+        draft["local_nutrition"] = local_macros
+
+        # --- LOGISTYK (cennik lokalny, LLM tylko dla przypadków granicznych) ---
+        local_shopping = local_shopper_review(chef_response)
+        if local_shopping["approved"] is False:
+            draft["feedback_history"].append(f"Logistyk: {local_shopping['feedback']}")
+            print(f"  ✗ Odrzucono (logistyk lokalny)")
             continue
+        if local_shopping["approved"] is None and not local_audits:
+            draft["local_cost"] = cost_summary(local_shopping["cost"])
+            shopper_review = await agent_shopper_audit(draft)
+            if not shopper_review or not shopper_review["approved"]:
+                feedback = f"Logistyk: {shopper_review.get('feedback') or 'Odrzucony' if shopper_review else 'Błąd'}"
+                draft["feedback_history"].append(feedback)
+                print(f"  ✗ Odrzucono (logistyk)")
+                continue
+
+        # --- DIETETYK (LLM tylko dla oceny jakościowej lub nierozpoznanych składników) ---
+        # Bez liczby porcji lokalne kcal to tylko szacunek - nie trafia do planu jako wynik
+        calories = local_macros["calories"] if local_macros.get("servings_known", True) else "?"
+        if local_review["needs_llm"] and not local_audits:
+            nutrition_review = await agent_nutrition_audit(draft)
+            if not nutrition_review or not nutrition_review["approved"]:
+                feedback = f"Dietetyk: {nutrition_review.get('feedback') or 'Odrzucony' if nutrition_review else 'Błąd'}"
+                draft["feedback_history"].append(feedback)
+                print(f"  ✗ Odrzucono (dietetyk)")
+                continue
+            if local_review["approved"] is None:
+                calories = nutrition_review.get("calories", "?")
         
         # SUKCES - wszystkie audyty przeszły!
-        draft["final_macros"] = {"calories": nutrition_review.get("calories", "?")}
+        draft["final_macros"] = {"calories": calories}
+        if local_review["approved"]:
+            draft["final_macros"].update({k: local_macros[k] for k in ("protein", "fat", "carbs")})
         return draft["chef_work"], draft["final_macros"]
 
     # Porażka po MAX_ITERATIONS próbach
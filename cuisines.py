@@ -0,0 +1,58 @@
+"""
+Moduł Katalogu Kuchni.
+
+Zawiera mapowanie regionów świata na kuchnie tematyczne i ich nazwy wyświetlane.
+Moduł nie ma zależności - narzędzia offline mogą go importować bez kosztu startu bota.
+"""
+
+# Mapowanie Regionów i Kuchni
+# Struktura: Kontynent -> Rodzaj Kuchni -> Nazwa wyświetlana (dopełniacz: "do...")
+CUISINE_REGIONS = {
+    "Europa": {
+        "Włoska (Klasyczna)": "Włoch",
+        "Włoska (Sycylia/Południe)": "Słonecznej Sycylii",
+        "Francuska (Prowansalska)": "Prowansji",
+        "Francuska (Bistro)": "Paryża",
+        "Hiszpańska (Tapas/Paella)": "Hiszpanii",
+        "Grecka (Tawerna)": "Grecji",
+        "Polska (Staropolska)": "Szlacheckiego Dworku",
+        "Polska (Bar Mleczny)": "PRL-u",
+        "Ukraińska (Wareniki/Barszcz)": "Ukrainy",
+        "Gruzińska (Supra)": "Gruzji",
+        "Węgierska (Papryka)": "Węgier",
+        "Niemiecka (Wurst/Kartoffel)": "Bawarii",
+        "Skandynawska (Hygge)": "Północy",
+        "Bałkańska (Grill)": "Bałkanów",
+    },
+    "Azja": {
+        "Japońska (Ramen Shop)": "Tokio",
+        "Japońska (Domowa)": "Japonii",
+        "Chińska (Syzuana/Ostry)": "Syczuanu",
+        "Chińska (Kantońska/DimSum)": "Kantonu",
+        "Wietnamska (Street Food)": "Hanoi",
+        "Tajska (Curry/PadThai)": "Bangkoku",
+        "Indyjska (Curry House)": "Mumbaju",
+        "Koreańska (K-Drama Food)": "Seulu",
+        "Indonezyjska (Bali Vibe)": "Bali",
+        "Turecka (Kebab/Meze)": "Stambułu",
+        "Libańska/Arabska": "Bejrutu",
+    },
+    "Ameryki": {
+        "Meksykańska (Cantina)": "Meksyku",
+        "Meksykańska (Tex-Mex)": "Pogranicza USA/Meksyk",
+        "USA (Southern BBQ)": "Teksasu",
+        "USA (NYC Style)": "Nowego Jorku",
+        "USA (Cajun/Creole)": "Nowego Orleanu",
+        "Brazylijska": "Rio de Janeiro",
+        "Argentyńska": "Buenos Aires",
+        "Peruwiańska": "Limon",
+    },
+    "Specjalne / Klimatyczne": {
+        "Babcina Kuchnia (Comfort Food)": "Domu Babci",
+        "Smak Jesieni (Dyniowe/Grzybowe)": "Złotej Jesieni",
+    }
+}
+
+# Spłaszczona mapa kuchni
+CUISINE_MAP = {k: v for region in CUISINE_REGIONS.values() for k, v in region.items()}
+CUISINES = list(CUISINE_MAP.keys())
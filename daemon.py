@@ -0,0 +1,90 @@
+"""
+Moduł Trybu Ciągłego (Daemon).
+
+Zawiera pomocnicze elementy długo działającego bota (python main.py --daemon):
+- Wyliczanie następnego terminu dziennego uruchomienia (harmonogram w procesie, bez crona).
+- Parsowanie komend na kanale ("!kucharz teraz", "!kucharz status", ...).
+- Okna poza godzinami szczytu dla napełniania puli opcji w tle (`option_pool`).
+
+Tryb jednorazowy (cron w GitHub Actions) pozostaje domyślny.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+# Stałe konfiguracyjne
+DAILY_RUN_TIME = os.environ.get("DAILY_RUN_TIME", "07:00")   # Godzina UTC (jak cron w workflow)
+COMMAND_PREFIX = "!kucharz"
+POOL_INTERVAL_MINUTES = 60   # Co ile próbować uzupełnić pulę opcji
+POOL_GUARD_MINUTES = 90      # Bez napełniania puli tuż przed dziennym przebiegiem
+
+COMMANDS = {
+    "teraz": "Przygotuj dzisiejszy plan od razu (nawet jeśli już był).",
+    "status": "Pokaż najbliższe zaplanowane gotowanie i stan bota.",
+    "szukaj": "Wyszukaj przepis w archiwum, np. `!kucharz szukaj pierogi`.",
+    "pomoc": "Lista komend.",
+}
+
+
+def parse_run_time(text=DAILY_RUN_TIME):
+    """"HH:MM" -> (godzina, minuta); niepoprawny format daje domyślne 07:00."""
+    try:
+        hour, minute = (int(part) for part in str(text).split(":", 1))
+        if 0 <= hour < 24 and 0 <= minute < 60:
+            return hour, minute
+    except ValueError:
+        pass
+    print(f"⚠️ Niepoprawna godzina DAILY_RUN_TIME='{text}'. Używam 07:00 UTC.")
+    return 7, 0
+
+
+def next_run_at(now=None, run_time=DAILY_RUN_TIME):
+    """
+    Najbliższy termin dziennego uruchomienia (UTC).
+
+    Returns:
+        datetime: Dziś o `run_time`, jeśli jeszcze nie minęło, w przeciwnym razie jutro.
+    """
+    now = now or datetime.now(timezone.utc)
+    hour, minute = parse_run_time(run_time)
+    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return candidate if candidate > now else candidate + timedelta(days=1)
+
+
+def is_off_peak(now=None, run_time=DAILY_RUN_TIME, guard_minutes=POOL_GUARD_MINUTES):
+    """
+    Czy to dobry moment na pracę w tle (dzienny przebieg nie zaczyna się w ciągu `guard_minutes`).
+    To tylko okno czasowe - o tym, czy stać nas na warsztat, decyduje `option_pool.affords_workshop`.
+    """
+    now = now or datetime.now(timezone.utc)
+    return next_run_at(now, run_time) - now > timedelta(minutes=guard_minutes)
+
+
+def manual_run_id(now=None):
+    """
+    Identyfikator wysyłki dla komendy "teraz": data i godzina, więc nie pokrywa się z przebiegiem
+    z harmonogramu (run_id = data) - dziennik wysyłki nie zwraca starych wiadomości zamiast nowego planu.
+    """
+    now = now or datetime.now(timezone.utc)
+    return f"{now:%Y-%m-%d}-teraz-{now:%H%M%S}"
+
+
+def parse_command(content):
+    """
+    Rozpoznaje komendę bota w treści wiadomości.
+
+    Returns:
+        tuple | None: (komenda, argument) lub None, jeśli wiadomość nie jest komendą.
+    """
+    text = (content or "").strip()
+    if not text.lower().startswith(COMMAND_PREFIX):
+        return None
+    parts = text[len(COMMAND_PREFIX):].strip().split(maxsplit=1)
+    command = parts[0].lower() if parts else "pomoc"
+    return (command if command in COMMANDS else "pomoc"), (parts[1] if len(parts) > 1 else "")
+
+
+def help_text():
+    """Tekst pomocy z listą komend."""
+    lines = [f"`{COMMAND_PREFIX} {name}` – {description}" for name, description in COMMANDS.items()]
+    return "👨‍🍳 **Komendy kucharza:**\n" + "\n".join(lines)
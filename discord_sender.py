@@ -0,0 +1,223 @@
+"""
+Moduł Wysyłki na Discorda.
+
+Zawiera kolejkę wyjściową bota:
+- Osobną kolejkę i pracownika na każdą trasę API (wiadomości kanału, reakcje wiadomości),
+  dzięki czemu reakcje ankiety idą równolegle z generowaniem i wysyłką treści,
+  a kolejność wiadomości na kanale jest zachowana.
+- Kubełki limitów per trasa (proaktywne tempo zgodne z limitami Discorda; obsługę 429
+  i nagłówków X-RateLimit zostawiamy bibliotece discord.py).
+- Dzielenie wiadomości dłuższych niż 2000 znaków (akapity -> linie -> słowa).
+- Idempotentną wysyłkę: dziennik wysłanych wiadomości (per uruchomienie) pozwala
+  wznowionemu procesowi nie publikować tego samego drugi raz.
+"""
+
+import os
+import time
+import asyncio
+
+from history import HISTORY_DIR, _load_json_file, _save_json_file
+
+# Stałe konfiguracyjne
+MESSAGE_LIMIT = 2000
+SENT_LOG_FILE = os.path.join(HISTORY_DIR, "sent_log.json")
+
+# Limity tras (żądania, okno w sekundach) - zgodne z publicznymi limitami Discorda
+ROUTE_LIMITS = {
+    "messages": (5, 5.0),     # POST /channels/{id}/messages
+    "reactions": (1, 0.25),   # PUT /channels/{id}/messages/{id}/reactions/...
+}
+
+
+# ==============================================================================
+# DZIELENIE WIADOMOŚCI
+# ==============================================================================
+
+def split_message(text, limit=MESSAGE_LIMIT, separators=("\n\n", "\n", " ")):
+    """
+    Dzieli tekst na części nie dłuższe niż `limit`, preferując granice akapitów,
+    potem linii, potem słów (twarde cięcie tylko dla bardzo długich słów/linków).
+
+    Returns:
+        list[str]: Niepuste części w kolejności.
+    """
+    text = (text or "").strip()
+    if len(text) <= limit:
+        return [text] if text else []
+    if not separators:
+        return [text[i:i + limit] for i in range(0, len(text), limit)]
+
+    separator, finer = separators[0], separators[1:]
+    chunks, current = [], ""
+    for piece in text.split(separator):
+        for part in (split_message(piece, limit, finer) if len(piece) > limit else [piece]):
+            candidate = f"{current}{separator}{part}" if current else part
+            if len(candidate) <= limit:
+                current = candidate
+                continue
+            if current.strip():
+                chunks.append(current.strip())
+            current = part
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+# ==============================================================================
+# KUBEŁKI LIMITÓW
+# ==============================================================================
+
+class RouteBucket:
+    """Kubełek tokenów dla jednej trasy API (np. 5 wiadomości na 5 s)."""
+
+    def __init__(self, capacity, per_seconds):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# ==============================================================================
+# KOLEJKA WYSYŁKI
+# ==============================================================================
+
+class DiscordSender:
+    """
+    Kolejka wyjściowa dla jednego kanału i jednego uruchomienia (np. dnia).
+
+    Użycie:
+        sender = DiscordSender(channel, run_id="2025-01-01")
+        poll = await sender.send("poll", embed=embed)
+        sender.add_reactions(poll, ["1⃣", "2⃣"])       # w tle
+        await sender.send_many("msg", messages)         # kolejność zachowana
+        await sender.close()                            # czeka na reakcje
+    """
+
+    def __init__(self, channel, run_id, log_file=SENT_LOG_FILE):
+        self.channel = channel
+        self.run_id = str(run_id)
+        self.log_file = log_file
+        log = _load_json_file(log_file, {}) if log_file else {}   # log_file=None - bez dziennika
+        # Dziennik dotyczy tylko bieżącego uruchomienia (inny run_id = czysta karta)
+        self.sent = log.get("sent", {}) if log.get("run_id") == self.run_id else {}
+        self.queues, self.workers, self.buckets = {}, {}, {}
+        self.background = []   # Operacje w tle (reakcje), na które czeka dopiero close()
+        self.stats = {"sent": 0, "skipped": 0, "reactions": 0}
+        self.started = time.monotonic()
+
+    # --- Trasy i pracownicy ---
+
+    def _submit(self, route, kind, factory, paced=True):
+        """
+        Dodaje operację do kolejki trasy i zwraca Future z jej wynikiem.
+        Operacje z paced=False (np. odzyskanie już wysłanej wiadomości) nie zużywają limitu trasy.
+        """
+        if route not in self.queues:
+            self.queues[route] = asyncio.Queue()
+            self.buckets[route] = RouteBucket(*ROUTE_LIMITS[kind])
+            self.workers[route] = asyncio.create_task(self._worker(route))
+        future = asyncio.get_running_loop().create_future()
+        self.queues[route].put_nowait((factory, future, paced))
+        return future
+
+    async def _worker(self, route):
+        queue, bucket = self.queues[route], self.buckets[route]
+        while True:
+            job = await queue.get()
+            if job is None:
+                queue.task_done()
+                return
+            factory, future, paced = job
+            if paced:
+                await bucket.acquire()
+            try:
+                future.set_result(await factory())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                queue.task_done()
+
+    def _record(self, key, message_id):
+        self.sent[key] = message_id
+        if self.log_file:
+            _save_json_file(self.log_file, {"run_id": self.run_id, "sent": self.sent})
+
+    # --- Operacje publiczne ---
+
+    async def send(self, key, content=None, embed=None):
+        """
+        Wysyła wiadomość (dzieląc ją na części do 2000 znaków) dokładnie raz w ramach uruchomienia.
+
+        Args:
+            key (str): Stały identyfikator wiadomości w uruchomieniu (np. "poll", "msg-1").
+
+        Returns:
+            discord.Message | None: Pierwsza część wiadomości (także odzyskana z dziennika) lub None.
+        """
+        parts = split_message(content) if content else [None]
+        route = f"messages:{self.channel.id}"
+        futures = []
+        for idx, part in enumerate(parts):
+            part_key = key if len(parts) == 1 else f"{key}.{idx}"
+            part_embed = embed if idx == 0 else None
+            futures.append(self._submit(route, "messages", lambda k=part_key, p=part, e=part_embed: self._send_once(k, p, e),
+                                        paced=part_key not in self.sent))
+        results = await asyncio.gather(*futures)
+        return results[0] if results else None
+
+    async def _send_once(self, key, content, embed):
+        import discord  # Leniwy import: kolejka i dzielenie wiadomości działają bez biblioteki Discorda
+
+        if key in self.sent:
+            try:
+                message = await self.channel.fetch_message(self.sent[key])
+                self.stats["skipped"] += 1
+                return message
+            except (discord.NotFound, LookupError):
+                pass  # Wiadomość usunięta z kanału (LookupError: kanał zastępczy) - ponowne wysłanie to nie duplikat
+        message = await self.channel.send(content=content, embed=embed)
+        self.stats["sent"] += 1
+        self._record(key, message.id)
+        return message
+
+    async def send_many(self, key_prefix, contents):
+        """Wysyła kilka wiadomości w kolejności (jedna kolejka trasy, bez stałych przerw)."""
+        sends = [self.send(f"{key_prefix}-{idx}", text) for idx, text in enumerate(contents) if text and text.strip()]
+        return await asyncio.gather(*sends)
+
+    def add_reactions(self, message, emojis):
+        """Dodaje reakcje w tle (własna trasa wiadomości, równolegle z resztą wysyłki)."""
+        if message is None:
+            return []
+        route = f"reactions:{message.id}"
+        futures = []
+        for emoji in emojis:
+            async def react(emoji=emoji):
+                await message.add_reaction(emoji)  # Ponowne dodanie tej samej reakcji nic nie zmienia
+                self.stats["reactions"] += 1
+            futures.append(self._submit(route, "reactions", react))
+        self.background.extend(futures)
+        return futures
+
+    async def close(self):
+        """Czeka na opróżnienie wszystkich kolejek i kończy pracowników."""
+        results = await asyncio.gather(*self.background, return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]
+        for queue in self.queues.values():
+            queue.put_nowait(None)
+        await asyncio.gather(*self.workers.values())
+        elapsed = time.monotonic() - self.started
+        print(f"📤 [DISCORD] Wysłano {self.stats['sent']} wiadomości, pominięto {self.stats['skipped']} "
+              f"(już wysłane), reakcje: {self.stats['reactions']} | {elapsed:.1f}s")
+        for error in errors:
+            print(f"  ⚠️ Błąd wysyłki: {error}")
@@ -0,0 +1,265 @@
+"""
+Moduł Zastępczego Serwera Groq (Lokalne API Zgodne z OpenAI).
+
+Lokalny serwer HTTP z endpointem `POST /openai/v1/chat/completions` (ten sam, którego
+używa biblioteka `groq`), do testów obciążeniowych warstwy LLM bez kluczy i bez limitów
+prawdziwego API. Klienta kieruje się na serwer zmienną GROQ_BASE_URL (czytaną przez `groq`).
+
+Zachowanie (konfigurowalne):
+- Opóźnienie odpowiedzi z rozkładu (`fixed:S`, `uniform:MIN,MAX`, `lognormal:MEDIANA,SIGMA`)
+  plus czas generowania tokenów odpowiedzi (TOKENS_PER_S).
+- Limity RPM i TPM per klucz (nagłówek Authorization) - kubełki tokenów jak w Groq;
+  przekroczenie to 429 z `retry-after` i nagłówkami `x-ratelimit-*`.
+- Wstrzykiwanie błędów z prawdopodobieństwem: ucięty JSON w treści odpowiedzi (json_mode),
+  uszkodzone ciało odpowiedzi HTTP, błąd serwera 500.
+- Statystyki per klucz: `GET /stats`, wyzerowanie limitów i statystyk: `POST /reset`.
+
+Użycie z linii komend:
+    python fake_groq.py --port 8765 --rpm 30 --tpm 6000
+    python fake_groq.py --latency lognormal:0.4,0.5 --malformed 0.1 --errors 0.02
+    GROQ_BASE_URL=http://127.0.0.1:8765 python pipeline.py --sink memory --count 3
+    GROQ_BASE_URL=http://127.0.0.1:8765 python weekly.py --days 1 --dry-run
+"""
+
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stałe konfiguracyjne
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+DEFAULT_RPM = 30
+DEFAULT_TPM = 6000
+DEFAULT_LATENCY = "lognormal:0.3,0.5"
+TOKENS_PER_S = 800          # Tempo "generowania" odpowiedzi (dolicza się do opóźnienia)
+COMPLETION_TOKENS = 300     # Średnia długość odpowiedzi w tokenach
+CHARS_PER_TOKEN = 4
+
+_WORDS = "pomidor bazylia czosnek makaron oliwa cebula papryka ryż imbir kolendra cytryna jogurt".split()
+
+
+def parse_latency(spec):
+    """
+    Rozkład opóźnienia z opisu tekstowego.
+
+    Returns:
+        callable: Funkcja `(rng) -> sekundy`.
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Nieznany rozkład opóźnienia: {spec} (fixed:S, uniform:MIN,MAX, lognormal:MEDIANA,SIGMA)")
+
+
+# ==============================================================================
+# SERWER
+# ==============================================================================
+
+class FakeGroqServer(ThreadingHTTPServer):
+    """Serwer HTTP ze stanem: kubełki limitów i statystyki per klucz."""
+
+    daemon_threads = True
+
+    def __init__(self, address, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, latency=DEFAULT_LATENCY,
+                 malformed=0.0, broken=0.0, errors=0.0, seed=None):
+        super().__init__(address, _Handler)
+        self.rpm, self.tpm = rpm, tpm
+        self.latency = parse_latency(latency)
+        self.malformed, self.broken, self.errors = malformed, broken, errors
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self):
+        """Pełne kubełki i wyzerowane statystyki."""
+        with self.lock:
+            self.buckets = {}
+            self.counters = {}
+
+    def count(self, key, field):
+        with self.lock:
+            counters = self.counters.setdefault(key, {})
+            counters[field] = counters.get(field, 0) + 1
+
+    def stats(self):
+        """Statystyki per klucz i suma: {klucz: {requests, ok, rate_limited, ...}, "total": {...}}."""
+        with self.lock:
+            result = {key: dict(c) for key, c in self.counters.items()}
+        total = {}
+        for counters in result.values():
+            for field, value in counters.items():
+                total[field] = total.get(field, 0) + value
+        result["total"] = total
+        return result
+
+    def take(self, key, tokens):
+        """
+        Pobranie jednego zapytania i `tokens` tokenów z kubełków klucza.
+
+        Returns:
+            tuple: (czy przyjęto, nagłówki x-ratelimit-*, sekundy do ponowienia, limit "requests"/"tokens").
+        """
+        with self.lock:
+            now = time.monotonic()
+            requests, available, updated = self.buckets.get(key, (self.rpm, self.tpm, now))
+            elapsed = now - updated
+            requests = min(self.rpm, requests + elapsed * self.rpm / 60)
+            available = min(self.tpm, available + elapsed * self.tpm / 60)
+            request_wait = (1 - requests) * 60 / self.rpm
+            token_wait = (min(tokens, self.tpm) - available) * 60 / self.tpm
+            wait = max(request_wait, token_wait, 0.0)
+            if wait <= 0:
+                requests, available = requests - 1, available - tokens
+            self.buckets[key] = (requests, available, now)
+        headers = {
+            "x-ratelimit-limit-requests": str(self.rpm),
+            "x-ratelimit-limit-tokens": str(self.tpm),
+            "x-ratelimit-remaining-requests": str(max(0, int(requests))),
+            "x-ratelimit-remaining-tokens": str(max(0, int(available))),
+            "x-ratelimit-reset-requests": f"{max(0.0, (self.rpm - requests) * 60 / self.rpm):.2f}s",
+            "x-ratelimit-reset-tokens": f"{max(0.0, (self.tpm - available) * 60 / self.tpm):.2f}s",
+        }
+        return wait <= 0, headers, wait, "requests" if request_wait >= token_wait else "tokens"
+
+    def sample(self):
+        """Losowanie pod blokadą (jeden generator, powtarzalny przy stałym seedzie)."""
+        with self.lock:
+            completion = max(1, int(self.rng.gauss(COMPLETION_TOKENS, COMPLETION_TOKENS / 4)))
+            return {
+                "delay": self.latency(self.rng) + completion / TOKENS_PER_S,
+                "completion": completion,
+                "malformed": self.rng.random() < self.malformed,
+                "broken": self.rng.random() < self.broken,
+                "error": self.rng.random() < self.errors,
+                "words": [self.rng.choice(_WORDS) for _ in range(min(completion, 60))],
+            }
+
+
+def _content(body, draw):
+    """Treść odpowiedzi modelu: JSON w json_mode (ewentualnie ucięty), inaczej tekst."""
+    if (body.get("response_format") or {}).get("type") != "json_object":
+        return " ".join(draw["words"]).capitalize() + "."
+    content = json.dumps({"nazwa": " ".join(draw["words"][:3]).title(), "opis": " ".join(draw["words"]),
+                          "tokeny": draw["completion"]}, ensure_ascii=False)
+    return content[: len(content) // 2] if draw["malformed"] else content
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass   # Bez logu każdego zapytania
+
+    def _reply(self, status, payload, headers=None, raw=None):
+        data = raw if raw is not None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self._reply(200, self.server.stats())
+        self._reply(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length)
+        if self.path == "/reset":
+            self.server.reset()
+            return self._reply(200, {"ok": True})
+        if self.path != COMPLETIONS_PATH:
+            return self._reply(404, {"error": {"message": "Not found"}})
+
+        key = self.headers.get("Authorization", "").removeprefix("Bearer ").strip() or "anonymous"
+        server = self.server
+        server.count(key, "requests")
+        try:
+            body = json.loads(raw_body)
+        except json.JSONDecodeError:
+            server.count(key, "bad_request")
+            return self._reply(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+
+        prompt = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // CHARS_PER_TOKEN
+        draw = server.sample()
+        accepted, headers, wait, limit = server.take(key, prompt + draw["completion"])
+        if not accepted:
+            server.count(key, "rate_limited")
+            headers["retry-after"] = str(max(1, math.ceil(wait)))
+            return self._reply(429, {"error": {
+                "message": f"Rate limit reached for model `{body.get('model')}`: please try again in {wait:.2f}s.",
+                "type": limit,
+                "code": "rate_limit_exceeded",
+            }}, headers)
+
+        time.sleep(draw["delay"])
+        if draw["error"]:
+            server.count(key, "server_error")
+            return self._reply(500, {"error": {"message": "Internal server error", "type": "internal_server_error"}}, headers)
+        if draw["broken"]:
+            server.count(key, "broken")
+            return self._reply(200, None, headers, raw=b'{"id": "chatcmpl-broken", "choices": [{"mess')
+
+        server.count(key, "malformed" if draw["malformed"] else "ok")
+        self._reply(200, {
+            "id": f"chatcmpl-{time.monotonic_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": _content(body, draw)}}],
+            "usage": {"prompt_tokens": prompt, "completion_tokens": draw["completion"],
+                      "total_tokens": prompt + draw["completion"]},
+        }, headers)
+
+
+def start_server(host="127.0.0.1", port=0, **config):
+    """
+    Uruchamia serwer w wątku w tle (port 0 - dowolny wolny).
+
+    Returns:
+        FakeGroqServer: Serwer (adres w `base_url`, zatrzymanie: `shutdown()`).
+    """
+    server = FakeGroqServer((host, port), **config)
+    threading.Thread(target=server.serve_forever, name="fake-groq", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokalny serwer zastępczy API Groq (testy obciążeniowe).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="Limit zapytań na minutę per klucz.")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TPM, help="Limit tokenów na minutę per klucz.")
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="fixed:S | uniform:MIN,MAX | lognormal:MEDIANA,SIGMA")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Odsetek uciętych odpowiedzi JSON (json_mode).")
+    parser.add_argument("--broken", type=float, default=0.0, help="Odsetek uszkodzonych ciał odpowiedzi HTTP.")
+    parser.add_argument("--errors", type=float, default=0.0, help="Odsetek błędów 500.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeGroqServer((args.host, args.port), rpm=args.rpm, tpm=args.tpm, latency=args.latency,
+                            malformed=args.malformed, broken=args.broken, errors=args.errors, seed=args.seed)
+    print(f"🧪 Serwer zastępczy Groq: {server.base_url} (RPM {args.rpm}, TPM {args.tpm}, opóźnienie {args.latency})")
+    print(f"   GROQ_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {json.dumps(server.stats()['total'], ensure_ascii=False)}")
@@ -0,0 +1,214 @@
+"""
+Moduł Wielu Kanałów (Fan-out ze Wspólnym Generowaniem).
+
+Jeden przebieg dzienny dla wielu kanałów (`tenants`), każdy z własną historią i preferencjami:
+1. Per kanał (tanio): analiza ankiety i czatu (Główny Analityk) - własny brief i sugestia kuchni.
+2. Grupowanie: kanały dzielą kuchnię, jeśli pozwala na to ich historia (kuchnia nie była
+   u nich ostatnio). Sugestie analityka mają pierwszeństwo, pozostałe kanały dołączają do
+   największej dopuszczalnej grupy, a dopiero w ostateczności losują nową kuchnię.
+3. Per grupa (drogo): pula, research, warsztat, plany posiłków i redakcja - raz dla całej grupy.
+   Filtr nowości bierze pod uwagę historię wszystkich kanałów grupy, ranking pomysłów -
+   uśredniony model preferencji wszystkich kanałów, a research i warsztat - briefy
+   wszystkich kanałów. Kanały w innych
+   lokalizacjach dostają wersje językowe złożone ze wspólnych przepisów (`locales`, raz na lokalizację).
+   Każda grupa przechodzi dopuszczenie limitu tokenów (`quota.admission`).
+4. Per kanał: publikacja wspólnego dnia na kanale i zapis w przestrzeni nazw kanału.
+
+Koszt rośnie z liczbą grup kuchni, a nie z liczbą kanałów. Wszystkie zapytania do LLM
+(wszystkich kanałów i grup) przechodzą przez jeden globalny limiter - semafor `core.ask_llm`.
+
+Użycie z linii komend (kanały zastępcze, bez zapisu):
+    python fanout.py --tenants 5
+    python fanout.py --tenants 5 --chat czat.txt
+"""
+
+import copy
+import time
+import asyncio
+import argparse
+from datetime import datetime
+
+from history import load_history
+from cuisines import CUISINES
+from recipe_store import ensure_recipe_store
+from plan_queue import pop_day
+from pipeline import (
+    analyze_last_poll, analyze_chat, choose_cuisine, gather_options, prepare_day, publish_day,
+    NO_IDEAS_MESSAGE, NO_OPTIONS_MESSAGE, QUOTA_MESSAGE
+)
+from tenants import make_tenant
+from preferences import merge_preference_models
+from core import GROQ_API_KEYS
+from quota import admission
+from sinks import MemoryChannel, load_chat_lines
+
+
+# ==============================================================================
+# ETAP PER KANAŁ
+# ==============================================================================
+
+async def prepare_tenant(tenant, channel, history=None, bot_user=None, persist=True):
+    """
+    Analiza ankiety i czatu jednego kanału.
+
+    Returns:
+        dict: {tenant, channel, history, brief, insight, suggested, chat}.
+    """
+    history = history if history is not None else load_history(tenant.history_dir)
+    print(f"\n--- [{tenant.name}] Analiza kanału #{channel.name} ---")
+    await analyze_last_poll(channel, history)
+    brief, insight, suggested, chat = await analyze_chat(
+        channel, history, bot_user, tenant.chat_log_file if persist else None
+    )
+    return {"tenant": tenant, "channel": channel, "history": history, "brief": brief,
+            "insight": insight, "suggested": suggested, "chat": chat}
+
+
+def assign_cuisines(states):
+    """
+    Grupuje kanały według kuchni dnia.
+
+    Kanał z ważną sugestią analityka dostaje ją (reguła `choose_cuisine`). Pozostałe
+    dołączają do największej grupy, której kuchni nie było u nich ostatnio; jeśli takiej
+    nie ma, kuchnia jest losowana dla kanału (nowa grupa).
+
+    Returns:
+        dict: kuchnia -> lista stanów kanałów (z `prepare_tenant`).
+    """
+    def has_valid_suggestion(state):
+        recent = state["history"].get("last_cuisines", [])
+        return state["suggested"] in CUISINES and state["suggested"] not in recent[:3]
+
+    groups = {}
+    for state in sorted(states, key=lambda s: not has_valid_suggestion(s)):
+        recent = state["history"].get("last_cuisines", [])
+        joinable = [c for c in groups if c not in recent]
+        if joinable and not has_valid_suggestion(state):
+            cuisine = max(joinable, key=lambda c: len(groups[c]))
+            print(f"🤝 [{state['tenant'].name}] Dołączam do grupy: {cuisine}")
+        else:
+            cuisine = choose_cuisine(state["history"], state["suggested"])
+        groups.setdefault(cuisine, []).append(state)
+    return groups
+
+
+def _group_history(members):
+    """
+    Historia grupy dla researchu i warsztatu: uśredniony model preferencji, ostatnie trendy,
+    polubione dania i wnioski wszystkich kanałów (bez powtórek dla żadnego z nich).
+    """
+    history = copy.deepcopy(members[0]["history"])
+    history["preference_model"] = merge_preference_models(m["history"].get("preference_model", {}) for m in members)
+    trends = [m["history"].get("last_trends", []) for m in members]
+    history["last_trends"] = [
+        [idea for days in trends if idx < len(days)
+         for idea in (days[idx] if isinstance(days[idx], list) else [days[idx]])]
+        for idx in range(max(map(len, trends)))
+    ]
+    insights = [i for m in members for i in m["history"].get("user_insights", [])]
+    history["user_insights"] = list(dict.fromkeys(insights))
+    liked = [d for m in members for d in m["history"].get("liked_trends", [])]
+    history["liked_trends"] = list(dict.fromkeys(liked))
+    return history
+
+
+def _group_brief(members):
+    """Brief grupy dla researchu i warsztatu: briefy wszystkich kanałów (bez powtórek)."""
+    return " | ".join(dict.fromkeys(m["brief"] for m in members if m["brief"]))
+
+
+# ==============================================================================
+# ETAP PER GRUPA (WSPÓLNE GENEROWANIE)
+# ==============================================================================
+
+async def produce_group(cuisine, members, use_pool=True):
+    """
+    Pula, research, warsztat, plany posiłków i redakcja raz dla całej grupy kanałów.
+
+    Returns:
+        dict | None: Dzień gotowy do publikacji (z `messages`) lub None (wtedy kanały
+        dostają komunikat o braku planu).
+    """
+    names = ", ".join(m["tenant"].name for m in members)
+    print(f"\n--- [GRUPA] {cuisine}: {names} ---")
+    brief = _group_brief(members)   # Każdy kanał publikuje potem własny brief (`fan_out`)
+    with admission(GROQ_API_KEYS) as run:   # Limit tokenów per grupa (rezerwacje grup się sumują)
+        if not run.admitted:
+            await asyncio.gather(*(m["channel"].send(QUOTA_MESSAGE) for m in members))
+            return None
+        verified_options, ideas = await gather_options(cuisine, brief, _group_history(members), use_pool)
+        if not verified_options:
+            print(f"❌ [GRUPA] {cuisine}: brak zweryfikowanych opcji.")
+            message = NO_OPTIONS_MESSAGE if ideas else NO_IDEAS_MESSAGE
+            await asyncio.gather(*(m["channel"].send(message) for m in members))
+            return None
+        return await prepare_day(cuisine, brief, "", ideas, verified_options, compose=True,
+                                 locales=[m["tenant"].locale for m in members])
+
+
+# ==============================================================================
+# GŁÓWNY PRZEBIEG
+# ==============================================================================
+
+async def fan_out(targets, bot_user=None, persist=True, date_str=None, run_id=None):
+    """
+    Dzienny przebieg dla wielu kanałów ze wspólnym generowaniem w grupach kuchni.
+
+    Args:
+        targets (list[tuple]): (Tenant, kanał, historia lub None - wczytana z przestrzeni kanału).
+        persist (bool): Zapis historii, dzienników, planów i kolejek kanałów (jak `generate_daily_plan`).
+        run_id (str): Identyfikator idempotentnej wysyłki (domyślnie data planu).
+
+    Returns:
+        list[tuple]: (Tenant, wynik `publish_day` lub None) w kolejności `targets`.
+    """
+    date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+    started = time.monotonic()
+    print(f"\n--- FAN-OUT: {len(targets)} kanałów ---")
+    states = await asyncio.gather(*(prepare_tenant(t, ch, h, bot_user, persist) for t, ch, h in targets))
+
+    # Dni z kolejki planów (tryb tygodniowy) publikowane są bez grupowania
+    results, pending = {}, []
+    for state in states:
+        tenant = state["tenant"]
+        queued = pop_day(tenant.plan_queue_file) if persist else None
+        if queued:
+            results[tenant] = await publish_day(state["channel"], state["history"], queued, date_str, persist, run_id,
+                                                tenant=tenant)
+        else:
+            pending.append(state)
+
+    groups = assign_cuisines(pending)
+    print(f"\n🧩 [FAN-OUT] {len(pending)} kanałów -> {len(groups)} grup kuchni: "
+          + "; ".join(f"{c} ({len(ms)})" for c, ms in groups.items()))
+    days = await asyncio.gather(*(produce_group(c, ms, use_pool=persist) for c, ms in groups.items()))
+
+    publications = []
+    for day, members in zip(days, groups.values()):
+        for state in members if day else []:
+            # Wspólne opcje i wiadomości, własny brief i wniosek kanału
+            tenant_day = dict(copy.deepcopy(day), brief=state["brief"], insight=state["insight"])
+            publications.append((state["tenant"], publish_day(
+                state["channel"], state["history"], tenant_day, date_str, persist, run_id,
+                chat_history=state["chat"], tenant=state["tenant"]
+            )))
+    published = await asyncio.gather(*(p for _, p in publications))
+    results.update(zip((t for t, _ in publications), published))
+
+    print(f"✅ [FAN-OUT] {len(targets)} kanałów, {len(groups)} wspólnych przebiegów w {time.monotonic() - started:.1f}s")
+    return [(tenant, results.get(tenant)) for tenant, _, _ in targets]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fan-out dziennego planu na wiele kanałów zastępczych (bez zapisu).")
+    parser.add_argument("--tenants", type=int, default=3, help="Liczba kanałów.")
+    parser.add_argument("--chat", help="Plik z wejściem czatu (\"autor: treść\" na linię) dla każdego kanału.")
+    args = parser.parse_args()
+
+    ensure_recipe_store()
+    chat = load_chat_lines(args.chat) if args.chat else []
+    history = load_history()
+    targets = [(make_tenant(idx + 1, f"kanal-{idx + 1}"), MemoryChannel(f"kanal-{idx + 1}", chat=chat), copy.deepcopy(history))
+               for idx in range(args.tenants)]
+    for tenant, result in asyncio.run(fan_out(targets, persist=False)):
+        print(f"  #{tenant.name}: {result['cuisine'] + ', ' + str(len(result['options'])) + ' opcje' if result else 'brak planu'}")
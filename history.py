@@ -0,0 +1,97 @@
+"""
+Moduł Historii (Pamięć Bota).
+
+Zawiera:
+- Ścieżki plików pamięci (memory/) i stałe historii.
+- Odczyt i zapis historii (główna, trendy, insighty) oraz planów dziennych (daily_plans/).
+
+Moduł zależy tylko od biblioteki standardowej (szybki import w narzędziach offline).
+"""
+
+import os
+import json
+
+# Pliki Historii
+HISTORY_DIR = "memory"
+MAIN_HISTORY_FILE = os.path.join(HISTORY_DIR, "main.json")  # Historia regionów, kuchni, ankiet
+TRENDS_FILE = os.path.join(HISTORY_DIR, "trends.json")      # Historia trendów
+INSIGHTS_FILE = os.path.join(HISTORY_DIR, "insights.json")  # Wnioski o użytkowniku
+PLANS_DIR = "daily_plans"                                   # Plany dzienne (Markdown)
+
+# Stałe konfiguracyjne
+MAX_INSIGHTS = 15      # Maksymalna liczba wniosków trzymanych w pamięci
+RECENT_REGION_COUNT = 2 # Ile ostatnich regionów pamiętać, by ich nie powtarzać
+
+
+# ==============================================================================
+# ZARZĄDZANIE HISTORIĄ (PAMIĘĆ)
+# ==============================================================================
+
+MAIN_KEYS = ["last_cuisines", "last_regions", "last_poll"]
+TRENDS_KEYS = ["last_trends"]
+INSIGHTS_KEYS = ["user_insights", "liked_trends", "preference_model"]
+
+def _load_json_file(file_path, default_value):
+    """Pomocnicza funkcja do bezpiecznego wczytywania JSON."""
+    if not os.path.exists(file_path):
+        return default_value
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+            if not content:
+                return default_value
+            return json.loads(content)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return default_value
+
+def _history_files(history_dir):
+    """Ścieżki plików historii w katalogu (domyślny katalog lub przestrzeń nazw kanału)."""
+    return tuple(os.path.join(history_dir, os.path.basename(f)) for f in (MAIN_HISTORY_FILE, TRENDS_FILE, INSIGHTS_FILE))
+
+def load_history(history_dir=HISTORY_DIR):
+    """Wczytuje całą historię (główną, trendy, insighty) do jednego słownika."""
+    os.makedirs(history_dir, exist_ok=True)
+    main_file, trends_file, insights_file = _history_files(history_dir)
+    
+    history = {}
+    
+    main_data = _load_json_file(main_file, {k: [] for k in MAIN_KEYS})
+    trends_data = _load_json_file(trends_file, {k: [] for k in TRENDS_KEYS})
+    insights_data = _load_json_file(insights_file, {k: [] for k in INSIGHTS_KEYS})
+    
+    history.update(main_data)
+    history.update(trends_data)
+    history.update(insights_data)
+    
+    # Inicjalizacja brakujących kluczy
+    for key in MAIN_KEYS + TRENDS_KEYS + INSIGHTS_KEYS:
+        if key not in history:
+            history[key] = [] if 'last' in key else {}
+            
+    return history
+
+def _save_json_file(file_path, data):
+    """Pomocnicza funkcja do zapisu JSON."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+def save_history(history, history_dir=HISTORY_DIR):
+    """Zapisuje stan historii do odpowiednich plików JSON."""
+    os.makedirs(history_dir, exist_ok=True)
+    main_file, trends_file, insights_file = _history_files(history_dir)
+    
+    main_data = {k: history.get(k) for k in MAIN_KEYS if k in history}
+    trends_data = {k: history.get(k) for k in TRENDS_KEYS if k in history}
+    insights_data = {k: history.get(k) for k in INSIGHTS_KEYS if k in history}
+    
+    _save_json_file(main_file, main_data)
+    _save_json_file(trends_file, trends_data)
+    _save_json_file(insights_file, insights_data)
+
+def save_daily_plan(date_str, content, plans_dir=PLANS_DIR):
+    """Zapisuje wygenerowany plan (Markdown) do pliku w folderze daily_plans."""
+    os.makedirs(plans_dir, exist_ok=True)
+    file_path = os.path.join(plans_dir, f"{date_str}.md")
+    with open(file_path, 'w', encoding='utf-8', errors='replace') as f:
+        f.write(content)
+    print(f"💾 [PLIK] Zapisano plan dzienny: {file_path}")
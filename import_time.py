@@ -0,0 +1,96 @@
+"""
+Moduł Pomiaru Czasu Importu.
+
+Mierzy koszt `import <moduł>` w świeżym interpreterze (`python -X importtime`),
+żeby pilnować szybkiego startu narzędzi offline (katalog kuchni, historia) i bota.
+
+Użycie z linii komend:
+    python import_time.py                      # tabela dla domyślnych modułów
+    python import_time.py cuisines history     # wybrane moduły
+    python import_time.py --check              # kod wyjścia 1 przy przekroczeniu budżetu
+"""
+
+import re
+import sys
+import argparse
+import subprocess
+
+# Moduły mierzone domyślnie i ich budżety (ms, skumulowany czas importu)
+DEFAULT_BUDGETS_MS = {
+    "cuisines": 5,
+    "history": 10,
+    "core": 150,
+    "recipe_store": 150,
+    "chat_log": 150,
+    "discord_sender": 100,   # asyncio (~50 ms) jest nieunikniony
+    "discord_bot": None,   # Bot ładuje discord.py i agentów - mierzymy bez budżetu
+}
+REPEATS = 3   # Wynik to minimum z kilku pomiarów (odporność na szum systemu)
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module, python=sys.executable):
+    """
+    Importuje moduł w osobnym procesie z `-X importtime`.
+
+    Returns:
+        tuple: (skumulowany czas importu modułu w ms, lista (ms, nazwa) najcięższych zależności).
+    """
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else module)
+
+    # Dzieci w drzewie importów są wypisywane przed rodzicem (z głębszym wcięciem),
+    # więc bezpośrednie zależności to wpisy o wcięciu 3 od ostatniego wpisu najwyższego poziomu
+    total, children = None, []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        name, depth = match.group(4), len(match.group(3))
+        if depth == 1:
+            if name == module:
+                total = cumulative_ms
+                break
+            children = []
+        elif depth == 3:
+            children.append((cumulative_ms, name))
+    children.sort(reverse=True)
+    return total or 0.0, children[:3]
+
+
+def run(modules, budgets, repeats=REPEATS):
+    """Mierzy moduły, drukuje tabelę i zwraca listę przekroczonych budżetów."""
+    over_budget = []
+    print(f"{'Moduł':<18}{'ms':>9}{'budżet':>9}   najcięższe zależności")
+    for module in modules:
+        try:
+            samples = [measure_import(module) for _ in range(repeats)]
+        except RuntimeError as e:
+            print(f"{module:<18}{'błąd':>9}{'':>9}   {e}")
+            continue
+        total, heavy = min(samples, key=lambda sample: sample[0])
+        budget = budgets.get(module)
+        flag = "" if budget is None or total <= budget else " ⚠️"
+        if flag:
+            over_budget.append(module)
+        deps = ", ".join(f"{name} {ms:.0f}" for ms, name in heavy)
+        print(f"{module:<18}{total:>9.1f}{(budget if budget is not None else '-'):>9}   {deps}{flag}")
+    return over_budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Czas importu modułów (python -X importtime).")
+    parser.add_argument("modules", nargs="*", help="Moduły do zmierzenia (domyślnie zestaw standardowy).")
+    parser.add_argument("--check", action="store_true", help="Zakończ z kodem 1 przy przekroczeniu budżetu.")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    over = run(args.modules or list(DEFAULT_BUDGETS_MS), DEFAULT_BUDGETS_MS, args.repeats)
+    if over:
+        print(f"⚠️ Przekroczony budżet: {', '.join(over)}")
+        if args.check:
+            sys.exit(1)
@@ -0,0 +1,163 @@
+"""
+Moduł Katalogu Składników.
+
+Zawiera:
+- Wbudowaną tabelę popularnych (polskich) składników: wartości odżywcze na 100 g,
+  typową masę sztuki i gęstość (do przeliczania łyżek/szklanek na gramy).
+- Rozpoznawanie składnika z dowolnej nazwy podanej przez agenta (synonimy, odmiana).
+
+Wartości są przybliżone (tabele wartości odżywczych, produkty surowe / suche),
+wystarczające do kontroli reguły kalorycznej i zbilansowania dania.
+"""
+
+from functools import lru_cache
+
+from matching import normalize_dish_name, stem_matches
+
+# ==============================================================================
+# TABELA SKŁADNIKÓW
+# ==============================================================================
+
+# Kolumny wartości odżywczych (na 100 g)
+NUTRIENT_COLUMNS = ("kcal", "protein", "fat", "carbs")
+
+# id: (synonimy (rdzenie po normalizacji), kcal, białko, tłuszcz, węglowodany, masa sztuki [g], gęstość [g/ml])
+INGREDIENTS = {
+    # --- Warzywa ---
+    "ziemniak": (["ziemniak", "kartof", "pyry"], 77, 2.0, 0.1, 17.0, 150, 1.0),
+    "marchew": (["marchew", "marchw"], 41, 0.9, 0.2, 10.0, 70, 1.0),
+    "cebula": (["cebul", "szalotk", "por"], 40, 1.1, 0.1, 9.0, 110, 1.0),
+    "czosnek": (["czosn"], 149, 6.4, 0.5, 33.0, 5, 1.0),
+    "pomidor": (["pomidor"], 18, 0.9, 0.2, 3.9, 120, 1.0),
+    "passata": (["passat", "pomidory z puszki", "pomidory krojone", "przecier", "koncentrat"], 35, 1.6, 0.2, 6.5, 400, 1.05),
+    "papryka": (["papryk", "chili", "jalapeno"], 31, 1.0, 0.3, 6.0, 150, 1.0),
+    "ogorek": (["ogor", "ogork"], 15, 0.7, 0.1, 3.6, 180, 1.0),
+    "kapusta": (["kapust", "kimchi"], 25, 1.3, 0.1, 5.8, 1000, 1.0),
+    "dynia": (["dyni", "dynia"], 26, 1.0, 0.1, 6.5, 1500, 1.0),
+    "grzyby": (["grzyb", "pieczark", "borowik", "podgrzyb", "shiitake", "boczniak", "kurk"], 22, 3.1, 0.3, 3.3, 20, 1.0),
+    "szpinak": (["szpinak"], 23, 2.9, 0.4, 3.6, 30, 1.0),
+    "brokul": (["brokul", "brokol", "kalafior"], 34, 2.8, 0.4, 7.0, 400, 1.0),
+    "cukinia": (["cukini"], 17, 1.2, 0.3, 3.1, 300, 1.0),
+    "baklazan": (["baklazan"], 25, 1.0, 0.2, 6.0, 300, 1.0),
+    "salata": (["salat", "rukol", "roszponk", "jarmuz", "zielenin", "szczypior", "pietruszk", "seler",
+                "natk", "koper", "warzyw", "kielk", "rzodkiew", "burak", "fasolka szparagow"], 20, 1.3, 0.2, 3.5, 50, 1.0),
+    "kukurydza": (["kukurydz"], 86, 3.3, 1.4, 19.0, 300, 1.0),
+    "groszek": (["groszek", "groszk", "edamame"], 81, 5.4, 0.4, 14.0, 400, 1.0),
+    "awokado": (["awokad", "guacamole"], 160, 2.0, 15.0, 9.0, 170, 1.0),
+    # --- Strączki, zboża, pieczywo ---
+    "fasola": (["fasol"], 127, 8.7, 0.5, 22.8, 400, 1.0),
+    "ciecierzyca": (["ciecierzyc", "hummus", "falafel"], 164, 8.9, 2.6, 27.0, 400, 1.0),
+    "soczewica": (["soczewic"], 353, 25.0, 1.1, 60.0, 400, 0.85),
+    "ryz": (["ryz", "sushi"], 360, 7.0, 0.6, 79.0, 100, 0.85),
+    "makaron": (["makaron", "spaghetti", "penne", "tagliatell", "noodle", "udon", "soba", "lasagn",
+                 "gnocchi", "kluski"], 350, 12.0, 1.5, 71.0, 100, 0.6),
+    "kasza": (["kasz", "bulgur", "kuskus", "quinoa", "komos", "polent"], 350, 11.0, 2.0, 72.0, 100, 0.85),
+    "maka": (["maka", "maki", "mace", "skrobi"], 350, 10.0, 1.2, 73.0, 100, 0.55),
+    "chleb": (["chleb", "bulk", "bagiet", "tost", "pieczyw", "tortill", "pita", "lawasz", "bajgl", "kromk"],
+              260, 8.5, 3.2, 49.0, 40, 0.3),
+    "platki": (["platki owsian", "owsian", "granol", "musli", "platk"], 370, 13.0, 7.0, 60.0, 40, 0.4),
+    # --- Nabiał i jajka ---
+    "jajko": (["jaj", "jajk"], 143, 12.6, 9.5, 0.7, 55, 1.0),
+    "mleko": (["mlek", "mleko"], 50, 3.3, 2.0, 4.8, 1000, 1.03),
+    "mleko_kokosowe": (["mleko kokosow", "mleczko kokosow", "sos kokosow", "smietanka kokosow"], 197, 2.0, 21.0, 3.0, 400, 1.0),
+    "jogurt": (["jogurt", "kefir", "maslank", "skyr"], 60, 4.0, 3.0, 5.0, 150, 1.03),
+    "smietana": (["smietan", "creme fraiche"], 195, 2.5, 18.0, 3.6, 200, 1.0),
+    "maslo": (["masl", "ghee"], 740, 0.7, 82.0, 0.7, 200, 0.95),
+    "ser": (["ser", "gouda", "cheddar", "mozzarell", "parmezan", "feta", "halloumi", "ricott",
+             "mascarpone", "camembert", "brie", "oscypek", "paneer"], 330, 22.0, 26.0, 2.0, 100, 1.0),
+    "twarog": (["twarog", "ser bialy", "serek wiejsk"], 130, 18.0, 4.0, 3.5, 250, 1.0),
+    # --- Mięso, ryby ---
+    "kurczak": (["kurczak", "kurczec", "drob", "indyk", "indycz", "kaczk"], 120, 22.0, 3.0, 0.0, 200, 1.0),
+    "wieprzowina": (["wieprzow", "schab", "karkowk", "poledwiczk", "golonk"], 200, 19.0, 14.0, 0.0, 150, 1.0),
+    "wolowina": (["wolow", "stek", "rostbef", "cielecin", "jagniec", "baranin"], 200, 20.0, 13.0, 0.0, 150, 1.0),
+    "mieso": (["mies", "mielon", "kebab", "gyros"], 230, 18.0, 17.0, 0.0, 150, 1.0),
+    "boczek": (["boczek", "boczk", "bekon", "pancett", "slonin"], 450, 13.0, 44.0, 0.5, 20, 1.0),
+    "kielbasa": (["kielbas", "chorizo", "salami", "parowk", "wurst", "kabanos", "szynk", "kaszank"], 300, 14.0, 26.0, 2.0, 100, 1.0),
+    "ryba": (["ryb", "dorsz", "mintaj", "tilapi", "pstrag", "sandacz", "makrel", "sledz", "halibut",
+              "tunczyk", "dorad", "okon"], 120, 20.0, 4.0, 0.0, 150, 1.0),
+    "losos": (["losos"], 200, 20.0, 13.0, 0.0, 150, 1.0),
+    "owoce_morza": (["krewet", "owoce morza", "kalmar", "malz", "osmiornic", "krab"], 90, 18.0, 1.5, 1.0, 15, 1.0),
+    "tofu": (["tofu", "tempeh", "seitan"], 76, 8.0, 4.8, 1.9, 180, 1.0),
+    # --- Owoce, orzechy, słodkie ---
+    "banan": (["banan"], 89, 1.1, 0.3, 23.0, 120, 1.0),
+    "jablko": (["jablk", "grusz"], 52, 0.3, 0.2, 14.0, 180, 1.0),
+    "owoce": (["owoc", "truskaw", "malin", "borowk", "jagod", "wisni", "sliw", "mango", "ananas", "pomarancz",
+               "mandaryn", "brzoskw", "czeres", "morel", "winogr", "kiwi", "granat", "cytryn", "limonk", "fig", "daktyl",
+               "rodzyn", "zurawin", "porzeczk", "agrest", "salatk owoc"], 55, 0.8, 0.3, 13.0, 120, 1.0),
+    "orzechy": (["orzech", "migdal", "nerkow", "pistacj", "pestk", "slonecznik", "sezam", "nasion", "siemi",
+                 "chia", "mak", "sesam", "almond"], 600, 20.0, 52.0, 15.0, 5, 0.6),
+    "maslo_orzechowe": (["maslo orzechow", "tahin", "krem orzechow", "almond butter"], 600, 25.0, 50.0, 20.0, 15, 1.1),
+    "cukier": (["cukier", "cukr", "syrop", "slodzik", "dzem", "konfitur"], 390, 0.0, 0.0, 97.0, 5, 0.85),
+    "miod": (["miod"], 304, 0.3, 0.0, 82.0, 20, 1.4),
+    "czekolada": (["czekolad", "kakao", "nutell"], 530, 7.0, 31.0, 55.0, 10, 0.6),
+    # --- Tłuszcze, sosy, płyny ---
+    "olej": (["olej", "oliw", "tluszcz", "smalec"], 884, 0.0, 100.0, 0.0, 10, 0.92),
+    "majonez": (["majonez", "aioli"], 680, 1.0, 75.0, 1.0, 15, 0.95),
+    "ketchup": (["ketchup", "keczup", "salsa", "sos pomidor", "sos bbq", "sos slodko"], 110, 1.5, 0.2, 25.0, 15, 1.1),
+    "sos_sojowy": (["sos sojow", "sos soja", "soja", "sos rybn", "sos ostrygow", "teriyaki", "sos", "pesto", "musztard",
+                    "chrzan", "miso", "pasta curry", "harissa", "gochujang"], 60, 5.0, 0.5, 8.0, 15, 1.15),
+    "bulion": (["bulion", "wywar", "rosol", "zupa"], 5, 0.5, 0.2, 0.5, 1000, 1.0),
+    "sok": (["sok"], 45, 0.5, 0.1, 10.0, 250, 1.04),
+    "wino": (["win", "piw", "sake", "mirin"], 85, 0.1, 0.0, 3.0, 750, 1.0),
+    "ocet": (["ocet", "octu"], 20, 0.0, 0.0, 1.0, 15, 1.0),
+    "woda": (["wod", "lod"], 0, 0.0, 0.0, 0.0, 250, 1.0),
+    # --- Przyprawy (pomijalna kaloryczność w typowych ilościach) ---
+    "przyprawy": (["sol", "pieprz", "przypraw", "kmin", "kumin", "cynamon", "oregano", "bazyli", "tymian",
+                   "majeran", "rozmaryn", "kolendr", "curry", "kurkum", "imbir", "gozdzik", "ziele", "lisc",
+                   "laur", "galk", "kardamon", "wanili", "zatar", "sumak", "gochugaru", "szafran", "ziol",
+                   "miet", "chilli", "anyz", "kozieradk", "jalowiec", "garam"], 250, 10.0, 5.0, 45.0, 1, 0.6),
+}
+
+INGREDIENT_IDS = list(INGREDIENTS.keys())
+
+
+def _synonym_index():
+    """Buduje listę (słowa_synonimu, długość, id) posortowaną od najdłuższych synonimów."""
+    index = []
+    for ingredient_id, (synonyms, *_rest) in INGREDIENTS.items():
+        for synonym in synonyms:
+            words = tuple(normalize_dish_name(synonym).split())
+            index.append((words, sum(len(w) for w in words), ingredient_id))
+    index.sort(key=lambda entry: entry[1], reverse=True)
+    return index
+
+
+_SYNONYMS = _synonym_index()
+
+
+@lru_cache(maxsize=2048)
+def resolve_ingredient(name):
+    """
+    Rozpoznaje składnik z nazwy podanej przez agenta.
+
+    Każde słowo synonimu musi być prefiksem któregoś słowa nazwy (obsługa odmiany,
+    np. "ziemniaki", "ziemniaków"); po rdzeniach do 3 liter dopuszczalna jest tylko
+    końcówka fleksyjna ("pory" -> por, "porzeczki" -> nie). Wygrywa najdłuższy pasujący synonim,
+    więc "mleko kokosowe" trafia do mleka kokosowego, a nie do mleka.
+
+    Returns:
+        str | None: ID składnika z katalogu lub None, jeśli nie rozpoznano.
+    """
+    words = normalize_dish_name(name).split()
+    if not words:
+        return None
+    for synonym_words, _, ingredient_id in _SYNONYMS:
+        if all(any(stem_matches(s, word) for word in words) for s in synonym_words):
+            return ingredient_id
+    return None
+
+
+def nutrients_per_100g(ingredient_id):
+    """Zwraca słownik wartości odżywczych na 100 g dla składnika z katalogu."""
+    values = INGREDIENTS[ingredient_id][1:5]
+    return dict(zip(NUTRIENT_COLUMNS, values))
+
+
+def piece_weight(ingredient_id):
+    """Typowa masa jednej sztuki składnika (g)."""
+    return INGREDIENTS[ingredient_id][5]
+
+
+def density(ingredient_id):
+    """Gęstość składnika (g/ml) - do przeliczania miar objętościowych."""
+    return INGREDIENTS[ingredient_id][6]
@@ -0,0 +1,465 @@
+"""
+Moduł Dekodowania JSON od Agentów LLM.
+
+Zawiera wspólną warstwę dla wszystkich agentów wywoływanych w trybie `json_mode`:
+- Lokalną naprawę typowych usterek (bloki ```json, przecinki na końcu list, literały Pythona,
+  tekst przed/po JSON, odpowiedź uciętą w połowie tablicy lub obiektu).
+- Walidację względem prostego schematu agenta (aliasy kluczy, np. "nazwa" -> "name",
+  koercja typów, składniki podane jako tekst "200 g mąki").
+- Celowane dopytanie modelu TYLKO o pola, których nie udało się odzyskać lokalnie
+  (zamiast pełnej regeneracji odpowiedzi).
+"""
+
+import re
+import json
+import unicodedata
+
+from quantities import parse_unit
+from wire import expand, compact, short_path
+
+# Stałe konfiguracyjne
+MAX_REASKS = 1               # Ile razy dopytujemy o brakujące pola
+MAX_TRUNCATION_CUTS = 25     # Ile ostatnich elementów można odciąć przy naprawie uciętej odpowiedzi
+
+_FENCE_RE = re.compile(r'```(?:json|JSON)?\s*(.*?)(?:```|$)', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_PY_LITERALS = ((re.compile(r'(?<=[:\[,\s])True\b'), "true"), (re.compile(r'(?<=[:\[,\s])False\b'), "false"),
+                (re.compile(r'(?<=[:\[,\s])None\b'), "null"))
+_INGREDIENT_LINE_RE = re.compile(r'^\s*([\d.,/½⅓⅔¼¾⅛-]+)\s*([^\W\d_]+\.?)?\s+(.+)$')
+_STEP_NUMBER_RE = re.compile(r'^\s*(?:\d+[.)]|[-•*])\s*')
+
+_TRUE_WORDS = ("true", "tak", "yes", "1", "approved", "zatwierdzony", "zatwierdzam", "ok")
+_FALSE_WORDS = ("false", "nie", "no", "0", "rejected", "odrzucony", "odrzucam")
+
+
+# ==============================================================================
+# SCHEMATY AGENTÓW
+# ==============================================================================
+
+def field(kind, required=False, aliases=(), default=None, schema=None, items=None):
+    """
+    Opis pola schematu.
+
+    Args:
+        kind (str): "str", "int", "bool", "list", "object", "ingredients" lub "steps".
+        required (bool): Czy brak pola wymaga dopytania modelu.
+        aliases (tuple): Alternatywne nazwy klucza (porównywane bez diakrytyków i wielkości liter).
+        default: Wartość wstawiana, gdy pola brak (tylko pola opcjonalne).
+        schema (dict): Schemat zagnieżdżonego obiektu (kind="object" lub elementy listy obiektów).
+        items (str): Rodzaj elementów listy prostych wartości (np. "str").
+    """
+    return {"kind": kind, "required": required, "aliases": aliases, "default": default,
+            "schema": schema, "items": items}
+
+
+INGREDIENT_SCHEMA = {
+    "item": field("str", True, ("name", "nazwa", "ingredient", "skladnik", "produkt", "product")),
+    "amount": field("str", False, ("quantity", "qty", "ilosc", "ile", "waga"), default=""),
+    "unit": field("str", False, ("jednostka", "units", "miara", "jm"), default=""),
+}
+
+RECIPE_SCHEMA = {
+    "dish_name": field("str", True, ("name", "nazwa", "title", "tytul", "danie", "dish", "recipe_name", "nazwa_dania")),
+    "description": field("str", False, ("opis", "desc", "summary"), default=""),
+    "prep_time": field("str", False, ("czas", "time", "czas_przygotowania", "preparation_time", "cooking_time")),
+    "servings": field("int", False, ("porcje", "portions", "liczba_porcji", "serves")),
+    "calories": field("str", False, ("kcal", "kalorie", "kalorycznosc", "energy")),
+    "ingredients": field("ingredients", True, ("skladniki", "ingredient_list", "lista_skladnikow")),
+    "steps": field("steps", True, ("kroki", "instructions", "instrukcje", "przygotowanie", "method", "directions")),
+}
+
+SHOPPER_SCHEMA = {
+    "approved": field("bool", True, ("akceptacja", "zatwierdzony", "zatwierdzone", "approve", "accepted", "decision", "decyzja")),
+    "feedback": field("str", False, ("uzasadnienie", "komentarz", "reason", "uwagi", "comment"), default=""),
+}
+
+NUTRITION_SCHEMA = dict(SHOPPER_SCHEMA, calories=field("str", False, ("kcal", "kalorie", "kalorycznosc")))
+
+MEAL_PLAN_SCHEMA = {
+    "breakfast": field("object", True, ("sniadanie", "morning"), schema=RECIPE_SCHEMA),
+    "dinner": field("object", True, ("kolacja", "supper", "evening"), schema=RECIPE_SCHEMA),
+}
+
+ANALYST_SCHEMA = {
+    "daily_brief": field("str", False, ("brief", "daily", "brief_dnia")),
+    "suggested_cuisine": field("str", False, ("cuisine", "kuchnia", "sugerowana_kuchnia")),
+    "new_learning": field("str", False, ("insight", "learning", "wniosek", "nowy_wniosek")),
+}
+
+QUERIES_SCHEMA = {
+    "queries": field("list", True, ("zapytania", "search_queries", "query"), items="str"),
+}
+
+IDEA_SCHEMA = {
+    "nazwa": field("str", True, ("name", "dish_name", "title", "tytul", "danie", "dish")),
+    "opis": field("str", False, ("description", "desc", "opis_dania"), default=""),
+}
+
+IDEAS_SCHEMA = {
+    "ideas": field("list", True, ("pomysly", "dishes", "dania", "trends"), schema=IDEA_SCHEMA),
+}
+
+PUBLISHER_SCHEMA = {
+    "messages": field("list", True, ("wiadomosci", "msgs", "output"), items="str"),
+}
+
+TRANSLATIONS_SCHEMA = {
+    "translations": field("list", True, ("tlumaczenia", "texts", "teksty", "output"), items="str"),
+}
+
+
+# ==============================================================================
+# NAPRAWA TEKSTU
+# ==============================================================================
+
+def _scan(text):
+    """Zwraca (stos otwartych nawiasów, czy w stringu, pozycje przecinków poza stringami)."""
+    stack, in_string, escaped, commas = [], False, False, []
+    for idx, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            commas.append(idx)
+    return stack, in_string, commas
+
+
+def _close_truncated(text):
+    """
+    Domyka uciętą odpowiedź (np. limit tokenów w połowie listy kroków).
+    Jeśli ostatni element jest niekompletny, odcina go i próbuje ponownie.
+    """
+    _, _, commas = _scan(text)
+    candidates = [text] + [text[:pos] for pos in reversed(commas[-MAX_TRUNCATION_CUTS:])]
+    for candidate in candidates:
+        stack, in_string, _ = _scan(candidate)
+        if in_string:
+            continue  # Ucięty tekst (np. "kiełba") jest gorszy niż brak ostatniego elementu
+        candidate = re.sub(r'[\s,:]+$', '', candidate)
+        closing = "".join("}" if bracket == "{" else "]" for bracket in reversed(stack))
+        try:
+            return json.loads(_TRAILING_COMMA_RE.sub(r'\1', candidate + closing))
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def repair_json(text):
+    """
+    Dekoduje JSON z odpowiedzi modelu, naprawiając lokalnie typowe usterki.
+
+    Returns:
+        tuple: (obiekt lub None, lista zastosowanych napraw).
+    """
+    if isinstance(text, (dict, list)):
+        return text, []
+    text = str(text or "").strip()
+    repairs = []
+
+    fence = _FENCE_RE.search(text)
+    if fence and "```" in text:
+        text = fence.group(1).strip()
+        repairs.append("blok kodu")
+
+    starts = [pos for pos in (text.find("{"), text.find("[")) if pos >= 0]
+    if not starts:
+        return None, repairs
+    start = min(starts)
+    if start > 0:
+        repairs.append("tekst przed JSON")
+    text = text[start:]
+
+    decoder = json.JSONDecoder()
+    try:
+        data, end = decoder.raw_decode(text)
+        if text[end:].strip():
+            repairs.append("tekst po JSON")
+        return data, repairs
+    except json.JSONDecodeError:
+        pass
+
+    fixed = _TRAILING_COMMA_RE.sub(r'\1', text)
+    for pattern, literal in _PY_LITERALS:
+        fixed = pattern.sub(literal, fixed)
+    try:
+        data, _ = decoder.raw_decode(fixed)
+        return data, repairs + ["składnia (przecinki/literały)"]
+    except json.JSONDecodeError:
+        pass
+
+    data = _close_truncated(fixed)
+    return data, repairs + (["ucięta odpowiedź"] if data is not None else [])
+
+
+# ==============================================================================
+# WALIDACJA I KOERCJA
+# ==============================================================================
+
+def _key(name):
+    """Klucz do porównywania nazw pól: bez diakrytyków, małe litery, podkreślniki."""
+    text = unicodedata.normalize("NFKD", str(name).replace("ł", "l").replace("Ł", "L"))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower().strip()
+    return re.sub(r'[\s\-]+', '_', text)
+
+
+def _lookup(data, name, spec):
+    """Znajduje wartość pola po nazwie kanonicznej lub aliasie."""
+    if name in data:
+        return True, data[name]
+    wanted = {_key(name)} | {_key(alias) for alias in spec["aliases"]}
+    for key, value in data.items():
+        if _key(key) in wanted:
+            return True, value
+    return False, None
+
+
+def _as_str(value):
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return f"{value:g}"
+    return None
+
+
+def _as_int(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.search(r'\d+', str(value or ""))
+    return int(match.group()) if match else None
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value or "").strip().lower()
+    if text in _TRUE_WORDS:
+        return True
+    if text in _FALSE_WORDS:
+        return False
+    return None
+
+
+def _ingredient_from_text(text):
+    """Składnik podany jako tekst ("200 g mąki", "sól - do smaku")."""
+    text = text.strip(" -•*")
+    match = _INGREDIENT_LINE_RE.match(text)
+    if match:
+        amount, maybe_unit, rest = match.groups()
+        if maybe_unit and parse_unit(maybe_unit):
+            return {"item": rest.strip(), "amount": amount, "unit": maybe_unit}
+        return {"item": f"{maybe_unit or ''} {rest}".strip(), "amount": amount, "unit": ""}
+    for separator in (" – ", " - ", ": "):
+        if separator in text:
+            item, amount = text.split(separator, 1)
+            return {"item": item.strip(), "amount": amount.strip(), "unit": ""}
+    return {"item": text, "amount": "", "unit": ""}
+
+
+def _as_steps(value):
+    """Lista kroków z listy tekstów, listy obiektów lub jednego tekstu z numeracją."""
+    if isinstance(value, str):
+        value = [line for line in value.splitlines() if line.strip()]
+    if not isinstance(value, list):
+        return None
+    steps = []
+    for step in value:
+        if isinstance(step, dict):
+            step = next((v for v in step.values() if isinstance(v, str) and v.strip()), None)
+        text = _as_str(step)
+        if text:
+            steps.append(_STEP_NUMBER_RE.sub("", text))
+    return steps
+
+
+def _coerce(value, spec, path, missing):
+    """Zwraca wartość zgodną ze specyfikacją pola lub None (błędy zagnieżdżone trafiają do `missing`)."""
+    kind = spec["kind"]
+    if kind == "str":
+        return _as_str(value)
+    if kind == "int":
+        return _as_int(value)
+    if kind == "bool":
+        return _as_bool(value)
+    if kind == "object":
+        if not isinstance(value, dict):
+            return None
+        return validate(value, spec["schema"], missing, prefix=f"{path}.")
+    if kind == "ingredients":
+        if isinstance(value, dict):
+            value = [{"item": k, "amount": v} for k, v in value.items()]
+        if not isinstance(value, list):
+            return None
+        items = []
+        for entry in value:
+            if isinstance(entry, str):
+                entry = _ingredient_from_text(entry)
+            if isinstance(entry, dict):
+                item = validate(entry, INGREDIENT_SCHEMA, [])
+                if item.get("item"):
+                    items.append(item)
+        return items or None
+    if kind == "steps":
+        return _as_steps(value) or None
+    if kind == "list":
+        if isinstance(value, (str, dict)):
+            value = [value]
+        if not isinstance(value, list):
+            return None
+        if spec["schema"]:
+            required = [n for n, s in spec["schema"].items() if s["required"]]
+            # Sam napis (np. "Ramen" zamiast {"nazwa": "Ramen"}) trafia do pierwszego pola wymaganego
+            if required:
+                value = [{required[0]: v} if isinstance(v, str) and v.strip() else v for v in value]
+            result = [validate(v, spec["schema"], []) for v in value if isinstance(v, dict)]
+            result = [r for r in result if all(n in r for n in required)]
+        else:
+            result = [s for s in (_as_str(v) for v in value) if s]
+        return result or None
+    return value
+
+
+def validate(data, schema, missing, prefix=""):
+    """
+    Sprowadza obiekt do schematu (aliasy kluczy, typy, wartości domyślne).
+
+    Args:
+        data (dict): Zdekodowany JSON.
+        schema (dict): Schemat agenta (pola utworzone przez `field`).
+        missing (list): Lista, do której dopisywane są brakujące pola wymagane (ścieżki "a.b").
+
+    Returns:
+        dict: Obiekt zawierający tylko poprawne pola schematu.
+    """
+    result = {}
+    for name, spec in schema.items():
+        path = f"{prefix}{name}"
+        found, raw = _lookup(data, name, spec)
+        value = _coerce(raw, spec, path, missing) if found else None
+        if value is not None:
+            result[name] = value
+        elif spec["required"]:
+            missing.append(path)
+        elif spec["default"] is not None:
+            result[name] = spec["default"]
+    return result
+
+
+def _normalize_shape(data, schema):
+    """Rozpakowuje typowe "opakowania" odpowiedzi (lista zamiast obiektu, {"recipe": {...}})."""
+    if isinstance(data, list):
+        list_fields = [n for n, s in schema.items() if s["kind"] == "list"]
+        return {list_fields[0]: data} if len(list_fields) == 1 else None
+    if not isinstance(data, dict):
+        return None
+    required = [n for n, s in schema.items() if s["required"]]
+    if len(data) == 1 and not any(_lookup(data, n, schema[n])[0] for n in required):
+        inner = next(iter(data.values()))
+        if isinstance(inner, (dict, list)):
+            return _normalize_shape(inner, schema)
+    return data
+
+
+def decode_json(text, schema, wire=None):
+    """
+    Pełne lokalne dekodowanie odpowiedzi agenta.
+
+    Args:
+        wire (dict): Mapa krótkich kluczy (moduł wire), jeśli agent odpowiada w formacie kompaktowym.
+
+    Returns:
+        tuple: (obiekt zgodny ze schematem lub None, lista brakujących pól, surowy obiekt, naprawy).
+    """
+    raw, repairs = repair_json(text)
+    if wire:
+        raw = expand(raw, wire)
+    raw = _normalize_shape(raw, schema)
+    if wire:
+        raw = expand(raw, wire)  # Lista rozpakowana przez _normalize_shape (idempotentne)
+    if raw is None:
+        return None, [n for n, s in schema.items() if s["required"]], None, repairs
+    missing = []
+    return validate(raw, schema, missing), missing, raw, repairs
+
+
+def _merge(base, update):
+    """Głębokie scalanie odpowiedzi uzupełniającej z częściowym obiektem."""
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+# ==============================================================================
+# WYWOŁANIE AGENTA
+# ==============================================================================
+
+async def ask_llm_json(messages, schema, label="Agent", partial=False, max_reasks=MAX_REASKS, wire=None, **llm_kwargs):
+    """
+    Wywołuje agenta w trybie JSON i zwraca obiekt zgodny ze schematem.
+
+    Usterki formatu są naprawiane lokalnie. Jeśli nadal brakuje pól wymaganych,
+    a część odpowiedzi jest poprawna, model jest dopytywany wyłącznie o te pola.
+
+    Args:
+        messages (list): Wiadomości jak dla `ask_llm`.
+        schema (dict): Schemat odpowiedzi agenta.
+        label (str): Nazwa agenta do logów.
+        partial (bool): Czy zwrócić obiekt mimo brakujących pól wymaganych (wywołujący uzupełnia je sam).
+        wire (dict): Mapa krótkich kluczy, jeśli prompt prosi o format kompaktowy (moduł wire).
+
+    Returns:
+        dict | None: Obiekt zgodny ze schematem lub None, jeśli odpowiedzi nie da się odzyskać.
+    """
+    from core import ask_llm
+
+    response = await ask_llm(messages, json_mode=True, agent=label, **llm_kwargs)
+    data, missing, raw, repairs = decode_json(response, schema, wire)
+    if repairs and data:
+        print(f"  🩹 {label}: naprawiono JSON lokalnie ({', '.join(repairs)})")
+
+    for _ in range(max_reasks):
+        # Dopytujemy tylko, gdy odzyskano jakiś obiekt (pusta odpowiedź = brak LLM lub pełna porażka);
+        # obiekt bez poprawnych pól (np. same niepoprawne pozycje listy) też jest wart dopytania
+        if not missing or not (data or (isinstance(raw, dict) and raw)):
+            break
+        print(f"  🔁 {label}: dopytuję o pola {', '.join(missing)}")
+        asked = [short_path(path, wire) for path in missing] if wire else missing
+        follow_up = messages + [
+            {"role": "assistant", "content": json.dumps(compact(raw, wire) if wire else raw, ensure_ascii=False)},
+            {"role": "user", "content": (
+                f"W odpowiedzi brakuje lub są niepoprawne pola: {', '.join(asked)}. "
+                "Zwróć JSON zawierający WYŁĄCZNIE te pola (zagnieżdżone tak jak w formacie wyjściowym)."
+            )},
+        ]
+        update, _ = repair_json(await ask_llm(follow_up, json_mode=True, agent=label, **llm_kwargs))
+        if not isinstance(update, dict):
+            break
+        if wire:
+            update = expand(update, wire)
+        raw = _merge(raw, update)
+        missing = []
+        data = validate(raw, schema, missing)
+
+    if missing and not partial:
+        if data:
+            print(f"  ❌ {label}: brak pól {', '.join(missing)}")
+        return None
+    return data
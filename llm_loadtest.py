@@ -0,0 +1,188 @@
+"""
+Moduł Testu Obciążeniowego Warstwy LLM (`core.ask_llm`).
+
+Uruchamia zastępczy serwer Groq (`fake_groq`) w tle, kieruje na niego klientów `groq`
+(GROQ_BASE_URL, klucze testowe) i przy rosnącej współbieżności wywołujących mierzy:
+- przepustowość (wywołania `ask_llm` na sekundę) i opóźnienie p50/p99 widziane przez wywołującego
+  (razem z kolejką na semaforze i przerwą LLM_COURTESY_DELAY_S),
+- wzmocnienie ponowień: zapytania HTTP na jedno wywołanie, z podziałem na ponowienia
+  `ask_llm` (429, backoff) i wewnętrzne ponowienia biblioteki `groq` (max_retries),
+- błędy: puste odpowiedzi (fallback) i ucięty JSON, który dotarł do wywołującego.
+
+Parametry warstwy (semafor, przerwa, wspólne limity) można zmieniać do eksperymentów;
+domyślnie mierzona jest konfiguracja produkcyjna.
+
+Użycie z linii komend:
+    python llm_loadtest.py                                  # poziomy 1,2,4,8; 2 klucze; RPM 30
+    python llm_loadtest.py --levels 1,4,16 --calls 40
+    python llm_loadtest.py --semaphore 4 --courtesy 0       # eksperyment: bez ograniczeń w procesie
+    python llm_loadtest.py --shared-limits                  # wspólne limity klienta (`rate_limit`)
+    python llm_loadtest.py --malformed 0.1 --errors 0.05 --latency uniform:0.2,1.5
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+
+import fake_groq
+
+# Stałe konfiguracyjne
+DEFAULT_LEVELS = "1,2,4,8"
+DEFAULT_CALLS = 16
+PROMPT_CHARS = 2000   # Długość promptu użytkownika (ok. 500 tokenów)
+
+
+def percentile(values, q):
+    """Percentyl metodą najbliższej rangi (q w zakresie 0-100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def _messages(idx):
+    return [
+        {"role": "system", "content": f"Tester obciążenia. Wywołanie {idx}. Odpowiadaj zwięźle."},
+        {"role": "user", "content": ("Zaproponuj przepis na obiad z sezonowych warzyw. " * 50)[:PROMPT_CHARS]},
+    ]
+
+
+def _setup_environment(server, keys, shared_limits, rpm, tpm):
+    """
+    Kieruje klientów `groq` na serwer zastępczy. Musi poprzedzać import `core`
+    (klucze i limity są czytane przy imporcie).
+    """
+    os.environ["GROQ_BASE_URL"] = server.base_url
+    # Telemetria tokenów (`quota`) w bazie tymczasowej - klucze testowe nie trafiają do memory/
+    work_dir = tempfile.mkdtemp(prefix="llm_loadtest_")
+    os.environ["LLM_USAGE_DB"] = os.path.join(work_dir, "token_usage.db")
+    os.environ["GROQ_API_KEY"] = "test-key-1"
+    for idx in range(2, keys + 1):
+        os.environ[f"GROQ_API_KEY_{idx}"] = f"test-key-{idx}"
+    if shared_limits:
+        os.environ["LLM_RATE_LIMIT"] = "1"
+        os.environ["GROQ_RPM"], os.environ["GROQ_TPM"] = str(rpm), str(tpm)
+        os.environ["LLM_RATE_DB"] = os.path.join(work_dir, "rate_limits.db")
+    else:
+        os.environ.pop("LLM_RATE_LIMIT", None)
+
+    import core
+    import quota
+    quota.USAGE_DB_FILE = os.environ["LLM_USAGE_DB"]   # Gdy `quota` był już zaimportowany
+    # Tylko klucze testowe (dodatkowe klucze z .env nie trafiają nawet do serwera zastępczego)
+    core.GROQ_API_KEYS[:] = [f"test-key-{idx}" for idx in range(1, keys + 1)]
+    core.GROQ_CLIENTS = None
+    return core
+
+
+async def run_level(core, server, concurrency, calls, json_ratio=0.5):
+    """
+    `concurrency` wywołujących wykonuje łącznie `calls` wywołań `ask_llm`.
+
+    Returns:
+        dict: Wyniki poziomu (czasy, błędy, statystyki serwera, ponowienia).
+    """
+    server.reset()
+    if core.is_rate_limited():
+        import rate_limit
+        from contextlib import closing
+        with closing(rate_limit._connect(rate_limit.RATE_DB_FILE)) as conn:
+            conn.execute("DELETE FROM buckets")   # Pełne kubełki klienta, jak na serwerze
+
+    pending = iter(range(calls))
+    latencies, failed, malformed = [], 0, 0
+
+    async def caller():
+        nonlocal failed, malformed
+        for idx in pending:
+            json_mode = idx < calls * json_ratio
+            started = time.perf_counter()
+            answer = await core.ask_llm(_messages(idx), json_mode=json_mode)
+            latencies.append(time.perf_counter() - started)
+            if answer in ("", "{}"):
+                failed += 1
+            elif json_mode:
+                try:
+                    json.loads(answer)
+                except json.JSONDecodeError:
+                    malformed += 1
+
+    log = io.StringIO()
+    started = time.perf_counter()
+    with redirect_stdout(log):
+        await asyncio.gather(*(caller() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    total = server.stats()["total"]
+    requests = total.get("requests", 0)
+    client_retries = log.getvalue().count("Rate limit, czekam")
+    return {
+        "concurrency": concurrency, "calls": calls, "seconds": elapsed,
+        "throughput": calls / elapsed, "p50": percentile(latencies, 50), "p99": percentile(latencies, 99),
+        "failed": failed, "malformed": malformed,
+        "requests": requests, "rate_limited": total.get("rate_limited", 0),
+        "amplification": requests / calls,
+        "client_retries": client_retries,
+        "sdk_retries": max(0, requests - calls - client_retries),
+    }
+
+
+def print_table(rows):
+    print(f"\n{'wsp.':>5}{'wywołań':>9}{'czas':>8}{'/s':>7}{'p50':>8}{'p99':>8}{'błędy':>7}{'zły JSON':>10}"
+          f"{'HTTP':>6}{'429':>6}{'wzm.':>7}{'ask_llm':>9}{'groq':>6}")
+    for r in rows:
+        print(f"{r['concurrency']:>5}{r['calls']:>9}{r['seconds']:>7.1f}s{r['throughput']:>7.2f}"
+              f"{r['p50']:>7.2f}s{r['p99']:>7.2f}s{r['failed']:>7}{r['malformed']:>10}"
+              f"{r['requests']:>6}{r['rate_limited']:>6}{r['amplification']:>7.2f}{r['client_retries']:>9}{r['sdk_retries']:>6}")
+    print("(wzm. - zapytania HTTP na wywołanie; ask_llm / groq - ponowienia warstwy aplikacji / biblioteki)")
+
+
+async def main(args):
+    server = fake_groq.start_server(rpm=args.rpm, tpm=args.tpm, latency=args.latency, malformed=args.malformed,
+                                    broken=args.broken, errors=args.errors, seed=args.seed)
+    core = _setup_environment(server, args.keys, args.shared_limits, args.rpm, args.tpm)
+    core.LLM_SEMAPHORE = asyncio.Semaphore(args.semaphore)
+    if args.courtesy is not None:
+        core.LLM_COURTESY_DELAY_S = args.courtesy
+
+    print(f"🧪 Serwer zastępczy: {server.base_url} | klucze: {args.keys} | RPM {args.rpm}, TPM {args.tpm} "
+          f"| opóźnienie {args.latency}")
+    print(f"⚙️ Semafor: {args.semaphore} | przerwa: {core.LLM_COURTESY_DELAY_S}s "
+          f"| wspólne limity: {'tak' if core.is_rate_limited() else 'nie'}")
+    rows = []
+    for concurrency in [int(level) for level in args.levels.split(",")]:
+        row = await run_level(core, server, concurrency, args.calls)
+        rows.append(row)
+        print(f"  ✓ współbieżność {concurrency}: {row['throughput']:.2f}/s, p99 {row['p99']:.2f}s, "
+              f"wzmocnienie {row['amplification']:.2f}", file=sys.stderr)
+    server.shutdown()
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=4)
+        print(f"💾 Wyniki: {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test obciążeniowy core.ask_llm na zastępczym serwerze Groq.")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS, help="Poziomy współbieżności wywołujących (po przecinku).")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="Wywołań ask_llm na poziom.")
+    parser.add_argument("--keys", type=int, default=2, help="Liczba kluczy testowych.")
+    parser.add_argument("--rpm", type=int, default=fake_groq.DEFAULT_RPM, help="Limit zapytań na minutę per klucz.")
+    parser.add_argument("--tpm", type=int, default=fake_groq.DEFAULT_TPM * 3, help="Limit tokenów na minutę per klucz.")
+    parser.add_argument("--latency", default=fake_groq.DEFAULT_LATENCY, help="Rozkład opóźnienia serwera.")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Odsetek uciętych odpowiedzi JSON.")
+    parser.add_argument("--broken", type=float, default=0.0, help="Odsetek uszkodzonych ciał odpowiedzi HTTP.")
+    parser.add_argument("--errors", type=float, default=0.0, help="Odsetek błędów 500.")
+    parser.add_argument("--seed", type=int, default=47)
+    parser.add_argument("--semaphore", type=int, default=1, help="Rozmiar LLM_SEMAPHORE (produkcyjnie 1).")
+    parser.add_argument("--courtesy", type=float, default=None, help="LLM_COURTESY_DELAY_S (domyślnie jak w core).")
+    parser.add_argument("--shared-limits", action="store_true", help="Wspólne limity klienta (LLM_RATE_LIMIT=1).")
+    parser.add_argument("--json", help="Zapisz wyniki poziomów do pliku JSON.")
+    asyncio.run(main(parser.parse_args()))
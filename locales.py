@@ -0,0 +1,306 @@
+"""
+Moduł Wersji Językowych (Wiele Lokalizacji z Jednego Przebiegu).
+
+Przepisy są generowane, weryfikowane i redagowane raz (po polsku). Wersje dla kanałów
+w innych językach składane są lokalnie ze wspólnych, ustrukturyzowanych przepisów
+(nazwy, opisy, składniki z ilościami, kroki, makro):
+- Etykiety posiłków i sekcji, ankiety, listy zakupów - tabele LOCALES (bez LLM).
+- Teksty z przepisów i intro - jedno zbiorcze wywołanie Tłumacza na lokalizację
+  (porcje po BATCH_SIZE), wyłącznie dla tekstów spoza pamięci tłumaczeń.
+- Pamięć tłumaczeń (memory/translations.json) - nazwy składników, ilości ("2 łyżki")
+  i powtarzające się teksty nie są tłumaczone ponownie.
+
+Koszt dodatkowej lokalizacji to jedno-dwa wywołania Tłumacza zamiast pełnego przebiegu
+(analiza, research, warsztat z audytami, plany posiłków, Styliści, Wydawca). Przy małym
+limicie tokenów (`quota`) nowe teksty zostają w oryginale, a etykiety i pamięć działają dalej.
+
+Konfiguracja (.env):
+    DISCORD_CHANNEL_IDS=456:Kitchen:en,789    # trzecie pole - lokalizacja kanału (domyślnie pl)
+
+Użycie z linii komend:
+    python locales.py               # lokalizacje i rozmiar pamięci tłumaczeń
+    python locales.py --clear en    # wyczyszczenie pamięci tłumaczeń lokalizacji
+"""
+
+import os
+import re
+import json
+import argparse
+import urllib.parse
+
+from history import HISTORY_DIR, _load_json_file, _save_json_file
+from cuisines import CUISINE_MAP
+from quantities import format_amount, aggregate_shopping_list, format_shopping_list
+
+# Stałe konfiguracyjne
+TRANSLATIONS_FILE = os.path.join(HISTORY_DIR, "translations.json")
+BASE_LOCALE = "pl"          # Język generowania i redakcji
+BATCH_SIZE = 60             # Tekstów w jednym wywołaniu Tłumacza
+MAX_CACHED = 5000           # Tłumaczeń na lokalizację (najstarsze są usuwane)
+
+# Słowa niewymagające tłumaczenia (jednostki międzynarodowe)
+_UNIVERSAL_WORDS = {"g", "kg", "dag", "mg", "ml", "l", "min", "h", "kcal"}
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+# Etykiety per lokalizacja (pl - jak w redakcji `pipeline.compose_messages`)
+LOCALES = {
+    "pl": {
+        "language": "polski",
+        "meals": {"breakfast": "Śniadanie", "lunch": "Obiad", "dinner": "Kolacja"},
+        "missing": {"breakfast": "Brak śniadania", "lunch": "Brak obiadu", "dinner": "Brak kolacji"},
+        "ingredients": "Składniki", "steps": "Przygotowanie", "calories": "Kalorie", "time": "Czas",
+        "photo": "Zobacz", "shopping": "🛒 Lista zakupów na dziś:", "pieces": "szt.",
+        "poll_many": "Oto {n} propozycje na obiad:", "poll_one": "Propozycja na obiad:",
+        "poll_vote": "Głosujcie, która opcja podoba Wam się najbardziej!",
+    },
+    "en": {
+        "language": "English",
+        "meals": {"breakfast": "Breakfast", "lunch": "Lunch", "dinner": "Dinner"},
+        "missing": {"breakfast": "No breakfast today", "lunch": "No lunch today", "dinner": "No dinner today"},
+        "ingredients": "Ingredients", "steps": "Method", "calories": "Calories", "time": "Time",
+        "photo": "See", "shopping": "🛒 Today's shopping list:", "pieces": "pcs",
+        "poll_many": "Here are {n} lunch ideas:", "poll_one": "Today's lunch idea:",
+        "poll_vote": "Vote for the option you like best!",
+    },
+    "de": {
+        "language": "Deutsch",
+        "meals": {"breakfast": "Frühstück", "lunch": "Mittagessen", "dinner": "Abendessen"},
+        "missing": {"breakfast": "Heute kein Frühstück", "lunch": "Heute kein Mittagessen", "dinner": "Heute kein Abendessen"},
+        "ingredients": "Zutaten", "steps": "Zubereitung", "calories": "Kalorien", "time": "Zeit",
+        "photo": "Ansehen:", "shopping": "🛒 Einkaufsliste für heute:", "pieces": "Stk.",
+        "poll_many": "Hier sind {n} Vorschläge fürs Mittagessen:", "poll_one": "Vorschlag fürs Mittagessen:",
+        "poll_vote": "Stimmt für eure Lieblingsoption ab!",
+    },
+    "es": {
+        "language": "español",
+        "meals": {"breakfast": "Desayuno", "lunch": "Almuerzo", "dinner": "Cena"},
+        "missing": {"breakfast": "Hoy sin desayuno", "lunch": "Hoy sin almuerzo", "dinner": "Hoy sin cena"},
+        "ingredients": "Ingredientes", "steps": "Preparación", "calories": "Calorías", "time": "Tiempo",
+        "photo": "Ver", "shopping": "🛒 Lista de la compra de hoy:", "pieces": "uds.",
+        "poll_many": "Aquí tenéis {n} propuestas para el almuerzo:", "poll_one": "Propuesta para el almuerzo:",
+        "poll_vote": "¡Votad la opción que más os guste!",
+    },
+}
+
+_translator_system = """Jesteś Tłumaczem Kulinarnym. Tłumaczysz teksty z polskiego na język: {language}.
+
+**Zasady:**
+1.  Zwróć JSON: `{{"translations": ["...", "..."]}}` - DOKŁADNIE tyle tekstów, ile otrzymałeś, w tej samej kolejności.
+2.  Tłumacz wiernie i naturalnie, bez skracania i bez dodawania treści.
+3.  Zachowaj emoji, formatowanie Markdown, liczby i jednostki metryczne (g, ml, kg).
+4.  Nazwy potraw regionalnych (np. "pierogi", "bigos") zostaw w oryginale, jeśli nie mają utartego odpowiednika.
+"""
+
+_caches = {}
+
+
+def locale_labels(locale):
+    """Etykiety lokalizacji (nieznana lokalizacja - etykiety bazowe)."""
+    return LOCALES.get(locale) or LOCALES[BASE_LOCALE]
+
+
+def poll_title(locale, count):
+    labels = locale_labels(locale)
+    return labels["poll_many"].format(n=count) if count > 1 else labels["poll_one"]
+
+
+# ==============================================================================
+# PAMIĘĆ TŁUMACZEŃ
+# ==============================================================================
+
+def load_translations(path=TRANSLATIONS_FILE):
+    """Pamięć tłumaczeń {lokalizacja: {tekst źródłowy: tłumaczenie}} (wczytywana raz na proces)."""
+    if path not in _caches:
+        _caches[path] = _load_json_file(path, {})
+    return _caches[path]
+
+
+def save_translations(path=TRANSLATIONS_FILE):
+    cache = load_translations(path)
+    for locale, entries in cache.items():
+        if len(entries) > MAX_CACHED:
+            cache[locale] = dict(list(entries.items())[-MAX_CACHED:])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _save_json_file(path, cache)
+
+
+def needs_translation(text):
+    """Czy tekst zawiera słowa do przetłumaczenia (same liczby i jednostki metryczne - nie)."""
+    return any(word.lower() not in _UNIVERSAL_WORDS for word in _WORD_RE.findall(text or ""))
+
+
+async def _translate_batch(texts, locale):
+    """
+    Jedno wywołanie Tłumacza.
+
+    Returns:
+        dict: Tekst źródłowy -> tłumaczenie (puste, gdy odpowiedź nie pasuje do wejścia).
+    """
+    from llm_json import ask_llm_json, TRANSLATIONS_SCHEMA
+
+    messages = [
+        {"role": "system", "content": _translator_system.format(language=locale_labels(locale)["language"])},
+        {"role": "user", "content": f"TEKSTY ({len(texts)}):\n{json.dumps(texts, ensure_ascii=False, indent=1)}"},
+    ]
+    response = await ask_llm_json(messages, TRANSLATIONS_SCHEMA, label="Tłumacz", max_reasks=0, temperature=0.2)
+    translated = (response or {}).get("translations") or []
+    if len(translated) != len(texts):
+        print(f"  ⚠️ Tłumacz ({locale}): {len(translated)} tłumaczeń zamiast {len(texts)}. Teksty zostają w oryginale.")
+        return {}
+    return {source: target.strip() for source, target in zip(texts, translated) if target and target.strip()}
+
+
+async def translate_texts(texts, locale, path=TRANSLATIONS_FILE):
+    """
+    Tłumaczenia tekstów: z pamięci, brakujące zbiorczo przez Tłumacza (w miarę limitu tokenów).
+
+    Returns:
+        dict: Tekst źródłowy -> tłumaczenie (tekst bez tłumaczenia - oryginał).
+    """
+    texts = [t for t in dict.fromkeys(texts) if t]
+    if locale == BASE_LOCALE or locale not in LOCALES:
+        return {t: t for t in texts}
+
+    from quota import current_budget
+
+    known = load_translations(path).setdefault(locale, {})
+    missing = [t for t in texts if t not in known and needs_translation(t)]
+    budget, calls = current_budget(), 0
+    for start in range(0, len(missing), BATCH_SIZE):
+        if budget and not budget.affords("Tłumacz"):
+            print(f"  🪫 [LIMIT] Tłumacz ({locale}): bez nowych tłumaczeń ({len(missing) - start} tekstów w oryginale)")
+            break
+        known.update(await _translate_batch(missing[start:start + BATCH_SIZE], locale))
+        calls += 1
+    if calls:
+        save_translations(path)
+    print(f"🌐 [LOKALIZACJA] {locale}: {len(texts)} tekstów, {len(missing)} spoza pamięci tłumaczeń, "
+          f"{calls} wywołań Tłumacza")
+    return {t: known.get(t, t) for t in texts}
+
+
+# ==============================================================================
+# SKŁADANIE WERSJI JĘZYKOWEJ
+# ==============================================================================
+
+def _day_meals(day):
+    """Przepisy dnia per posiłek: {posiłek: (przepis, makro)}."""
+    star_dish = day["star_dish"]
+    meal_plan = star_dish.get("meal_plan") or {}
+    return {
+        "breakfast": (meal_plan.get("breakfast") or {}, None),
+        "lunch": (star_dish.get("recipe") or {}, star_dish.get("macros")),
+        "dinner": (meal_plan.get("dinner") or {}, None),
+    }
+
+
+def _recipe_texts(recipe):
+    texts = [recipe.get("dish_name"), recipe.get("description"), recipe.get("prep_time")]
+    for ingredient in recipe.get("ingredients") or []:
+        if isinstance(ingredient, dict):
+            texts += [ingredient.get("item"), format_amount(ingredient.get("amount"), ingredient.get("unit"))]
+    texts += [str(step) for step in recipe.get("steps") or []]
+    return [str(t) for t in texts if t]
+
+
+def _source_intro(day):
+    messages = day.get("messages")
+    if messages:
+        return messages[0]
+    return f"Dziś zabieram Was do {CUISINE_MAP.get(day['cuisine'], day['cuisine'])}!"
+
+
+def day_texts(day):
+    """Wszystkie teksty dnia do tłumaczenia: intro, opcje ankiety i przepisy posiłków."""
+    texts = [_source_intro(day)]
+    for option in day["options"]:
+        recipe = option.get("recipe") or {}
+        texts += [recipe.get("dish_name"), recipe.get("description"), recipe.get("prep_time")]
+    for recipe, _ in _day_meals(day).values():
+        texts += _recipe_texts(recipe)
+    return [str(t) for t in texts if t]
+
+
+def render_recipe(recipe, meal, macros, locale, tr):
+    """Przepis w Markdown z etykietami lokalizacji i tekstami przetłumaczonymi przez `tr`."""
+    labels = locale_labels(locale)
+    if not recipe:
+        return labels["missing"][meal]
+    dish = tr(recipe.get("dish_name") or "")
+    calories = (macros or {}).get("calories") or recipe.get("calories") or "?"
+    ingredients = []
+    for ingredient in recipe.get("ingredients") or []:
+        if not isinstance(ingredient, dict) or not ingredient.get("item"):
+            continue
+        amount = format_amount(ingredient.get("amount"), ingredient.get("unit"))
+        ingredients.append(f"- {tr(str(ingredient['item']))}" + (f" – {tr(amount)}" if amount else ""))
+    steps = [f"{idx + 1}. {tr(str(step))}" for idx, step in enumerate(recipe.get("steps") or [])]
+
+    parts = [f"**{labels['meals'][meal].upper()}: {dish}**"]
+    if recipe.get("description"):
+        parts.append(tr(str(recipe["description"])))
+    parts += [
+        f"🔥 {labels['calories']}: {calories} | ⏱️ {labels['time']}: {tr(str(recipe.get('prep_time') or '?'))}",
+        f"**{labels['ingredients']}:**\n" + "\n".join(ingredients),
+        f"**{labels['steps']}:**\n" + "\n".join(steps),
+    ]
+    text = "\n\n".join(parts)
+    if dish:
+        link = f"https://www.google.com/search?q={urllib.parse.quote(dish)}&tbm=isch"
+        text += f"\n\n📷 [{labels['photo']} {dish}]({link})"
+    return text
+
+
+async def localize_day(day, locale, path=TRANSLATIONS_FILE):
+    """
+    Wersja dnia w lokalizacji `locale` ze wspólnych przepisów (bez ponownego generowania i redakcji).
+
+    Args:
+        day (dict): Dzień jak w `pipeline.prepare_day` (`messages` opcjonalnie - źródło intro).
+
+    Returns:
+        dict: {"messages": 4 wiadomości, "options": opcje z przetłumaczonymi tekstami do ankiety,
+        "shopping": lista zakupów w Markdown (bez nagłówka)}.
+    """
+    translations = await translate_texts(day_texts(day), locale, path)
+    tr = lambda text: translations.get(text, text)
+
+    meals = _day_meals(day)
+    messages = [tr(_source_intro(day))] + [render_recipe(recipe, meal, macros, locale, tr)
+                                           for meal, (recipe, macros) in meals.items()]
+
+    options = []
+    for option in day["options"]:
+        recipe = dict(option.get("recipe") or {})
+        for key in ("dish_name", "description", "prep_time"):
+            if recipe.get(key):
+                recipe[key] = tr(str(recipe[key]))
+        options.append(dict(option, recipe=recipe))
+
+    items = [dict(entry, name=tr(entry["name"])) for entry in aggregate_shopping_list([r for r, _ in meals.values()])]
+    shopping = format_shopping_list(sorted(items, key=lambda e: e["name"]), count_unit=locale_labels(locale)["pieces"])
+    return {"messages": messages, "options": options, "shopping": shopping}
+
+
+async def localize_days(day, locales, path=TRANSLATIONS_FILE):
+    """Wersje dnia dla wszystkich lokalizacji innych niż bazowa: {lokalizacja: wynik `localize_day`}."""
+    localized = {}
+    for locale in dict.fromkeys(locales):
+        if locale != BASE_LOCALE and locale in LOCALES:
+            localized[locale] = await localize_day(day, locale, path)
+    return localized
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokalizacje i pamięć tłumaczeń.")
+    parser.add_argument("--clear", metavar="LOKALIZACJA", help="Wyczyść pamięć tłumaczeń lokalizacji.")
+    args = parser.parse_args()
+
+    cache = load_translations()
+    if args.clear:
+        removed = len(cache.pop(args.clear, {}))
+        save_translations()
+        print(f"🧹 Usunięto {removed} tłumaczeń ({args.clear}).")
+    for code, labels in LOCALES.items():
+        status = "bazowa" if code == BASE_LOCALE else f"{len(cache.get(code, {}))} tłumaczeń w pamięci"
+        print(f"  {code} ({labels['language']}): {status}")
@@ -6,6 +6,15 @@ Ten plik odpowiada za:
 2. Inicjalizację bota Discord.
 3. Uruchomienie pętli zdarzeń (event loop).
 
+Tryby:
+- `python main.py`           - jednorazowy przebieg (cron w GitHub Actions), po nim bot się rozłącza.
+- `python main.py --daemon`  - tryb ciągły: harmonogram dzienny w procesie (DAILY_RUN_TIME, UTC)
+                               i komendy na kanale ("!kucharz pomoc").
+- `python main.py --plan-week 7` - przygotowanie 7 dni do kolejki planów (memory/plan_queue.json);
+                               kolejne przebiegi dzienne tylko publikują dzień z kolejki.
+- `python main.py --profile`  - przebieg jednorazowy z raportem profilowania (profiles/):
+                               fazy (cProfile, tracemalloc), agenci (czas ścienny/CPU), przestoje pętli.
+
 Przepływ wykonania:
 - Weryfikacja zmiennych środowiskowych (.env)
 - Konfiguracja uprawnień bota (Intents)
@@ -16,6 +25,7 @@ Przepływ wykonania:
 import discord
 import sys
 import asyncio
+import argparse
 from core import DISCORD_TOKEN, CHANNEL_ID
 from discord_bot import RecipeCookerClient
 
@@ -24,6 +34,15 @@ from discord_bot import RecipeCookerClient
 # ==============================================================================
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RecipeCookerAI - bot kulinarny na Discordzie")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Tryb ciągły: harmonogram w procesie i komendy zamiast jednorazowego przebiegu")
+    parser.add_argument("--plan-week", type=int, default=0, metavar="DNI",
+                        help="Przygotuj DNI dni do kolejki planów (jedna analiza i wspólny research)")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="RAPORT",
+                        help="Raport profilowania przebiegu jednorazowego (domyślnie profiles/profile-<czas>.txt)")
+    args = parser.parse_args()
+
     # Banner powitalny
     print("===========================================")
     print("🤖 Bot przepisowy - Startuję!")
@@ -48,7 +67,12 @@ if __name__ == "__main__":
     # --- INICJALIZACJA KLIENTA ---
     # RecipeCookerClient to nasza klasa dziedzicząca z discord.Client
     # zawiera całą logikę biznesową bota
-    client = RecipeCookerClient(intents=intents)
+    client = RecipeCookerClient(intents=intents, daemon=args.daemon, week_days=args.plan_week,
+                                profile=args.profile)
+    if args.daemon:
+        print("♾️ Tryb ciągły (daemon): harmonogram dzienny i komendy '!kucharz'")
+    elif args.plan_week:
+        print(f"🗓️ Tryb tygodniowy: przygotowuję {args.plan_week} dni do kolejki planów")
     
     # --- URUCHOMIENIE BOTA ---
     try:
@@ -0,0 +1,148 @@
+"""
+Moduł Dopasowań (Fuzzy Matching).
+
+Zawiera lekkie, lokalne (bez LLM) narzędzia do porównywania nazw dań:
+- Normalizację nazw (małe litery, bez diakrytyków i interpunkcji).
+- N-gramy znakowe i współczynnik podobieństwa Dice'a.
+- Filtr nowości pomysłów (odrzuca powtórki przed warsztatem kulinarnym).
+- Dopasowanie rdzeni słów kluczowych do odmienionych słów (katalog składników, cennik, preferencje).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+NGRAM_SIZE = 3
+DUPLICATE_THRESHOLD = 0.75     # Od tej wartości pomysł jest uznawany za powtórkę
+SIMILAR_THRESHOLD = 0.6        # Od tej wartości pomysł jest podobny do starszego dania (koniec kolejki)
+
+# Słowa pomijane przy porównaniu słów kluczowych nazwy
+_STOPWORDS = {"z", "ze", "i", "w", "na", "po", "do", "a", "la", "al", "with", "and", "the"}
+
+# Krótkie rdzenie ("por", "ser", "jaj") jako zwykły prefiks pochłaniają niezwiązane słowa
+# ("porzeczki", "porcja", "sernik") - dopuszczamy po nich tylko końcówkę fleksyjną.
+SHORT_STEM_LENGTH = 3
+INFLECTION_ENDINGS = frozenset({
+    "", "a", "e", "i", "y", "u", "o", "em", "ie", "ow", "om", "ami", "ach", "mi",
+    "ek", "ka", "ki", "ko", "ku", "ny", "na", "ne", "nej", "nym", "nych", "owy", "owa", "owe", "owej",
+})
+
+
+def normalize_dish_name(name):
+    """
+    Normalizuje nazwę dania do klucza porównań:
+    małe litery, bez polskich znaków diakrytycznych, bez interpunkcji i nawiasów.
+    """
+    text = str(name or "").lower().replace("ł", "l")
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r'\(.*?\)', ' ', text)
+    return " ".join(re.findall(r'[a-z0-9]+', text))
+
+
+def stem_matches(stem, word):
+    """
+    Czy znormalizowane słowo jest odmianą rdzenia ("pory" -> "por", "ziemniaków" -> "ziemniak").
+    Dłuższe rdzenie pasują jako prefiks, rdzenie do SHORT_STEM_LENGTH liter - tylko z końcówką fleksyjną.
+    """
+    if not word.startswith(stem):
+        return False
+    return len(stem) > SHORT_STEM_LENGTH or word[len(stem):] in INFLECTION_ENDINGS
+
+
+@lru_cache(maxsize=4096)
+def char_ngrams(name, n=NGRAM_SIZE):
+    """Zwraca zbiór n-gramów znakowych znormalizowanej nazwy (z dopełnieniem spacjami)."""
+    text = f" {normalize_dish_name(name)} "
+    if len(text) <= n:
+        return frozenset([text])
+    return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def similarity(a, b):
+    """Współczynnik Dice'a na n-gramach znakowych (0.0 - różne, 1.0 - identyczne po normalizacji)."""
+    grams_a, grams_b = char_ngrams(a), char_ngrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def _content_words(name):
+    """Słowa znaczące nazwy (bez spójników i przyimków), z obciętą końcówką fleksyjną."""
+    return {w[:-1] if len(w) > 4 else w for w in normalize_dish_name(name).split() if w not in _STOPWORDS}
+
+
+def name_similarity(a, b):
+    """
+    Podobieństwo nazw dań łączące n-gramy znakowe i słowa kluczowe.
+    Słowa liczone są jako zawieranie krótszej nazwy w dłuższej, więc
+    "Ceviche Nikkei" i "Ceviche nikkei z łososiem" są uznawane za to samo danie.
+    """
+    words_a, words_b = _content_words(a), _content_words(b)
+    containment = len(words_a & words_b) / min(len(words_a), len(words_b)) if words_a and words_b else 0.0
+    return 0.5 * similarity(a, b) + 0.5 * containment
+
+
+def idea_name(idea):
+    """Wyodrębnia nazwę pomysłu (obsługa różnych formatów JSON od modelu)."""
+    if isinstance(idea, dict):
+        for key in ['nazwa', 'idea', 'name', 'dish_name']:
+            if key in idea:
+                return str(idea[key] or "")
+        return ""
+    return idea if isinstance(idea, str) else ""
+
+
+def filter_novel_ideas(ideas, recent_names, archive_names=()):
+    """
+    Lokalny filtr nowości uruchamiany przed warsztatem kulinarnym.
+
+    - Pomysły bardzo podobne do ostatnich dań (trendy, niedawne przepisy z archiwum)
+      lub do wcześniejszych pomysłów z tej samej listy są odrzucane.
+    - Pomysły podobne do starszych dań z archiwum są przesuwane na koniec kolejki
+      (warsztat może je wtedy tanio odtworzyć z archiwum, ale pierwszeństwo mają nowe dania).
+
+    Args:
+        ideas (list): Pomysły od analityka trendów (słowniki lub stringi).
+        recent_names (list): Nazwy dań z okna nowości (np. z `last_trends`).
+        archive_names (list): Nazwy starszych dań z archiwum przepisów.
+
+    Returns:
+        tuple: (lista_zachowanych_pomysłów, lista_odrzuconych_par (pomysł, podobne_danie)).
+    """
+    recent = [n for n in recent_names if n]
+    archive = [n for n in archive_names if n]
+    fresh, similar, dropped, accepted = [], [], [], []
+
+    for idea in ideas:
+        name = idea_name(idea)
+        if not name:
+            continue
+        match, score = max(
+            ((candidate, name_similarity(name, candidate)) for candidate in recent + accepted),
+            key=lambda pair: pair[1], default=(None, 0.0)
+        )
+        if score >= DUPLICATE_THRESHOLD:
+            dropped.append((idea, match))
+            continue
+        accepted.append(name)
+        if any(name_similarity(name, old) >= SIMILAR_THRESHOLD for old in archive):
+            similar.append(idea)
+        else:
+            fresh.append(idea)
+    return fresh + similar, dropped
+
+
+def best_match(name, candidates):
+    """
+    Znajduje najbardziej podobną nazwę spośród kandydatów.
+
+    Returns:
+        tuple: (najlepszy_kandydat, podobieństwo) lub (None, 0.0) dla pustej listy.
+    """
+    best, best_score = None, 0.0
+    for candidate in candidates:
+        score = similarity(name, candidate)
+        if score > best_score:
+            best, best_score = candidate, score
+    return best, best_score
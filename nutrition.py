@@ -0,0 +1,145 @@
+"""
+Moduł Lokalnego Silnika Żywieniowego.
+
+Zawiera:
+- Wektorowy kalkulator makroskładników (NumPy) dla całego przepisu z listy `ingredients` Szefa Kuchni.
+- Lokalną kontrolę reguły kalorycznej obiadu (400-900 kcal na porcję) i zbilansowania dania.
+- Decyzję, czy audyt LLM (Dietetyk) jest w ogóle potrzebny.
+
+Audyt LLM jest uruchamiany tylko, gdy brief wymaga oceny jakościowej (np. danie wegetariańskie),
+gdy części składników nie udało się rozpoznać lokalnie lub gdy przepis nie podaje liczby porcji
+(kalorii na porcję nie da się wtedy lokalnie rozstrzygnąć).
+"""
+
+import numpy as np
+
+from ingredient_catalog import INGREDIENTS, INGREDIENT_IDS, NUTRIENT_COLUMNS
+from quantities import parse_ingredients
+
+# ==============================================================================
+# KONFIGURACJA
+# ==============================================================================
+
+DEFAULT_SERVINGS = 2           # Gdy Szef Kuchni nie poda liczby porcji - tylko do szacunku, nie do odrzucenia
+MIN_LUNCH_KCAL = 400
+MAX_LUNCH_KCAL = 900
+KCAL_TOLERANCE = 0.15          # "Lekkie wyjście poza ramy" nie jest powodem odrzucenia
+MIN_COVERAGE = 0.8             # Minimalny udział rozpoznanych składników, by ufać wynikowi lokalnemu
+
+# Słowa w briefie wymagające jakościowej oceny Dietetyka (LLM)
+DIET_KEYWORDS = ("wege", "wegetaria", "wegań", "wegan", "bez mięsa", "bezmięs", "bezglut", "keto", "vegan")
+
+# Macierz wartości odżywczych (składnik x [kcal, białko, tłuszcz, węglowodany]) na 1 g
+NUTRIENT_MATRIX = np.array([INGREDIENTS[i][1:5] for i in INGREDIENT_IDS], dtype=np.float64) / 100.0
+_ROW = {ingredient_id: idx for idx, ingredient_id in enumerate(INGREDIENT_IDS)}
+
+
+def _servings(recipe):
+    """Liczba porcji z przepisu (pole `servings`) lub None, gdy jej brak albo jest nieczytelna."""
+    try:
+        servings = int(float(str(recipe.get("servings")).split()[0].replace(",", ".")))
+    except (ValueError, IndexError):
+        return None
+    return servings if servings >= 1 else None
+
+
+def calculate_macros(recipe):
+    """
+    Oblicza makroskładniki przepisu na porcję.
+
+    Returns:
+        dict: {"calories", "protein", "fat", "carbs"} na porcję (zaokrąglone),
+              "servings", "servings_known" (False - szacunek dla DEFAULT_SERVINGS porcji),
+              "coverage" (udział rozpoznanych składników) i "unresolved" (nazwy).
+    """
+    ingredients = parse_ingredients(recipe)
+    rows, grams, unresolved = [], [], []
+    for record in ingredients:
+        if record.ingredient_id is None or record.grams is None:
+            unresolved.append(record.item)
+            continue
+        rows.append(_ROW[record.ingredient_id])
+        grams.append(record.grams)
+
+    known = _servings(recipe)
+    servings = known or DEFAULT_SERVINGS
+    totals = np.asarray(grams, dtype=np.float64) @ NUTRIENT_MATRIX[rows] if rows else np.zeros(len(NUTRIENT_COLUMNS))
+    per_serving = totals / servings
+
+    result = {"calories": int(round(per_serving[0]))}
+    result.update({column: round(float(value), 1) for column, value in zip(NUTRIENT_COLUMNS[1:], per_serving[1:])})
+    result["servings"] = servings
+    result["servings_known"] = known is not None
+    result["coverage"] = round(1 - len(unresolved) / len(ingredients), 2) if ingredients else 0.0
+    result["unresolved"] = unresolved
+    return result
+
+
+def check_calorie_rule(macros, low=MIN_LUNCH_KCAL, high=MAX_LUNCH_KCAL):
+    """
+    Sprawdza regułę kaloryczną obiadu (z tolerancją).
+
+    Returns:
+        tuple: (czy_zgodne, feedback dla Szefa Kuchni lub "").
+    """
+    kcal = macros.get("calories", 0)
+    if kcal < low * (1 - KCAL_TOLERANCE):
+        return False, f"Za mało kalorii ({kcal} kcal/porcję, wymagane {low}-{high}). Zwiększ porcje lub dodaj sycący składnik."
+    if kcal > high * (1 + KCAL_TOLERANCE):
+        return False, f"Za dużo kalorii ({kcal} kcal/porcję, wymagane {low}-{high}). Zmniejsz ilość tłuszczu lub porcje."
+    return True, ""
+
+
+def check_balance(macros):
+    """
+    Prosta kontrola zbilansowania: udział energii z tłuszczu, węglowodanów i białka.
+
+    Returns:
+        tuple: (czy_zbilansowane, feedback lub "").
+    """
+    energy = 4 * macros.get("protein", 0) + 9 * macros.get("fat", 0) + 4 * macros.get("carbs", 0)
+    if energy <= 0:
+        return True, ""
+    fat_share = 9 * macros["fat"] / energy
+    carbs_share = 4 * macros["carbs"] / energy
+    protein_share = 4 * macros["protein"] / energy
+    if fat_share > 0.65:
+        return False, f"Danie skrajnie tłuste ({fat_share:.0%} energii z tłuszczu). Ogranicz olej/masło."
+    if carbs_share > 0.85:
+        return False, f"Danie to prawie same węglowodany ({carbs_share:.0%}). Dodaj źródło białka lub warzywa."
+    if protein_share < 0.05:
+        return False, "Danie prawie bez białka. Dodaj jajko, strączki, nabiał lub mięso."
+    return True, ""
+
+
+def needs_llm_audit(macros, guidelines):
+    """Czy potrzebny jest audyt LLM (ocena jakościowa diety, nierozpoznane składniki lub nieznane porcje)."""
+    brief = str(guidelines or "").lower()
+    return (macros.get("coverage", 0) < MIN_COVERAGE or not macros.get("servings_known", True)
+            or any(word in brief for word in DIET_KEYWORDS))
+
+
+def local_nutrition_review(recipe, guidelines=None):
+    """
+    Pełna lokalna ocena przepisu (odpowiednik odpowiedzi Dietetyka).
+
+    Returns:
+        dict: {"approved": bool | None, "feedback": str, "macros": dict, "needs_llm": bool}.
+              approved=None oznacza, że lokalnie nie da się rozstrzygnąć (za mało rozpoznanych
+              składników lub reguła kaloryczna przy nieznanej liczbie porcji) - decyduje Dietetyk LLM.
+    """
+    macros = calculate_macros(recipe)
+    needs_llm = needs_llm_audit(macros, guidelines)
+    if macros["coverage"] < MIN_COVERAGE:
+        return {"approved": None, "feedback": "", "macros": macros, "needs_llm": True}
+
+    undecided = False
+    for check in (check_calorie_rule, check_balance):
+        ok, feedback = check(macros)
+        if not ok and check is check_calorie_rule and not macros["servings_known"]:
+            undecided = True   # Kalorie na porcję to tylko szacunek - rozstrzyga Dietetyk LLM
+        elif not ok:
+            return {"approved": False, "feedback": feedback, "macros": macros, "needs_llm": False}
+    if undecided:
+        return {"approved": None, "feedback": "", "macros": macros, "needs_llm": True}
+    return {"approved": True, "feedback": "", "macros": macros, "needs_llm": needs_llm}
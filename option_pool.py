@@ -0,0 +1,230 @@
+"""
+Moduł Puli Opcji (Przygotowanie w Tle).
+
+Zweryfikowane opcje (przepis + makro po pełnym audycie warsztatu) przygotowywane poza
+godzinami dziennego przebiegu, gdy klucze Groq są bezczynne:
+- Cele per kuchnia: pełny dzień (3 opcje) dla kuchni, które mogą zostać wylosowane
+  najbliższym razem (bez ostatnio użytych), w kolejności wag z modelu preferencji.
+- Wygasanie: opcje starsze niż OPTION_TTL_DAYS są usuwane (trendy i sezon się zmieniają).
+- Usuwanie: limit na kuchnię i na całą pulę (najstarsze pierwsze) oraz opcje, które
+  przestały być nowe (danie podano w międzyczasie).
+- Tylko wolny limit: przed każdym researchem i warsztatem sprawdzany jest limit kluczy
+  pomniejszony o prognozę dzisiejszego dziennego przebiegu (`quota.spare_quota`) -
+  napełnianie nie może odebrać tokenów przebiegowi, dla którego pula istnieje.
+
+Dzienny przebieg pobiera opcje dla wybranej kuchni (`take_options`) i uruchamia warsztat
+na żywo tylko dla brakujących.
+
+Użycie z linii komend:
+    python option_pool.py                              # stan puli
+    python option_pool.py --fill --max-workshops 6     # napełnianie (np. z crona poza godzinami szczytu)
+"""
+
+import os
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from history import HISTORY_DIR, _load_json_file, _save_json_file
+from cuisines import CUISINES
+from matching import idea_name
+
+# Stałe konfiguracyjne
+POOL_FILE = os.path.join(HISTORY_DIR, "option_pool.json")
+POOL_TARGET = int(os.environ.get("POOL_TARGET", 3))   # Opcji na kuchnię (pełna ankieta dnia)
+MAX_PER_CUISINE = 6
+MAX_POOL_SIZE = 120
+OPTION_TTL_DAYS = 14
+WORKSHOPS_PER_KEY = 3       # Budżet jednego napełniania na każdy klucz API Groq
+POOL_BRIEF = "Sezonowo, smacznie i przystępnie - propozycja na dowolny dzień."
+
+
+# ==============================================================================
+# MAGAZYN PULI
+# ==============================================================================
+
+def _is_fresh(entry, now=None):
+    now = now or datetime.now()
+    try:
+        return now - datetime.strptime(entry.get("created", ""), "%Y-%m-%d %H:%M") <= timedelta(days=OPTION_TTL_DAYS)
+    except ValueError:
+        return False
+
+
+def load_pool(path=POOL_FILE):
+    """Wczytuje pulę (kuchnia -> lista opcji) bez opcji przeterminowanych."""
+    pool = _load_json_file(path, {})
+    return {cuisine: [e for e in entries if _is_fresh(e)] for cuisine, entries in pool.items()}
+
+
+def save_pool(pool, path=POOL_FILE):
+    """Zapisuje pulę, egzekwując limity (najstarsze opcje są usuwane pierwsze)."""
+    for cuisine in list(pool):
+        pool[cuisine] = sorted(pool[cuisine], key=lambda e: e["created"])[-MAX_PER_CUISINE:]
+        if not pool[cuisine]:
+            del pool[cuisine]
+    entries = sorted(((e["created"], c) for c, es in pool.items() for e in es))
+    for _, cuisine in entries[:max(0, len(entries) - MAX_POOL_SIZE)]:
+        pool[cuisine].pop(0)   # Listy są posortowane od najstarszej opcji
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _save_json_file(path, {c: es for c, es in pool.items() if es})
+
+
+def add_option(cuisine, idea, recipe, macros, path=POOL_FILE):
+    """Dodaje zweryfikowaną opcję do puli (odczyt-zapis w jednym kroku, bez oczekiwania)."""
+    pool = load_pool(path)
+    pool.setdefault(cuisine, []).append({
+        "idea": idea, "recipe": recipe, "macros": macros,
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M"),
+    })
+    save_pool(pool, path)
+
+
+def take_options(cuisine, count=3, keep=None, path=POOL_FILE):
+    """
+    Pobiera (i usuwa z puli) do `count` opcji dla kuchni.
+
+    Args:
+        keep (callable): Filtr listy pomysłów (np. ranking i filtr nowości z pipeline'u);
+            opcje odrzucone przez filtr są usuwane z puli.
+
+    Returns:
+        list[dict]: Opcje {"idea", "recipe", "macros"} w kolejności filtra.
+    """
+    pool = load_pool(path)
+    entries = pool.get(cuisine, [])
+    if not entries:
+        return []
+    by_name = {idea_name(e["idea"]): e for e in entries}
+    ideas = [e["idea"] for e in entries]
+    kept = [by_name[idea_name(i)] for i in (keep(ideas) if keep else ideas) if idea_name(i) in by_name]
+    evicted = len(entries) - len(kept)
+    taken, pool[cuisine] = kept[:count], kept[count:]
+    print(f"🧺 [PULA] {cuisine}: pobrano {len(taken)} opcji"
+          + (f", usunięto {evicted} nieaktualnych" if evicted else "") + f" (zostało {len(pool[cuisine])})")
+    save_pool(pool, path)
+    return taken
+
+
+def pool_targets(history):
+    """
+    Cele puli per kuchnia: POOL_TARGET dla kuchni, które mogą zostać wylosowane najbliższym razem,
+    0 dla ostatnio użytych. Kolejność: od najwyżej ocenianych w modelu preferencji.
+
+    Returns:
+        list[tuple]: (kuchnia, cel) w kolejności napełniania.
+    """
+    from preferences import cuisine_weights
+
+    recent = set(history.get("last_cuisines", []))
+    weights = cuisine_weights(history.get("preference_model", {}), CUISINES)
+    ranked = sorted(zip(CUISINES, weights), key=lambda pair: -pair[1])
+    return [(cuisine, 0 if cuisine in recent else POOL_TARGET) for cuisine, _ in ranked]
+
+
+def pool_status(path=POOL_FILE):
+    """Liczba opcji w puli: (razem, liczba kuchni)."""
+    pool = load_pool(path)
+    return sum(len(es) for es in pool.values()), len(pool)
+
+
+# ==============================================================================
+# PRODUCENT (NAPEŁNIANIE W TLE)
+# ==============================================================================
+
+def daily_run_pending(now=None):
+    """Czy dzienny przebieg odbędzie się jeszcze w bieżącym dniu limitu (doba UTC)."""
+    from daemon import next_run_at
+
+    now = now or datetime.now(timezone.utc)
+    return next_run_at(now).date() == now.date()
+
+
+def affords_workshop(api_keys, now=None):
+    """Czy wolny limit (po rezerwacji dziennego przebiegu) wystarcza na research i warsztat w tle."""
+    import quota
+
+    if not api_keys:
+        return True   # Bez kluczy (testy, tryb offline) limit nie obowiązuje
+    usage = quota.load_usage()
+    cost, calls = quota.background_workshop_cost(usage)
+    tokens, requests = quota.spare_quota(api_keys, daily_run_pending(now), usage)
+    if cost <= tokens and calls <= requests:
+        return True
+    print(f"🪫 [PULA] Wolny limit {max(0, tokens):.0f} tokenów < prognoza warsztatu {cost:.0f} "
+          "(rezerwa na dzienny przebieg) - kończę napełnianie")
+    return False
+
+
+async def fill_pool(history, max_workshops=None, should_continue=None, path=POOL_FILE):
+    """
+    Uzupełnia pulę do celów: research i warsztat dla kuchni z największym priorytetem.
+
+    Args:
+        max_workshops (int): Budżet warsztatów (domyślnie WORKSHOPS_PER_KEY na klucz Groq).
+        should_continue (callable): Sprawdzane przed każdym warsztatem (np. "dzienny przebieg nie trwa").
+            Niezależnie od niego każdy warsztat musi zmieścić się w wolnym limicie (`affords_workshop`).
+
+    Returns:
+        int: Liczba dodanych opcji.
+    """
+    from core import GROQ_API_KEYS, culinary_workshop
+    from pipeline import research_trends, novel_ideas
+
+    max_workshops = max_workshops or WORKSHOPS_PER_KEY * max(1, len(GROQ_API_KEYS))
+    workshops, added, affordable = 0, 0, True
+    for cuisine, target in pool_targets(history):
+        pooled = load_pool(path).get(cuisine, [])
+        need = target - len(pooled)
+        if need <= 0:
+            continue
+        if workshops >= max_workshops or (should_continue and not should_continue()):
+            break
+        affordable = affordable and affords_workshop(GROQ_API_KEYS)
+        if not affordable:
+            break
+
+        print(f"\n🧺 [PULA] {cuisine}: {len(pooled)}/{target} - uzupełniam")
+        pooled_names = [idea_name(e["idea"]) for e in pooled] + [e["recipe"].get("dish_name", "") for e in pooled]
+        ideas = (await research_trends(cuisine, POOL_BRIEF, history)).get("ideas", [])
+        ideas = novel_ideas(ideas, history, taken=pooled_names)
+
+        for idea in ideas:
+            if need <= 0 or workshops >= max_workshops or (should_continue and not should_continue()):
+                break
+            name = idea_name(idea)
+            if not name:
+                continue
+            affordable = affords_workshop(GROQ_API_KEYS)
+            if not affordable:
+                break
+            workshops += 1
+            taken = [e["recipe"].get("dish_name", "") for e in load_pool(path).get(cuisine, [])]
+            recipe, macros = await culinary_workshop(name, cuisine, POOL_BRIEF, history.get("user_insights", []),
+                                                     exclude=taken)
+            if recipe and macros:
+                add_option(cuisine, idea if isinstance(idea, dict) else {"nazwa": name}, recipe, macros, path)
+                added += 1
+                need -= 1
+
+    total, cuisines = pool_status(path)
+    print(f"🧺 [PULA] Dodano {added} opcji ({workshops} warsztatów). W puli: {total} opcji, {cuisines} kuchni.")
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pula zweryfikowanych opcji per kuchnia.")
+    parser.add_argument("--fill", action="store_true", help="Uzupełnij pulę do celów.")
+    parser.add_argument("--max-workshops", type=int, default=None, help="Budżet warsztatów na to napełnianie.")
+    args = parser.parse_args()
+
+    if args.fill:
+        from history import load_history
+        from recipe_store import ensure_recipe_store
+
+        ensure_recipe_store()
+        asyncio.run(fill_pool(load_history(), args.max_workshops))
+    for cuisine, entries in sorted(load_pool().items()):
+        print(f"  {cuisine}: {', '.join(e['recipe'].get('dish_name', '?') for e in entries)}")
+    total, cuisines = pool_status()
+    print(f"🧺 W puli: {total} opcji, {cuisines} kuchni.")
@@ -0,0 +1,825 @@
+"""
+Moduł Pipeline'u Dziennego Planu (bez Discorda).
+
+Zawiera cały dzienny przebieg bota jako zwykłe API:
+- `generate_daily_plan(channel, ...)` - analiza, research, warsztat, planowanie, stylizacja
+  i prezentacja na dowolnym kanale (Discord albo kanał zastępczy z `sinks`).
+- `generate_plans(count, ...)` - N planów równolegle (benchmarki, wsadowe generowanie).
+- Etapy wielokrotnego użytku (warsztat, plany posiłków, redakcja, publikacja dnia) - także
+  dla trybu tygodniowego (`weekly.py`), którego dni z kolejki planów są tu tylko publikowane.
+- Prezentację wyników (`present_culinary_journey`) i decyzje oparte o historię
+  (wybór kuchni, analiza ankiety, aktualizacja historii).
+
+Klient Discorda (`discord_bot.RecipeCookerClient`) jest cienką nakładką na ten moduł.
+
+Użycie z linii komend:
+    python pipeline.py                                   # jeden plan na stdout, bez zapisu
+    python pipeline.py --sink file --out plans --count 3 # 3 plany równolegle do plików
+    python pipeline.py --chat czat.txt                   # wejście czatu ("autor: treść" na linię)
+    python pipeline.py --persist                         # zapis historii i planu jak bot
+    python pipeline.py --profile                         # raport profilowania (profiles/)
+    python pipeline.py --locales en,de                   # dodatkowe wersje językowe z tego samego przebiegu
+"""
+
+import os
+import copy
+import time
+import random
+import asyncio
+import argparse
+import urllib.parse
+from datetime import datetime
+
+from core import google_search_snippets, is_google_search_configured, culinary_workshop, GROQ_API_KEYS
+from history import RECENT_REGION_COUNT, load_history, save_history, save_daily_plan
+from tenants import default_tenant
+from cuisines import CUISINE_MAP, CUISINE_REGIONS, CUISINES
+
+from agents.analysis import (
+    agent_deep_analyst,
+    agent_search_strategist,
+    agent_trend_analyst_multi_source
+)
+
+from agents.planning import agent_meal_planner
+
+from agents.presentation import (
+    agent_smart_stylist,
+    agent_publisher,
+    publisher_fallback
+)
+
+from preferences import update_preference_model, cuisine_weights, rank_ideas
+from recipe_store import ensure_recipe_store, save_day, served_dish_names, novelty_cutoff
+from matching import filter_novel_ideas, idea_name
+from retrieval import select_snippets
+from quantities import format_amount, aggregate_shopping_list, format_shopping_list
+from discord_sender import DiscordSender, SENT_LOG_FILE
+from plan_queue import pop_day
+from option_pool import take_options
+from chat_log import load_chat_log, ingest_chat, format_for_analyst, mark_analyzed
+from sinks import MemoryChannel, StdoutChannel, FileChannel, load_chat_lines
+from profiling import phase, session
+from quota import admission, current_budget
+from locales import BASE_LOCALE, locale_labels, poll_title, localize_day, localize_days
+
+# Komunikaty wysyłane na kanał, gdy planu nie da się przygotować
+NO_IDEAS_MESSAGE = "Dziś wena mnie opuściła, moi drodzy. Spróbujmy jutro!"
+NO_OPTIONS_MESSAGE = "Żaden z pomysłów nie sprostał dziś moim wyśrubowanym standardom. Widzimy się jutro!"
+QUOTA_MESSAGE = "Moja kuchnia na dziś wyczerpała zapasy (limit API). Wracam jutro z nowymi pomysłami!"
+
+
+# ==============================================================================
+# LOGIKA PREZENTACJI (WYSYŁANIE WIADOMOŚCI)
+# ==============================================================================
+
+def format_recipe_raw(recipe: dict, title: str, macros: dict = None) -> str:
+    """Tworzy surowy ciąg znaków z przepisem (przed stylizacją)."""
+    if not recipe or not isinstance(recipe, dict): return ""
+    
+    calories = macros.get('calories') if macros else recipe.get('calories')
+    # Obsługa brakujących nazw składników i podwójnych jednostek
+    ing_list = []
+    for i in recipe.get('ingredients', []):
+        name = i.get('item', 'Składnik')
+        if not name: name = "Składnik"
+        
+        # Eliminacja duplikatów (np. amount="200g", unit="g")
+        display_amount = format_amount(i.get('amount'), i.get('unit'))
+              
+        ing_list.append(f"- {name} – {display_amount}")
+
+    ingredients = "\n".join(ing_list)
+    steps = "\n".join([f"{idx+1}. {s}" for idx, s in enumerate(recipe.get('steps', []))])
+    
+    return (
+        f"{title}: {recipe.get('dish_name','Danie')}\n"
+        f"{recipe.get('description','Smaczne danie.')}\n"
+        f"Kalorie: {calories or '?'}, Czas: {recipe.get('prep_time','?')}\n\n"
+        f"Składniki:\n{ingredients}\n\n"
+        f"Przygotowanie:\n{steps}"
+    )
+
+async def compose_messages(cuisine, star_dish, meal_plan):
+    """
+    Redakcja dnia: stylizacja intro i trzech przepisów (Smart Stylist) oraz skład numeru (Publisher).
+    Nie wysyła niczego - wynik można opublikować od razu albo odłożyć do kolejki planów.
+
+    Returns:
+        list[str]: Dokładnie 4 wiadomości (intro, śniadanie, obiad, kolacja).
+    """
+    destination = CUISINE_MAP.get(cuisine, cuisine)
+    meal_plan = meal_plan or {}
+
+    # Mały limit tokenów (`quota`): prezentacja lokalna - surowe teksty i fallback Wydawcy
+    budget = current_budget()
+    local = bool(budget) and not budget.affords_presentation()
+
+    async def stylize(text, mode):
+        return text if local else await agent_smart_stylist(text, mode=mode)
+
+    # A. Wprowadzenie (Raw -> Stylist)
+    # Uproszczone intro - bez surowych danych, tylko esencja
+    raw_intro = f"Dziś zabieram Was do {destination}!"
+    
+    # Dodaj ciekawostkę zamiast briefu (brief będzie wykorzystany przez LLM automatycznie)
+    # anecdote_context informuje Stylist żeby dodał ciekawostkę o regionie
+    anecdote_context = f"Wpleć ciekawostkę o {destination} (kultura, historia, tradycja kulinarna)."
+    # (bez Stylisty kontekst ciekawostki nie trafia do tekstu)
+    intro_task = asyncio.create_task(stylize(raw_intro if local else f"{raw_intro} ({anecdote_context})", "intro"))
+    
+    # --- Krok 2: Generowanie Treści (Smart Stylist) ---
+    print("🎨 [REDACJA] Uruchamiam Inteligentnego Stylistę...")
+      # C. Przepisy (Raw -> Stylists)
+    # Tu przygotowujemy listę krotek (raw_text, dish_name) aby potem móc dodać link
+    recipe_data_list = []
+    
+    def prepare_recipe_data(r_data, title, macros):
+         r = r_data.get('recipe') if 'recipe' in r_data else r_data # Handle varying structure
+         if not r: r = {}
+         raw = format_recipe_raw(r, title, macros)
+         return (raw, r.get('dish_name', ''))
+
+    # Struktura danych wejściowych jest niespójna (meal_plan vs star_dish), ujednolicam:
+    # meal_plan.get('breakfast') zwraca słownik przepisu (nie ma klucza 'recipe')
+    # star_dish ma klucz 'recipe'
+    
+    # Śniadanie
+    r_breakfast = meal_plan.get('breakfast', {})
+    if r_breakfast: recipe_data_list.append( (format_recipe_raw(r_breakfast, 'Śniadanie'), r_breakfast.get('dish_name')) )
+    
+    # Obiad
+    r_lunch = star_dish.get('recipe', {})
+    m_lunch = star_dish.get('macros', {})
+    if r_lunch: recipe_data_list.append( (format_recipe_raw(r_lunch, 'Obiad', m_lunch), r_lunch.get('dish_name')) )
+
+    # Kolacja
+    r_dinner = meal_plan.get('dinner', {})
+    if r_dinner: recipe_data_list.append( (format_recipe_raw(r_dinner, 'Kolacja'), r_dinner.get('dish_name')) )
+    
+    # WALIDACJA KRYTYCZNA: Wymuszamy dokładnie 3 przepisy
+    while len(recipe_data_list) < 3:
+        meal_names = ['Śniadanie', 'Obiad', 'Kolacja']
+        placeholder = f"{meal_names[len(recipe_data_list)]}: Proste danie\n\nKalorie: 300\n\nSkładniki:\n- Podstawowe składniki\n\nPrzygotowanie:\n1. Przygotuj zgodnie z przepisem"
+        recipe_data_list.append( (placeholder, 'Proste danie') )
+    
+    # Uruchamiamy zadania równolegle
+    recipe_tasks = [asyncio.create_task(stylize(r_raw, "recipe")) for r_raw, _ in recipe_data_list]
+
+    # Czekamy na wyniki
+    intro_res = await intro_task
+    recipe_styled_texts = await asyncio.gather(*recipe_tasks)
+    
+    # Dodajemy linki do zdjęć do Stylizowanych Przepisów
+    # WAŻNE: Musimy mieć dokładnie 3 przepisy (śniadanie, obiad, kolacja)
+    final_recipes = []
+    for styled_text, (_, dish_name) in zip(recipe_styled_texts, recipe_data_list):
+        if dish_name:
+            query = urllib.parse.quote(dish_name)
+            link = f"https://www.google.com/search?q={query}&tbm=isch"
+            final_text = f"{styled_text}\n\n📷 [Zobacz {dish_name}]({link})"
+            final_recipes.append(final_text)
+        else:
+            final_recipes.append(styled_text)
+
+    # --- Krok 3: Publikacja (Publisher) ---
+    print("📰 [REDACJA] Składanie numeru...")
+    
+    # KLUCZOWE: Publisher oczekuje oddzielnych kluczy, nie listy!
+    # Musimy przekazać: intro, breakfast, lunch, dinner
+    components = {
+        "intro": intro_res,
+        "breakfast": final_recipes[0] if len(final_recipes) > 0 else "",
+        "lunch": final_recipes[1] if len(final_recipes) > 1 else "",
+        "dinner": final_recipes[2] if len(final_recipes) > 2 else ""
+    }
+    
+    final_messages = publisher_fallback(components) if local else await agent_publisher(components)
+    
+    # WALIDACJA KRYTYCZNA: Wymuszamy dokładnie 4 wiadomości!
+    if len(final_messages) != 4:
+        print(f"  ⚠️ Publisher zwrócił {len(final_messages)} zamiast 4. Używam fallbacku.")
+        final_messages = [
+            components["intro"],
+            components["breakfast"] if components.get("breakfast") else "Brak śniadania",
+            components["lunch"] if components.get("lunch") else "Brak obiadu",
+            components["dinner"] if components.get("dinner") else "Brak kolacji"
+        ]
+
+    return final_messages
+
+
+async def present_culinary_journey(channel, cuisine, brief, insight, options, star_dish, meal_plan, history, preferences, chat_history,
+                                   run_id=None, sent_log=SENT_LOG_FILE, final_messages=None, locale=BASE_LOCALE):
+    """
+    Główna funkcja prezentacyjna. Tworzy narrację, stylizuje ją i wysyła na kanał
+    (Discord lub kanał zastępczy z `sinks`).
+
+    Args:
+        run_id (str): Identyfikator uruchomienia dla idempotentnej wysyłki (domyślnie dzisiejsza data).
+        sent_log (str | None): Dziennik wysłanych wiadomości (None - bez dziennika, np. przebiegi bez zapisu).
+        final_messages (list[str]): Gotowe wiadomości (np. z kolejki planów) - redakcja jest pomijana.
+        locale (str): Lokalizacja etykiet ankiety (teksty opcji i wiadomości - już w tej lokalizacji).
+    """
+    import discord  # Leniwy import: tylko embed ankiety
+    print("\n--- Prezentacja Podróży Kulinarnej (Architektura Uproszczona) ---")
+    sender = DiscordSender(channel, run_id=run_id or datetime.now().strftime("%Y-%m-%d"), log_file=sent_log)
+
+    # Redakcja nie zależy od ankiety - Styliści pracują, gdy ankieta i reakcje idą na kanał
+    compose_task = None
+    if final_messages is None:
+        compose_task = asyncio.create_task(compose_messages(cuisine, star_dish, meal_plan))
+
+    # --- Krok 1: Ankieta (Szybka, bez AI) ---
+    print("📤 [DISCORD] Wysyłam ankietę...")
+    num_options = len(options)
+    poll_embed = discord.Embed(title=poll_title(locale, num_options), description=locale_labels(locale)["poll_vote"], color=0x5865F2)
+    
+    for i, opt in enumerate(options):
+        recipe, macros = opt.get('recipe', {}), opt.get('macros', {})
+        poll_embed.add_field(
+            name=f"{i+1}️⃣ {recipe.get('dish_name', 'N/A')}", 
+            value=f"> {recipe.get('description', 'N/A')}\n*🔥 {macros.get('calories', '?')} kcal | ⏱️ {recipe.get('prep_time', '?')}*", 
+            inline=False
+        )
+    
+    poll_message = await sender.send("poll", embed=poll_embed)
+    
+    # Reakcje idą w tle własną kolejką (równolegle z generowaniem i wysyłką treści)
+    reactions = [f"{i+1}\u20e3" for i in range(num_options)] if num_options > 1 else ["👍", "👎"]
+    sender.add_reactions(poll_message, reactions)
+
+    if compose_task is not None:
+        final_messages = await compose_task
+
+    print(f"📤 [DISCORD] Wysyłam {len(final_messages)} wiadomości...")
+    # Kolejność zachowuje kolejka trasy; długie wiadomości dzielone są na części do 2000 znaków
+    await sender.send_many("msg", final_messages)
+    await sender.close()
+
+    print("✔️ Prezentacja zakończona.")
+    return poll_message, final_messages
+
+
+# ==============================================================================
+# DECYZJE OPARTE O HISTORIĘ
+# ==============================================================================
+
+def get_region_for_cuisine(cuisine):
+    """Pomocnicza funkcja mapująca kuchnię na region."""
+    return next((r for r, cs in CUISINE_REGIONS.items() if cuisine in cs), "Specjalne / Klimatyczne")
+
+
+def choose_cuisine(history, suggested):
+    """
+    Wybiera kuchnię na dziś.
+    Jeśli analityk coś zasugerował (i nie było to ostatnio), akceptuje.
+    W przeciwnym razie losuje kuchnię, unikając powtórzeń.
+    """
+    print("\n--- Wybór Kuchni ---")
+    last_cuisines = history.get("last_cuisines", [])
+
+    # 1. Sprawdzenie sugestii analityka
+    if suggested in CUISINES and suggested not in last_cuisines[:3]:
+        print(f"🕵️ Analityk zasugerował: {suggested}. Akceptuję.")
+        return suggested
+
+    if suggested:
+        print(f"🕵️ Analityk zasugerował: {suggested}, ale była już ostatnio. Ignoruję i losuję.")
+
+    # 2. Losowanie regionu (unikając ostatnich)
+    last_regions = history.get("last_regions", [])
+    available_regions = [r for r in CUISINE_REGIONS.keys() if r not in last_regions] or list(CUISINE_REGIONS.keys())
+    chosen_region = random.choice(available_regions)
+    print(f"🌍 Wylosowany region: {chosen_region} (Ostatnio: {', '.join(last_regions)})")
+
+    # 3. Losowanie kuchni w ramach regionu
+    # (wagi z modelu preferencji - kuchnie lubiane w ankietach są losowane częściej)
+    available_cuisines = list(CUISINE_REGIONS[chosen_region].keys())
+    final_choices = [c for c in available_cuisines if c not in last_cuisines] or available_cuisines
+    weights = cuisine_weights(history.get("preference_model", {}), final_choices)
+    chosen_cuisine = random.choices(final_choices, weights=weights, k=1)[0]
+
+    print(f"🍝 Ostateczny wybór: {chosen_cuisine}")
+    return chosen_cuisine
+
+
+async def analyze_last_poll(channel, history):
+    """Sprawdza wyniki ostatniej ankiety na kanale i aktualizuje preferencje."""
+    from discord import NotFound  # Leniwy import (kanały zastępcze zgłaszają LookupError)
+
+    last_poll = history.get("last_poll")
+    if not last_poll or not last_poll.get("message_id"): 
+        print("📊 Brak ostatniej ankiety do analizy.")
+        return
+    try:
+        print(f"📊 Analizuję ankietę: {last_poll.get('message_id')}")
+        message = await channel.fetch_message(last_poll["message_id"])
+        reactions = message.reactions
+        options = last_poll.get("options", [])
+
+        if not reactions:
+            print("- Ankieta bez reakcji.")
+            return
+
+        # Pełne wyniki ankiety (liczba głosów bez reakcji bota) dla każdej opcji
+        votes = [0] * len(options)
+        for reaction in reactions:
+            emoji = str(reaction.emoji)
+            count = max(reaction.count - 1, 0)
+            if emoji.endswith('\u20e3') and emoji[0].isdigit():
+                # Konwersja emoji (1️⃣ -> indeks 0)
+                idx = int(emoji[0]) - 1
+                if 0 <= idx < len(votes):
+                    votes[idx] += count
+            elif len(votes) == 1 and emoji in ("👍", "👎"):
+                votes[0] += count if emoji == "👍" else -count
+
+        # Inkrementalna aktualizacja modelu preferencji (opcje z ingredientami lub same nazwy)
+        poll_ingredients = last_poll.get("ingredients") or []
+        poll_options = [
+            {"dish_name": name, "ingredients": poll_ingredients[i] if i < len(poll_ingredients) else []}
+            for i, name in enumerate(options)
+        ]
+        history["preference_model"] = update_preference_model(
+            history.get("preference_model", {}), last_poll.get("cuisine", ""), poll_options, votes
+        )
+        print(f"📈 Zaktualizowano model preferencji (głosy: {votes})")
+
+        best_idx = max(range(len(votes)), key=lambda i: votes[i], default=None)
+        if best_idx is not None and votes[best_idx] > 0:
+            winner_dish = options[best_idx]
+            history.setdefault("liked_trends", []).append(winner_dish)
+            print(f"🏆 Zwycięzca ankiety: {winner_dish} (Głosy: {votes[best_idx]})")
+        else:
+            print("- Brak wyraźnego zwycięzcy ankiety.")
+    except (NotFound, LookupError):
+        print(f"- Nie znaleziono wiadomości z ankietą ({last_poll['message_id']}).")
+    except Exception as e:
+        print(f"- Błąd podczas analizy ankiety: {e}")
+    finally:
+        history["last_poll"] = {} # Wyczyść po analizie
+
+
+async def research_trends(cuisine, daily_brief, history):
+    """Przeprowadza research trendów w Google lub fallback do historii."""
+    print("\n--- Badanie Trendów ---")
+    if not is_google_search_configured():
+        print("🌐 [Tryb Offline] Wyszukiwanie Google nie jest skonfigurowane. Używam tylko historii.")
+        return await agent_trend_analyst_multi_source(cuisine, "", history, [])
+
+    queries = (await agent_search_strategist(cuisine, daily_brief)).get("queries", [])
+
+    data = ""
+    if queries:
+        print(f"🔍 Wykonuję zapytania: {', '.join(queries)}")
+        # Pełna strona wyników (10) kosztuje tyle samo co 3 - lokalny ranking BM25 wybierze najlepsze
+        search_coroutines = [asyncio.to_thread(google_search_snippets, q, 10) for q in queries]
+        search_results = await asyncio.gather(*search_coroutines)
+
+        results = {q: snippets for q, (snippets, _) in zip(queries, search_results)}
+        data = select_snippets(results, f"{cuisine} {daily_brief}")
+    else:
+        print("⚠️ Strateg nie wygenerował żadnych zapytań.")
+
+    return await agent_trend_analyst_multi_source(cuisine, data, history, [])
+
+
+def update_history(history, cuisine, ideas, message_id, options):
+    """Aktualizuje lokalną historię sesji."""
+    print("\n--- Aktualizacja Historii ---")
+    region = get_region_for_cuisine(cuisine)
+
+    history.setdefault("last_regions", []).insert(0, region)
+    history["last_regions"] = history["last_regions"][:RECENT_REGION_COUNT]
+
+    history.setdefault("last_cuisines", []).insert(0, cuisine)
+    history["last_cuisines"] = history["last_cuisines"][:15]
+
+    history.setdefault("last_trends", []).insert(0, ideas)
+    history["last_trends"] = history["last_trends"][:20]
+
+    dish_names = [opt.get('recipe', {}).get('dish_name', '') for opt in options]
+    ingredients = [
+        [i.get('item', '') for i in opt.get('recipe', {}).get('ingredients', []) if isinstance(i, dict)]
+        for opt in options
+    ]
+    history["last_poll"] = {
+        "message_id": message_id, "options": dish_names,
+        "cuisine": cuisine, "ingredients": ingredients
+    }
+
+    print(f"💾 Zapisano historię (Region: {region}, Kuchnia: {cuisine}). Ankieta: {message_id}")
+
+
+# ==============================================================================
+# ETAPY PRZEBIEGU
+# ==============================================================================
+
+def novel_ideas(ideas, history, taken=()):
+    """
+    Ranking pomysłów według modelu preferencji i filtr nowości (bez powtórek z historii i archiwum).
+    `taken` - nazwy dań już wybranych w tym przebiegu (np. z puli), traktowane jak ostatnie trendy.
+    """
+    # Ranking pomysłów według modelu preferencji (najlepiej dopasowane trafiają do warsztatu pierwsze)
+    ideas = rank_ideas(history.get("preference_model", {}), ideas)
+
+    # Filtr nowości: odrzucamy powtórki (ostatnie trendy + niedawne dania z archiwum)
+    cutoff = novelty_cutoff()
+    recent_names = [idea_name(t) for day in history.get("last_trends", []) for t in (day if isinstance(day, list) else [day])]
+    recent_names += served_dish_names(since=cutoff) + list(taken)
+    ideas, dropped = filter_novel_ideas(ideas, recent_names, served_dish_names(until=cutoff))
+    for idea, match in dropped:
+        print(f"  ⏭️ Pomijam powtórkę: '{idea_name(idea)}' (podobne do '{match}')")
+    return ideas
+
+
+async def run_workshop(ideas, cuisine, daily_brief, history, max_options=3, chosen=()):
+    """
+    Warsztat kulinarny: kolejne pomysły przechodzą przez `culinary_workshop`,
+    aż zbierze się `max_options` zweryfikowanych opcji. `chosen` - nazwy dań już wybranych
+    (np. z puli); ani one, ani opcje z tego warsztatu nie wracają z archiwum drugi raz.
+
+    Returns:
+        list[dict]: Opcje {"recipe", "macros"}.
+    """
+    verified_options = []
+    budget = current_budget()   # Limit tokenów przebiegu (`quota`), None - bez ograniczeń
+
+    # Iteracja przez pomysły i generowanie przepisów
+    for idea_item in ideas:
+        if len(verified_options) >= max_options:
+            print(f"✔️ Zebrano {max_options} zweryfikowane opcje. Kończę warsztat.")
+            break
+        if budget and not budget.next_idea(len(verified_options)):
+            break
+
+        # Wyodrębnienie nazwy (obsługa różnych formatów JSON od modelu)
+        trend_name = idea_name(idea_item)
+
+        if not trend_name:
+            print(f"⚠️ Nie udało się wyodrębnić nazwy pomysłu z: {idea_item}")
+            continue
+
+        # Uruchomienie warsztatu dla pojedynczego pomysłu
+        taken = list(chosen) + [o["recipe"].get("dish_name", "") for o in verified_options]
+        recipe, macros = await culinary_workshop(trend_name, cuisine, daily_brief, history.get("user_insights", []),
+                                                 local_audits=bool(budget and budget.local_audits), exclude=taken)
+
+        if recipe and macros:
+            verified_options.append({"recipe": recipe, "macros": macros})
+    return verified_options
+
+
+async def plan_meals(options):
+    """Plany żywieniowe (śniadanie/kolacja) dla każdej opcji - zapisywane w option['meal_plan']."""
+    print("📅 Przygotowuję plany żywieniowe (śniadanie/kolacja)...")
+    for option in options:
+        meal_plan = await agent_meal_planner(option.get('recipe'))
+        # Fallback tylko dla posiłków, których nie udało się odzyskać (zamiast całego planu)
+        meal_plan.setdefault('breakfast', {'dish_name': 'Owsianka', 'ingredients': [], 'steps': []})
+        meal_plan.setdefault('dinner', {'dish_name': 'Sałatka', 'ingredients': [], 'steps': []})
+        option['meal_plan'] = meal_plan
+    return options
+
+
+async def publish_day(channel, history, day, date_str, persist=True, run_id=None, chat_history=None, tenant=None):
+    """
+    Publikuje przygotowany dzień: ankieta i wiadomości na kanale, plan Markdown,
+    archiwum przepisów i aktualizacja historii.
+
+    Args:
+        day (dict): {cuisine, brief, insight, ideas, options, star_dish} oraz opcjonalnie
+            gotowe `messages` (dzień z kolejki lub wspólny dla kilku kanałów - bez ponownej redakcji)
+            i wersje językowe `localized` (z `prepare_day`).
+        tenant (Tenant): Przestrzeń nazw plików kanału (domyślnie kanał główny). Kanał w innej
+            lokalizacji dostaje wersję złożoną ze wspólnych przepisów (`locales`), bez nowej redakcji.
+
+    Returns:
+        dict: Wynik dnia (jak `generate_daily_plan`).
+    """
+    tenant = tenant or default_tenant()
+    cuisine, star_dish, verified_options = day["cuisine"], day["star_dish"], day["options"]
+    localized = None
+    if tenant.locale != BASE_LOCALE:
+        localized = (day.get("localized") or {}).get(tenant.locale) or await localize_day(day, tenant.locale)
+
+    print(f"🎉 Prezentuję wyniki na #{channel.name}!")
+    sent_message, final_messages = await present_culinary_journey(
+        channel=channel, 
+        cuisine=cuisine, 
+        brief=day.get("brief", ""), 
+        insight=day.get("insight", ""), 
+        options=localized["options"] if localized else verified_options,
+        star_dish=star_dish, 
+        meal_plan=star_dish.get('meal_plan'), 
+        history=history, 
+        preferences={}, 
+        chat_history=chat_history or [],
+        run_id=run_id or date_str,
+        sent_log=tenant.sent_log_file if persist else None,
+        final_messages=localized["messages"] if localized else day.get("messages"),
+        locale=tenant.locale
+    )
+
+    # Plan dnia w Markdown (z listą zakupów)
+    full_markdown_content = "\n\n".join(final_messages)
+    day_meals = star_dish.get('meal_plan') or {}
+    shopping_list = aggregate_shopping_list([day_meals.get('breakfast'), star_dish.get('recipe'), day_meals.get('dinner')])
+    if shopping_list:
+        shopping = localized["shopping"] if localized else format_shopping_list(shopping_list)
+        full_markdown_content += f"\n\n**{locale_labels(tenant.locale)['shopping']}**\n{shopping}"
+
+    # Aktualizuj historię (w pamięci zawsze, na dysku tylko przy persist)
+    update_history(history, cuisine, day.get("ideas", []), sent_message.id, verified_options)
+    if persist:
+        save_daily_plan(date_str, full_markdown_content, tenant.plans_dir)
+        save_day(date_str, cuisine, verified_options, star_dish, star_dish.get('meal_plan'))
+        save_history(history, tenant.history_dir)
+
+    print("\n✅ Podróż kulinarna na dziś zakończona.")
+    return {
+        "date": date_str, "cuisine": cuisine, "brief": day.get("brief", ""),
+        "options": verified_options, "star_dish": star_dish,
+        "messages": final_messages, "markdown": full_markdown_content,
+        "poll_message_id": sent_message.id,
+    }
+
+
+async def analyze_chat(channel, history, bot_user=None, chat_log_path=None):
+    """
+    Pobiera nowe wiadomości czatu i uruchamia Głównego Analityka.
+
+    Returns:
+        tuple: (brief, nowy wniosek, sugerowana kuchnia, lista linii czatu dla prezentacji).
+    """
+    # 0. Pobranie historii czatu (dla kontekstu)
+    # Tylko wiadomości nowsze niż kursor z poprzedniego uruchomienia (jedna strona API)
+    print("💬 Pobieram historię czatu Discord (dla analityka)...")
+    chat_log = await ingest_chat(channel, bot_user=bot_user, log=load_chat_log(chat_log_path), path=chat_log_path)
+    chat_history_str, chat_history_list = format_for_analyst(chat_log)
+    print(f"📜 [DEBUG] Historia czatu ({len(chat_history_list)} nowych wiadomości):")
+    for msg in chat_history_list[-3:]:  # Pokaż ostatnie 3
+        print(f"   {msg}")
+
+    # 1. Głęboka Analiza (Deep Analyst)
+    analysis_result = await agent_deep_analyst(chat_history_str, history)
+    if analysis_result:
+        mark_analyzed(chat_log, chat_log_path)
+
+    daily_brief = analysis_result.get("daily_brief", "Standardowo, szukamy czegoś taniego i dobrego")
+    new_insight = analysis_result.get("new_learning", "")
+    suggested_cuisine = analysis_result.get("suggested_cuisine", "")
+
+    print(f"📝 Codzienny brief: {daily_brief}")
+    print(f"🔍 [DEBUG] Analityk zasugerował: '{suggested_cuisine}'")
+    if new_insight: 
+        print(f"💡 Nowy wniosek o użytkowniku: {new_insight}")
+        history.setdefault("user_insights", []).append(new_insight)
+    return daily_brief, new_insight, suggested_cuisine, chat_history_list
+
+
+async def gather_options(cuisine, daily_brief, history, use_pool=False):
+    """
+    Zweryfikowane opcje dla kuchni: najpierw z puli przygotowanej w tle, brakujące
+    z researchu i warsztatu na żywo.
+
+    Returns:
+        tuple: (opcje {"recipe", "macros"}, pomysły użyte w warsztacie lub z puli).
+    """
+    # 3. Opcje z puli przygotowanej w tle (research i warsztat na żywo tylko dla brakujących)
+    pooled = take_options(cuisine, 3, keep=lambda pool_ideas: novel_ideas(pool_ideas, history)) if use_pool else []
+    verified_options = [{"recipe": e["recipe"], "macros": e["macros"]} for e in pooled]
+    ideas = [e["idea"] for e in pooled]
+    if len(verified_options) >= 3:
+        return verified_options, ideas
+
+    # 4. Badanie Trendów (Research)
+    live_ideas = (await research_trends(cuisine, daily_brief, history)).get("ideas", [])
+    if live_ideas:
+        print(f"✔️ Znaleziono {len(live_ideas)} pomysłów: {', '.join(map(str, live_ideas))}")
+        pooled_names = [idea_name(i) for i in ideas] + [o["recipe"].get("dish_name", "") for o in verified_options]
+        live_ideas = novel_ideas(live_ideas, history, taken=pooled_names)
+        if not live_ideas:
+            print("❌ Wszystkie pomysły to powtórki.")
+    else:
+        print("❌ Brak pomysłów na dziś.")
+
+    if live_ideas:
+        print("\n--- FAZA 2: Warsztat Kulinarny ---")
+        verified_options += await run_workshop(live_ideas, cuisine, daily_brief, history, max_options=3 - len(verified_options),
+                                               chosen=[o["recipe"].get("dish_name", "") for o in verified_options])
+        ideas += live_ideas
+    return verified_options, ideas
+
+
+async def prepare_day(cuisine, daily_brief, new_insight, ideas, verified_options, compose=False, locales=()):
+    """
+    Gwiazda dnia i plany posiłków (opcjonalnie także redakcja wiadomości) - dzień gotowy do publikacji.
+    Dla `locales` innych niż bazowa dochodzą wersje językowe ze wspólnych przepisów (`day["localized"]`).
+    """
+    print(f"\n--- FAZA 3: Prezentacja ---")
+    print(f"🍝 Wybrano {len(verified_options)} opcje do prezentacji.")
+    star_dish = random.choice(verified_options) # Wybór "gwiazdy dnia" do pełnego planu
+    await plan_meals(verified_options)
+
+    day = {"cuisine": cuisine, "brief": daily_brief, "insight": new_insight, "ideas": ideas,
+           "options": verified_options, "star_dish": star_dish}
+    if compose:
+        day["messages"] = await compose_messages(cuisine, star_dish, star_dish.get("meal_plan"))
+    if any(locale != BASE_LOCALE for locale in locales):
+        day["localized"] = await localize_days(day, locales)
+    return day
+
+
+# ==============================================================================
+# GŁÓWNY PRZEBIEG
+# ==============================================================================
+
+async def _add_localized(result, day, locales):
+    """Dopisuje do wyniku publikacji wersje językowe dnia: `localized` (lokalizacja -> wiadomości)."""
+    if result and locales:
+        with phase("lokalizacja"):
+            versions = await localize_days(dict(day, messages=result["messages"]), locales)
+        result["localized"] = {locale: version["messages"] for locale, version in versions.items()}
+    return result
+
+
+async def generate_daily_plan(channel, history=None, bot_user=None, date_str=None, persist=True, run_id=None, use_queue=None,
+                              use_pool=None, tenant=None, locales=()):
+    """
+    Pełny dzienny przebieg: analiza, research, warsztat, planowanie, stylizacja i prezentacja.
+
+    Args:
+        channel: Kanał wejścia/wyjścia - kanał Discorda lub kanał zastępczy z `sinks`.
+        history (dict): Historia bota (modyfikowana w miejscu); domyślnie wczytana z pamięci kanału.
+        bot_user: Użytkownik bota (jego wiadomości nie trafiają do dziennika czatu).
+        date_str (str): Data planu (domyślnie dziś).
+        persist (bool): Zapis historii, dziennika czatu, planu Markdown i archiwum przepisów.
+            False - przebieg "na sucho" (benchmarki, wsadowe generowanie, testy).
+        run_id (str): Identyfikator idempotentnej wysyłki (domyślnie data planu).
+        use_queue (bool): Najpierw publikuj dzień z kolejki planów (domyślnie = persist).
+        use_pool (bool): Bierz opcje z puli przygotowanej w tle (domyślnie = persist).
+        tenant (Tenant): Przestrzeń nazw plików kanału (domyślnie kanał główny, memory/).
+        locales (list[str]): Dodatkowe wersje językowe dnia (wynik `localized`: lokalizacja -> wiadomości),
+            złożone ze wspólnych przepisów bez ponownego generowania.
+
+    Returns:
+        dict | None: {date, cuisine, brief, options, star_dish, messages, markdown, poll_message_id, localized}
+        lub None, gdy nie udało się przygotować planu.
+    """
+    tenant = tenant or default_tenant()
+    history = history if history is not None else load_history(tenant.history_dir)
+    date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+    print(f"📍 Kanał docelowy: #{channel.name} (ID: {channel.id})")
+
+    print("\n--- FAZA 1: Analiza i Planowanie ---")
+    with phase("analiza ankiety"):
+        await analyze_last_poll(channel, history)
+
+    # Dzień przygotowany wcześniej w trybie tygodniowym: tylko publikacja
+    if use_queue if use_queue is not None else persist:
+        queued = pop_day(tenant.plan_queue_file)
+        if queued:
+            with phase("publikacja"):
+                result = await publish_day(channel, history, queued, date_str, persist, run_id, tenant=tenant)
+            return await _add_localized(result, queued, locales)
+
+    # Dopuszczenie: przebieg, na który nie wystarczy dziennego limitu kluczy, nie startuje (`quota`)
+    with admission(GROQ_API_KEYS) as run:
+        if not run.admitted:
+            await channel.send(QUOTA_MESSAGE)
+            return None
+
+        with phase("analiza czatu"):
+            daily_brief, new_insight, suggested_cuisine, chat_history_list = await analyze_chat(
+                channel, history, bot_user, tenant.chat_log_file if persist else None
+            )
+
+        # 2. Wybór Kuchni
+        print(f"\n🎯 [DEBUG] Przekazuję '{suggested_cuisine}' do choose_cuisine()")
+        cuisine = choose_cuisine(history, suggested_cuisine)
+        print(f"🌍 Wybrana kuchnia na dziś: {cuisine}")
+        print(f"✅ [DEBUG] Ostateczna decyzja: {cuisine}")
+
+        with phase("research i warsztat"):
+            verified_options, ideas = await gather_options(
+                cuisine, daily_brief, history, use_pool if use_pool is not None else persist
+            )
+        if not verified_options:
+            print("❌ Żaden z projektów nie został zaakceptowany." if ideas else "❌ Brak nowych pomysłów na dziś.")
+            await channel.send(NO_OPTIONS_MESSAGE if ideas else NO_IDEAS_MESSAGE)
+            return None
+
+        with phase("plany posiłków"):
+            day = await prepare_day(cuisine, daily_brief, new_insight, ideas, verified_options)
+        with phase("publikacja"):
+            result = await publish_day(channel, history, day, date_str, persist, run_id, chat_history_list, tenant)
+        return await _add_localized(result, day, locales)
+
+
+async def generate_plans(count, channel_factory, history=None, date_str=None, locales=()):
+    """
+    Generuje `count` planów równolegle, każdy na własnym kanale i kopii historii (bez zapisu).
+    Zapytania do LLM i tak przechodzą przez wspólny semafor `core.ask_llm`; równolegle idą
+    wyszukiwania, wysyłka i oczekiwanie na odpowiedzi.
+
+    Args:
+        channel_factory (callable): idx -> kanał dla planu o numerze idx.
+
+    Returns:
+        list[tuple]: (kanał, wynik `generate_daily_plan` lub None, czas w sekundach) dla każdego planu.
+    """
+    history = history if history is not None else load_history()
+    date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+
+    async def one(idx):
+        channel = channel_factory(idx)
+        started = time.monotonic()
+        try:
+            result = await generate_daily_plan(channel, copy.deepcopy(history), date_str=date_str,
+                                               persist=False, run_id=f"{date_str}-{idx}", locales=locales)
+        except Exception as e:
+            print(f"❌ Plan #{idx}: {e}")
+            result = None
+        return channel, result, time.monotonic() - started
+
+    return await asyncio.gather(*(one(idx) for idx in range(count)))
+
+
+# ==============================================================================
+# LINIA KOMEND
+# ==============================================================================
+
+def _emit_localized(sink, out_dir, channel, result):
+    """Dodatkowe wersje językowe planu: pliki obok planu (--sink file) lub stdout."""
+    for locale, messages in (result or {}).get("localized", {}).items():
+        content = "\n\n".join(messages)
+        if sink == "file":
+            path = os.path.join(out_dir, f"{channel.name}.{locale}.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content + "\n")
+        elif sink == "stdout":
+            print(f"\n🌐 #{channel.name} [{locale}]\n{content}")
+
+
+def _channel_factory(sink, out_dir, chat):
+    """Fabryka kanałów dla wybranego sinka (stdout, file, memory)."""
+    if sink == "file":
+        os.makedirs(out_dir, exist_ok=True)
+        return lambda idx: FileChannel(os.path.join(out_dir, f"plan-{idx + 1}.md"), name=f"plan-{idx + 1}", chat=chat)
+    if sink == "stdout":
+        return lambda idx: StdoutChannel(name=f"plan-{idx + 1}", chat=chat)
+    return lambda idx: MemoryChannel(name=f"plan-{idx + 1}", chat=chat)
+
+
+async def _main(args):
+    async with session(args.profile, enabled=args.profile is not None):
+        return await _run(args)
+
+
+async def _run(args):
+    ensure_recipe_store()
+    chat = load_chat_lines(args.chat) if args.chat else []
+    factory = _channel_factory(args.sink, args.out, chat)
+
+    if args.persist:
+        channel = factory(0)
+        started = time.monotonic()
+        result = await generate_daily_plan(channel, locales=args.locales)
+        runs = [(channel, result, time.monotonic() - started)]
+    else:
+        runs = await generate_plans(args.count, factory, locales=args.locales)
+    for channel, result, _ in runs:
+        _emit_localized(args.sink, args.out, channel, result)
+
+    print("\n📊 Podsumowanie:")
+    for channel, result, elapsed in runs:
+        status = f"{result['cuisine']}, {len(result['options'])} opcje" if result else "brak planu"
+        if result and result.get("localized"):
+            status += f" (+{', '.join(result['localized'])})"
+        print(f"  #{channel.name}: {status} | {elapsed:.1f}s")
+    if args.sink == "file":
+        print(f"📁 Plany zapisane w: {args.out}")
+    return all(result for _, result, _ in runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dzienny plan bez Discorda (pipeline + sinki).")
+    parser.add_argument("--sink", choices=["stdout", "file", "memory"], default="stdout",
+                        help="Gdzie trafiają wiadomości (domyślnie stdout).")
+    parser.add_argument("--out", default="headless_plans", help="Katalog dla --sink file.")
+    parser.add_argument("--count", type=int, default=1, help="Liczba planów generowanych równolegle.")
+    parser.add_argument("--chat", help="Plik z wejściem czatu (\"autor: treść\" na linię).")
+    parser.add_argument("--persist", action="store_true",
+                        help="Zapisz historię, plan i archiwum jak bot (tylko jeden plan).")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="RAPORT",
+                        help="Profilowanie faz, agentów i przestojów pętli (raport w profiles/ lub RAPORT).")
+    parser.add_argument("--locales", type=lambda value: [v.strip() for v in value.split(",") if v.strip()], default=[],
+                        help="Dodatkowe wersje językowe z tego samego przebiegu (np. en,de).")
+    args = parser.parse_args()
+    if args.persist and args.count != 1:
+        parser.error("--persist działa tylko dla --count 1")
+
+    ok = asyncio.run(_main(args))
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,76 @@
+"""
+Moduł Kolejki Planów.
+
+Gotowe dni (po warsztacie, planowaniu i redakcji) czekają w `memory/plan_queue.json`
+na publikację. Kolejkę zapełnia tryb tygodniowy (`weekly.py`), a dzienny przebieg tylko
+zdejmuje pierwszy dzień i go publikuje. Dni starsze niż MAX_AGE_DAYS są odrzucane
+(trendy i sezonowość się dezaktualizują).
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from history import HISTORY_DIR, _load_json_file, _save_json_file
+
+# Stałe konfiguracyjne
+PLAN_QUEUE_FILE = os.path.join(HISTORY_DIR, "plan_queue.json")
+MAX_AGE_DAYS = 10
+
+
+def load_queue(path=PLAN_QUEUE_FILE):
+    """Wczytuje kolejkę planów (lista dni w kolejności publikacji)."""
+    return _load_json_file(path, {}).get("days", [])
+
+
+def save_queue(days, path=PLAN_QUEUE_FILE):
+    """Zapisuje kolejkę planów."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _save_json_file(path, {"days": days})
+
+
+def _is_fresh(day, now=None):
+    now = now or datetime.now()
+    try:
+        created = datetime.strptime(day.get("created", ""), "%Y-%m-%d")
+    except ValueError:
+        return False
+    return now - created <= timedelta(days=MAX_AGE_DAYS)
+
+
+def enqueue_days(days, path=PLAN_QUEUE_FILE):
+    """
+    Dopisuje gotowe dni na koniec kolejki (z datą przygotowania).
+
+    Returns:
+        int: Liczba dni w kolejce po dopisaniu.
+    """
+    created = datetime.now().strftime("%Y-%m-%d")
+    queue = [day for day in load_queue(path) if _is_fresh(day)]
+    queue.extend(dict(day, created=day.get("created", created)) for day in days)
+    save_queue(queue, path)
+    return len(queue)
+
+
+def pop_day(path=PLAN_QUEUE_FILE):
+    """
+    Zdejmuje pierwszy aktualny dzień z kolejki (przeterminowane są usuwane po drodze).
+
+    Returns:
+        dict | None: Dzień {cuisine, brief, insight, ideas, options, star_dish, messages, created} lub None.
+    """
+    queue = load_queue(path)
+    if not queue:
+        return None
+    fresh = [day for day in queue if _is_fresh(day)]
+    if len(fresh) < len(queue):
+        print(f"🗑️ [KOLEJKA] Odrzucam {len(queue) - len(fresh)} przeterminowanych dni.")
+    day = fresh.pop(0) if fresh else None
+    save_queue(fresh, path)
+    if day:
+        print(f"📦 [KOLEJKA] Publikuję dzień z kolejki: {day.get('cuisine')} (zostało {len(fresh)})")
+    return day
+
+
+def queued_cuisines(path=PLAN_QUEUE_FILE):
+    """Kuchnie dni czekających w kolejce (by tydzień nie powtarzał zaplanowanych kuchni)."""
+    return [day.get("cuisine") for day in load_queue(path) if _is_fresh(day)]
@@ -0,0 +1,175 @@
+"""
+Moduł Modelu Preferencji.
+
+Zawiera:
+- Kompaktowy, liczbowy model preferencji użytkownika (kuchnie i składniki).
+- Inkrementalną aktualizację modelu na podstawie pełnych wyników ankiety.
+- Zapytania lokalne (bez LLM): afinitet kuchni, ranking pomysłów, streszczenie dla analityka.
+- Łączenie modeli kilku kanałów (wspólne generowanie w grupie kuchni).
+
+Model przechowywany jest w historii pod kluczem `preference_model`:
+    {"cuisines": {nazwa: wynik}, "ingredients": {składnik: wynik}, "polls": liczba_ankiet}
+Każda nowa ankieta najpierw wygasza (mnoży przez PREFERENCE_DECAY) wszystkie wyniki,
+więc stare głosy tracą znaczenie wykładniczo.
+"""
+
+import math
+import re
+
+from matching import normalize_dish_name, stem_matches
+
+# Stałe konfiguracyjne
+PREFERENCE_DECAY = 0.85          # Współczynnik wygaszania przy każdej ankiecie
+PREFERENCE_MIN_SCORE = 0.05      # Wyniki poniżej tego progu (co do modułu) są usuwane
+MAX_TRACKED_INGREDIENTS = 40     # Ile składników trzymamy w modelu
+NO_VOTES_PENALTY = -0.25         # Sygnał dla kuchni, na którą nikt nie zagłosował
+
+
+def empty_preference_model():
+    """Zwraca pusty model preferencji."""
+    return {"cuisines": {}, "ingredients": {}, "polls": 0}
+
+
+def _ensure_model(model):
+    """Uzupełnia brakujące klucze modelu (np. po wczytaniu pustego słownika z historii)."""
+    if not isinstance(model, dict):
+        model = {}
+    base = empty_preference_model()
+    base.update({k: v for k, v in model.items() if k in base})
+    return base
+
+
+def normalize_ingredient(name):
+    """
+    Sprowadza nazwę składnika do krótkiego klucza (np. "Grzyby (borowik)" -> "grzyby").
+    Usuwa nawiasy, znaki interpunkcyjne i pozostawia maksymalnie 2 pierwsze słowa.
+    """
+    if not name:
+        return ""
+    text = re.sub(r'\(.*?\)', ' ', str(name).lower())
+    words = re.findall(r'[^\W\d_]+', text)
+    return " ".join(words[:2])
+
+
+def _decay(scores, factor):
+    """Wygasza wyniki i usuwa te, które spadły poniżej progu."""
+    return {k: round(v * factor, 4) for k, v in scores.items() if abs(v * factor) >= PREFERENCE_MIN_SCORE}
+
+
+def update_preference_model(model, cuisine, options, votes):
+    """
+    Aktualizuje model na podstawie pełnych wyników jednej ankiety.
+
+    Args:
+        model (dict): Obecny model preferencji (może być pusty).
+        cuisine (str): Kuchnia, z której pochodziły opcje ankiety.
+        options (list): Lista opcji w formacie [{"dish_name": str, "ingredients": [str]}].
+        votes (list): Liczba głosów (bez reakcji bota) dla każdej opcji, w tej samej kolejności.
+
+    Returns:
+        dict: Zaktualizowany model.
+    """
+    model = _ensure_model(model)
+    model["cuisines"] = _decay(model["cuisines"], PREFERENCE_DECAY)
+    model["ingredients"] = _decay(model["ingredients"], PREFERENCE_DECAY)
+
+    votes = [max(int(v or 0), 0) for v in votes][:len(options)]
+    total = sum(votes)
+
+    # Kuchnia: wszystkie opcje są z tej samej kuchni, więc liczy się łączne zaangażowanie
+    if cuisine:
+        signal = total / (total + 1) if total else NO_VOTES_PENALTY
+        model["cuisines"][cuisine] = round(model["cuisines"].get(cuisine, 0.0) + signal, 4)
+
+    # Składniki: udział głosów opcji względem równego podziału (składniki wspólne się znoszą)
+    if total and options:
+        baseline = 1 / len(votes)
+        for option, count in zip(options, votes):
+            share = count / total - baseline
+            keys = {normalize_ingredient(i) for i in option.get("ingredients", [])}
+            for key in keys - {""}:
+                model["ingredients"][key] = round(model["ingredients"].get(key, 0.0) + share, 4)
+
+    # Ograniczenie rozmiaru modelu (zostawiamy najsilniejsze sygnały)
+    strongest = sorted(model["ingredients"].items(), key=lambda kv: abs(kv[1]), reverse=True)
+    model["ingredients"] = {k: v for k, v in strongest[:MAX_TRACKED_INGREDIENTS] if abs(v) >= PREFERENCE_MIN_SCORE}
+    model["polls"] += 1
+    return model
+
+
+def merge_preference_models(models):
+    """
+    Łączy modele kilku kanałów w jeden (np. dla wspólnego generowania w grupie kuchni).
+    Wyniki są uśredniane po wszystkich modelach (brak wyniku liczy się jako 0), więc sygnał
+    jednego kanału nie przeważa nad pozostałymi; liczby ankiet się sumują.
+    """
+    models = [_ensure_model(m) for m in models]
+    merged = empty_preference_model()
+    for section in ("cuisines", "ingredients"):
+        keys = dict.fromkeys(k for m in models for k in m[section])
+        scores = {k: sum(m[section].get(k, 0.0) for m in models) / len(models) for k in keys}
+        merged[section] = {k: round(v, 4) for k, v in scores.items() if abs(v) >= PREFERENCE_MIN_SCORE}
+    merged["polls"] = sum(m["polls"] for m in models)
+    return merged
+
+
+def cuisine_affinity(model, cuisine):
+    """Zwraca wynik afinitetu dla kuchni (0.0 jeśli brak danych)."""
+    return _ensure_model(model)["cuisines"].get(cuisine, 0.0)
+
+
+def cuisine_weights(model, cuisines):
+    """
+    Zwraca wagi losowania dla listy kuchni (softmax z afinitetów).
+    Kuchnie bez historii mają wagę neutralną, więc losowanie pozostaje różnorodne.
+    """
+    return [math.exp(cuisine_affinity(model, c)) for c in cuisines]
+
+
+def _stems(key):
+    """Prymitywny stemming (obcina końcówkę fleksyjną): "dynia" -> "dyni" pasuje też do "dynią"."""
+    return [w[:-1] if len(w) > 4 else w for w in key.split()]
+
+
+def score_text(model, text):
+    """
+    Sumuje afinitety składników, które występują w podanym tekście (np. nazwie i opisie pomysłu).
+    Rdzenie porównywane są z całymi słowami (`stem_matches`), więc "ser" nie pasuje do "deser".
+    """
+    words = normalize_dish_name(text).split()
+    return sum(
+        score for key, score in _ensure_model(model)["ingredients"].items()
+        if all(any(stem_matches(stem, word) for word in words) for stem in _stems(normalize_dish_name(key)))
+    )
+
+
+def rank_ideas(model, ideas):
+    """
+    Sortuje pomysły od najlepiej dopasowanych do preferencji (sortowanie stabilne).
+    Obsługuje zarówno pomysły w formie słowników (nazwa/opis), jak i zwykłych stringów.
+    """
+    def idea_text(idea):
+        if isinstance(idea, dict):
+            return " ".join(str(v) for v in idea.values())
+        return str(idea)
+
+    return sorted(ideas, key=lambda idea: score_text(model, idea_text(idea)), reverse=True)
+
+
+def summarize_preferences(model, top_n=3):
+    """
+    Zwraca zwięzłe streszczenie modelu dla promptów analityków.
+    Przykład: "Lubi: Włoska (Klasyczna), dynia, grzyby | Nie lubi: tofu"
+    """
+    model = _ensure_model(model)
+    combined = list(model["cuisines"].items()) + list(model["ingredients"].items())
+    liked = [k for k, v in sorted(combined, key=lambda kv: kv[1], reverse=True) if v > 0][:top_n]
+    disliked = [k for k, v in sorted(combined, key=lambda kv: kv[1]) if v < 0][:top_n]
+    if not liked and not disliked:
+        return ""
+    parts = []
+    if liked:
+        parts.append(f"Lubi: {', '.join(liked)}")
+    if disliked:
+        parts.append(f"Nie lubi: {', '.join(disliked)}")
+    return " | ".join(parts)
@@ -0,0 +1,234 @@
+"""
+Moduł Lokalnego Cennika i Dostępności.
+
+Zawiera:
+- Przybliżone ceny (zł/kg) i poziom dostępności składników w polskich supermarketach
+  (Lidl, Biedronka, Auchan), oparte o katalog składników.
+- Listę składników specjalnych (drogich lub egzotycznych) z sugerowanymi zamiennikami.
+- Lokalną ocenę kosztu przepisu i liczby egzotycznych składników (odpowiednik Logistyka).
+
+Do Logistyka LLM trafiają tylko przypadki graniczne.
+"""
+
+from matching import normalize_dish_name, stem_matches
+from ingredient_catalog import resolve_ingredient
+from quantities import parse_ingredient, to_grams
+
+# ==============================================================================
+# KONFIGURACJA
+# ==============================================================================
+
+# Poziomy dostępności
+TIER_BASIC = 0        # Każdy dyskont
+TIER_SUPERMARKET = 1  # Większe supermarkety / sezonowo
+TIER_EXOTIC = 2       # Sklepy specjalistyczne, internet
+
+MAX_COST_PER_SERVING = 25.0     # zł - powyżej: odrzucenie
+CHEAP_COST_PER_SERVING = 15.0   # zł - poniżej (i bez egzotyki): akceptacja bez LLM
+MAX_EXOTIC = 2                  # Dopuszczalna liczba egzotycznych dodatków
+EXOTIC_BASE_SHARE = 0.3         # Egzotyk stanowiący >30% masy dania to "baza", nie dodatek
+MIN_COVERAGE = 0.8
+
+# id składnika z katalogu: (cena zł/kg, poziom dostępności)
+PRICES = {
+    "ziemniak": (3, TIER_BASIC), "marchew": (3, TIER_BASIC), "cebula": (4, TIER_BASIC),
+    "czosnek": (25, TIER_BASIC), "pomidor": (10, TIER_BASIC), "passata": (8, TIER_BASIC),
+    "papryka": (14, TIER_BASIC), "ogorek": (8, TIER_BASIC), "kapusta": (4, TIER_BASIC),
+    "dynia": (5, TIER_BASIC), "grzyby": (14, TIER_BASIC), "szpinak": (25, TIER_BASIC),
+    "brokul": (12, TIER_BASIC), "cukinia": (9, TIER_BASIC), "baklazan": (14, TIER_BASIC),
+    "salata": (20, TIER_BASIC), "kukurydza": (10, TIER_BASIC), "groszek": (10, TIER_BASIC),
+    "awokado": (25, TIER_BASIC), "fasola": (8, TIER_BASIC), "ciecierzyca": (9, TIER_BASIC),
+    "soczewica": (12, TIER_BASIC), "ryz": (7, TIER_BASIC), "makaron": (8, TIER_BASIC),
+    "kasza": (8, TIER_BASIC), "maka": (3, TIER_BASIC), "chleb": (10, TIER_BASIC),
+    "platki": (8, TIER_BASIC), "jajko": (18, TIER_BASIC), "mleko": (4, TIER_BASIC),
+    "mleko_kokosowe": (20, TIER_BASIC), "jogurt": (10, TIER_BASIC), "smietana": (14, TIER_BASIC),
+    "maslo": (35, TIER_BASIC), "ser": (40, TIER_BASIC), "twarog": (18, TIER_BASIC),
+    "kurczak": (25, TIER_BASIC), "wieprzowina": (22, TIER_BASIC), "wolowina": (55, TIER_BASIC),
+    "mieso": (25, TIER_BASIC), "boczek": (35, TIER_BASIC), "kielbasa": (30, TIER_BASIC),
+    "ryba": (40, TIER_BASIC), "losos": (80, TIER_BASIC), "owoce_morza": (70, TIER_SUPERMARKET),
+    "tofu": (25, TIER_SUPERMARKET), "banan": (6, TIER_BASIC), "jablko": (4, TIER_BASIC),
+    "owoce": (15, TIER_BASIC), "orzechy": (50, TIER_BASIC), "maslo_orzechowe": (35, TIER_BASIC),
+    "cukier": (4, TIER_BASIC), "miod": (40, TIER_BASIC), "czekolada": (40, TIER_BASIC),
+    "olej": (12, TIER_BASIC), "majonez": (20, TIER_BASIC), "ketchup": (12, TIER_BASIC),
+    "sos_sojowy": (25, TIER_BASIC), "bulion": (2, TIER_BASIC), "sok": (5, TIER_BASIC),
+    "wino": (25, TIER_BASIC), "ocet": (6, TIER_BASIC), "woda": (0, TIER_BASIC),
+    "przyprawy": (60, TIER_BASIC),
+}
+
+# Składniki specjalne (sprawdzane przed katalogiem): słowa kluczowe -> (cena zł/kg, poziom, id do przeliczeń, zamiennik)
+SPECIALTY = {
+    "szafran": (40000, TIER_SUPERMARKET, "przyprawy", "kurkuma"),
+    "trufl": (3000, TIER_EXOTIC, "grzyby", "suszone borowiki"),
+    "poledwica wolow": (150, TIER_SUPERMARKET, "wolowina", "łopatka lub karkówka"),
+    "antrykot": (120, TIER_SUPERMARKET, "wolowina", "karkówka"),
+    "jagniec": (90, TIER_SUPERMARKET, "wolowina", "wieprzowina"),
+    "kaczk": (45, TIER_SUPERMARKET, "kurczak", "udka z kurczaka"),
+    "osmiornic": (120, TIER_EXOTIC, "owoce_morza", "kalmary lub dorsz"),
+    "homar": (400, TIER_EXOTIC, "owoce_morza", "krewetki lub dorsz"),
+    "krab": (150, TIER_EXOTIC, "owoce_morza", "paluszki krabowe"),
+    "paluszki krab": (30, TIER_BASIC, "ryba", None),   # Surimi z dyskontu, nie krab (dłuższy klucz wygrywa)
+    "przegrzeb": (300, TIER_EXOTIC, "owoce_morza", "krewetki"),
+    "tunczyk swiez": (120, TIER_EXOTIC, "ryba", "tuńczyk z puszki"),
+    "gochujang": (60, TIER_EXOTIC, "sos_sojowy", "pasta chili + sos sojowy"),
+    "miso": (60, TIER_EXOTIC, "sos_sojowy", "sos sojowy"),
+    "sos rybn": (40, TIER_SUPERMARKET, "sos_sojowy", "sos sojowy"),
+    "tamaryn": (60, TIER_EXOTIC, "sos_sojowy", "sok z limonki + cukier"),
+    "trawa cytryn": (80, TIER_EXOTIC, "przyprawy", "skórka z cytryny"),
+    "galangal": (80, TIER_EXOTIC, "przyprawy", "imbir"),
+    "kaffir": (200, TIER_EXOTIC, "przyprawy", "skórka z limonki"),
+    "yuzu": (150, TIER_EXOTIC, "sok", "sok z cytryny"),
+    "sumak": (120, TIER_EXOTIC, "przyprawy", "skórka z cytryny"),
+    "zatar": (120, TIER_EXOTIC, "przyprawy", "tymianek + sezam"),
+    "harissa": (60, TIER_SUPERMARKET, "sos_sojowy", "koncentrat pomidorowy + chili"),
+    "tahin": (50, TIER_SUPERMARKET, "maslo_orzechowe", "pasta sezamowa domowa"),
+    "nori": (300, TIER_SUPERMARKET, "salata", "pominąć"),
+    "wakame": (200, TIER_EXOTIC, "salata", "pominąć"),
+    "kombu": (200, TIER_EXOTIC, "salata", "pominąć"),
+    "mirin": (50, TIER_SUPERMARKET, "wino", "białe wino + cukier"),
+    "sake": (60, TIER_EXOTIC, "wino", "białe wino"),
+    "paneer": (60, TIER_EXOTIC, "ser", "twarożek półtłusty"),
+    "halloumi": (70, TIER_SUPERMARKET, "ser", "ser feta"),
+    "ricott": (45, TIER_SUPERMARKET, "ser", "twaróg"),
+    "mascarpone": (45, TIER_SUPERMARKET, "ser", "serek śmietankowy"),
+    "pistacj": (120, TIER_SUPERMARKET, "orzechy", "orzechy włoskie"),
+    "orzech makadami": (200, TIER_EXOTIC, "orzechy", "orzechy nerkowca"),
+    "orzech pekan": (150, TIER_EXOTIC, "orzechy", "orzechy włoskie"),
+    "kardamon": (400, TIER_SUPERMARKET, "przyprawy", "cynamon"),
+    "wanili": (2000, TIER_SUPERMARKET, "przyprawy", "cukier wanilinowy"),
+    "gochugaru": (150, TIER_EXOTIC, "przyprawy", "papryka ostra mielona"),
+    "kimchi": (50, TIER_SUPERMARKET, "kapusta", "kiszona kapusta + chili"),
+    "tempeh": (60, TIER_EXOTIC, "tofu", "tofu"),
+    "seitan": (60, TIER_EXOTIC, "tofu", "tofu"),
+    "edamame": (40, TIER_SUPERMARKET, "groszek", "zielony groszek"),
+    "jalapeno": (60, TIER_SUPERMARKET, "papryka", "świeże chili"),
+    "chipotle": (150, TIER_EXOTIC, "przyprawy", "wędzona papryka"),
+    "mango": (20, TIER_SUPERMARKET, "owoce", "brzoskwinia"),
+    "granat": (25, TIER_SUPERMARKET, "owoce", "żurawina"),
+    "limonk": (20, TIER_SUPERMARKET, "owoce", "cytryna"),
+}
+
+_SPECIALTY_INDEX = sorted(
+    ((tuple(normalize_dish_name(key).split()), key) for key in SPECIALTY),
+    key=lambda entry: sum(len(w) for w in entry[0]), reverse=True
+)
+
+
+def _match_specialty(name):
+    """Zwraca klucz składnika specjalnego pasującego do nazwy (lub None)."""
+    words = normalize_dish_name(name).split()
+    for key_words, key in _SPECIALTY_INDEX:
+        if all(any(stem_matches(k, word) for word in words) for k in key_words):
+            return key
+    return None
+
+
+def price_ingredient(ingredient):
+    """
+    Wycenia pojedynczy składnik przepisu.
+
+    Returns:
+        dict | None: {"name", "grams", "cost", "tier", "substitute"} lub None, jeśli nie rozpoznano.
+    """
+    name = ingredient.get("item", "")
+    specialty = _match_specialty(name)
+    extra_cost = 0.0
+    if specialty:
+        price, tier, unit_id, substitute = SPECIALTY[specialty]
+        base_id = resolve_ingredient(normalize_dish_name(name).split()[0])
+        if unit_id == "przyprawy" and base_id not in (None, "przyprawy"):
+            # Produkt przyprawiony drogą przyprawą ("sos szafranowy", "ryż szafranowy"):
+            # masa to produkt bazowy, przyprawa to ok. 0.2 g
+            extra_cost = price * 0.2 / 1000
+            unit_id = base_id
+            price = PRICES[base_id][0]
+        grams = to_grams(ingredient.get("amount"), ingredient.get("unit"), unit_id)
+    else:
+        record = parse_ingredient(ingredient)
+        if not record.ingredient_id:
+            return None
+        price, tier = PRICES[record.ingredient_id]
+        substitute = None
+        grams = record.grams
+
+    if grams is None:
+        return None
+    cost = grams / 1000 * price + (extra_cost if grams else 0.0)
+    return {"name": name, "grams": grams, "cost": cost, "tier": tier, "substitute": substitute}
+
+
+def score_recipe_cost(recipe, servings=None):
+    """
+    Lokalna wycena przepisu.
+
+    Returns:
+        dict: {"total_pln", "per_serving_pln", "exotic" (nazwy), "exotic_base" (nazwy),
+               "most_expensive" (lista pozycji), "coverage", "unresolved"}.
+    """
+    ingredients = [i for i in recipe.get("ingredients", []) if isinstance(i, dict)]
+    priced, unresolved = [], []
+    for ingredient in ingredients:
+        item = price_ingredient(ingredient)
+        if item is None:
+            unresolved.append(ingredient.get("item", ""))
+        else:
+            priced.append(item)
+
+    try:
+        servings = max(int(float(str(servings or recipe.get("servings") or 2).split()[0].replace(",", "."))), 1)
+    except (ValueError, IndexError):
+        servings = 2
+    total = sum(i["cost"] for i in priced)
+    total_grams = sum(i["grams"] for i in priced) or 1.0
+    exotic = [i for i in priced if i["tier"] == TIER_EXOTIC]
+    return {
+        "total_pln": round(total, 2),
+        "per_serving_pln": round(total / servings, 2),
+        "exotic": [i["name"] for i in exotic],
+        "exotic_base": [i["name"] for i in exotic if i["grams"] / total_grams > EXOTIC_BASE_SHARE],
+        "most_expensive": sorted(priced, key=lambda i: i["cost"], reverse=True)[:3],
+        "coverage": round(len(priced) / len(ingredients), 2) if ingredients else 0.0,
+        "unresolved": unresolved,
+    }
+
+
+def _substitution_hints(items):
+    """Buduje krótkie podpowiedzi zamienników dla Szefa Kuchni."""
+    hints = [f"{i['name']} -> {i['substitute']}" for i in items if i.get("substitute")]
+    return f" Zamienniki: {'; '.join(hints)}." if hints else ""
+
+
+def local_shopper_review(recipe):
+    """
+    Lokalna ocena kosztu i dostępności (odpowiednik Logistyka).
+
+    Returns:
+        dict: {"approved": True/False/None, "feedback": str, "cost": dict}.
+              approved=None oznacza przypadek graniczny - decyzję podejmuje Logistyk LLM.
+    """
+    cost = score_recipe_cost(recipe)
+    per_serving = cost["per_serving_pln"]
+    expensive = cost["most_expensive"]
+    priced_exotic = [i for i in expensive if i["tier"] == TIER_EXOTIC]
+
+    if cost["coverage"] < MIN_COVERAGE:
+        return {"approved": None, "feedback": "", "cost": cost}
+    if per_serving > MAX_COST_PER_SERVING:
+        top = ", ".join(f"{i['name']} (~{i['cost']:.0f} zł)" for i in expensive)
+        feedback = f"Za drogo (~{per_serving:.0f} zł/porcję, limit {MAX_COST_PER_SERVING:.0f} zł). Najdroższe: {top}."
+        return {"approved": False, "feedback": feedback + _substitution_hints(expensive), "cost": cost}
+    if cost["exotic_base"]:
+        feedback = f"Egzotyczny składnik jest bazą dania: {', '.join(cost['exotic_base'])}. Oprzyj danie na produktach z dyskontu."
+        return {"approved": False, "feedback": feedback + _substitution_hints(priced_exotic), "cost": cost}
+    if len(cost["exotic"]) > MAX_EXOTIC:
+        feedback = f"Za dużo trudno dostępnych składników ({len(cost['exotic'])}): {', '.join(cost['exotic'])}. Zostaw maksymalnie {MAX_EXOTIC}."
+        return {"approved": False, "feedback": feedback, "cost": cost}
+    if per_serving <= CHEAP_COST_PER_SERVING and len(cost["exotic"]) <= 1:
+        return {"approved": True, "feedback": f"Tanio (~{per_serving:.0f} zł/porcję) i dostępne.", "cost": cost}
+    return {"approved": None, "feedback": "", "cost": cost}
+
+
+def cost_summary(cost):
+    """Zwięzłe podsumowanie wyceny dla promptu Logistyka LLM (tylko przypadki graniczne)."""
+    return (f"~{cost['per_serving_pln']:.0f} zł/porcję (razem {cost['total_pln']:.0f} zł), "
+            f"egzotyczne: {', '.join(cost['exotic']) or 'brak'}, "
+            f"nierozpoznane: {', '.join(cost['unresolved']) or 'brak'}")
@@ -0,0 +1,286 @@
+"""
+Moduł Profilowania (Opcjonalny).
+
+Włączany flagą `python main.py --profile [RAPORT]` (lub `python pipeline.py --profile`),
+pokazuje, skąd bierze się czas przebiegu: opóźnienia LLM, ponowienia, I/O Discorda
+czy praca CPU w pętli zdarzeń (regexy stylisty, duże `json.dumps` wydawcy, parsowanie JSON).
+
+- Fazy (`phase("nazwa")` w pipeline): czas ścienny i CPU procesu, cProfile
+  i migawka tracemalloc na końcu fazy (szczyt pamięci, największe przyrosty alokacji
+  względem poprzedniej migawki - jedna migawka na fazę, bo każda kosztuje).
+- Agenci: każda korutyna `agent_*`, `culinary_workshop` i `ask_llm` - liczba wywołań,
+  czas ścienny i czas CPU liczony tylko dla kroków samej korutyny (bez innych zadań).
+- Detektor przestojów pętli: wątek-strażnik mierzy opóźnienie "bicia serca" pętli
+  zdarzeń; przy przestoju dłuższym niż STALL_THRESHOLD_S zapisuje stos wątku pętli.
+
+Na końcu przebiegu wszystko trafia do pliku raportu (domyślnie profiles/profile-<czas>.txt).
+Bez flagi `phase()` jest pustym kontekstem, a agenci nie są opakowywani.
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import asyncio
+import cProfile
+import importlib
+import threading
+import traceback
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager, nullcontext
+
+# Stałe konfiguracyjne
+PROFILES_DIR = "profiles"
+STALL_THRESHOLD_S = 0.1      # Jak asyncio slow_callback_duration
+TOP_FUNCTIONS = 20
+TOP_ALLOCATIONS = 10
+STACK_DEPTH = 6              # Najgłębsze ramki stosu przy przestoju (oprócz ramek projektu)
+AGENT_MODULES = ["core", "agents.analysis", "agents.planning", "agents.presentation", "agents.workshop"]
+CALLER_MODULES = ["pipeline", "weekly", "fanout", "option_pool"]   # Importowane nazwy agentów
+
+_IGNORED_ALLOCATIONS = (tracemalloc.__file__, "<frozen importlib", os.path.dirname(os.__file__) + os.sep + "linecache")
+_ACTIVE = None   # Bieżąca sesja profilowania (jedna na proces)
+
+
+def phase(name):
+    """Kontekst fazy przebiegu - mierzony tylko w trakcie sesji profilowania."""
+    return _ACTIVE.phase(name) if _ACTIVE else nullcontext()
+
+
+def session(report_path=None, enabled=True):
+    """Sesja profilowania (async with) albo pusty kontekst, gdy profilowanie jest wyłączone."""
+    return Profiler(report_path) if enabled else nullcontext()
+
+
+def default_report_path():
+    return os.path.join(PROFILES_DIR, f"profile-{datetime.now():%Y-%m-%d-%H%M%S}.txt")
+
+
+# ==============================================================================
+# AGENCI: CZAS ŚCIENNY I CPU WŁASNYCH KROKÓW KORUTYNY
+# ==============================================================================
+
+class _TimedCoroutine:
+    """Opakowanie korutyny liczące czas CPU wątku tylko podczas jej własnych kroków."""
+
+    def __init__(self, coro, stats):
+        self.coro, self.stats = coro, stats
+
+    def __await__(self):
+        steps = self.coro.__await__()
+        send, error = None, None
+        started = time.perf_counter()
+        try:
+            while True:
+                cpu = time.thread_time()
+                try:
+                    yielded = steps.throw(error) if error is not None else steps.send(send)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    self.stats["cpu"] += time.thread_time() - cpu
+                send, error = None, None
+                try:
+                    send = yield yielded
+                except BaseException as e:
+                    error = e
+        finally:
+            self.stats["calls"] += 1
+            self.stats["wall"] += time.perf_counter() - started
+
+
+def _format_stall_stack(frame):
+    """Stos wątku pętli: ramki kodu projektu (kto zablokował) i STACK_DEPTH najgłębszych (co blokuje)."""
+    project = os.path.dirname(os.path.abspath(__file__)) + os.sep
+    entries = traceback.extract_stack(frame)
+    keep = [e for idx, e in enumerate(entries) if idx >= len(entries) - STACK_DEPTH or e.filename.startswith(project)]
+    return "".join(traceback.format_list(keep))
+
+
+def _wrap_agent(func, stats):
+    async def timed(*args, **kwargs):
+        return await _TimedCoroutine(func(*args, **kwargs), stats)
+
+    timed.__name__, timed.__doc__, timed.__wrapped__ = func.__name__, func.__doc__, func
+    return timed
+
+
+def _is_agent(name, value):
+    return asyncio.iscoroutinefunction(value) and (
+        name.startswith("agent_") or name in ("culinary_workshop", "ask_llm"))
+
+
+# ==============================================================================
+# SESJA PROFILOWANIA
+# ==============================================================================
+
+class Profiler:
+    """
+    Sesja profilowania przebiegu (`async with Profiler(raport):`).
+
+    Args:
+        report_path (str): Plik raportu (domyślnie profiles/profile-<czas>.txt).
+        stall_threshold (float): Próg przestoju pętli zdarzeń w sekundach.
+    """
+
+    def __init__(self, report_path=None, stall_threshold=STALL_THRESHOLD_S):
+        self.report_path = report_path or default_report_path()
+        self.stall_threshold = stall_threshold
+        self.phases = {}       # nazwa -> {calls, wall, cpu, peak, snapshots}
+        self.profiles = {}     # nazwa -> cProfile.Profile (tylko fazy niezagnieżdżone)
+        self.agents = {}       # nazwa -> {calls, wall, cpu}
+        self.stalls = []       # {at, duration, stack}
+        self._owner = None
+        self._snapshot = None
+        self._snapshotting = False
+        self._overhead = 0.0
+        self._patched = []
+        self._stop = threading.Event()
+
+    # --- Fazy ---
+
+    @contextmanager
+    def phase(self, name):
+        stats = self.phases.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak": 0, "snapshots": None})
+        # cProfile i migawki pamięci tylko dla fazy zewnętrznej (fazy równoległe/zagnieżdżone: same czasy)
+        exclusive = self._owner is None
+        if exclusive:
+            self._owner = name
+            tracemalloc.reset_peak()
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stats["calls"] += 1
+            stats["wall"] += time.perf_counter() - wall
+            stats["cpu"] += time.process_time() - cpu
+            if exclusive:
+                profile.disable()
+                self._owner = None
+                stats["peak"] = max(stats["peak"], tracemalloc.get_traced_memory()[1])
+                # Porównanie migawek (kosztowne) dopiero przy zapisie raportu
+                stats["snapshots"] = (self._snapshot, self._take_snapshot())
+
+    def _take_snapshot(self):
+        """Migawka tracemalloc (blokuje pętlę - strażnik przestojów ją pomija)."""
+        self._snapshotting = True
+        started = time.perf_counter()
+        try:
+            self._snapshot = tracemalloc.take_snapshot()
+        finally:
+            self._overhead += time.perf_counter() - started
+            self._beat = time.monotonic()
+            self._snapshotting = False
+        return self._snapshot
+
+    # --- Agenci ---
+
+    def _instrument(self):
+        # Moduły agentów są importowane zawsze (warsztat importuje agentów leniwie),
+        # moduły wywołujące - tylko jeśli są używane w tym przebiegu
+        modules = [importlib.import_module(name) for name in AGENT_MODULES]
+        modules += [sys.modules[name] for name in CALLER_MODULES if name in sys.modules]
+        for module in modules:
+            for name, value in list(vars(module).items()):
+                if _is_agent(name, value):
+                    stats = self.agents.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0})
+                    setattr(module, name, _wrap_agent(value, stats))
+                    self._patched.append((module, name, value))
+
+    def _restore(self):
+        for module, name, value in reversed(self._patched):
+            setattr(module, name, value)
+        self._patched.clear()
+
+    # --- Detektor przestojów pętli ---
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.stall_threshold / 4)
+
+    def _watchdog(self, loop_thread_id):
+        interval = self.stall_threshold / 4
+        current = None
+        while not self._stop.wait(interval):
+            lag = time.monotonic() - self._beat - interval
+            if self._snapshotting:
+                current = None
+            elif lag > self.stall_threshold:
+                if current is None:
+                    frame = sys._current_frames().get(loop_thread_id)
+                    current = {"at": datetime.now().strftime("%H:%M:%S.%f")[:-3], "duration": lag,
+                               "stack": _format_stall_stack(frame) if frame else "(brak stosu)"}
+                    self.stalls.append(current)
+                current["duration"] = lag
+            else:
+                current = None
+
+    # --- Cykl życia ---
+
+    async def __aenter__(self):
+        global _ACTIVE
+        _ACTIVE = self
+        tracemalloc.start()
+        self._instrument()
+        self._beat = time.monotonic()
+        self._take_snapshot()
+        self._started = (time.perf_counter(), time.process_time())
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, args=(threading.get_ident(),), daemon=True)
+        self._thread.start()
+        print(f"🔬 [PROFIL] Profilowanie włączone (raport: {self.report_path})")
+        return self
+
+    async def __aexit__(self, *exc):
+        global _ACTIVE
+        self._stop.set()
+        self._thread.join()
+        self._heartbeat_task.cancel()
+        self._restore()
+        total = (time.perf_counter() - self._started[0], time.process_time() - self._started[1])
+        tracemalloc.stop()
+        _ACTIVE = None
+        self.write_report(total)
+        print(f"🔬 [PROFIL] Raport zapisany: {self.report_path}")
+        return False
+
+    # --- Raport ---
+
+    def write_report(self, total):
+        lines = [f"RAPORT PROFILOWANIA - {datetime.now():%Y-%m-%d %H:%M:%S}",
+                 f"Całość: {total[0]:.2f}s ściennie, {total[1]:.2f}s CPU procesu "
+                 f"(w tym migawki pamięci: {self._overhead:.2f}s)", ""]
+
+        lines += ["=" * 78, "FAZY (czas ścienny / CPU procesu / szczyt pamięci)", "=" * 78]
+        for name, s in self.phases.items():
+            lines.append(f"{name:<24} x{s['calls']:<3} {s['wall']:8.2f}s {s['cpu']:8.2f}s CPU "
+                         f"{s['peak'] / 2 ** 20:8.1f} MiB")
+
+        lines += ["", "=" * 78, "AGENCI (czas ścienny / CPU własnych kroków; ściana - CPU = oczekiwanie)", "=" * 78]
+        for name, s in sorted(self.agents.items(), key=lambda item: -item[1]["wall"]):
+            if s["calls"]:
+                lines.append(f"{name:<36} x{s['calls']:<4} {s['wall']:8.2f}s {s['cpu']:8.3f}s CPU "
+                             f"({s['cpu'] / s['wall'] * 100 if s['wall'] else 0:4.1f}%)")
+
+        lines += ["", "=" * 78, f"PRZESTOJE PĘTLI ZDARZEŃ (> {self.stall_threshold * 1000:.0f} ms): {len(self.stalls)}", "=" * 78]
+        for stall in sorted(self.stalls, key=lambda s: -s["duration"]):
+            lines += [f"--- {stall['at']} | {stall['duration'] * 1000:.0f} ms", stall["stack"].rstrip()]
+
+        for name, profile in self.profiles.items():
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            lines += ["", "=" * 78, f"FAZA: {name} - cProfile (top {TOP_FUNCTIONS}, cumulative)", "=" * 78,
+                      out.getvalue().strip(), "", f"FAZA: {name} - największe przyrosty alokacji"]
+            snapshots = self.phases[name]["snapshots"]
+            diff = [d for d in (snapshots[1].compare_to(snapshots[0], "lineno") if snapshots else [])
+                    if not d.traceback[0].filename.startswith(_IGNORED_ALLOCATIONS)][:TOP_ALLOCATIONS]
+            lines += [str(d) for d in diff] or ["(brak)"]
+
+        os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
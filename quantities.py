@@ -0,0 +1,331 @@
+"""
+Moduł Ilości i Jednostek.
+
+Zawiera:
+- Parser ilości z pól `amount`/`unit` zwracanych przez agentów ("200g", "0,5", "1/2", "2-3", "pół").
+- Słownik polskich jednostek kuchennych (łyżka, szklanka, ząbek, szczypta...).
+- Przeliczanie ilości na gramy z użyciem katalogu składników (masa sztuki, gęstość).
+- Wspólny parser pozycji `{"item", "amount", "unit"}` do rekordów kanonicznych
+  (id składnika, gramy / ml, sztuki), używany przez Dietetyka, wycenę i listę zakupów.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from ingredient_catalog import piece_weight, density, resolve_ingredient
+from matching import normalize_dish_name
+
+# ==============================================================================
+# JEDNOSTKI
+# ==============================================================================
+
+# Jednostka kanoniczna: (rodzaj, mnożnik). Rodzaje: "g" (masa), "ml" (objętość), "szt" (sztuki)
+UNITS = {
+    "mg": ("g", 0.001), "g": ("g", 1.0), "gr": ("g", 1.0), "gram": ("g", 1.0), "dag": ("g", 10.0),
+    "dkg": ("g", 10.0), "kg": ("g", 1000.0), "kilogram": ("g", 1000.0),
+    "ml": ("ml", 1.0), "mililitr": ("ml", 1.0), "cl": ("ml", 10.0), "dl": ("ml", 100.0),
+    "l": ("ml", 1000.0), "litr": ("ml", 1000.0),
+    "łyżka": ("ml", 15.0), "łyżki": ("ml", 15.0), "łyżek": ("ml", 15.0), "łyż": ("ml", 15.0),
+    "tbsp": ("ml", 15.0),
+    "łyżeczka": ("ml", 5.0), "łyżeczki": ("ml", 5.0), "łyżeczek": ("ml", 5.0), "łyżecz": ("ml", 5.0),
+    "tsp": ("ml", 5.0),
+    "szklanka": ("ml", 250.0), "szklanki": ("ml", 250.0), "szklanek": ("ml", 250.0), "szkl": ("ml", 250.0),
+    "kubek": ("ml", 250.0), "cup": ("ml", 240.0), "filiżanka": ("ml", 150.0),
+    "szt": ("szt", 1.0), "sztuka": ("szt", 1.0), "sztuki": ("szt", 1.0), "sztuk": ("szt", 1.0),
+    "ząbek": ("szt", 1.0), "ząbki": ("szt", 1.0), "ząbków": ("szt", 1.0),
+    "główka": ("szt", 8.0), "plaster": ("szt", 0.3), "plastry": ("szt", 0.3), "plasterek": ("szt", 0.2),
+    "szczypta": ("g", 0.5), "szczypty": ("g", 0.5), "szczypt": ("g", 0.5),
+    "garść": ("g", 30.0), "garści": ("g", 30.0), "pęczek": ("g", 50.0), "pęczki": ("g", 50.0),
+    "puszka": ("g", 400.0), "puszki": ("g", 400.0), "słoik": ("g", 300.0), "słój": ("g", 300.0),
+    "opakowanie": ("g", 250.0), "opakowania": ("g", 250.0), "kostka": ("g", 200.0),
+    "kromka": ("szt", 1.0),
+}
+
+# Rdzenie odmian (gramów, litrów, plasterki, filiżanki, garście...) -> jednostka z UNITS.
+# Sprawdzane od najdłuższego, więc "łyżecz" wygrywa z "łyż", a "kilogram" z "gram".
+UNIT_STEMS = {
+    "miligram": "mg", "gram": "gram", "dekagram": "dag", "kilogram": "kilogram",
+    "mililitr": "mililitr", "litr": "litr",
+    "łyżecz": "łyżeczka", "łyżk": "łyżka", "łyżek": "łyżka", "szklan": "szklanka", "szklanec": "szklanka",
+    "filiżan": "filiżanka", "kubk": "kubek", "sztuk": "sztuka", "ząb": "ząbek", "główk": "główka",
+    "główek": "główka", "plasterk": "plasterek", "plasterek": "plasterek", "plastr": "plaster",
+    "plaster": "plaster", "kromk": "kromka", "kromek": "kromka", "szczypt": "szczypta",
+    "garś": "garść", "garśc": "garść", "pęcz": "pęczek", "puszk": "puszka", "puszek": "puszka",
+    "słoik": "słoik", "słoj": "słój", "opakowa": "opakowanie", "kostk": "kostka", "kostek": "kostka",
+}
+_STEMS_BY_LENGTH = sorted(UNIT_STEMS, key=len, reverse=True)
+
+# Słowa w ilości, które nie są jednostką, a nie zmieniają liczenia w sztukach ("2 duże", "ok. 3")
+_PIECE_WORDS = {"ok", "około", "ca", "lub", "albo", "na", "po", "x", "i"}
+_PIECE_WORD_PREFIXES = ("mał", "średn", "duż", "spor", "cał")
+
+# Ilości słowne
+WORD_QUANTITIES = {"pół": 0.5, "ćwierć": 0.25, "półtorej": 1.5, "półtora": 1.5, "jeden": 1, "jedna": 1,
+                   "dwa": 2, "dwie": 2, "trzy": 3, "cztery": 4, "kilka": 3, "odrobina": 0.3}
+
+# Określenia "bez ilości" (np. "do smaku") - traktowane jako pomijalne
+NEGLIGIBLE_PHRASES = ("do smaku", "opcjonalnie", "do dekoracji", "wolny wybór", "dowolnie")
+
+# Ułamki zapisane jednym znakiem Unicode ("½ szklanki", "1½ łyżki")
+UNICODE_FRACTIONS = {"½": 0.5, "⅓": 1 / 3, "⅔": 2 / 3, "¼": 0.25, "¾": 0.75, "⅕": 0.2, "⅛": 0.125}
+
+_UNICODE_FRACTION_RE = re.compile(r'(\d*)\s*([' + "".join(UNICODE_FRACTIONS) + r'])')
+_NUMBER_RE = re.compile(r'(\d+(?:[.,]\d+)?)(?:\s*/\s*(\d+))?')
+_RANGE_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*[-–]\s*(\d+(?:[.,]\d+)?)')
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+
+def _to_float(text):
+    return float(text.replace(",", "."))
+
+
+def _expand_unicode_fractions(text):
+    """Zamienia "1½" na "1.5", a "½" na "0.5" (reszta parsera widzi zwykłe liczby)."""
+    def replace(match):
+        whole = float(match.group(1)) if match.group(1) else 0.0
+        return f"{whole + UNICODE_FRACTIONS[match.group(2)]:g}"
+    return _UNICODE_FRACTION_RE.sub(replace, text)
+
+
+def parse_quantity(text):
+    """
+    Wyciąga liczbę z tekstu ilości. Zakresy ("2-3") zamieniane są na średnią,
+    ułamki ("1/2", "½") i liczby mieszane ("1 1/2", "1½") na wartości dziesiętne.
+
+    Returns:
+        float | None: Ilość lub None, jeśli w tekście nie ma liczby.
+    """
+    text = _expand_unicode_fractions(str(text or "").lower())
+    range_match = _RANGE_RE.search(text)
+    if range_match:
+        return (_to_float(range_match.group(1)) + _to_float(range_match.group(2))) / 2
+
+    numbers = _NUMBER_RE.findall(text)
+    if numbers:
+        total = 0.0
+        for whole, denominator in numbers[:2]:
+            value = _to_float(whole) / float(denominator) if denominator else _to_float(whole)
+            if total and not denominator:
+                break  # Druga liczba bez ułamka to już inna informacja (np. "200g 2 szt")
+            total += value
+        return total
+
+    for word in _WORD_RE.findall(text):
+        if word in WORD_QUANTITIES:
+            return float(WORD_QUANTITIES[word])
+    return None
+
+
+def parse_unit(*texts):
+    """
+    Znajduje pierwszą rozpoznaną jednostkę w podanych tekstach (np. amount="200g", unit="szt").
+    Jednostka sklejona z liczbą ("200g") ma pierwszeństwo przed polem `unit`.
+
+    Returns:
+        str | None: Nazwa jednostki ze słownika UNITS.
+    """
+    for text in texts:
+        for word in _WORD_RE.findall(str(text or "").lower()):
+            if word in UNITS:
+                return word
+            # Odmiany ("200 gramów", "2 plasterki", "3 garście")
+            stem = next((stem for stem in _STEMS_BY_LENGTH if word.startswith(stem)), None)
+            if stem:
+                return UNIT_STEMS[stem]
+            # Skróty z kropką lub niestandardowe końcówki ("łyżk", "szklan")
+            for unit in UNITS:
+                if len(word) >= 4 and unit.startswith(word):
+                    return unit
+    return None
+
+
+# ==============================================================================
+# REKORDY KANONICZNE
+# ==============================================================================
+
+# Wynik parsowania samej ilości (niezależny od składnika, więc cache'owany po tekstach)
+Quantity = namedtuple("Quantity", ["amount", "unit", "kind", "factor", "negligible"])
+
+# Pozycja przepisu w postaci kanonicznej. Dokładnie jedno z pól grams / ml / count jest
+# "natywne" (wg rodzaju jednostki); `grams` jest zawsze wyliczane, jeśli to możliwe.
+IngredientRecord = namedtuple("IngredientRecord", ["item", "ingredient_id", "kind", "grams", "ml", "count", "negligible"])
+
+
+@lru_cache(maxsize=4096)
+def parse_amount(amount, unit):
+    """
+    Parsuje pola `amount`/`unit` do ilości w jednostce kanonicznej (g, ml lub szt).
+
+    Returns:
+        Quantity | None: Ilość (amount * factor w jednostce `kind`) lub None, jeśli nie da się jej odczytać
+        (także przy nierozpoznanym słowie jednostki - bez zgadywania sztuk).
+    """
+    combined = f"{amount or ''} {unit or ''}".lower()
+    if any(phrase in combined for phrase in NEGLIGIBLE_PHRASES):
+        return Quantity(0.0, None, "g", 1.0, True)
+
+    quantity = parse_quantity(amount)
+    if quantity is None:
+        quantity = parse_quantity(unit)
+    unit_name = parse_unit(amount, unit)
+    if quantity is None:
+        # "szczypta", "garść" bez liczby oznacza jedną jednostkę
+        if unit_name is None:
+            return None
+        quantity = 1.0
+
+    if unit_name is None:
+        # Sama liczba to sztuki ("2" jajka); nieznane słowo to nieznana jednostka
+        unknown = [w for w in _WORD_RE.findall(combined)
+                   if w not in WORD_QUANTITIES and w not in _PIECE_WORDS and not w.startswith(_PIECE_WORD_PREFIXES)]
+        if unknown:
+            return None
+        return Quantity(quantity, None, "szt", 1.0, False)
+
+    kind, factor = UNITS[unit_name]
+    return Quantity(quantity, unit_name, kind, factor, False)
+
+
+def _grams(parsed, ingredient_id):
+    """Masa w gramach dla sparsowanej ilości (gęstość i masa sztuki z katalogu)."""
+    value = parsed.amount * parsed.factor
+    if parsed.kind == "g":
+        return value
+    if parsed.kind == "ml":
+        return value * density(ingredient_id)
+    return value * piece_weight(ingredient_id)
+
+
+def to_grams(amount, unit, ingredient_id):
+    """
+    Przelicza ilość składnika na gramy.
+
+    Args:
+        amount (str): Pole `amount` od agenta (np. "200g", "2", "1/2", "do smaku").
+        unit (str): Pole `unit` od agenta (np. "g", "łyżka", "szt").
+        ingredient_id (str): ID składnika z katalogu (masa sztuki, gęstość).
+
+    Returns:
+        float | None: Masa w gramach, 0.0 dla ilości pomijalnych lub None, jeśli nie da się przeliczyć.
+    """
+    parsed = parse_amount(_text(amount), _text(unit))
+    return None if parsed is None else _grams(parsed, ingredient_id)
+
+
+def _text(value):
+    """Klucz cache: agenci zwracają czasem liczby zamiast tekstu."""
+    return "" if value is None else str(value).strip()
+
+
+@lru_cache(maxsize=4096)
+def _parse_line(item, amount, unit):
+    ingredient_id = resolve_ingredient(item)
+    parsed = parse_amount(amount, unit)
+    if parsed is None:
+        return IngredientRecord(item, ingredient_id, None, None, None, None, False)
+
+    value = parsed.amount * parsed.factor
+    grams = _grams(parsed, ingredient_id) if ingredient_id else (value if parsed.kind == "g" else None)
+    return IngredientRecord(
+        item, ingredient_id, parsed.kind, grams,
+        value if parsed.kind == "ml" else None,
+        value if parsed.kind == "szt" else None,
+        parsed.negligible,
+    )
+
+
+def parse_ingredient(ingredient):
+    """
+    Zamienia pozycję przepisu od dowolnego agenta na rekord kanoniczny.
+
+    Args:
+        ingredient (dict): Pozycja {"item", "amount", "unit"}.
+
+    Returns:
+        IngredientRecord: ingredient_id=None dla składników spoza katalogu,
+                          grams=None, gdy masy nie da się wyliczyć.
+    """
+    return _parse_line(_text(ingredient.get("item")), _text(ingredient.get("amount")), _text(ingredient.get("unit")))
+
+
+def parse_ingredients(recipe):
+    """Rekordy kanoniczne wszystkich (poprawnych) pozycji przepisu."""
+    if not isinstance(recipe, dict):
+        return []
+    return [parse_ingredient(i) for i in recipe.get("ingredients") or [] if isinstance(i, dict)]
+
+
+def format_amount(amount, unit):
+    """
+    Tekst ilości do wyświetlenia bez podwójnej jednostki
+    (amount="200g", unit="g" -> "200g"; amount="2 łyżki", unit="łyżka" -> "2 łyżki").
+    """
+    amount, unit = _text(amount), _text(unit)
+    if amount and unit:
+        already_in_amount = parse_unit(amount) is not None or unit.lower() in amount.lower().split()
+        return amount if already_in_amount else f"{amount} {unit}"
+    return amount or unit
+
+
+# ==============================================================================
+# LISTA ZAKUPÓW
+# ==============================================================================
+
+def aggregate_shopping_list(recipes):
+    """
+    Sumuje składniki posiłków dnia (np. śniadanie, obiad, kolacja) w listę zakupów.
+
+    Pozycje łączone są po znormalizowanej nazwie produktu (płyny w ml, produkty na sztuki
+    w sztukach, reszta w gramach). ID z katalogu to grupa wartości odżywczych, nie produkt
+    ("parmezan" i "feta" to oba "ser"), więc nie jest kluczem listy. Nazwą pozycji jest
+    pierwsza napotkana nazwa od agenta. Ilości "do smaku" nie są sumowane.
+
+    Returns:
+        list[dict]: {"name", "ingredient_id", "grams", "ml", "count", "meals"} posortowane po nazwie.
+    """
+    totals = {}
+    for meal_idx, recipe in enumerate(recipes):
+        for record in parse_ingredients(recipe):
+            if not record.item:
+                continue
+            key = normalize_dish_name(record.item) or record.item
+            entry = totals.setdefault(key, {
+                "name": record.item,
+                "ingredient_id": record.ingredient_id, "grams": 0.0, "ml": 0.0, "count": 0.0, "meals": set(),
+            })
+            entry["meals"].add(meal_idx)
+            if record.negligible or record.kind is None:
+                continue
+            if record.kind == "ml":
+                entry["ml"] += record.ml
+            elif record.kind == "szt":
+                entry["count"] += record.count
+            else:
+                entry["grams"] += record.grams or 0.0
+
+    items = []
+    for entry in totals.values():
+        entry["meals"] = sorted(entry["meals"])
+        items.append(entry)
+    return sorted(items, key=lambda e: e["name"])
+
+
+def _format_measure(value, unit):
+    """Ilość zaokrąglona do jednostki; ułamki poniżej 1 jako "<1" (zamiast mylącego "0")."""
+    return f"<1 {unit}" if value < 1 else f"{value:.0f} {unit}"
+
+
+def format_shopping_list(items, count_unit="szt."):
+    """Lista zakupów w Markdown (jedna pozycja na linię; `count_unit` - jednostka sztuk w lokalizacji)."""
+    lines = []
+    for entry in items:
+        parts = []
+        if entry["grams"]:
+            parts.append(_format_measure(entry["grams"], "g"))
+        if entry["ml"]:
+            parts.append(_format_measure(entry["ml"], "ml"))
+        if entry["count"]:
+            parts.append(f"{entry['count']:g} {count_unit}")
+        lines.append(f"- {entry['name']}" + (f" – {' + '.join(parts)}" if parts else ""))
+    return "\n".join(lines)
@@ -0,0 +1,440 @@
+"""
+Moduł Prognozy Zużycia Tokenów i Kontroli Dopuszczenia Przebiegu.
+
+Pełny przebieg (3 opcje x do 3 iteracji warsztatu x 3 agentów, planiści, styliści, wydawca)
+potrafi przekroczyć dzienny limit tokenów klucza Groq - wtedy pada w połowie serią 429.
+Moduł pilnuje, żeby przebieg nie zaczynał tego, czego nie skończy:
+
+- Telemetria (`record_usage`, wołane przez `core.ask_llm`): tokeny każdego wywołania per agent
+  (średnia i rozrzut, EWMA) i dzienne zużycie per klucz, w SQLite (tryb WAL, `memory/token_usage.db`,
+  jak `rate_limit`) - wspólne i atomowe dla procesów puli `workers`.
+  Klucz, który dostał 429 z limitem dziennym, jest wyłączony do końca dnia (`mark_exhausted`).
+- Prognoza (`estimate_run`): najgorszy przypadek przebiegu z kosztów agentów (średnia + 2 odchylenia;
+  bez telemetrii - AGENT_PRIORS) i kształtu przebiegu (liczba pomysłów w warsztacie, audyty LLM
+  lub lokalne, prezentacja LLM lub lokalna).
+- Dopuszczenie (`admission`): przed przebiegiem wybiera największy wariant z RUN_LADDER, który
+  mieści się w pozostałym limicie kluczy (minus rezerwacje innych przebiegów w procesie).
+  Gdy nie mieści się nawet najmniejszy - przebieg nie startuje. Plan tygodnia (`days` > 1)
+  dostaje tyle dni, ile zmieści się w limicie.
+- Podsumowanie kosztów agentów (`export_agent_costs`, `memory/agent_costs.json`): baza telemetrii
+  jest lokalna dla maszyny (.gitignore), więc przepływ GitHub Actions (świeże repozytorium przy
+  każdym uruchomieniu) zapisuje po przebiegu małe podsumowanie per agent do gita. Prognoza
+  bierze koszt agenta z bazy, a gdy jej brak - z podsumowania, dopiero potem z AGENT_PRIORS.
+- W trakcie przebiegu (`current_budget`): warsztat przed każdym pomysłem sprawdza, czy limit
+  nadal wystarcza na pomysł i resztę przebiegu (w razie potrzeby przechodzi na audyty lokalne
+  lub kończy z zebranymi opcjami), a redakcja - czy stać ją na stylistów i wydawcę.
+
+Konfiguracja (.env):
+    GROQ_TPD=500000   # dzienny limit tokenów jednego klucza
+    GROQ_RPD=14400    # dzienny limit zapytań jednego klucza
+    LLM_USAGE_DB=...  # inna baza telemetrii (np. test obciążeniowy)
+
+Użycie z linii komend:
+    python quota.py                # koszty agentów, zużycie kluczy i decyzja dopuszczenia
+    python quota.py --tpd 40000    # symulacja innego limitu dziennego
+    python quota.py --export       # podsumowanie kosztów agentów do memory/agent_costs.json
+"""
+
+import os
+import sqlite3
+import argparse
+import contextvars
+from collections import namedtuple
+from datetime import datetime, timezone
+from contextlib import contextmanager, closing
+
+from history import HISTORY_DIR, _load_json_file, _save_json_file
+from rate_limit import key_id
+
+# Stałe konfiguracyjne
+USAGE_DB_FILE = os.environ.get("LLM_USAGE_DB") or os.path.join(HISTORY_DIR, "token_usage.db")
+AGENT_COSTS_FILE = os.path.join(HISTORY_DIR, "agent_costs.json")   # Podsumowanie w gicie (GitHub Actions)
+TPD = int(os.environ.get("GROQ_TPD", 500_000))
+RPD = int(os.environ.get("GROQ_RPD", 14_400))
+EWMA_ALPHA = 0.2
+MIN_SAMPLES = 3          # Poniżej - koszt agenta z AGENT_PRIORS
+SAFETY_MARGIN = 1.15     # Zapas prognozy (dopytania llm_json, niedoszacowania)
+WORKSHOP_ITERATIONS = 3  # Jak MAX_ITERATIONS w `core.culinary_workshop`
+OPTIONS = 3
+STYLIST_CALLS = 4        # Intro i trzy przepisy
+
+# Koszt jednego wywołania (tokeny promptu i odpowiedzi) bez telemetrii
+AGENT_PRIORS = {
+    "Analityk": 1500, "Strateg": 600, "Analityk Trendów": 2000,
+    "Chef": 2500, "Logistyk": 1500, "Dietetyk": 1500,
+    "Planista": 2500, "Stylista": 1500, "Wydawca": 4000, "Tłumacz": 4000,
+}
+DEFAULT_PRIOR = 2000
+
+# Warianty przebiegu od największego: (pomysły w warsztacie, audyty lokalne, prezentacja lokalna)
+RUN_LADDER = [(5, False, False), (3, False, False), (3, True, False), (3, True, True), (1, True, True)]
+
+Admission = namedtuple("Admission", "budget admitted")   # admitted=False - przebieg nie startuje
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    agent TEXT PRIMARY KEY,
+    calls INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    var REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keys (
+    key_id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    requests INTEGER NOT NULL,
+    exhausted INTEGER NOT NULL
+);
+"""
+
+_BUDGET = contextvars.ContextVar("run_budget", default=None)   # Budżet bieżącego przebiegu (per zadanie)
+_ACTIVE = []   # Budżety trwających przebiegów w procesie (rezerwacje)
+
+
+def _today():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+# ==============================================================================
+# TELEMETRIA
+# ==============================================================================
+
+def _connect(db_path=None):
+    db_path = db_path or USAGE_DB_FILE
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def load_usage(db_path=None):
+    """
+    Telemetria: {"agents": {agent: {calls, mean, var}}, "keys": {id klucza: {date, tokens, requests, exhausted}}}.
+    Agenci bez wpisu w bazie (świeże repozytorium) - z podsumowania `AGENT_COSTS_FILE`.
+    """
+    agents = dict(_load_json_file(AGENT_COSTS_FILE, {}))
+    with closing(_connect(db_path)) as conn:
+        agents.update({agent: {"calls": calls, "mean": mean, "var": var}
+                       for agent, calls, mean, var in conn.execute("SELECT agent, calls, mean, var FROM agents")})
+        keys = {kid: {"date": date, "tokens": tokens, "requests": requests, "exhausted": bool(exhausted)}
+                for kid, date, tokens, requests, exhausted in
+                conn.execute("SELECT key_id, date, tokens, requests, exhausted FROM keys")}
+    return {"agents": agents, "keys": keys}
+
+
+def export_agent_costs(path=None, db_path=None):
+    """Zapisuje podsumowanie kosztów agentów (bez kluczy) - małe i stabilne, do zapisania w gicie."""
+    agents = load_usage(db_path)["agents"]
+    summary = {agent: {"calls": stats["calls"], "mean": round(stats["mean"], 1), "var": round(stats["var"], 1)}
+               for agent, stats in sorted(agents.items())}
+    _save_json_file(path or AGENT_COSTS_FILE, summary)
+    return summary
+
+
+def _key_today(usage, api_key):
+    """Dzienne zużycie klucza (nowy dzień UTC - czysta karta)."""
+    entry = usage.setdefault("keys", {}).get(key_id(api_key))
+    if not entry or entry.get("date") != _today():
+        entry = {"date": _today(), "tokens": 0, "requests": 0, "exhausted": False}
+        usage["keys"][key_id(api_key)] = entry
+    return entry
+
+
+def _update_key(conn, api_key, tokens=0, requests=0, exhausted=False):
+    """Dzienne liczniki klucza w bieżącej transakcji (nowy dzień UTC zeruje liczniki)."""
+    conn.execute(
+        "INSERT INTO keys (key_id, date, tokens, requests, exhausted) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(key_id) DO UPDATE SET "
+        "tokens = CASE WHEN date = excluded.date THEN tokens + excluded.tokens ELSE excluded.tokens END, "
+        "requests = CASE WHEN date = excluded.date THEN requests + excluded.requests ELSE excluded.requests END, "
+        "exhausted = CASE WHEN date = excluded.date THEN max(exhausted, excluded.exhausted) ELSE excluded.exhausted END, "
+        "date = excluded.date",
+        (key_id(api_key), _today(), tokens, requests, int(exhausted)),
+    )
+
+
+def record_usage(agent, tokens, api_key, db_path=None):
+    """
+    Zapisuje zużycie jednego wywołania LLM: koszt agenta, dzienne zużycie klucza i budżet przebiegu.
+    Odczyt i zapis w jednej transakcji BEGIN IMMEDIATE - atomowe między procesami (pula `workers`).
+    Blokujące (SQLite) - w pętli zdarzeń wołane przez `asyncio.to_thread`.
+    """
+    if not tokens:
+        return
+    with closing(_connect(db_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT calls, mean, var FROM agents WHERE agent = ?", (agent,)).fetchone()
+            calls, mean, var = row or (0, float(tokens), 0.0)
+            diff = tokens - mean
+            mean += EWMA_ALPHA * diff
+            var = (1 - EWMA_ALPHA) * (var + EWMA_ALPHA * diff * diff)
+            conn.execute("INSERT OR REPLACE INTO agents (agent, calls, mean, var) VALUES (?, ?, ?, ?)",
+                         (agent, calls + 1, mean, var))
+            if api_key:
+                _update_key(conn, api_key, tokens=tokens, requests=1)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    budget = _BUDGET.get()
+    if budget:
+        budget.spent += tokens
+
+
+def mark_exhausted(api_key, db_path=None):
+    """Klucz wyczerpał limit dzienny (429 "per day") - pomijany do końca dnia."""
+    with closing(_connect(db_path)) as conn:
+        _update_key(conn, api_key, exhausted=True)
+    print(f"  🚫 Klucz {key_id(api_key)[:6]}: wyczerpany limit dzienny")
+
+
+def is_daily_limit_error(error):
+    """Czy błąd 429 dotyczy limitu dziennego (TPD/RPD), a nie minutowego."""
+    text = str(error).lower()
+    return "429" in text and ("per day" in text or "tpd" in text or "rpd" in text)
+
+
+def usable_keys(api_keys, db_path=None):
+    """Indeksy kluczy, które nie wyczerpały dziś limitu (wszystkie, gdy wyczerpane są wszystkie)."""
+    usage = load_usage(db_path)
+    usable = [idx for idx, key in enumerate(api_keys) if not _key_today(usage, key)["exhausted"]]
+    return usable or list(range(len(api_keys)))
+
+
+def remaining_quota(api_keys, db_path=None):
+    """Pozostały dzisiejszy limit kluczy: (tokeny, zapytania) - suma po kluczach niewyczerpanych."""
+    usage = load_usage(db_path)
+    tokens = requests = 0
+    for key in api_keys:
+        entry = _key_today(usage, key)
+        if not entry["exhausted"]:
+            tokens += max(0, TPD - entry["tokens"])
+            requests += max(0, RPD - entry["requests"])
+    return tokens, requests
+
+
+# ==============================================================================
+# PROGNOZA
+# ==============================================================================
+
+def agent_cost(agent, usage=None):
+    """Koszt wywołania agenta w najgorszym (rozsądnym) przypadku: średnia + 2 odchylenia z telemetrii."""
+    stats = (usage or load_usage()).get("agents", {}).get(agent)
+    if not stats or stats["calls"] < MIN_SAMPLES:
+        return AGENT_PRIORS.get(agent, DEFAULT_PRIOR)
+    return stats["mean"] + 2 * stats["var"] ** 0.5
+
+
+def estimate_run(ideas, local_audits=False, local_presentation=False, usage=None, analysis=True, research=True, days=1):
+    """
+    Prognoza przebiegu (najgorszy przypadek: każdy pomysł przez wszystkie iteracje i audyty).
+    Plan tygodnia (`days` > 1): jedna analiza i jeden Strateg, reszta - dla każdego dnia.
+
+    Returns:
+        tuple: (tokeny, zapytania).
+    """
+    usage = usage or load_usage()
+    cost = lambda agent: agent_cost(agent, usage)
+    calls = []
+    if analysis:
+        calls += ["Analityk"]
+    if research:
+        calls += ["Strateg"] + ["Analityk Trendów"] * days
+    workshop = ["Chef"] + ([] if local_audits else ["Logistyk", "Dietetyk"])
+    calls += workshop * (ideas * WORKSHOP_ITERATIONS * days)
+    calls += tail_calls(OPTIONS, local_presentation) * days
+    return sum(map(cost, calls)) * SAFETY_MARGIN, len(calls)
+
+
+def tail_calls(options, local_presentation=False):
+    """Wywołania po warsztacie: planiści dla opcji i redakcja (styliści i wydawca)."""
+    return ["Planista"] * options + ([] if local_presentation else ["Stylista"] * STYLIST_CALLS + ["Wydawca"])
+
+
+# ==============================================================================
+# DOPUSZCZENIE I BUDŻET PRZEBIEGU
+# ==============================================================================
+
+class RunBudget:
+    """Wariant przebiegu dopuszczony przez `admission` i jego bieżące zużycie."""
+
+    def __init__(self, api_keys, ideas, local_audits, local_presentation, reserved, days=1):
+        self.api_keys = api_keys
+        self.ideas, self.local_audits, self.local_presentation = ideas, local_audits, local_presentation
+        self.days = days   # Plan tygodnia: pomysły liczone łącznie dla wszystkich dni
+        self.reserved = reserved
+        self.spent = 0
+        self.workshopped = 0
+
+    @property
+    def outstanding(self):
+        """Rezerwacja, której przebieg jeszcze nie zużył."""
+        return max(0.0, self.reserved - self.spent)
+
+    def available(self):
+        """Pozostały limit kluczy dla tego przebiegu (bez rezerwacji innych przebiegów)."""
+        tokens, _ = remaining_quota(self.api_keys)
+        return tokens - sum(b.outstanding for b in _ACTIVE if b is not self)
+
+    def next_idea(self, options):
+        """
+        Czy warsztat może wziąć kolejny pomysł (mając `options` zweryfikowanych opcji).
+        Gdy limit nie wystarcza na pomysł z audytami LLM, przechodzi na audyty lokalne.
+        """
+        if self.workshopped >= self.ideas * self.days:
+            return False
+        usage = load_usage()
+        available = self.available()
+        tail = sum(agent_cost(a, usage) for a in tail_calls(max(1, options), self.local_presentation))
+        for local in (True,) if self.local_audits else (False, True):
+            workshop = ["Chef"] + ([] if local else ["Logistyk", "Dietetyk"])
+            needed = (sum(agent_cost(a, usage) for a in workshop) * WORKSHOP_ITERATIONS + tail) * SAFETY_MARGIN
+            if needed <= available:
+                if local and not self.local_audits:
+                    print("  🪫 [LIMIT] Przechodzę na audyty lokalne")
+                    self.local_audits = True
+                self.workshopped += 1
+                return True
+        print(f"  🪫 [LIMIT] Kończę warsztat: zostało {available:.0f} tokenów")
+        return False
+
+    def affords(self, agent):
+        """Czy stać nas na jedno wywołanie agenta poza prognozą przebiegu (np. Tłumacz lokalizacji)."""
+        return agent_cost(agent, load_usage()) * SAFETY_MARGIN <= self.available()
+
+    def affords_presentation(self):
+        """Czy stać nas na stylistów i wydawcę (inaczej - prezentacja lokalna)."""
+        if self.local_presentation:
+            return False
+        usage = load_usage()
+        needed = sum(agent_cost(a, usage) for a in tail_calls(0)) * SAFETY_MARGIN
+        if needed > self.available():
+            print("  🪫 [LIMIT] Prezentacja lokalna (bez stylistów i wydawcy)")
+            self.local_presentation = True
+        return not self.local_presentation
+
+
+def plan_run(api_keys, usage=None, days=1):
+    """
+    Największy wariant RUN_LADDER mieszczący się w pozostałym limicie.
+    Plan tygodnia: warianty z pełną ankietą (co najmniej OPTIONS pomysłów) dla `days` dni, potem
+    dla coraz mniejszej liczby dni; awaryjny wariant z jednym pomysłem tylko dla jednego dnia.
+
+    Returns:
+        tuple: (wariant lub None, prognoza tokenów wariantu, dostępne tokeny, liczba dni).
+    """
+    usage = usage or load_usage()
+    tokens, requests = remaining_quota(api_keys)
+    available = tokens - sum(b.outstanding for b in _ACTIVE)
+    needed = 0.0
+    for day_count in range(days, 0, -1):
+        for variant in RUN_LADDER if day_count == 1 else [v for v in RUN_LADDER if v[0] >= OPTIONS]:
+            needed, calls = estimate_run(*variant, usage=usage, days=day_count)
+            if needed <= available and calls <= requests:
+                return variant, needed, available, day_count
+    return None, needed, available, 0
+
+
+def background_workshop_cost(usage=None):
+    """Prognoza jednego warsztatu w tle (research kuchni i pomysł z audytami LLM) - `option_pool`."""
+    usage = usage or load_usage()
+    calls = ["Strateg", "Analityk Trendów"] + ["Chef", "Logistyk", "Dietetyk"] * WORKSHOP_ITERATIONS
+    return sum(agent_cost(a, usage) for a in calls) * SAFETY_MARGIN, len(calls)
+
+
+def spare_quota(api_keys, reserve_daily_run=True, usage=None):
+    """
+    Limit wolny dla pracy w tle: pozostały limit kluczy minus rezerwacje trwających przebiegów
+    i (jeśli dzienny przebieg jeszcze dziś się odbędzie) prognoza jego największego wariantu.
+
+    Returns:
+        tuple: (tokeny, zapytania) - mogą być ujemne, gdy limit nie pokrywa nawet rezerwacji.
+    """
+    usage = usage or load_usage()
+    tokens, requests = remaining_quota(api_keys)
+    tokens -= sum(b.outstanding for b in _ACTIVE)
+    if reserve_daily_run:
+        daily_tokens, daily_calls = estimate_run(*RUN_LADDER[0], usage=usage)
+        tokens, requests = tokens - daily_tokens, requests - daily_calls
+    return tokens, requests
+
+
+@contextmanager
+def admission(api_keys, days=1):
+    """
+    Dopuszczenie przebiegu: budżet bieżącego zadania (`current_budget`) z rezerwacją prognozy.
+    Bez kluczy (LLM niedostępny, testy) - brak budżetu i brak ograniczeń.
+
+    Args:
+        days (int): Liczba dni planu tygodnia; dopuszczony budżet ma `days` <= tej liczby.
+
+    Yields:
+        Admission: (budżet lub None, czy dopuszczono - False: nie startować).
+    """
+    if not api_keys:
+        yield Admission(None, True)
+        return
+    variant, needed, available, day_count = plan_run(api_keys, days=days)
+    if not variant:
+        print(f"🪫 [LIMIT] Przebieg niedopuszczony: prognoza {needed:.0f} > dostępne {available:.0f} tokenów")
+        yield Admission(None, False)
+        return
+    ideas, local_audits, local_presentation = variant
+    budget = RunBudget(api_keys, ideas, local_audits, local_presentation, needed, day_count)
+    print(f"🔋 [LIMIT] Prognoza {needed:.0f}/{available:.0f} tokenów: "
+          + (f"{day_count}/{days} dni, " if days > 1 else "")
+          + f"{ideas} pomysłów, audyty {'lokalne' if local_audits else 'LLM'}, "
+          f"prezentacja {'lokalna' if local_presentation else 'LLM'}")
+    token = _BUDGET.set(budget)
+    _ACTIVE.append(budget)
+    try:
+        yield Admission(budget, True)
+    finally:
+        _ACTIVE.remove(budget)
+        _BUDGET.reset(token)
+
+
+def current_budget():
+    """Budżet przebiegu w bieżącym zadaniu asyncio (None - bez ograniczeń)."""
+    return _BUDGET.get()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prognoza zużycia tokenów i dopuszczenie przebiegu.")
+    parser.add_argument("--tpd", type=int, default=None, help="Symulowany dzienny limit tokenów klucza.")
+    parser.add_argument("--export", action="store_true", help="Zapisz podsumowanie kosztów agentów (do gita).")
+    args = parser.parse_args()
+    if args.tpd:
+        TPD = args.tpd
+    if args.export:
+        summary = export_agent_costs()
+        print(f"💾 Zapisano koszty {len(summary)} agentów: {AGENT_COSTS_FILE}")
+        raise SystemExit(0)
+
+    from core import GROQ_API_KEYS
+
+    usage = load_usage()
+    print("🤖 Koszt wywołania agenta (tokeny):")
+    for agent in sorted(set(AGENT_PRIORS) | set(usage.get("agents", {}))):
+        stats = usage.get("agents", {}).get(agent)
+        source = f"{stats['calls']} wywołań, średnio {stats['mean']:.0f}" if stats else "szacunek"
+        print(f"  {agent:<18}{agent_cost(agent, usage):>8.0f}  ({source})")
+
+    print(f"\n🔑 Klucze (limit dzienny {TPD} tokenów, {RPD} zapytań):")
+    for key in GROQ_API_KEYS:
+        entry = _key_today(usage, key)
+        print(f"  {key_id(key)[:6]}: {entry['tokens']} tokenów, {entry['requests']} zapytań"
+              f"{' - WYCZERPANY' if entry['exhausted'] else ''}")
+
+    print("\n📐 Warianty przebiegu:")
+    for ideas, local_audits, local_presentation in RUN_LADDER:
+        tokens, calls = estimate_run(ideas, local_audits, local_presentation, usage)
+        print(f"  {ideas} pomysłów, audyty {'lokalne' if local_audits else 'LLM':<7} prezentacja "
+              f"{'lokalna' if local_presentation else 'LLM':<8}: {tokens:>8.0f} tokenów, {calls} zapytań")
+    variant, needed, available, _ = plan_run(GROQ_API_KEYS, usage)
+    print(f"\n{'✅ Dopuszczony: ' + str(variant) if variant else '🪫 Niedopuszczony'} "
+          f"(prognoza {needed:.0f}, dostępne {available:.0f})")
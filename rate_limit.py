@@ -0,0 +1,213 @@
+"""
+Moduł Limitów Zapytań LLM (Wspólnych dla Procesów).
+
+Kubełki tokenów per klucz API Groq w SQLite (tryb WAL, `memory/rate_limits.db`) - wspólne
+dla wszystkich procesów na maszynie (pula procesów roboczych `workers.py`, bot, cron):
+- Dwa kubełki na klucz: zapytania na minutę (RPM) i tokeny na minutę (TPM).
+- Rezerwacja przed każdą próbą zapytania (szacunek tokenów), rozliczenie po odpowiedzi
+  (`usage.total_tokens`), opróżnienie kubełka po 429 (wszystkie procesy odczekują).
+- Odczyt, uzupełnienie i pobranie z kubełka w jednej transakcji BEGIN IMMEDIATE -
+  atomowe między procesami, więc żaden klucz nie dostaje więcej, niż pozwalają limity.
+
+Włączane zmienną LLM_RATE_LIMIT=1 (pula procesów ustawia ją sama). Bez niej `core.ask_llm`
+działa jak dotąd - tylko semafor w procesie (`core.is_rate_limited`).
+
+Konfiguracja (.env):
+    GROQ_RPM=30      # limit zapytań na minutę jednego klucza
+    GROQ_TPM=6000    # limit tokenów na minutę jednego klucza
+
+Użycie z linii komend:
+    python rate_limit.py                  # stan kubełków
+    python rate_limit.py --stress 4       # test: 4 procesy naraz, sprawdzenie, że limit nie jest przekroczony
+"""
+
+import os
+import time
+import random
+import sqlite3
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import multiprocessing
+from contextlib import closing
+
+from history import HISTORY_DIR
+
+# Stałe konfiguracyjne
+RATE_DB_FILE = os.environ.get("LLM_RATE_DB") or os.path.join(HISTORY_DIR, "rate_limits.db")
+RPM = int(os.environ.get("GROQ_RPM", 30))
+TPM = int(os.environ.get("GROQ_TPM", 6000))
+COMPLETION_TOKENS_ESTIMATE = 800   # Rezerwacja na odpowiedź (rozliczana po fakcie)
+CHARS_PER_TOKEN = 4
+MAX_WAIT_STEP = 5.0                # Najdłuższe pojedyncze oczekiwanie przed ponownym sprawdzeniem
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key_id TEXT PRIMARY KEY,
+    requests REAL NOT NULL,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+def key_id(api_key):
+    """Identyfikator klucza w bazie (skrót - sam klucz nie trafia na dysk)."""
+    return hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()[:12]
+
+
+def estimate_tokens(messages, completion=COMPLETION_TOKENS_ESTIMATE):
+    """Szacunek tokenów zapytania: długość promptu / CHARS_PER_TOKEN + rezerwa na odpowiedź."""
+    return sum(len(str(m.get("content", ""))) for m in messages) // CHARS_PER_TOKEN + completion
+
+
+def _connect(db_path=RATE_DB_FILE):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _update(api_key, change, rpm, tpm, db_path):
+    """
+    Atomowo: wczytanie kubełków klucza, uzupełnienie za upływ czasu i `change(requests, tokens)`.
+
+    Returns:
+        Wynik `change` (nowe requests, nowe tokens, wartość zwracana).
+    """
+    with closing(_connect(db_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT requests, tokens, updated FROM buckets WHERE key_id = ?",
+                               (key_id(api_key),)).fetchone()
+            requests, tokens, updated = row if row else (rpm, tpm, now)
+            elapsed = max(0.0, now - updated)
+            requests = min(rpm, requests + elapsed * rpm / 60)
+            tokens = min(tpm, tokens + elapsed * tpm / 60)
+            requests, tokens, result = change(requests, tokens)
+            conn.execute("INSERT OR REPLACE INTO buckets (key_id, requests, tokens, updated) VALUES (?, ?, ?, ?)",
+                         (key_id(api_key), requests, tokens, now))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return result
+
+
+def try_acquire(api_key, tokens, rpm=None, tpm=None, db_path=RATE_DB_FILE):
+    """
+    Próbuje zarezerwować jedno zapytanie i `tokens` tokenów na kluczu.
+
+    Returns:
+        float: 0.0 - zarezerwowano; w przeciwnym razie liczba sekund do możliwej rezerwacji.
+    """
+    rpm, tpm = rpm or RPM, tpm or TPM
+    tokens = min(tokens, tpm)   # Większe zapytanie nigdy by się nie zmieściło
+
+    def change(requests, available):
+        wait = max((1 - requests) * 60 / rpm, (tokens - available) * 60 / tpm, 0.0)
+        if wait > 0:
+            return requests, available, wait
+        return requests - 1, available - tokens, 0.0
+
+    return _update(api_key, change, rpm, tpm, db_path)
+
+
+def settle(api_key, reserved, used, db_path=RATE_DB_FILE):
+    """Rozliczenie po odpowiedzi: zwrot nadmiaru rezerwacji albo dopłata (kubełek może zejść poniżej zera)."""
+    if used is None or used == reserved:
+        return
+    _update(api_key, lambda r, t: (r, t + reserved - used, None), RPM, TPM, db_path)
+
+
+def drain(api_key, db_path=RATE_DB_FILE):
+    """Po 429: opróżnia kubełek zapytań klucza - wszystkie procesy odczekają, zamiast ponawiać naraz."""
+    _update(api_key, lambda r, t: (min(r, 0.0), t, None), RPM, TPM, db_path)
+
+
+async def acquire(api_keys, tokens, db_path=RATE_DB_FILE):
+    """
+    Czeka, aż któryś klucz będzie miał wolny limit, i rezerwuje go.
+
+    Returns:
+        int: Indeks klucza w `api_keys`, na którym zarezerwowano zapytanie.
+    """
+    while True:
+        waits = []
+        for idx in random.sample(range(len(api_keys)), len(api_keys)):
+            wait = await asyncio.to_thread(try_acquire, api_keys[idx], tokens, db_path=db_path)
+            if wait <= 0:
+                return idx
+            waits.append(wait)
+        await asyncio.sleep(min(min(waits), MAX_WAIT_STEP))
+
+
+def bucket_status(db_path=RATE_DB_FILE):
+    """Stan kubełków (po uzupełnieniu do chwili obecnej): lista (key_id, zapytania, tokeny)."""
+    if not os.path.exists(db_path):
+        return []
+    now = time.time()
+    with closing(_connect(db_path)) as conn:
+        rows = conn.execute("SELECT key_id, requests, tokens, updated FROM buckets ORDER BY key_id").fetchall()
+    return [(kid, min(RPM, r + (now - u) * RPM / 60), min(TPM, t + (now - u) * TPM / 60)) for kid, r, t, u in rows]
+
+
+# ==============================================================================
+# TEST OBCIĄŻENIOWY (WIELE PROCESÓW)
+# ==============================================================================
+
+def _stress_worker(db_path, requests, rpm, grants, start):
+    start.wait()
+    for _ in range(requests):
+        while (wait := try_acquire("stress", 1, rpm=rpm, tpm=10 ** 9, db_path=db_path)) > 0:
+            time.sleep(min(wait, MAX_WAIT_STEP))
+        grants.put(time.time())
+
+
+def stress(processes, requests=30, rpm=1200):
+    """
+    `processes` procesów rezerwuje po `requests` zapytań na jednym kluczu, startując z pustego kubełka.
+
+    Returns:
+        tuple: (liczba rezerwacji, największe przekroczenie ponad 1 + rpm/60 * czas między rezerwacjami).
+    """
+    db_path = os.path.join(tempfile.mkdtemp(prefix="rate_limit_"), "stress.db")
+    ctx = multiprocessing.get_context("spawn")
+    grants, start = ctx.Queue(), ctx.Event()
+    workers = [ctx.Process(target=_stress_worker, args=(db_path, requests, rpm, grants, start)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    time.sleep(1.0)   # Start procesów (spawn) - wszystkie czekają na sygnał
+    _update("stress", lambda r, t: (0.0, t, None), rpm, 10 ** 9, db_path)   # Pusty kubełek: tempo stałe
+    start.set()
+    times = sorted(grants.get() for _ in range(processes * requests))
+    for worker in workers:
+        worker.join()
+
+    rate = rpm / 60
+    excess = max((j - i + 1) - (1 + rate * (times[j] - times[i]))
+                 for i in range(len(times)) for j in range(i, len(times)))
+    return len(times), excess
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wspólne (międzyprocesowe) limity kluczy Groq.")
+    parser.add_argument("--stress", type=int, default=0, metavar="PROCESY", help="Test obciążeniowy z PROCESY procesami.")
+    parser.add_argument("--requests", type=int, default=30, help="Zapytań na proces w teście.")
+    parser.add_argument("--rpm", type=int, default=1200, help="Limit zapytań na minutę w teście.")
+    args = parser.parse_args()
+
+    if args.stress:
+        started = time.monotonic()
+        total, excess = stress(args.stress, args.requests, args.rpm)
+        elapsed = time.monotonic() - started
+        print(f"🪣 {total} rezerwacji z {args.stress} procesów w {elapsed:.1f}s "
+              f"(limit {args.rpm / 60:.1f}/s, średnio {total / elapsed:.1f}/s), największe przekroczenie: {excess:.2f}")
+        # Tolerancja 1 zapytania: czas rezerwacji jest odczytywany tuż po transakcji, nie w niej
+        raise SystemExit(0 if excess <= 1.0 else 1)
+    for kid, requests, tokens in bucket_status():
+        print(f"  {kid}: {requests:.1f}/{RPM} zapytań, {tokens:.0f}/{TPM} tokenów")
@@ -0,0 +1,466 @@
+"""
+Moduł Archiwum Przepisów (Recipe Store).
+
+Zawiera:
+- Strukturalne archiwum przepisów w SQLite (`memory/recipes.db`), obok Markdownów z `daily_plans/`.
+- Zapis każdej zweryfikowanej opcji oraz planu dnia (śniadanie/obiad/kolacja).
+- Indeksy po nazwie dania, kuchni, składniku i dacie + wyszukiwanie pełnotekstowe (FTS5).
+- Importer (backfill), który parsuje istniejące archiwum Markdown do bazy.
+
+Użycie z linii komend:
+    python recipe_store.py --backfill          # import daily_plans/*.md
+    python recipe_store.py --search "dynia"    # wyszukiwanie pełnotekstowe
+"""
+
+import os
+import re
+import json
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+from contextlib import closing
+
+from history import HISTORY_DIR
+from preferences import normalize_ingredient
+from matching import normalize_dish_name, similarity
+
+# ==============================================================================
+# KONFIGURACJA
+# ==============================================================================
+
+RECIPE_DB_FILE = os.path.join(HISTORY_DIR, "recipes.db")
+DAILY_PLANS_DIR = "daily_plans"
+
+# Rodzaje wpisów: opcje z ankiety oraz posiłki z planu dnia
+MEAL_OPTION = "option"
+MEALS = ["breakfast", "lunch", "dinner"]
+MEAL_LABELS = {"śniadanie": "breakfast", "obiad": "lunch", "kolacja": "dinner"}
+
+# Ponowne użycie zweryfikowanych przepisów (pomijanie warsztatu)
+REUSE_MIN_SIMILARITY = 0.75    # Minimalne podobieństwo nazwy pomysłu do nazwy z archiwum
+NOVELTY_WINDOW_DAYS = 30       # Przepis młodszy niż tyle dni nie może wrócić (byłby powtórką)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plan_date TEXT NOT NULL,
+    meal TEXT NOT NULL,
+    dish_name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    cuisine TEXT,
+    calories TEXT,
+    approved INTEGER NOT NULL DEFAULT 1,
+    source TEXT NOT NULL DEFAULT 'live',
+    data TEXT NOT NULL,
+    UNIQUE (plan_date, meal, name_key)
+);
+CREATE TABLE IF NOT EXISTS recipe_ingredients (
+    recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+    ingredient TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recipes_name ON recipes(name_key);
+CREATE INDEX IF NOT EXISTS idx_recipes_cuisine ON recipes(cuisine);
+CREATE INDEX IF NOT EXISTS idx_recipes_date ON recipes(plan_date);
+CREATE INDEX IF NOT EXISTS idx_ingredients_name ON recipe_ingredients(ingredient);
+CREATE INDEX IF NOT EXISTS idx_ingredients_recipe ON recipe_ingredients(recipe_id);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+    dish_name, description, ingredients, steps, tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _connect(db_path=RECIPE_DB_FILE):
+    """Otwiera bazę i tworzy schemat (jeśli nie istnieje). Zwraca (połączenie, czy_fts)."""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+    try:
+        conn.executescript(_FTS_SCHEMA)
+        has_fts = True
+    except sqlite3.OperationalError:
+        # SQLite bez FTS5 - wyszukiwanie tekstowe przechodzi na LIKE
+        has_fts = False
+    return conn, has_fts
+
+
+# ==============================================================================
+# ZAPIS
+# ==============================================================================
+
+def _insert_recipe(conn, has_fts, recipe, plan_date, meal, cuisine, calories, approved, source):
+    """Wstawia (lub nadpisuje) jeden przepis wraz z indeksem składników i FTS."""
+    dish_name = recipe.get("dish_name") or "Danie"
+    name_key = normalize_dish_name(dish_name)
+    items = [i.get("item", "") for i in recipe.get("ingredients", []) if isinstance(i, dict)]
+
+    old = conn.execute(
+        "SELECT id FROM recipes WHERE plan_date = ? AND meal = ? AND name_key = ?",
+        (plan_date, meal, name_key)
+    ).fetchone()
+    if old:
+        conn.execute("DELETE FROM recipes WHERE id = ?", (old["id"],))
+        if has_fts:
+            conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", (old["id"],))
+
+    cursor = conn.execute(
+        "INSERT INTO recipes (plan_date, meal, dish_name, name_key, cuisine, calories, approved, source, data) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (plan_date, meal, dish_name, name_key, cuisine, str(calories) if calories else None,
+         int(bool(approved)), source, json.dumps(recipe, ensure_ascii=False))
+    )
+    recipe_id = cursor.lastrowid
+    keys = {normalize_ingredient(i) for i in items} - {""}
+    conn.executemany(
+        "INSERT INTO recipe_ingredients (recipe_id, ingredient) VALUES (?, ?)",
+        [(recipe_id, k) for k in sorted(keys)]
+    )
+    if has_fts:
+        conn.execute(
+            "INSERT INTO recipes_fts (rowid, dish_name, description, ingredients, steps) VALUES (?, ?, ?, ?, ?)",
+            (recipe_id, dish_name, recipe.get("description", ""), "\n".join(items),
+             "\n".join(str(s) for s in recipe.get("steps", [])))
+        )
+    return recipe_id
+
+
+def save_recipe(recipe, plan_date, meal=MEAL_OPTION, cuisine=None, macros=None,
+                approved=True, source="live", db_path=RECIPE_DB_FILE):
+    """
+    Zapisuje pojedynczy przepis w archiwum.
+
+    Args:
+        recipe (dict): Przepis w formacie agentów (dish_name, description, ingredients, steps...).
+        plan_date (str): Data planu (YYYY-MM-DD).
+        meal (str): "option" (opcja z ankiety) lub "breakfast"/"lunch"/"dinner".
+        cuisine (str): Kuchnia dnia.
+        macros (dict): Zweryfikowane makro (np. {"calories": 650}).
+
+    Returns:
+        int: ID przepisu w bazie.
+    """
+    calories = (macros or {}).get("calories") or recipe.get("calories")
+    conn, has_fts = _connect(db_path)
+    with closing(conn), conn:
+        return _insert_recipe(conn, has_fts, recipe, plan_date, meal, cuisine, calories, approved, source)
+
+
+def save_day(plan_date, cuisine, options, star_dish, meal_plan, db_path=RECIPE_DB_FILE):
+    """Zapisuje wszystkie zweryfikowane opcje oraz pełny plan dnia (jedna transakcja)."""
+    conn, has_fts = _connect(db_path)
+    with closing(conn), conn:
+        for option in options:
+            recipe = option.get("recipe") or {}
+            if recipe:
+                calories = (option.get("macros") or {}).get("calories")
+                _insert_recipe(conn, has_fts, recipe, plan_date, MEAL_OPTION, cuisine, calories, True, "live")
+
+        day = {
+            "breakfast": ((meal_plan or {}).get("breakfast"), None),
+            "lunch": ((star_dish or {}).get("recipe"), cuisine),
+            "dinner": ((meal_plan or {}).get("dinner"), None),
+        }
+        for meal, (recipe, meal_cuisine) in day.items():
+            if isinstance(recipe, dict) and recipe.get("dish_name"):
+                calories = (star_dish.get("macros") or {}).get("calories") if meal == "lunch" else recipe.get("calories")
+                _insert_recipe(conn, has_fts, recipe, plan_date, meal, meal_cuisine, calories, True, "live")
+    print(f"🗄️ [ARCHIWUM] Zapisano przepisy dnia {plan_date} ({len(options)} opcji + plan dnia)")
+
+
+# ==============================================================================
+# ODCZYT (ZAPYTANIA)
+# ==============================================================================
+
+def _row_to_dict(row):
+    """Konwertuje wiersz bazy na słownik (z rozpakowanym przepisem)."""
+    result = dict(row)
+    result["recipe"] = json.loads(result.pop("data"))
+    return result
+
+
+def find_recipes(name=None, cuisine=None, ingredient=None, date_from=None, date_to=None,
+                 text=None, meal=None, approved_only=False, limit=20, db_path=RECIPE_DB_FILE):
+    """
+    Wyszukuje przepisy w archiwum. Wszystkie filtry są opcjonalne i łączone przez AND.
+
+    Args:
+        name (str): Fragment nazwy dania (porównanie po znormalizowanym kluczu).
+        cuisine (str): Dokładna nazwa kuchni.
+        ingredient (str): Składnik (porównanie po znormalizowanym kluczu).
+        date_from / date_to (str): Zakres dat (YYYY-MM-DD, włącznie).
+        text (str): Zapytanie pełnotekstowe (FTS5) po nazwie, opisie, składnikach i krokach.
+        meal (str): "option", "breakfast", "lunch" lub "dinner".
+
+    Returns:
+        list[dict]: Wiersze archiwum (najnowsze najpierw) z kluczem "recipe".
+    """
+    conn, has_fts = _connect(db_path)
+    clauses, params = [], []
+    if name:
+        clauses.append("r.name_key LIKE ?")
+        params.append(f"%{normalize_dish_name(name)}%")
+    if cuisine:
+        clauses.append("r.cuisine = ?")
+        params.append(cuisine)
+    if ingredient:
+        clauses.append("r.id IN (SELECT recipe_id FROM recipe_ingredients WHERE ingredient = ?)")
+        params.append(normalize_ingredient(ingredient))
+    if date_from:
+        clauses.append("r.plan_date >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("r.plan_date <= ?")
+        params.append(date_to)
+    if meal:
+        clauses.append("r.meal = ?")
+        params.append(meal)
+    if approved_only:
+        clauses.append("r.approved = 1")
+    if text:
+        if has_fts:
+            clauses.append("r.id IN (SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH ?)")
+            params.append(" ".join(f'"{w}"' for w in text.replace('"', ' ').split()))
+        else:
+            clauses.append("(r.dish_name LIKE ? OR r.data LIKE ?)")
+            params.extend([f"%{text}%", f"%{text}%"])
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = f"SELECT r.* FROM recipes r {where} ORDER BY r.plan_date DESC, r.id DESC LIMIT ?"
+    with closing(conn):
+        return [_row_to_dict(row) for row in conn.execute(query, (*params, limit))]
+
+
+def served_dish_names(since=None, until=None, db_path=RECIPE_DB_FILE):
+    """Zwraca unikalne nazwy dań z archiwum z zakresu dat (YYYY-MM-DD, włącznie)."""
+    if not os.path.exists(db_path):
+        return []
+    clauses, params = [], []
+    if since:
+        clauses.append("plan_date >= ?")
+        params.append(since)
+    if until:
+        clauses.append("plan_date <= ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn, _ = _connect(db_path)
+    with closing(conn):
+        rows = conn.execute(f"SELECT dish_name, MAX(plan_date) FROM recipes {where} GROUP BY name_key", params)
+        return [row[0] for row in rows]
+
+
+def novelty_cutoff(today=None, novelty_days=NOVELTY_WINDOW_DAYS):
+    """Zwraca pierwszą datę okna nowości (dania podane od tej daty nie mogą się powtórzyć)."""
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    return (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=novelty_days)).strftime("%Y-%m-%d")
+
+
+def find_reusable_recipe(idea, cuisine, min_similarity=REUSE_MIN_SIMILARITY,
+                         novelty_days=NOVELTY_WINDOW_DAYS, today=None, exclude=(), db_path=RECIPE_DB_FILE):
+    """
+    Szuka w archiwum zatwierdzonego przepisu, który można użyć zamiast warsztatu.
+
+    Kandydatami są tylko przepisy z warsztatu (opcje i obiady z trybu "live") tej samej kuchni.
+    Przepis musi być podobny do pomysłu (n-gramy nazwy) i nie może pojawić się w oknie nowości
+    (jeśli danie było podawane w ostatnich `novelty_days` dniach, nie wraca). `exclude` to nazwy
+    dań już wybranych w tym przebiegu - ten sam przepis nie trafia dwa razy do jednej ankiety.
+
+    Returns:
+        dict | None: Wiersz archiwum (z kluczem "recipe" i "similarity") lub None.
+    """
+    if not os.path.exists(db_path) or not idea:
+        return None
+    cutoff = novelty_cutoff(today, novelty_days)
+    excluded = {normalize_dish_name(name) for name in exclude}
+
+    conn, _ = _connect(db_path)
+    with closing(conn):
+        rows = conn.execute(
+            "SELECT r.*, (SELECT MAX(x.plan_date) FROM recipes x WHERE x.name_key = r.name_key) AS last_served "
+            "FROM recipes r "
+            "WHERE r.cuisine = ? AND r.approved = 1 AND r.source = 'live' AND r.meal IN (?, 'lunch') "
+            "ORDER BY r.plan_date DESC",
+            (cuisine, MEAL_OPTION)
+        ).fetchall()
+
+    best, best_score = None, 0.0
+    for row in rows:
+        if row["last_served"] >= cutoff or row["name_key"] in excluded:
+            continue
+        score = similarity(idea, row["dish_name"])
+        if score > best_score:
+            best, best_score = row, score
+    if best is None or best_score < min_similarity:
+        return None
+    result = _row_to_dict(best)
+    result.pop("last_served", None)
+    result["similarity"] = round(best_score, 3)
+    return result
+
+
+# ==============================================================================
+# BACKFILL (IMPORT ARCHIWUM MARKDOWN)
+# ==============================================================================
+
+_PHOTO_RE = re.compile(r'📷\s*\[Zobacz\s+(.+?)\]\(')
+_CALORIES_RE = re.compile(r'kalorie:?\**\s*:?\s*\**\s*(\d+(?:\s*[-–]\s*\d+)?)', re.IGNORECASE)
+_STEP_RE = re.compile(r'^\s*\**\s*(\d+)\.\s*\**\s*(.+)$')
+_LEADING_SYMBOLS_RE = re.compile(r'^[^\w(]+', re.UNICODE)
+
+
+def _clean_markdown(line):
+    """Usuwa pogrubienia, wypunktowania i emoji z początku linii."""
+    line = line.replace("**", "").strip()
+    return _LEADING_SYMBOLS_RE.sub("", line).strip()
+
+
+def _is_header(line, word):
+    """Czy linia jest nagłówkiem sekcji (np. **Składniki:** 📝)."""
+    cleaned = _clean_markdown(line).lower()
+    return cleaned.startswith(word) and len(cleaned) <= len(word) + 4
+
+
+def _parse_ingredient_line(line):
+    """Parsuje linię składnika ("🥔 Ziemniaki – 3 sztuki") do formatu agentów."""
+    cleaned = _clean_markdown(line)
+    if not cleaned:
+        return None
+    parts = re.split(r'\s+[–—-]\s+|:\s+', cleaned, maxsplit=1)
+    item = parts[0].strip()
+    amount = parts[1].strip() if len(parts) > 1 else ""
+    return {"item": item, "amount": amount, "unit": ""} if item else None
+
+
+def _find_title(lines, start, stop):
+    """Szuka tytułu przepisu (ostatnia pogrubiona linia przed sekcją składników)."""
+    for idx in range(stop - 1, start - 1, -1):
+        raw = lines[idx].strip()
+        if not raw.startswith("**"):
+            continue
+        cleaned = _clean_markdown(raw)
+        lowered = cleaned.lower()
+        if lowered.startswith(("kalorie", "składniki", "przygotowanie", "ciekawostka")):
+            continue
+        label = next((meal for word, meal in MEAL_LABELS.items() if lowered.startswith(word)), None)
+        name = re.sub(r'^(śniadanie|obiad|kolacja)\s*:?\s*', '', cleaned, flags=re.IGNORECASE)
+        name = _LEADING_SYMBOLS_RE.sub("", name).strip(" :")
+        name = re.sub(r'[^\w)]+$', '', name).strip()
+        if name:
+            return name, label
+        if label:
+            # Sama etykieta ("**Obiad:**") - nazwa jest linię wyżej
+            prev_name, _ = _find_title(lines, start, idx)
+            return prev_name, label
+    return None, None
+
+
+def parse_daily_plan_markdown(content):
+    """
+    Parsuje Markdown planu dnia do listy przepisów.
+
+    Kotwicą są sekcje "Składniki:" (po jednej na przepis). Nazwa dania pochodzi z linku
+    "📷 [Zobacz ...]" (najpewniejsze źródło) lub z pogrubionego tytułu nad sekcją.
+
+    Returns:
+        list[tuple[str, dict]]: Lista par (posiłek, przepis).
+    """
+    lines = content.splitlines()
+    headers = [i for i, line in enumerate(lines) if _is_header(line, "składniki")]
+    results = []
+    prev_end = 0
+    for pos, header in enumerate(headers):
+        block_end = headers[pos + 1] if pos + 1 < len(headers) else len(lines)
+
+        ingredients, steps, photo_name, steps_started = [], [], None, False
+        last_content = header
+        for idx in range(header + 1, block_end):
+            line = lines[idx]
+            photo = _PHOTO_RE.search(line)
+            if photo:
+                photo_name = photo.group(1).strip()
+                last_content = idx
+                break
+            if _is_header(line, "przygotowanie"):
+                steps_started = True
+                continue
+            if not line.strip():
+                continue
+            if steps_started:
+                step = _STEP_RE.match(line)
+                if step:
+                    steps.append(_clean_markdown(step.group(2)))
+                    last_content = idx
+                elif steps:
+                    break
+            elif line.strip().startswith("**") and not ingredients:
+                continue
+            elif not line.strip().startswith("**"):
+                parsed = _parse_ingredient_line(line)
+                if parsed:
+                    ingredients.append(parsed)
+                last_content = idx
+
+        title, label = _find_title(lines, prev_end, header)
+        calories = None
+        for idx in range(prev_end, header):
+            match = _CALORIES_RE.search(lines[idx].replace("**", ""))
+            if match:
+                calories = re.sub(r'\s+', '', match.group(1))
+        dish_name = photo_name or title
+        if dish_name and ingredients:
+            meal = label or (MEALS[pos] if len(headers) == 3 else MEALS[min(pos, 2)])
+            recipe = {"dish_name": dish_name, "description": "", "ingredients": ingredients, "steps": steps}
+            if calories:
+                recipe["calories"] = calories
+            results.append((meal, recipe))
+        prev_end = last_content + 1
+    return results
+
+
+def backfill_from_markdown(plans_dir=DAILY_PLANS_DIR, db_path=RECIPE_DB_FILE):
+    """
+    Importuje całe archiwum Markdown do bazy (pliki luźne i paczki miesięczne - `archive`).
+    Operacja jest idempotentna (ponowny import nadpisuje wpisy o tej samej dacie, posiłku i nazwie).
+
+    Returns:
+        int: Liczba zaimportowanych przepisów.
+    """
+    if not os.path.isdir(plans_dir):
+        print(f"⚠️ Brak folderu {plans_dir}")
+        return 0
+
+    from archive import iter_plans
+
+    conn, has_fts = _connect(db_path)
+    imported = 0
+    with closing(conn), conn:
+        for plan_date, content in iter_plans(plans_dir):
+            for meal, recipe in parse_daily_plan_markdown(content):
+                _insert_recipe(conn, has_fts, recipe, plan_date, meal, None, recipe.get("calories"), True, "backfill")
+                imported += 1
+    print(f"🗄️ [ARCHIWUM] Zaimportowano {imported} przepisów z {plans_dir}/")
+    return imported
+
+
+def ensure_recipe_store(plans_dir=DAILY_PLANS_DIR, db_path=RECIPE_DB_FILE):
+    """Przy pierwszym uruchomieniu (brak bazy) automatycznie importuje archiwum Markdown."""
+    if not os.path.exists(db_path):
+        backfill_from_markdown(plans_dir, db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archiwum przepisów RecipeCookerAI")
+    parser.add_argument("--backfill", action="store_true", help="Importuj daily_plans/*.md do bazy")
+    parser.add_argument("--search", help="Wyszukiwanie pełnotekstowe")
+    parser.add_argument("--cuisine", help="Filtr kuchni")
+    parser.add_argument("--ingredient", help="Filtr składnika")
+    args = parser.parse_args()
+
+    if args.backfill:
+        backfill_from_markdown()
+    if args.search or args.cuisine or args.ingredient:
+        for row in find_recipes(text=args.search, cuisine=args.cuisine, ingredient=args.ingredient):
+            print(f"{row['plan_date']} [{row['meal']}] {row['dish_name']} ({row['cuisine'] or '-'})")
@@ -0,0 +1,150 @@
+"""
+Moduł Lokalnego Wyszukiwania (Retrieval).
+
+Zawiera etap przygotowania wyników Google dla Analityka Trendów (bez wywołań API):
+- Czyszczenie i odrzucanie fragmentów "śmieciowych" (cookies, logowanie, same daty).
+- Deduplikację fragmentów między zapytaniami (dokładną i przybliżoną).
+- Ranking BM25 względem kuchni i briefu.
+- Wybór top-k fragmentów mieszczących się w budżecie tokenów.
+"""
+
+import re
+import math
+import unicodedata
+from collections import Counter
+
+from matching import normalize_dish_name, similarity
+
+# Stałe konfiguracyjne
+BM25_K1 = 1.5
+BM25_B = 0.75
+MAX_SNIPPETS = 8               # Maksymalna liczba fragmentów w prompcie
+SNIPPET_TOKEN_BUDGET = 600     # Budżet tokenów na dane z wyszukiwarki
+NEAR_DUPLICATE_THRESHOLD = 0.85
+MIN_SNIPPET_LENGTH = 40
+
+# Frazy typowe dla boilerplate'u (regulaminy, logowanie, nawigacja sklepów)
+_BOILERPLATE = (
+    "cookie", "ciasteczk", "zaloguj", "log in", "sign in", "subscribe", "newsletter",
+    "regulamin", "polityka prywatności", "privacy policy", "koszyk", "dostawa gratis",
+    "all rights reserved", "wszelkie prawa zastrzeżone",
+)
+_DATE_PREFIX_RE = re.compile(r'^\s*(\d{1,2}\s+\w{3,}\.?\s+\d{4}|\w{3}\s+\d{1,2},\s+\d{4})\s*(\.\.\.|—|-)?\s*')
+
+
+def estimate_tokens(text):
+    """Szacunkowa liczba tokenów (ok. 4 znaki na token, wystarczające do budżetowania)."""
+    return max(1, len(text) // 4)
+
+
+def tokenize(text):
+    """
+    Tokenizacja do BM25: małe litery bez diakrytyków i prosty stemming końcówek.
+    W odróżnieniu od `normalize_dish_name` zachowuje tekst w nawiasach i dzieli na "/"
+    (opis kuchni "Turecka (Kebab/Meze)" to najlepsze słowa zapytania).
+    """
+    text = unicodedata.normalize("NFKD", str(text or "").lower().replace("ł", "l"))
+    words = re.findall(r'[a-z0-9]+', "".join(ch for ch in text if not unicodedata.combining(ch)))
+    return [w[:-1] if len(w) > 4 else w for w in words if len(w) > 1]
+
+
+def clean_snippet(snippet):
+    """Usuwa datę z początku, wielokropki i nadmiarowe białe znaki."""
+    text = _DATE_PREFIX_RE.sub("", str(snippet or ""))
+    text = text.replace("\xa0", " ").replace("...", " ").replace("…", " ")
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def is_boilerplate(snippet):
+    """Czy fragment to śmieć (za krótki lub zawiera frazy regulaminowe/nawigacyjne)."""
+    lowered = snippet.lower()
+    return len(snippet) < MIN_SNIPPET_LENGTH or any(phrase in lowered for phrase in _BOILERPLATE)
+
+
+def dedupe_snippets(snippets):
+    """
+    Usuwa duplikaty (także przybliżone) z zachowaniem kolejności pierwszego wystąpienia.
+
+    Args:
+        snippets (list): Lista par (zapytanie, fragment).
+
+    Returns:
+        list: Lista par (zapytanie, oczyszczony fragment) bez duplikatów i boilerplate'u.
+    """
+    kept, seen_keys = [], set()
+    for query, snippet in snippets:
+        text = clean_snippet(snippet)
+        if is_boilerplate(text):
+            continue
+        key = normalize_dish_name(text)
+        if key in seen_keys:
+            continue
+        if any(similarity(text, other) >= NEAR_DUPLICATE_THRESHOLD for _, other in kept):
+            continue
+        seen_keys.add(key)
+        kept.append((query, text))
+    return kept
+
+
+def bm25_scores(documents, query):
+    """
+    Oblicza wyniki BM25 dokumentów względem zapytania.
+
+    Args:
+        documents (list[str]): Teksty dokumentów.
+        query (str): Zapytanie (np. kuchnia + brief).
+
+    Returns:
+        list[float]: Wynik dla każdego dokumentu (w tej samej kolejności).
+    """
+    docs = [tokenize(d) for d in documents]
+    if not docs:
+        return []
+    avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+    doc_freq = Counter(term for d in docs for term in set(d))
+    n_docs = len(docs)
+    query_terms = set(tokenize(query))
+
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        score = 0.0
+        for term in query_terms:
+            if term not in tf:
+                continue
+            idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            norm = tf[term] + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_len)
+            score += idf * tf[term] * (BM25_K1 + 1) / norm
+        scores.append(score)
+    return scores
+
+
+def select_snippets(results, query, max_snippets=MAX_SNIPPETS, token_budget=SNIPPET_TOKEN_BUDGET):
+    """
+    Pełny etap lokalnego wyszukiwania: deduplikacja, ranking BM25 i przycięcie do budżetu.
+
+    Args:
+        results (dict): Mapa zapytanie -> lista fragmentów z Google.
+        query (str): Tekst, względem którego liczymy trafność (kuchnia + brief).
+
+    Returns:
+        str: Dane dla Analityka Trendów (najtrafniejsze fragmenty, jeden na linię).
+    """
+    pairs = [(q, s) for q, snippets in results.items() for s in snippets]
+    unique = dedupe_snippets(pairs)
+    scores = bm25_scores([s for _, s in unique], query)
+    ranked = sorted(zip(scores, range(len(unique))), key=lambda pair: (-pair[0], pair[1]))
+
+    chosen, used = [], 0
+    for _, idx in ranked:
+        if len(chosen) >= max_snippets:
+            break
+        line = f"- {unique[idx][1]}"
+        cost = estimate_tokens(line)
+        if used + cost > token_budget:
+            continue
+        chosen.append(line)
+        used += cost
+
+    print(f"🔎 [RETRIEVAL] Fragmenty: {len(pairs)} -> {len(unique)} unikalnych -> {len(chosen)} w prompcie (~{used} tok.)")
+    return "\n".join(chosen)
@@ -0,0 +1,119 @@
+"""
+Moduł Kanałów Zastępczych (Sinki Wejścia/Wyjścia).
+
+Kanały o tym samym interfejsie, którego pipeline używa na kanale Discorda
+(`send`, `fetch_message`, `history`, reakcje wiadomości), ale bez logowania do Discorda:
+- `MemoryChannel` - wszystko w pamięci (testy, benchmarki, wsadowe generowanie).
+- `StdoutChannel` - wiadomości drukowane na standardowe wyjście.
+- `FileChannel`   - wiadomości dopisywane do pliku Markdown.
+
+Wejście czatu (dla Analityka) podaje się jako linie "autor: treść" (`load_chat_lines`).
+"""
+
+import itertools
+from types import SimpleNamespace
+from datetime import datetime, timezone
+
+_IDS = itertools.count(1)
+
+
+def _next_id():
+    """Unikalne ID wiadomości w procesie (rosnące, jak snowflake Discorda)."""
+    return next(_IDS)
+
+
+class SinkMessage:
+    """Wiadomość wysłana do kanału zastępczego (treść, embed, reakcje)."""
+
+    def __init__(self, channel, content=None, embed=None, author=None):
+        self.id = _next_id()
+        self.channel = channel
+        self.content = content or ""
+        self.embed = embed
+        self.author = author or SimpleNamespace(id=0, name="RecipeCooker", bot=True)
+        self.created_at = datetime.now(timezone.utc)
+        self.reactions = []
+
+    async def add_reaction(self, emoji):
+        if not any(str(r.emoji) == emoji for r in self.reactions):
+            self.reactions.append(SimpleNamespace(emoji=emoji, count=1))
+
+    def render(self):
+        """Tekst wiadomości (embed jako tytuł, opis i pola)."""
+        parts = [self.content] if self.content else []
+        if self.embed is not None:
+            parts.append(f"## {self.embed.title}\n{self.embed.description or ''}".strip())
+            parts.extend(f"**{field.name}**\n{field.value}" for field in self.embed.fields)
+        return "\n\n".join(parts)
+
+
+class MemoryChannel:
+    """
+    Kanał w pamięci.
+
+    Args:
+        name (str): Nazwa kanału (do logów).
+        chat (list[str]): Wiadomości użytkowników "autor: treść" widoczne w historii kanału.
+    """
+
+    def __init__(self, name="headless", chat=None):
+        self.id = _next_id()
+        self.name = name
+        self.messages = []
+        for line in chat or []:
+            author, _, text = line.partition(":") if ":" in line else ("uzytkownik", "", line)
+            user = SimpleNamespace(id=hash(author.strip()) & 0xFFFF, name=author.strip(), bot=False)
+            self.messages.append(SinkMessage(self, text.strip(), author=user))
+
+    async def send(self, content=None, embed=None):
+        message = SinkMessage(self, content, embed)
+        self.messages.append(message)
+        self.emit(message)
+        return message
+
+    async def fetch_message(self, message_id):
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise LookupError(f"Brak wiadomości {message_id} na kanale '{self.name}'")
+
+    async def history(self, limit=100, after=None, oldest_first=False):
+        """Historia kanału (najnowsze pierwsze, chyba że `oldest_first`), jak `TextChannel.history`."""
+        after_id = getattr(after, "id", after) or 0
+        messages = [m for m in self.messages if m.id > after_id]
+        messages = messages[:limit] if oldest_first else messages[::-1][:limit]
+        for message in messages:
+            yield message
+
+    def bot_messages(self):
+        """Wiadomości wysłane przez pipeline (bez wejścia czatu)."""
+        return [m for m in self.messages if m.author.bot]
+
+    def emit(self, message):
+        """Punkt rozszerzenia: co zrobić z nową wiadomością (tu: nic, zostaje w pamięci)."""
+
+
+class StdoutChannel(MemoryChannel):
+    """Kanał drukujący wiadomości na standardowe wyjście."""
+
+    def emit(self, message):
+        print(f"\n────── #{self.name} ──────\n{message.render()}")
+
+
+class FileChannel(MemoryChannel):
+    """Kanał dopisujący wiadomości do pliku Markdown (plik jest czyszczony przy utworzeniu)."""
+
+    def __init__(self, path, name=None, chat=None):
+        super().__init__(name or path, chat)
+        self.path = path
+        open(path, "w", encoding="utf-8").close()
+
+    def emit(self, message):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(message.render() + "\n\n")
+
+
+def load_chat_lines(path):
+    """Wczytuje wejście czatu z pliku tekstowego (jedna wiadomość "autor: treść" na linię)."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
@@ -0,0 +1,83 @@
+"""
+Moduł Kanałów (Wielu Odbiorców).
+
+Każdy obsługiwany kanał Discorda ma własną przestrzeń nazw pamięci: historię, preferencje,
+dziennik czatu, dziennik wysłanych wiadomości, kolejkę planów i katalog planów dziennych.
+Archiwum przepisów i pula opcji są wspólne (dzielenie wyników między kanałami).
+
+Konfiguracja (.env):
+    DISCORD_CHANNEL_ID=123                     # kanał główny (dotychczasowe memory/ i daily_plans/)
+    DISCORD_CHANNEL_IDS=456:Kuchnia,789:Kitchen:en   # dodatkowe kanały (opcjonalnie nazwa i lokalizacja)
+"""
+
+import os
+from collections import namedtuple
+
+from history import HISTORY_DIR, PLANS_DIR
+from locales import BASE_LOCALE, LOCALES
+
+# Stałe konfiguracyjne
+TENANTS_DIR = os.path.join(HISTORY_DIR, "tenants")
+
+
+class Tenant(namedtuple("Tenant", "channel_id name history_dir plans_dir locale", defaults=(BASE_LOCALE,))):
+    """Kanał-odbiorca z własną przestrzenią nazw plików pamięci i lokalizacją wiadomości (`locales`)."""
+
+    __slots__ = ()
+
+    @property
+    def chat_log_file(self):
+        return os.path.join(self.history_dir, "chat_log.json")
+
+    @property
+    def sent_log_file(self):
+        return os.path.join(self.history_dir, "sent_log.json")
+
+    @property
+    def plan_queue_file(self):
+        return os.path.join(self.history_dir, "plan_queue.json")
+
+
+def default_tenant(channel_id=0):
+    """Kanał główny - pliki w dotychczasowych miejscach (zgodność wstecz)."""
+    return Tenant(channel_id, "main", HISTORY_DIR, PLANS_DIR)
+
+
+def make_tenant(channel_id, name=None, locale=BASE_LOCALE):
+    """Dodatkowy kanał - pliki w memory/tenants/<id>/ i daily_plans/<id>/."""
+    return Tenant(channel_id, name or str(channel_id),
+                  os.path.join(TENANTS_DIR, str(channel_id)), os.path.join(PLANS_DIR, str(channel_id)), locale)
+
+
+def parse_tenants(main_channel_id, extra=""):
+    """
+    Lista kanałów: główny (jeśli ustawiony) i dodatkowe z listy "id[:nazwa[:lokalizacja]],...".
+
+    Returns:
+        list[Tenant]: Kanały bez duplikatów, kanał główny pierwszy.
+    """
+    tenants = [default_tenant(main_channel_id)] if main_channel_id else []
+    for item in (extra or "").split(","):
+        raw_id, _, rest = item.strip().partition(":")
+        name, _, locale = rest.partition(":")
+        if not raw_id:
+            continue
+        try:
+            channel_id = int(raw_id)
+        except ValueError:
+            print(f"⚠️ Niepoprawne ID kanału w DISCORD_CHANNEL_IDS: '{raw_id}'. Pomijam.")
+            continue
+        locale = locale.strip().lower() or BASE_LOCALE
+        if locale not in LOCALES:
+            print(f"⚠️ Nieznana lokalizacja '{locale}' kanału {channel_id}. Używam '{BASE_LOCALE}'.")
+            locale = BASE_LOCALE
+        if all(t.channel_id != channel_id for t in tenants):
+            tenants.append(make_tenant(channel_id, name.strip() or None, locale))
+    return tenants
+
+
+def load_tenants():
+    """Kanały z konfiguracji środowiska (DISCORD_CHANNEL_ID + DISCORD_CHANNEL_IDS)."""
+    from core import CHANNEL_ID
+
+    return parse_tenants(CHANNEL_ID, os.environ.get("DISCORD_CHANNEL_IDS", ""))
@@ -0,0 +1,60 @@
+"""Archiwum planów: zwijanie miesiąca do paczki, odczyt z paczki i wykrywanie uszkodzeń."""
+
+import os
+
+import pytest
+
+import archive
+
+
+def _write_plans(plans_dir, dates):
+    os.makedirs(plans_dir, exist_ok=True)
+    contents = {}
+    for idx, date_str in enumerate(dates):
+        contents[date_str] = f"# Plan {date_str}\n\n**OBIAD: Pierogi ruskie {idx}** 🥟\n" + "Składniki:\n- mąka – 500 g\n" * (idx + 1)
+        with open(os.path.join(plans_dir, f"{date_str}.md"), "w", encoding="utf-8") as f:
+            f.write(contents[date_str])
+    return contents
+
+
+def test_roll_round_trip(tmp_path):
+    plans_dir, history_dir = str(tmp_path / "plans"), str(tmp_path / "memory")
+    contents = _write_plans(plans_dir, ["2026-08-01", "2026-08-02", "2026-09-05", "2026-10-18"])
+
+    assert archive.roll(plans_dir, history_dir, today="2026-10-19") == 3
+
+    # Minione miesiące tylko w paczkach, bieżący miesiąc zostaje luźny
+    assert sorted(os.listdir(plans_dir)) == ["2026-10-18.md", "archive"]
+    assert archive.plan_dates(plans_dir) == sorted(contents)
+    for date_str, content in contents.items():
+        assert archive.read_plan(date_str, plans_dir) == content
+    assert dict(archive.iter_plans(plans_dir)) == contents
+    assert archive.read_plan("2026-08-03", plans_dir) is None
+
+
+def test_late_entry_merges_into_existing_pack(tmp_path):
+    plans_dir, history_dir = str(tmp_path / "plans"), str(tmp_path / "memory")
+    contents = _write_plans(plans_dir, ["2026-08-01"])
+    archive.roll(plans_dir, history_dir, today="2026-10-19")
+    contents.update(_write_plans(plans_dir, ["2026-08-15"]))
+
+    assert archive.roll(plans_dir, history_dir, today="2026-10-19") == 1
+    assert dict(archive.iter_plans(plans_dir)) == contents
+
+
+def test_corrupt_member_is_detected_and_skipped(tmp_path):
+    plans_dir, history_dir = str(tmp_path / "plans"), str(tmp_path / "memory")
+    contents = _write_plans(plans_dir, ["2026-08-01", "2026-08-02"])
+    archive.roll(plans_dir, history_dir, today="2026-10-19")
+
+    pack_path = os.path.join(plans_dir, "archive", "plans-2026-08.pack")
+    with open(pack_path, "r+b") as f:
+        f.seek(-8, os.SEEK_END)
+        f.write(b"\xff" * 8)
+    stat = os.stat(pack_path)
+    os.utime(pack_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))   # Odczyt z pamięci podręcznej unieważniony
+
+    last = max(contents)
+    with pytest.raises(ValueError):
+        archive.read_plan(last, plans_dir)
+    assert last not in dict(archive.iter_plans(plans_dir))
@@ -0,0 +1,37 @@
+"""Porównanie wyników benchmarków z bazą (normalizacja medianą stosunków lub kalibracją)."""
+
+from benchmarks import compare, machine_speed
+
+BASELINE = {"calibration": 0.001, "results": {"slow_machine": 0.010, "regressed": 0.010}}
+
+
+def test_slower_machine_is_not_a_regression():
+    (row,) = compare({"slow_machine": 0.015}, BASELINE, tolerance=0.3, calibration=0.0015)
+    assert abs(row[3] - 1.0) < 1e-9
+    assert row[4] is False
+
+
+def test_regression_survives_normalization():
+    (row,) = compare({"regressed": 0.020}, BASELINE, tolerance=0.3, calibration=0.001)
+    assert row[4] is True
+
+
+def test_baseline_without_calibration_compares_absolute_times():
+    (row,) = compare({"slow_machine": 0.015}, {"results": BASELINE["results"]}, tolerance=0.3, calibration=0.0015)
+    assert row[4] is True
+
+
+def test_new_case_has_no_ratio():
+    (row,) = compare({"new": 0.001}, BASELINE, calibration=0.001)
+    assert row[2] is None and row[3] is None and not row[4]
+
+
+def test_median_of_cases_beats_overcorrecting_calibration():
+    # Maszyna wolniejsza x1.4, mikropętla kalibracyjna twierdzi x2.0, jeden przypadek ma realną regresję 50%
+    baseline = {"calibration": 0.001, "results": {f"case{i}": 0.010 for i in range(6)}}
+    results = {f"case{i}": 0.014 for i in range(5)}
+    results["case5"] = 0.021
+    speed, source = machine_speed(results, baseline, calibration=0.002)
+    assert source == "mediana" and abs(speed - 1.4) < 1e-9
+    flagged = [row[0] for row in compare(results, baseline, tolerance=0.3, calibration=0.002) if row[4]]
+    assert flagged == ["case5"]
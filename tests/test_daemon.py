@@ -0,0 +1,31 @@
+"""Tryb ciągły: komendy na kanale i okna czasowe harmonogramu."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from daemon import parse_command, next_run_at, is_off_peak
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("!kucharz teraz", ("teraz", "")),
+    ("!KUCHARZ Szukaj pierogi ruskie", ("szukaj", "pierogi ruskie")),
+    ("!kucharz", ("pomoc", "")),
+    ("!kucharz gotuj", ("pomoc", "")),
+    ("kucharz teraz", None),
+    ("", None),
+])
+def test_parse_command(content, expected):
+    assert parse_command(content) == expected
+
+
+def test_next_run_today_or_tomorrow():
+    assert next_run_at(datetime(2026, 10, 19, 6, 0, tzinfo=timezone.utc), "07:00") == \
+        datetime(2026, 10, 19, 7, 0, tzinfo=timezone.utc)
+    assert next_run_at(datetime(2026, 10, 19, 7, 0, tzinfo=timezone.utc), "07:00") == \
+        datetime(2026, 10, 20, 7, 0, tzinfo=timezone.utc)
+
+
+def test_off_peak_guard_before_daily_run():
+    assert not is_off_peak(datetime(2026, 10, 19, 6, 0, tzinfo=timezone.utc), "07:00", guard_minutes=90)
+    assert is_off_peak(datetime(2026, 10, 19, 4, 0, tzinfo=timezone.utc), "07:00", guard_minutes=90)
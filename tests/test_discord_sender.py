@@ -0,0 +1,41 @@
+"""Idempotentna wysyłka: ponowienie tego samego uruchomienia nie duplikuje wiadomości, nowe run_id - tak."""
+
+import asyncio
+from datetime import datetime, timezone
+
+from daemon import manual_run_id
+from discord_sender import DiscordSender, split_message
+from sinks import MemoryChannel
+
+
+async def _publish(channel, run_id, log_file, texts):
+    sender = DiscordSender(channel, run_id=run_id, log_file=log_file)
+    poll = await sender.send("poll", "Ankieta")
+    await sender.send_many("msg", texts)
+    await sender.close()
+    return poll
+
+
+def test_retry_of_the_same_run_does_not_resend(tmp_path):
+    channel, log_file = MemoryChannel("test"), str(tmp_path / "sent_log.json")
+    first = asyncio.run(_publish(channel, "2026-10-19", log_file, ["Plan", "Lista zakupów"]))
+    again = asyncio.run(_publish(channel, "2026-10-19", log_file, ["Plan", "Lista zakupów"]))
+    assert again.id == first.id
+    assert [m.content for m in channel.messages] == ["Ankieta", "Plan", "Lista zakupów"]
+
+
+def test_manual_run_gets_fresh_messages(tmp_path):
+    channel, log_file = MemoryChannel("test"), str(tmp_path / "sent_log.json")
+    scheduled = asyncio.run(_publish(channel, "2026-10-19", log_file, ["Plan"]))
+    manual = asyncio.run(_publish(channel, manual_run_id(), log_file, ["Nowy plan"]))
+    assert manual.id != scheduled.id
+    assert [m.content for m in channel.messages] == ["Ankieta", "Plan", "Ankieta", "Nowy plan"]
+
+
+def test_manual_run_id_is_not_the_scheduled_date():
+    assert manual_run_id(datetime(2026, 10, 19, 9, 30, 5, tzinfo=timezone.utc)) == "2026-10-19-teraz-093005"
+
+
+def test_split_message_respects_limit():
+    parts = split_message("\n\n".join(["x" * 1500] * 3), limit=2000)
+    assert len(parts) == 3 and all(len(p) <= 2000 for p in parts)
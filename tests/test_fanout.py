@@ -0,0 +1,54 @@
+"""Fan-out: grupowanie kanałów według kuchni i wspólna historia grupy."""
+
+from tenants import make_tenant
+from preferences import merge_preference_models
+from fanout import assign_cuisines, _group_history, _group_brief
+
+ITALIAN, FRENCH = "Włoska (Klasyczna)", "Francuska (Bistro)"
+
+
+def _state(idx, suggested="", last_cuisines=(), brief="", **history):
+    history = dict(history, last_cuisines=list(last_cuisines))
+    return {"tenant": make_tenant(idx, f"kanal-{idx}"), "channel": None, "history": history,
+            "brief": brief, "insight": "", "suggested": suggested, "chat": []}
+
+
+def _names(groups):
+    return {cuisine: [s["tenant"].name for s in members] for cuisine, members in groups.items()}
+
+
+def test_suggestions_first_then_largest_allowed_group():
+    states = [_state(1), _state(2, suggested=ITALIAN), _state(3, suggested=ITALIAN), _state(4, suggested=FRENCH)]
+    assert _names(assign_cuisines(states)) == {
+        ITALIAN: ["kanal-2", "kanal-3", "kanal-1"],
+        FRENCH: ["kanal-4"],
+    }
+
+
+def test_recent_cuisine_is_not_joined():
+    states = [_state(1, last_cuisines=[ITALIAN]), _state(2, suggested=ITALIAN), _state(3, suggested=FRENCH)]
+    assert _names(assign_cuisines(states)) == {ITALIAN: ["kanal-2"], FRENCH: ["kanal-3", "kanal-1"]}
+
+
+def test_merge_preference_models_averages_scores():
+    merged = merge_preference_models([
+        {"cuisines": {ITALIAN: 1.0}, "ingredients": {"dynia": 0.6, "tofu": -0.4}, "polls": 3},
+        {"cuisines": {FRENCH: 0.5}, "ingredients": {"dynia": 0.2}, "polls": 2},
+        {},
+    ])
+    assert merged["cuisines"] == {ITALIAN: round(1 / 3, 4), FRENCH: round(0.5 / 3, 4)}
+    assert merged["ingredients"] == {"dynia": round(0.8 / 3, 4), "tofu": round(-0.4 / 3, 4)}
+    assert merged["polls"] == 5
+
+
+def test_group_history_and_brief_use_every_member():
+    members = [
+        _state(1, brief="tanio", preference_model={"ingredients": {"tofu": -1.0}}, liked_trends=["Pierogi"]),
+        _state(2, brief="na imprezę", preference_model={"ingredients": {"tofu": 1.0, "dynia": 0.5}},
+               liked_trends=["Pierogi", "Bigos"]),
+        _state(3, brief="tanio"),
+    ]
+    history = _group_history(members)
+    assert history["preference_model"]["ingredients"] == {"dynia": round(0.5 / 3, 4)}
+    assert history["liked_trends"] == ["Pierogi", "Bigos"]
+    assert _group_brief(members) == "tanio | na imprezę"
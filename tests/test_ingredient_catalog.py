@@ -0,0 +1,41 @@
+"""Rozpoznawanie składników: krótkie rdzenie synonimów nie pochłaniają niezwiązanych słów."""
+
+import pytest
+
+from ingredient_catalog import resolve_ingredient
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("por", "cebula"),
+    ("pory", "cebula"),
+    ("jajek", "jajko"),
+    ("ryżu", "ryz"),
+    ("serek topiony", "ser"),
+    ("mleko kokosowe", "mleko_kokosowe"),
+    ("ziemniaków", "ziemniak"),
+])
+def test_inflected_names_resolve(name, expected):
+    assert resolve_ingredient(name) == expected
+
+
+@pytest.mark.parametrize("name, wrong", [
+    ("Porzeczki", "cebula"),
+    ("porcja", "cebula"),
+    ("sernik", "ser"),
+    ("wodorosty", "woda"),
+])
+def test_short_stems_do_not_absorb_unrelated_words(name, wrong):
+    assert resolve_ingredient(name) != wrong
+
+
+def test_currants_are_fruit():
+    assert resolve_ingredient("Porzeczki czerwone") == "owoce"
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Sałatka owocowa", "owoce"),
+    ("Maki sushi", "ryz"),
+    ("mąki", "maka"),
+])
+def test_dish_like_names_resolve_to_main_ingredient(name, expected):
+    assert resolve_ingredient(name) == expected
@@ -0,0 +1,43 @@
+"""Lokalne dekodowanie odpowiedzi agentów (naprawa JSON, aliasy, typy, dopytanie o brakujące pola)."""
+
+import asyncio
+
+import core
+from llm_json import decode_json, ask_llm_json, repair_json, IDEAS_SCHEMA, NUTRITION_SCHEMA, RECIPE_SCHEMA
+
+
+def test_string_ideas_become_named_ideas():
+    data, missing, _, _ = decode_json('{"ideas": ["Ramen", "Pho"]}', IDEAS_SCHEMA)
+    assert missing == []
+    assert [idea["nazwa"] for idea in data["ideas"]] == ["Ramen", "Pho"]
+
+
+def test_mixed_ideas_and_aliases():
+    data, missing, _, _ = decode_json('{"pomysly": [{"name": "Ramen", "description": "bulion"}, "Pho", ""]}', IDEAS_SCHEMA)
+    assert missing == []
+    assert data["ideas"] == [{"nazwa": "Ramen", "opis": "bulion"}, {"nazwa": "Pho", "opis": ""}]
+
+
+def test_repair_truncated_json_with_fence():
+    data, repairs = repair_json('```json\n{"approved": true, "feedback": "ok"')
+    assert data == {"approved": True, "feedback": "ok"}
+    assert repairs
+
+
+def test_types_are_coerced():
+    data, _, _, _ = decode_json('{"approved": "tak", "kcal": 650}', NUTRITION_SCHEMA)
+    assert data["approved"] is True
+    assert data["calories"] == "650"
+    recipe, _, _, _ = decode_json('{"dish_name": "Pho", "porcje": "4 porcje"}', RECIPE_SCHEMA)
+    assert recipe["servings"] == 4
+
+
+def test_object_without_valid_fields_is_reasked(monkeypatch):
+    responses = iter(['{"ideas": [1, 2]}', '{"ideas": [{"nazwa": "Ramen"}]}'])
+
+    async def fake_ask_llm(messages, **kwargs):
+        return next(responses)
+
+    monkeypatch.setattr(core, "ask_llm", fake_ask_llm)
+    data = asyncio.run(ask_llm_json([{"role": "user", "content": "?"}], IDEAS_SCHEMA, label="Test"))
+    assert data == {"ideas": [{"nazwa": "Ramen", "opis": ""}]}
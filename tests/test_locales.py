@@ -0,0 +1,70 @@
+"""Lokalizacje: wersje językowe dnia ze wspólnych przepisów."""
+
+import asyncio
+
+import locales
+import pipeline
+from sinks import MemoryChannel
+
+
+DAY = {
+    "cuisine": "Polska (Tradycyjna)",
+    "messages": ["Dziś pierogi!"],
+    "options": [{"recipe": {"dish_name": "Pierogi ruskie", "description": "Klasyka"}, "macros": {"calories": 650}}],
+}
+DAY["star_dish"] = dict(DAY["options"][0], meal_plan={
+    "breakfast": {"dish_name": "Owsianka", "ingredients": [{"item": "płatki owsiane", "amount": 60, "unit": "g"}],
+                  "steps": ["Zalej mlekiem"]},
+})
+DAY["star_dish"]["recipe"] = dict(DAY["star_dish"]["recipe"], prep_time="40 min",
+                                  ingredients=[{"item": "mąka", "amount": 500, "unit": "g"}], steps=["Zagnieć ciasto"])
+
+
+def _fake_translator(monkeypatch):
+    async def translate(texts, locale):
+        return {text: f"[{locale}] {text}" for text in texts}
+    monkeypatch.setattr(locales, "_translate_batch", translate)
+    monkeypatch.setattr(locales, "_caches", {})
+
+
+def test_localize_day_renders_labels_and_translations(tmp_path, monkeypatch):
+    _fake_translator(monkeypatch)
+    version = asyncio.run(locales.localize_day(DAY, "en", str(tmp_path / "translations.json")))
+
+    intro, breakfast, lunch, dinner = version["messages"]
+    assert intro == "[en] Dziś pierogi!"
+    assert breakfast.startswith("**BREAKFAST: [en] Owsianka**")
+    assert "- [en] płatki owsiane – 60 g" in breakfast
+    assert "🔥 Calories: 650 | ⏱️ Time: 40 min" in lunch
+    assert "1. [en] Zagnieć ciasto" in lunch
+    assert dinner == "No dinner today"
+    assert version["options"][0]["recipe"]["dish_name"] == "[en] Pierogi ruskie"
+    assert "[en] mąka" in version["shopping"]
+
+
+def test_localize_days_skips_base_and_unknown_locales(tmp_path, monkeypatch):
+    _fake_translator(monkeypatch)
+    versions = asyncio.run(locales.localize_days(DAY, ["pl", "de", "xx", "de"], str(tmp_path / "translations.json")))
+    assert list(versions) == ["de"]
+
+
+def test_queued_day_is_localized(monkeypatch):
+    published = dict(DAY, date="2026-10-19")
+
+    async def publish_day(channel, history, day, *args, **kwargs):
+        return dict(published)
+
+    async def analyze_last_poll(channel, history):
+        return None
+
+    async def localize_days(day, wanted):
+        return {locale: {"messages": [f"{locale}: {day['messages'][0]}"]} for locale in wanted}
+
+    monkeypatch.setattr(pipeline, "pop_day", lambda path: DAY)
+    monkeypatch.setattr(pipeline, "publish_day", publish_day)
+    monkeypatch.setattr(pipeline, "analyze_last_poll", analyze_last_poll)
+    monkeypatch.setattr(pipeline, "localize_days", localize_days)
+
+    result = asyncio.run(pipeline.generate_daily_plan(MemoryChannel(), history={}, persist=False, use_queue=True,
+                                                      locales=["en"]))
+    assert result["localized"] == {"en": ["en: Dziś pierogi!"]}
@@ -0,0 +1,35 @@
+"""Lokalny Dietetyk: reguła kaloryczna tylko przy znanej liczbie porcji."""
+
+from nutrition import calculate_macros, local_nutrition_review
+
+PIDE = {"dish_name": "Pide", "ingredients": [
+    {"item": "mąka pszenna", "amount": "1", "unit": "kg"},
+    {"item": "mięso mielone wołowe", "amount": "500", "unit": "g"},
+    {"item": "ser", "amount": "300", "unit": "g"},
+    {"item": "cebula", "amount": "2", "unit": ""},
+]}
+
+
+def test_missing_servings_goes_to_llm_instead_of_rejecting():
+    review = local_nutrition_review(PIDE)
+    assert review["approved"] is None
+    assert review["needs_llm"] is True
+    assert review["macros"]["servings_known"] is False
+
+
+def test_known_servings_decide_locally():
+    assert local_nutrition_review(dict(PIDE, servings=6))["approved"] is True
+    rejected = local_nutrition_review(dict(PIDE, servings=1))
+    assert rejected["approved"] is False
+    assert "Za dużo kalorii" in rejected["feedback"]
+
+
+def test_unreadable_servings_are_unknown():
+    assert calculate_macros(dict(PIDE, servings="kilka"))["servings_known"] is False
+    assert calculate_macros(dict(PIDE, servings="4 porcje"))["servings"] == 4
+
+
+def test_imbalance_is_rejected_even_without_servings():
+    oil = {"ingredients": [{"item": "olej rzepakowy", "amount": "500", "unit": "ml"},
+                           {"item": "cukier", "amount": "50", "unit": "g"}]}
+    assert local_nutrition_review(oil)["approved"] is False
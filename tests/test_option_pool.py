@@ -0,0 +1,41 @@
+"""Napełnianie puli opcji: tylko wolny limit, z rezerwą na dzienny przebieg."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+import quota
+from option_pool import affords_workshop, daily_run_pending
+
+
+@pytest.fixture(autouse=True)
+def usage_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(quota, "USAGE_DB_FILE", str(tmp_path / "token_usage.db"))
+    monkeypatch.setattr(quota, "AGENT_COSTS_FILE", str(tmp_path / "agent_costs.json"))
+
+
+def _spend_until_left(tokens_left):
+    quota.record_usage("Inny", quota.TPD - tokens_left, "key-a")
+
+
+def test_daily_run_pending_only_before_todays_run():
+    assert daily_run_pending(datetime(2026, 10, 19, 1, 0, tzinfo=timezone.utc))
+    assert not daily_run_pending(datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc))
+
+
+def test_workshop_refused_when_it_would_eat_the_daily_reserve():
+    daily, _ = quota.estimate_run(*quota.RUN_LADDER[0])
+    workshop, _ = quota.background_workshop_cost()
+    _spend_until_left(int(daily + workshop / 2))
+    early = datetime(2026, 10, 19, 1, 0, tzinfo=timezone.utc)
+    late = datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+    assert not affords_workshop(["key-a"], now=early)
+    assert affords_workshop(["key-a"], now=late)   # Dzisiejszy przebieg już był - limit jutro się odnowi
+
+
+def test_workshop_allowed_with_spare_quota():
+    assert affords_workshop(["key-a"], now=datetime(2026, 10, 19, 1, 0, tzinfo=timezone.utc))
+
+
+def test_no_keys_means_no_limit():
+    assert affords_workshop([])
@@ -0,0 +1,28 @@
+"""Przebieg dzienny: łączenie opcji z puli z researchem na żywo."""
+
+import asyncio
+
+import pipeline
+
+
+def test_live_ideas_similar_to_pooled_ones_are_dropped(monkeypatch):
+    pooled = [{"idea": {"nazwa": "Pierogi ruskie"}, "recipe": {"dish_name": "Pierogi ruskie z cebulką"},
+               "macros": {"calories": 650}}]
+    workshop = []
+
+    async def research_trends(cuisine, brief, history):
+        return {"ideas": ["Pierogi ruskie!", "Pierogi ruskie z cebulka", "Bigos myśliwski"]}
+
+    async def run_workshop(ideas, cuisine, brief, history, max_options=3, chosen=()):
+        workshop.extend(ideas)
+        return []
+
+    monkeypatch.setattr(pipeline, "take_options", lambda cuisine, count, keep=None: pooled)
+    monkeypatch.setattr(pipeline, "research_trends", research_trends)
+    monkeypatch.setattr(pipeline, "run_workshop", run_workshop)
+    monkeypatch.setattr(pipeline, "served_dish_names", lambda since=None, until=None: [])
+
+    options, ideas = asyncio.run(pipeline.gather_options("Polska (Tradycyjna)", "", {}, use_pool=True))
+    assert workshop == ["Bigos myśliwski"]
+    assert ideas == [{"nazwa": "Pierogi ruskie"}, "Bigos myśliwski"]
+    assert len(options) == 1
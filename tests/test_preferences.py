@@ -0,0 +1,23 @@
+"""Model preferencji: dopasowanie składników do tekstu pomysłu."""
+
+import pytest
+
+from preferences import score_text, rank_ideas
+
+MODEL = {"ingredients": {"ser": 1.0, "dynia": 0.5, "tofu": -1.0}}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Deser czekoladowy", 0.0),
+    ("Makaron z serem", 1.0),
+    ("Zupa z dynią i serami", 1.5),
+    ("Curry z TOFU", -1.0),
+    ("Serwetki z serwisu", 0.0),
+])
+def test_score_text_matches_whole_words(text, expected):
+    assert score_text(MODEL, text) == pytest.approx(expected)
+
+
+def test_rank_ideas_prefers_liked_ingredients():
+    ideas = [{"nazwa": "Deser z tofu"}, "Tarta dyniowa", {"nazwa": "Pierogi z serem"}]
+    assert rank_ideas(MODEL, ideas) == [{"nazwa": "Pierogi z serem"}, "Tarta dyniowa", {"nazwa": "Deser z tofu"}]
@@ -0,0 +1,26 @@
+"""Lokalny cennik: składniki specjalne rozpoznawane po rdzeniach, bez pochłaniania tanich produktów."""
+
+from pricing import price_ingredient, local_shopper_review, TIER_BASIC, TIER_EXOTIC
+
+
+def test_crab_sticks_are_a_cheap_product():
+    item = price_ingredient({"item": "Paluszki krabowe", "amount": "200", "unit": "g"})
+    assert item["tier"] == TIER_BASIC
+    assert item["cost"] < 10
+    assert item["substitute"] is None
+
+
+def test_real_crab_is_exotic_with_substitute():
+    item = price_ingredient({"item": "Mięso kraba", "amount": "200", "unit": "g"})
+    assert item["tier"] == TIER_EXOTIC
+    assert item["substitute"] == "paluszki krabowe"
+
+
+def test_expensive_recipe_rejected_with_hints():
+    recipe = {"servings": 2, "ingredients": [
+        {"item": "Homar", "amount": "500", "unit": "g"},
+        {"item": "Masło", "amount": "50", "unit": "g"},
+    ]}
+    review = local_shopper_review(recipe)
+    assert review["approved"] is False
+    assert "Homar -> krewetki lub dorsz" in review["feedback"]
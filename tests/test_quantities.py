@@ -0,0 +1,66 @@
+"""Parser ilości i jednostek: odmiany polskich jednostek i brak zgadywania sztuk."""
+
+import pytest
+
+from quantities import parse_amount, parse_unit, format_amount, to_grams, aggregate_shopping_list, format_shopping_list
+
+
+@pytest.mark.parametrize("amount, unit, kind, total", [
+    ("200 gramów", "", "g", 200.0),
+    ("2", "gramy", "g", 2.0),
+    ("1", "kilogramów", "g", 1000.0),
+    ("5", "dekagramów", "g", 50.0),
+    ("0,5 litrów", "", "ml", 500.0),
+    ("2", "litry", "ml", 2000.0),
+    ("250", "mililitrów", "ml", 250.0),
+    ("2", "filiżanki", "ml", 300.0),
+    ("2", "garście", "g", 60.0),
+    ("3", "plasterki", "szt", 0.6),
+    ("2 kromki", "", "szt", 2.0),
+    ("1 kromka", "", "szt", 1.0),
+    ("2", "łyżeczki", "ml", 10.0),
+    ("3 łyżki", "", "ml", 45.0),
+    ("200g", "", "g", 200.0),
+])
+def test_inflected_units(amount, unit, kind, total):
+    parsed = parse_amount(amount, unit)
+    assert parsed.kind == kind
+    assert parsed.amount * parsed.factor == pytest.approx(total)
+
+
+def test_bare_number_and_size_words_are_pieces():
+    assert parse_amount("2", "").kind == "szt"
+    assert parse_amount("2 duże", "").kind == "szt"
+    assert parse_amount("ok. 3", "").amount == 3.0
+
+
+def test_unknown_unit_is_unresolved():
+    assert parse_amount("2", "trzaski") is None
+    assert parse_unit("trzaski") is None
+
+
+def test_flour_in_inflected_grams_is_not_pieces():
+    assert to_grams("200 gramów", "", "maka") == pytest.approx(200.0)
+
+
+def test_format_amount_does_not_duplicate_inflected_unit():
+    assert format_amount("200 gramów", "g") == "200 gramów"
+    assert format_amount("200", "g") == "200 g"
+
+
+def _shopping(*meals):
+    recipes = [{"ingredients": [{"item": i, "amount": a, "unit": u} for i, a, u in meal]} for meal in meals]
+    return format_shopping_list(aggregate_shopping_list(recipes)).splitlines()
+
+
+def test_shopping_list_keeps_products_from_one_catalogue_group_apart():
+    lines = _shopping([("Parmezan", "30", "g"), ("Cytryna", "1", "")], [("Feta", "100", "g"), ("Mango", "2", "")])
+    assert lines == ["- Cytryna – 1 szt.", "- Feta – 100 g", "- Mango – 2 szt.", "- Parmezan – 30 g"]
+
+
+def test_shopping_list_sums_the_same_product_across_meals():
+    assert _shopping([("Feta", "100", "g")], [("feta", "50", "g")]) == ["- Feta – 150 g"]
+
+
+def test_shopping_list_shows_sub_gram_amounts():
+    assert _shopping([("Sól", "5", "ml"), ("Cynamon", "0.5", "g")]) == ["- Cynamon – <1 g", "- Sól – 5 ml"]
@@ -0,0 +1,114 @@
+"""Telemetria tokenów (SQLite, wiele procesów) i dopuszczenie przebiegu."""
+
+import multiprocessing
+
+import pytest
+
+import quota
+
+
+@pytest.fixture(autouse=True)
+def usage_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "token_usage.db")
+    monkeypatch.setattr(quota, "USAGE_DB_FILE", path)
+    monkeypatch.setattr(quota, "AGENT_COSTS_FILE", str(tmp_path / "agent_costs.json"))
+    return path
+
+
+def test_record_usage_counts_agents_and_keys():
+    for _ in range(4):
+        quota.record_usage("Chef", 1000, "key-a")
+    usage = quota.load_usage()
+    assert usage["agents"]["Chef"]["calls"] == 4
+    assert usage["agents"]["Chef"]["mean"] == pytest.approx(1000.0)
+    assert quota.remaining_quota(["key-a"]) == (quota.TPD - 4000, quota.RPD - 4)
+
+
+def test_new_day_resets_key_counters(monkeypatch):
+    monkeypatch.setattr(quota, "_today", lambda: "2026-10-18")
+    quota.record_usage("Chef", 1000, "key-a")
+    quota.mark_exhausted("key-a")
+    assert quota.remaining_quota(["key-a"]) == (0, 0)
+
+    monkeypatch.setattr(quota, "_today", lambda: "2026-10-19")
+    assert quota.remaining_quota(["key-a"]) == (quota.TPD, quota.RPD)
+    quota.record_usage("Chef", 500, "key-a")
+    assert quota.load_usage()["keys"][quota.key_id("key-a")] == \
+        {"date": "2026-10-19", "tokens": 500, "requests": 1, "exhausted": False}
+
+
+def test_exhausted_key_is_skipped():
+    quota.mark_exhausted("key-a")
+    assert quota.usable_keys(["key-a", "key-b"]) == [1]
+    quota.mark_exhausted("key-b")
+    assert quota.usable_keys(["key-a", "key-b"]) == [0, 1]
+
+
+def _record_many(path, count):
+    quota.USAGE_DB_FILE = path
+    for _ in range(count):
+        quota.record_usage("Chef", 10, "key-a")
+
+
+def test_concurrent_processes_do_not_lose_updates(usage_db):
+    processes = [multiprocessing.Process(target=_record_many, args=(usage_db, 50)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    usage = quota.load_usage()
+    assert usage["agents"]["Chef"]["calls"] == 200
+    assert usage["keys"][quota.key_id("key-a")]["tokens"] == 2000
+
+
+def test_admission_picks_largest_variant_that_fits(monkeypatch):
+    monkeypatch.setattr(quota, "TPD", 10_000_000)
+    with quota.admission(["key-a"]) as run:
+        assert run.admitted
+        assert (run.budget.ideas, run.budget.local_audits, run.budget.local_presentation) == quota.RUN_LADDER[0]
+
+    smallest, _ = quota.estimate_run(*quota.RUN_LADDER[-1])
+    second_to_last, _ = quota.estimate_run(*quota.RUN_LADDER[-2])
+    monkeypatch.setattr(quota, "TPD", int((smallest + second_to_last) / 2))
+    with quota.admission(["key-a"]) as run:
+        assert run.admitted
+        assert run.budget.ideas == quota.RUN_LADDER[-1][0]
+
+
+def test_admission_refuses_when_quota_is_spent(monkeypatch):
+    monkeypatch.setattr(quota, "TPD", 1000)
+    with quota.admission(["key-a"]) as run:
+        assert not run.admitted
+
+
+def test_admission_without_keys_is_unlimited():
+    with quota.admission([]) as run:
+        assert run == quota.Admission(None, True)
+
+
+def test_week_admission_shrinks_days_to_fit(monkeypatch):
+    three_days, _ = quota.estimate_run(*quota.RUN_LADDER[-2], days=3)
+    monkeypatch.setattr(quota, "TPD", int(three_days) + 1)
+    with quota.admission(["key-a"], days=7) as run:
+        assert run.admitted
+        assert run.budget.days == 3
+        assert run.budget.ideas >= quota.OPTIONS   # Mniej dni zamiast dni z jednym pomysłem
+
+
+def test_week_budget_counts_ideas_across_days(monkeypatch):
+    monkeypatch.setattr(quota, "TPD", 100_000_000)
+    with quota.admission(["key-a"], days=2) as run:
+        ideas = run.budget.ideas
+        assert all(run.budget.next_idea(0) for _ in range(2 * ideas))
+        assert not run.budget.next_idea(0)
+
+
+def test_exported_agent_costs_seed_a_fresh_database(tmp_path):
+    for _ in range(5):
+        quota.record_usage("Chef", 3000, "key-a")
+    summary = quota.export_agent_costs()
+    assert summary["Chef"]["calls"] == 5
+
+    quota.USAGE_DB_FILE = str(tmp_path / "fresh.db")   # Świeży checkout: pusta baza, podsumowanie z gita
+    assert quota.agent_cost("Chef") == pytest.approx(3000.0)
+    assert quota.agent_cost("Wydawca") == quota.AGENT_PRIORS["Wydawca"]
@@ -0,0 +1,40 @@
+"""Wspólne limity kluczy: kubełki zapytań i tokenów w SQLite."""
+
+import pytest
+
+import rate_limit
+from rate_limit import try_acquire, drain
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+def test_request_bucket_empties_and_refills(tmp_path, clock):
+    db_path = str(tmp_path / "rate.db")
+    assert [try_acquire("k1", 10, rpm=3, tpm=1000, db_path=db_path) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert try_acquire("k1", 10, rpm=3, tpm=1000, db_path=db_path) == pytest.approx(20.0)
+    assert try_acquire("k2", 10, rpm=3, tpm=1000, db_path=db_path) == 0.0   # Osobny kubełek klucza
+
+    clock[0] += 20
+    assert try_acquire("k1", 10, rpm=3, tpm=1000, db_path=db_path) == 0.0
+
+
+def test_token_bucket_limits_large_requests(tmp_path, clock):
+    db_path = str(tmp_path / "rate.db")
+    assert try_acquire("k1", 900, rpm=30, tpm=1000, db_path=db_path) == 0.0
+    assert try_acquire("k1", 400, rpm=30, tpm=1000, db_path=db_path) == pytest.approx(18.0)
+    # Zapytanie większe niż TPM jest przycinane do TPM (inaczej czekałoby w nieskończoność)
+    clock[0] += 60
+    assert try_acquire("k1", 5000, rpm=30, tpm=1000, db_path=db_path) == 0.0
+
+
+def test_drain_after_429_makes_every_process_wait(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RPM", 6)
+    db_path = str(tmp_path / "rate.db")
+    assert try_acquire("k1", 10, db_path=db_path) == 0.0
+    drain("k1", db_path=db_path)
+    assert try_acquire("k1", 10, db_path=db_path) == pytest.approx(10.0)
@@ -0,0 +1,20 @@
+"""Archiwum przepisów: ponowne użycie zweryfikowanych przepisów z warsztatu."""
+
+from recipe_store import save_recipe, find_reusable_recipe
+
+CUISINE = "Polska (Tradycyjna)"
+
+
+def test_reuse_skips_recipes_already_chosen_in_this_run(tmp_path):
+    db_path = str(tmp_path / "recipes.db")
+    save_recipe({"dish_name": "Pierogi ruskie"}, "2026-01-05", cuisine=CUISINE, db_path=db_path)
+    save_recipe({"dish_name": "Pierogi ruskie z cebulką"}, "2026-01-12", cuisine=CUISINE, db_path=db_path)
+
+    first = find_reusable_recipe("Pierogi ruskie", CUISINE, today="2026-10-19", db_path=db_path)
+    assert first["dish_name"] == "Pierogi ruskie"
+
+    second = find_reusable_recipe("Pierogi ruskie", CUISINE, today="2026-10-19", min_similarity=0.3,
+                                  exclude=["pierogi RUSKIE"], db_path=db_path)
+    assert second["dish_name"] == "Pierogi ruskie z cebulką"
+    assert find_reusable_recipe("Pierogi ruskie", CUISINE, today="2026-10-19", min_similarity=0.3,
+                                exclude=[first["dish_name"], second["dish_name"]], db_path=db_path) is None
@@ -0,0 +1,30 @@
+"""Ranking BM25 fragmentów wyszukiwarki względem kuchni i briefu."""
+
+from retrieval import tokenize, bm25_scores, select_snippets
+
+
+def test_tokenize_keeps_parenthesised_descriptor():
+    assert tokenize("Turecka (Kebab/Meze) tanio") == ["tureck", "keba", "meze", "tani"]
+
+
+def test_tokenize_folds_diacritics():
+    assert tokenize("Żurek łódzki") == tokenize("zurek lodzki")
+
+
+def test_descriptor_match_scores_above_unrelated():
+    documents = [
+        "Domowy kebab z jagnięciną i sosem czosnkowym, podawany w picie.",
+        "Sernik baskijski z przypalonym wierzchem - przepis krok po kroku.",
+    ]
+    kebab, sernik = bm25_scores(documents, "Turecka (Kebab/Meze) tanio")
+    assert kebab > 0.0
+    assert sernik == 0.0
+
+
+def test_select_snippets_ranks_relevant_first():
+    results = {
+        "q1": ["Sernik baskijski z przypalonym wierzchem - przepis krok po kroku, bez spodu."],
+        "q2": ["Meze po turecku: hummus, ezme i pieczony bakłażan na wspólnym półmisku."],
+    }
+    selected = select_snippets(results, "Turecka (Kebab/Meze) tanio")
+    assert selected.index("Meze") < selected.index("Sernik")
@@ -0,0 +1,32 @@
+"""Bezstratność kompaktowego formatu wymiany z agentami."""
+
+import json
+
+from wire import compact, expand, short_path, MEAL_PLAN_WIRE, RECIPE_WIRE
+
+RECIPE = {
+    "dish_name": "Pierogi ruskie",
+    "prep_time": "60 min",
+    "servings": 4,
+    "ingredients": [
+        {"item": "mąka pszenna", "amount": "500", "unit": "g"},
+        {"item": "ziemniaki", "amount": "1", "unit": "kg"},
+    ],
+    "steps": ["Zagnieć ciasto.", "Ulep pierogi."],
+}
+
+
+def test_recipe_round_trip():
+    assert expand(compact(RECIPE, RECIPE_WIRE), RECIPE_WIRE) == RECIPE
+
+
+def test_nested_meal_plan_round_trip():
+    plan = {"breakfast": RECIPE, "dinner": RECIPE}
+    assert expand(compact(plan, MEAL_PLAN_WIRE), MEAL_PLAN_WIRE) == plan
+    assert short_path("dinner.steps", MEAL_PLAN_WIRE) == "d.s"
+
+
+def test_compact_is_smaller_with_identical_serialization():
+    def tight(data):
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    assert len(tight(compact(RECIPE, RECIPE_WIRE))) < len(tight(RECIPE))
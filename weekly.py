@@ -0,0 +1,181 @@
+"""
+Moduł Planowania Tygodniowego (Tryb Wsadowy).
+
+Przygotowuje kilka dni naraz i odkłada je do kolejki planów (`plan_queue`):
+- Jedna analiza czatu i historii (Deep Analyst) zamiast codziennej.
+- Jeden wspólny research dla wszystkich wybranych kuchni: jeden Strateg, jedna pula
+  wyników Google, z której lokalny ranking BM25 wybiera fragmenty dla każdej kuchni.
+- Warsztaty, plany posiłków i redakcja wszystkich dni uruchamiane naraz
+  (tempo zapytań do LLM reguluje wspólny semafor `core.ask_llm`).
+- Dopuszczenie jak w przebiegu dziennym (`quota.admission`): tydzień dostaje tyle dni
+  (i taki wariant warsztatu), ile zmieści się w dziennym limicie kluczy.
+
+Dzienny przebieg (`pipeline.generate_daily_plan`) zdejmuje potem dzień z kolejki i tylko go publikuje.
+
+Użycie:
+    python main.py --plan-week 7          # na kanale Discorda (czat jako wejście Analityka)
+    python weekly.py --days 7             # bez Discorda (wejście czatu z --chat)
+    python weekly.py --days 3 --dry-run   # bez zapisu kolejki i historii
+"""
+
+import copy
+import time
+import random
+import asyncio
+import argparse
+
+from core import GROQ_API_KEYS, google_search_snippets, is_google_search_configured
+from quota import admission
+from history import RECENT_REGION_COUNT, load_history, save_history
+from agents.analysis import agent_deep_analyst, agent_search_strategist, agent_trend_analyst_multi_source
+from retrieval import select_snippets
+from recipe_store import ensure_recipe_store
+from chat_log import CHAT_LOG_FILE, load_chat_log, ingest_chat, format_for_analyst, mark_analyzed
+from plan_queue import enqueue_days, queued_cuisines
+from pipeline import (
+    choose_cuisine, get_region_for_cuisine, novel_ideas, run_workshop, plan_meals, compose_messages
+)
+from sinks import MemoryChannel, load_chat_lines
+
+# Stałe konfiguracyjne
+WEEK_DAYS = 7
+QUERIES_PER_CUISINE = 2   # Budżet zapytań wspólnego researchu (zamiast 3 na każdy dzień)
+
+
+# ==============================================================================
+# WYBÓR KUCHNI I WSPÓLNY RESEARCH
+# ==============================================================================
+
+def choose_week_cuisines(history, suggested, days):
+    """
+    Wybiera kuchnie na kolejne dni tą samą regułą co przebieg dzienny (`choose_cuisine`),
+    przesuwając po każdym wyborze listy ostatnich kuchni i regionów (bez powtórek w tygodniu).
+    Kuchnie dni czekających już w kolejce też są traktowane jako "ostatnie".
+    """
+    scratch = copy.deepcopy(history)
+    scratch["last_cuisines"] = queued_cuisines()[::-1] + scratch.get("last_cuisines", [])
+    cuisines = []
+    for idx in range(days):
+        cuisine = choose_cuisine(scratch, suggested if idx == 0 else "")
+        cuisines.append(cuisine)
+        scratch["last_cuisines"].insert(0, cuisine)
+        scratch.setdefault("last_regions", []).insert(0, get_region_for_cuisine(cuisine))
+        scratch["last_regions"] = scratch["last_regions"][:RECENT_REGION_COUNT]
+    return cuisines
+
+
+async def research_week(cuisines, brief, history):
+    """
+    Wspólny research dla wszystkich kuchni: jedna lista zapytań, jedna pula wyników,
+    osobny ranking fragmentów i osobny Analityk Trendów dla każdej kuchni.
+
+    Returns:
+        dict: kuchnia -> lista pomysłów.
+    """
+    print("\n--- Wspólne Badanie Trendów ---")
+    data = {cuisine: "" for cuisine in cuisines}
+    if is_google_search_configured():
+        max_queries = QUERIES_PER_CUISINE * len(cuisines)
+        queries = (await agent_search_strategist(cuisines, brief, max_queries=max_queries)).get("queries", [])
+        if queries:
+            print(f"🔍 Wykonuję {len(queries)} zapytań dla {len(cuisines)} kuchni (zamiast ok. {3 * len(cuisines)})")
+            search_results = await asyncio.gather(*[asyncio.to_thread(google_search_snippets, q, 10) for q in queries])
+            results = {q: snippets for q, (snippets, _) in zip(queries, search_results)}
+            data = {cuisine: select_snippets(results, f"{cuisine} {brief}") for cuisine in cuisines}
+        else:
+            print("⚠️ Strateg nie wygenerował żadnych zapytań.")
+    else:
+        print("🌐 [Tryb Offline] Wyszukiwanie Google nie jest skonfigurowane. Używam tylko historii.")
+
+    analyses = await asyncio.gather(*[agent_trend_analyst_multi_source(c, data[c], history, []) for c in cuisines])
+    return {cuisine: analysis.get("ideas", []) for cuisine, analysis in zip(cuisines, analyses)}
+
+
+# ==============================================================================
+# PLAN TYGODNIA
+# ==============================================================================
+
+async def _prepare_day(cuisine, ideas, brief, insight, history):
+    """Warsztat, plany posiłków i redakcja jednego dnia (bez publikacji)."""
+    ideas = novel_ideas(ideas, history)
+    options = await run_workshop(ideas, cuisine, brief, history) if ideas else []
+    if not options:
+        print(f"❌ [TYDZIEŃ] {cuisine}: brak zweryfikowanych opcji - dzień pominięty.")
+        return None
+    star_dish = random.choice(options)
+    await plan_meals(options)
+    messages = await compose_messages(cuisine, star_dish, star_dish.get("meal_plan"))
+    return {"cuisine": cuisine, "brief": brief, "insight": insight, "ideas": ideas,
+            "options": options, "star_dish": star_dish, "messages": messages}
+
+
+async def plan_week(channel, history=None, days=WEEK_DAYS, bot_user=None, persist=True):
+    """
+    Przygotowuje do `days` dni (tyle, ile dopuści limit tokenów) i dopisuje je do kolejki planów.
+
+    Args:
+        channel: Kanał wejściowy (historia czatu dla Analityka) - Discord lub kanał z `sinks`.
+        persist (bool): Zapis kolejki, historii (wnioski) i dziennika czatu.
+
+    Returns:
+        list[dict]: Przygotowane dni (w kolejności publikacji).
+    """
+    history = history if history is not None else load_history()
+    chat_log_path = CHAT_LOG_FILE if persist else None
+    started = time.monotonic()
+    print(f"\n--- PLAN TYGODNIA: {days} dni ---")
+
+    # Dopuszczenie: tyle dni, ile zmieści się w dziennym limicie kluczy (`quota`)
+    with admission(GROQ_API_KEYS, days=days) as run:
+        if not run.admitted:
+            print("🪫 [TYDZIEŃ] Za mały limit tokenów nawet na jeden dzień - pomijam plan tygodnia.")
+            return []
+        days = run.budget.days if run.budget else days
+        return await _plan_admitted_week(channel, history, days, bot_user, persist, chat_log_path, started)
+
+
+async def _plan_admitted_week(channel, history, days, bot_user, persist, chat_log_path, started):
+    """Plan tygodnia w ramach dopuszczonego budżetu (analiza, research, warsztaty i kolejka)."""
+    # 1. Jedna analiza dla całego tygodnia
+    chat_log = await ingest_chat(channel, bot_user=bot_user, log=load_chat_log(chat_log_path), path=chat_log_path)
+    chat_history_str, _ = format_for_analyst(chat_log)
+    analysis_result = await agent_deep_analyst(chat_history_str, history)
+    if analysis_result:
+        mark_analyzed(chat_log, chat_log_path)
+    brief = analysis_result.get("daily_brief", "Standardowo, szukamy czegoś taniego i dobrego")
+    insight = analysis_result.get("new_learning", "")
+    if insight:
+        print(f"💡 Nowy wniosek o użytkowniku: {insight}")
+        history.setdefault("user_insights", []).append(insight)
+
+    # 2. Kuchnie na kolejne dni i wspólny research
+    cuisines = choose_week_cuisines(history, analysis_result.get("suggested_cuisine", ""), days)
+    print(f"🗓️ Kuchnie tygodnia: {', '.join(cuisines)}")
+    ideas_by_cuisine = await research_week(cuisines, brief, history)
+
+    # 3. Warsztaty wszystkich dni naraz
+    print("\n--- Warsztaty Tygodnia ---")
+    prepared = await asyncio.gather(*[_prepare_day(c, ideas_by_cuisine.get(c, []), brief, insight, history)
+                                      for c in cuisines])
+    week = [day for day in prepared if day]
+
+    if persist and week:
+        queued = enqueue_days(week)
+        save_history(history)
+        print(f"📦 [KOLEJKA] Dopisano {len(week)} dni (w kolejce: {queued})")
+    print(f"✅ Plan tygodnia: {len(week)}/{days} dni w {time.monotonic() - started:.1f}s")
+    return week
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plan tygodniowy do kolejki planów (bez Discorda).")
+    parser.add_argument("--days", type=int, default=WEEK_DAYS)
+    parser.add_argument("--chat", help="Plik z wejściem czatu (\"autor: treść\" na linię).")
+    parser.add_argument("--dry-run", action="store_true", help="Bez zapisu kolejki, historii i dziennika czatu.")
+    args = parser.parse_args()
+
+    ensure_recipe_store()
+    channel = MemoryChannel("weekly", chat=load_chat_lines(args.chat) if args.chat else [])
+    week = asyncio.run(plan_week(channel, days=args.days, persist=not args.dry_run))
+    for day in week:
+        print(f"  - {day['cuisine']}: {', '.join(o['recipe'].get('dish_name', '?') for o in day['options'])}")
@@ -0,0 +1,218 @@
+"""
+Moduł Kompaktowego Formatu Wymiany z Agentami.
+
+Zawiera:
+- Krótkie klucze dla odpowiedzi każdego agenta (np. "n" zamiast "dish_name")
+  i składniki jako wiersze tabeli "składnik|ilość|jednostka".
+- Bezstratne rozwinięcie odpowiedzi do dzisiejszych struktur (dict z pełnymi kluczami).
+- Zwięzłe kodowanie danych wejściowych do promptów (zamiast reprezentacji `str(dict)`).
+- Pomiar zysku tokenowego na przepisach z archiwum: `python wire.py`.
+
+Znak "|" w nazwach składników jest zamieniany na "/" (jedyna stratna zamiana; nie występuje w praktyce).
+"""
+
+# ==============================================================================
+# MAPY KLUCZY (krótki klucz -> pełny klucz lub (pełny klucz, mapa zagnieżdżona))
+# ==============================================================================
+
+ROW_SEPARATOR = "|"
+INGREDIENTS_KEY = "ingredients"   # Pole zapisywane jako wiersze tabeli
+
+RECIPE_WIRE = {"n": "dish_name", "d": "description", "t": "prep_time", "p": "servings",
+               "k": "calories", "i": INGREDIENTS_KEY, "s": "steps"}
+SHOPPER_WIRE = {"a": "approved", "f": "feedback"}
+NUTRITION_WIRE = {"a": "approved", "k": "calories", "f": "feedback"}
+MEAL_PLAN_WIRE = {"b": ("breakfast", RECIPE_WIRE), "d": ("dinner", RECIPE_WIRE)}
+ANALYST_WIRE = {"b": "daily_brief", "c": "suggested_cuisine", "l": "new_learning"}
+QUERIES_WIRE = {"q": "queries"}
+IDEAS_WIRE = {"i": ("ideas", {"n": "nazwa", "o": "opis"})}
+
+# Opisy formatu dla promptów systemowych (jedno miejsce = spójność z mapami powyżej)
+RECIPE_WIRE_FORMAT = ('{"n": "<Nazwa dania>", "d": "<Opis>", "t": "<Czas przygotowania>", "p": <Liczba porcji>, '
+                      '"i": ["<składnik>|<ilość>|<jednostka>"], "s": ["<Krok 1>", "<Krok 2>"]}')
+RECIPE_WIRE_LEGEND = ("Klucze: n=nazwa, d=opis, t=czas, p=porcje, k=kcal, i=składniki "
+                      "(jeden wiersz \"składnik|ilość|jednostka\" na składnik), s=kroki.")
+
+
+def _entry(wire, key):
+    """Zwraca (pełny klucz, mapa zagnieżdżona lub None) dla krótkiego LUB pełnego klucza."""
+    for short, target in wire.items():
+        full, nested = target if isinstance(target, tuple) else (target, None)
+        if key in (short, full):
+            return full, nested
+    return None, None
+
+
+# ==============================================================================
+# WIERSZE SKŁADNIKÓW
+# ==============================================================================
+
+def ingredient_row(ingredient):
+    """{"item", "amount", "unit"} -> "item|amount|unit" (puste końcowe pola są pomijane)."""
+    if not isinstance(ingredient, dict):
+        return str(ingredient)
+    cells = [str(ingredient.get(k) if ingredient.get(k) is not None else "").replace(ROW_SEPARATOR, "/").strip()
+             for k in ("item", "amount", "unit")]
+    while len(cells) > 1 and not cells[-1]:
+        cells.pop()
+    return ROW_SEPARATOR.join(cells)
+
+
+def parse_ingredient_row(row):
+    """"item|amount|unit" -> {"item", "amount", "unit"} (słowniki przechodzą bez zmian)."""
+    if isinstance(row, dict):
+        return row
+    cells = [cell.strip() for cell in str(row).split(ROW_SEPARATOR)]
+    cells += [""] * (3 - len(cells))
+    return {"item": cells[0], "amount": cells[1], "unit": ROW_SEPARATOR.join(cells[2:]).strip(ROW_SEPARATOR)}
+
+
+def format_ingredient_rows(ingredients):
+    """Tabela składników do promptu (jeden wiersz na składnik)."""
+    return "\n".join(ingredient_row(i) for i in ingredients or [])
+
+
+# ==============================================================================
+# ROZWIJANIE I KOMPAKTOWANIE
+# ==============================================================================
+
+def expand(data, wire):
+    """
+    Rozwija odpowiedź w formacie kompaktowym do pełnych kluczy.
+    Operacja jest idempotentna: pełne klucze i nieznane pola przechodzą bez zmian.
+    """
+    if isinstance(data, list):
+        return [expand(item, wire) for item in data]
+    if not isinstance(data, dict):
+        return data
+    result = {}
+    for key, value in data.items():
+        full, nested = _entry(wire, key)
+        if full is None:
+            result.setdefault(key, value)
+            continue
+        if full == INGREDIENTS_KEY and isinstance(value, list):
+            value = [parse_ingredient_row(row) for row in value]
+        elif nested:
+            value = expand(value, nested)
+        result[full] = value
+    return result
+
+
+def compact(data, wire):
+    """Odwrotność `expand`: pełne klucze -> krótkie, składniki -> wiersze tabeli."""
+    if isinstance(data, list):
+        return [compact(item, wire) for item in data]
+    if not isinstance(data, dict):
+        return data
+    reverse = {(t[0] if isinstance(t, tuple) else t): (s, t[1] if isinstance(t, tuple) else None) for s, t in wire.items()}
+    result = {}
+    for key, value in data.items():
+        if key not in reverse:
+            result[key] = value
+            continue
+        short, nested = reverse[key]
+        if key == INGREDIENTS_KEY and isinstance(value, list):
+            value = [ingredient_row(i) for i in value]
+        elif nested:
+            value = compact(value, nested)
+        result[short] = value
+    return result
+
+
+def short_path(path, wire):
+    """Ścieżka pola w pełnych kluczach ("dinner.steps") -> w krótkich ("d.s") dla dopytania modelu."""
+    parts = []
+    for name in path.split("."):
+        if wire is None:
+            parts.append(name)
+            continue
+        short = next((s for s, t in wire.items() if (t[0] if isinstance(t, tuple) else t) == name), name)
+        target = wire.get(short)
+        wire = target[1] if isinstance(target, tuple) else None
+        parts.append(short)
+    return ".".join(parts)
+
+
+# ==============================================================================
+# DANE WEJŚCIOWE DO PROMPTÓW
+# ==============================================================================
+
+def encode_recipe(recipe, with_description=False):
+    """Zwięzły zapis przepisu do promptu (nazwa, porcje, tabela składników, kroki)."""
+    recipe = recipe or {}
+    lines = [f"Danie: {recipe.get('dish_name', '')}"]
+    if with_description and recipe.get("description"):
+        lines.append(f"Opis: {recipe['description']}")
+    if recipe.get("servings"):
+        lines.append(f"Porcje: {recipe['servings']}")
+    lines.append("Składniki (składnik|ilość|jednostka):")
+    lines.append(format_ingredient_rows(recipe.get("ingredients")))
+    steps = recipe.get("steps") or []
+    if steps:
+        lines.append("Kroki:")
+        lines.extend(f"{idx}. {step}" for idx, step in enumerate(steps, 1))
+    return "\n".join(lines)
+
+
+def encode_mapping(data):
+    """Słownik (np. wyliczenia lokalne, wytyczne) jako "klucz: wartość; ..." zamiast repr."""
+    if not isinstance(data, dict):
+        return str(data) if data else "Brak"
+    parts = []
+    for key, value in data.items():
+        if value in (None, "", [], {}):
+            continue
+        if isinstance(value, (list, tuple)):
+            value = "; ".join(str(v) for v in value)
+        parts.append(f"{key}: {value}")
+    return ", ".join(parts) or "Brak"
+
+
+# ==============================================================================
+# POMIAR ZYSKU TOKENOWEGO (python wire.py)
+# ==============================================================================
+
+def _measure(plans_dir="daily_plans"):
+    """Porównuje rozmiar wejść i wyjść agentów: format dotychczasowy vs kompaktowy."""
+    import json
+    from archive import iter_plans
+    from recipe_store import parse_daily_plan_markdown
+    from retrieval import estimate_tokens
+
+    recipes = []
+    for _, content in iter_plans(plans_dir):
+        recipes.extend(recipe for _, recipe in parse_daily_plan_markdown(content))
+    if len(recipes) < 2:
+        print("Za mało przepisów w archiwum do pomiaru.")
+        return
+
+    # Bezstratność: rozwinięcie kompaktu daje dokładnie ten sam przepis
+    lossless = all(expand(compact(r, RECIPE_WIRE), RECIPE_WIRE) == r for r in recipes)
+
+    def tight(data):
+        # Obie strony bez białych znaków: mierzymy sam format (klucze, wiersze składników), nie wcięcia
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    pairs = list(zip(recipes[::2], recipes[1::2]))
+    verdict = {"approved": True, "calories": "650", "feedback": "Danie zbilansowane, składniki łatwo dostępne."}
+    rows = [
+        ("Chef (wyjście)", [(tight(r), tight(compact(r, RECIPE_WIRE))) for r in recipes]),
+        ("Planista (wyjście)", [(tight({"breakfast": a, "dinner": b}),
+                                 tight(compact({"breakfast": a, "dinner": b}, MEAL_PLAN_WIRE))) for a, b in pairs]),
+        ("Dietetyk (wejście)", [(str(r), encode_recipe(r)) for r in recipes]),
+        ("Dietetyk (wyjście)", [(tight(verdict), tight(compact(verdict, NUTRITION_WIRE)))]),
+        ("Logistyk (wejście)", [(str(r.get("ingredients")), format_ingredient_rows(r.get("ingredients"))) for r in recipes]),
+        ("Planista (wejście)", [(str(r.get("ingredients")), format_ingredient_rows(r.get("ingredients"))) for r in recipes]),
+    ]
+
+    print(f"📏 Przepisy z archiwum: {len(recipes)} | bezstratne rozwinięcie: {'TAK' if lossless else 'NIE'}")
+    print(f"{'Agent':<22}{'przed':>8}{'po':>8}{'zysk':>8}   (średnio tokenów, ~4 znaki/token)")
+    for label, samples in rows:
+        before = sum(estimate_tokens(b) for b, _ in samples) / len(samples)
+        after = sum(estimate_tokens(a) for _, a in samples) / len(samples)
+        print(f"{label:<22}{before:>8.0f}{after:>8.0f}{1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    _measure()
@@ -0,0 +1,216 @@
+"""
+Moduł Puli Procesów Roboczych.
+
+Kilka procesów pobiera zadania generowania z lokalnej kolejki (SQLite w trybie WAL,
+`memory/jobs.db`) i wykonuje je niezależnie - każdy proces ma własną pętlę zdarzeń,
+własnych klientów Groq i własny rdzeń. Limity kluczy Groq są wspólne dla wszystkich
+procesów (`rate_limit`, włączane tu automatycznie): procesów może być więcej niż kluczy,
+a żaden klucz nie dostaje więcej zapytań i tokenów, niż pozwalają limity.
+
+Kolejka:
+- Pobranie zadania jest atomowe (BEGIN IMMEDIATE) - każde zadanie wykonuje jeden proces.
+- Zadanie, którego proces padł (brak zakończenia w JOB_TIMEOUT_S), wraca do kolejki
+  (najwyżej MAX_ATTEMPTS prób).
+
+Rodzaje zadań (JOB_HANDLERS):
+- "plan" - plan dnia bez zapisu historii (jak `pipeline.generate_plans`) do pliku Markdown.
+
+Użycie z linii komend:
+    python workers.py --plans 8 --workers 4          # 8 planów w 4 procesach (worker_plans/)
+    python workers.py --plans 8 --chat czat.txt      # wejście czatu dla Analityka
+    python workers.py --status                       # stan kolejki
+"""
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import argparse
+import multiprocessing
+from datetime import datetime
+from contextlib import closing
+
+from history import HISTORY_DIR
+
+# Stałe konfiguracyjne
+JOBS_DB_FILE = os.path.join(HISTORY_DIR, "jobs.db")
+JOBS_PER_WORKER = 2     # Zadania wykonywane naraz w jednym procesie (asyncio)
+JOB_TIMEOUT_S = 30 * 60
+MAX_ATTEMPTS = 2
+IDLE_POLL_S = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_at REAL,
+    finished_at REAL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+"""
+
+
+# ==============================================================================
+# KOLEJKA ZADAŃ
+# ==============================================================================
+
+def _connect(db_path=JOBS_DB_FILE):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def enqueue_jobs(kind, payloads, db_path=JOBS_DB_FILE):
+    """Dopisuje zadania do kolejki. Zwraca ich ID."""
+    with closing(_connect(db_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        ids = [conn.execute("INSERT INTO jobs (kind, payload) VALUES (?, ?)",
+                            (kind, json.dumps(p, ensure_ascii=False))).lastrowid for p in payloads]
+        conn.execute("COMMIT")
+    return ids
+
+
+def claim_job(worker, db_path=JOBS_DB_FILE):
+    """
+    Atomowo pobiera najstarsze zadanie z kolejki (najpierw przywraca zadania porzucone).
+
+    Returns:
+        dict | None: {id, kind, payload} lub None, gdy kolejka jest pusta.
+    """
+    with closing(_connect(db_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        now = time.time()
+        conn.execute("UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END "
+                     "WHERE status = 'running' AND claimed_at < ?", (MAX_ATTEMPTS, now - JOB_TIMEOUT_S))
+        row = conn.execute("SELECT id, kind, payload FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        if row:
+            conn.execute("UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, claimed_at = ? "
+                         "WHERE id = ?", (worker, now, row["id"]))
+        conn.execute("COMMIT")
+    return {"id": row["id"], "kind": row["kind"], "payload": json.loads(row["payload"])} if row else None
+
+
+def finish_job(job_id, result, ok=True, db_path=JOBS_DB_FILE):
+    """Oznacza zadanie jako zakończone (done/failed) z wynikiem."""
+    with closing(_connect(db_path)) as conn:
+        conn.execute("UPDATE jobs SET status = ?, finished_at = ?, result = ? WHERE id = ?",
+                     ("done" if ok else "failed", time.time(), json.dumps(result, ensure_ascii=False), job_id))
+
+
+def queue_status(db_path=JOBS_DB_FILE):
+    """Liczba zadań w każdym stanie: {status: liczba}."""
+    if not os.path.exists(db_path):
+        return {}
+    with closing(_connect(db_path)) as conn:
+        return dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+# ==============================================================================
+# ZADANIA
+# ==============================================================================
+
+async def _run_plan_job(payload):
+    """Plan dnia bez zapisu historii na kanale plikowym."""
+    from history import load_history
+    from pipeline import generate_daily_plan
+    from sinks import FileChannel
+
+    os.makedirs(os.path.dirname(payload["out"]) or ".", exist_ok=True)
+    channel = FileChannel(payload["out"], name=os.path.basename(payload["out"]), chat=payload.get("chat"))
+    result = await generate_daily_plan(channel, load_history(), date_str=payload.get("date"), persist=False,
+                                       run_id=payload.get("run_id"))
+    if not result:
+        return False, {"out": payload["out"]}
+    return True, {"out": payload["out"], "cuisine": result["cuisine"], "options": len(result["options"])}
+
+
+JOB_HANDLERS = {"plan": _run_plan_job}
+
+
+# ==============================================================================
+# PROCESY ROBOCZE
+# ==============================================================================
+
+async def _worker_loop(worker, db_path, concurrency):
+    """Pętla procesu: `concurrency` zadań naraz, do opróżnienia kolejki."""
+    from recipe_store import ensure_recipe_store
+
+    ensure_recipe_store()
+    done = 0
+
+    async def slot():
+        nonlocal done
+        while True:
+            job = await asyncio.to_thread(claim_job, worker, db_path)
+            if not job:
+                return
+            started = time.monotonic()
+            try:
+                ok, result = await JOB_HANDLERS[job["kind"]](job["payload"])
+            except Exception as e:
+                ok, result = False, {"error": str(e)[:200]}
+            result["seconds"] = round(time.monotonic() - started, 1)
+            await asyncio.to_thread(finish_job, job["id"], result, ok, db_path)
+            print(f"{'✅' if ok else '❌'} [{worker}] Zadanie #{job['id']} ({job['kind']}) w {result['seconds']}s")
+            done += 1
+
+    await asyncio.gather(*(slot() for _ in range(concurrency)))
+    return done
+
+
+def _worker_main(worker, db_path, concurrency):
+    """Punkt wejścia procesu roboczego."""
+    done = asyncio.run(_worker_loop(worker, db_path, concurrency))
+    print(f"🏁 [{worker}] Koniec pracy: {done} zadań")
+
+
+def run_workers(workers=None, db_path=JOBS_DB_FILE, concurrency=JOBS_PER_WORKER):
+    """
+    Uruchamia `workers` procesów (domyślnie liczba rdzeni) i czeka, aż opróżnią kolejkę.
+    Limity kluczy Groq są w nich wspólne (LLM_RATE_LIMIT=1 dziedziczone przez procesy).
+
+    Returns:
+        dict: Stan kolejki po zakończeniu.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.environ["LLM_RATE_LIMIT"] = "1"
+    ctx = multiprocessing.get_context("spawn")   # Czysty stan w procesie (bez kopii pętli zdarzeń)
+    processes = [ctx.Process(target=_worker_main, args=(f"w{idx + 1}", db_path, concurrency), daemon=True)
+                 for idx in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return queue_status(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pula procesów roboczych z kolejką zadań i wspólnymi limitami Groq.")
+    parser.add_argument("--plans", type=int, default=0, help="Dopisz N zadań planu dnia i uruchom pulę.")
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów (domyślnie liczba rdzeni).")
+    parser.add_argument("--out", default="worker_plans", help="Katalog planów.")
+    parser.add_argument("--chat", help="Plik z wejściem czatu (\"autor: treść\" na linię).")
+    parser.add_argument("--status", action="store_true", help="Tylko stan kolejki.")
+    args = parser.parse_args()
+
+    if not args.status:
+        if args.plans:
+            from sinks import load_chat_lines
+
+            chat = load_chat_lines(args.chat) if args.chat else []
+            date_str = datetime.now().strftime("%Y-%m-%d")
+            enqueue_jobs("plan", [{"out": os.path.join(args.out, f"plan-{idx + 1}.md"), "chat": chat,
+                                   "date": date_str, "run_id": f"{date_str}-{idx + 1}"} for idx in range(args.plans)])
+        started = time.monotonic()
+        run_workers(args.workers)
+        print(f"⏱️ Pula zakończona w {time.monotonic() - started:.1f}s")
+    print(f"📋 Kolejka: {queue_status() or 'pusta'}")